@@ -7,9 +7,16 @@ import json
 from typing import Dict, List, Optional
 import base64
 from pathlib import Path
+from contextlib import nullcontext
+import html
 import plotly.express as px
 import plotly.graph_objects as go
 
+from backend.metrics import start_metrics_server
+from backend.tracing import TRACES, Span, new_trace_id, start_span
+from config import config
+from services.azure_client import get_azure_client
+
 # Page config
 st.set_page_config(
     page_title="HSO Data Extractor",
@@ -158,8 +165,10 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 class DataExtractorApp:
-    def __init__(self):
+    def __init__(self, client=None):
         self.init_session_state()
+        # Mock of HTTP client volgens de configuratie; de calls lopen onder de document trace
+        self.client = client or get_azure_client()
         # Preload logo (if present)
         self._logo_b64 = self._load_logo_b64()
         
@@ -421,9 +430,28 @@ class DataExtractorApp:
             with col2:
                 if st.button("Start Converting", type="primary"):
                     st.session_state.current_process['document'] = uploaded_file
+                    # Trace van dit document: client calls en Function routes hangen eronder
+                    st.session_state.current_process['trace'] = Span(
+                        "document", new_trace_id(), service="streamlit",
+                        attributes={"filename": uploaded_file.name}
+                    )
                     st.session_state.current_process['step'] = 2
                     st.rerun()
     
+    def document_span(self, name: str):
+        """Span onder de trace van het huidige document (leeg als er geen trace is)"""
+        trace = st.session_state.current_process.get('trace')
+        if trace is None:
+            return nullcontext()
+        return start_span(name, parent=trace, service="streamlit")
+    
+    def finish_document_trace(self, status: str):
+        """Sluit de document span af en bewaar hem bij de spans van dit proces"""
+        trace = st.session_state.current_process.get('trace')
+        if trace is not None:
+            trace.status = status
+            TRACES.record(trace)
+    
     def render_converting_step(self):
         """Render converteer stap"""
         st.markdown("""
@@ -433,44 +461,20 @@ class DataExtractorApp:
         </div>
         """, unsafe_allow_html=True)
 
-        # Simuleer conversie proces
-        if st.session_state.current_process['status'] != 'converting':
-            st.session_state.current_process['status'] = 'converting'
+        st.session_state.current_process['status'] = 'converting'
+        document = st.session_state.current_process['document']
 
-        progress_bar = st.progress(0)
-        status_text = st.empty()
+        # De client call draait in de span, dus traceparent en blob metadata dragen de document trace
+        with st.spinner("Converteer document..."), self.document_span("converting"):
+            result = self.client.convert_pdf_to_text(document.getvalue(), document.name)
 
-        # Simuleer progressie
-        for i in range(100):
-            progress_bar.progress(i + 1)
-            status_text.text(f'Converteer document... {i + 1}%')
-            time.sleep(0.01)
+        if not result.get("success"):
+            st.session_state.current_process['status'] = 'failed'
+            st.error(f"Conversie mislukt: {result.get('error', 'onbekende fout')}")
+            return
 
         st.success("Document succesvol geconverteerd naar tekst!")
-
-        # Sample tekst content voor demo
-        st.session_state.current_process['text_content'] = """
-        PURCHASE ORDER
-        
-        Order Number: APO-00199
-        Date: 2024-01-15
-        Supplier: JASA Packaging Solutions B.V.
-        
-        Items:
-        - Product A: 100 units @ €25.00 = €2,500.00
-        - Product B: 50 units @ €15.00 = €750.00
-        
-        Subtotal: €3,250.00
-        VAT (21%): €682.50
-        Total: €3,932.50
-        
-        Delivery Address:
-        HSO Nederland B.V.
-        Postbus 12345
-        1234 AB Amsterdam
-        """
-
-        time.sleep(1)
+        st.session_state.current_process['text_content'] = result["text"]
         st.session_state.current_process['step'] = 3
         st.rerun()
     
@@ -483,47 +487,20 @@ class DataExtractorApp:
         </div>
         """, unsafe_allow_html=True)
 
-        # Simuleer extractie proces
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-
-        extraction_steps = [
-            "Detecteer document type...",
-            "Identificeer header informatie...",
-            "Extraheer ordergegevens...",
-            "Verwerk line items...",
-            "Berekend totalen...",
-            "Valideer extracted data..."
-        ]
-
-        for i, step in enumerate(extraction_steps):
-            progress = int((i + 1) / len(extraction_steps) * 100)
-            progress_bar.progress(progress)
-            status_text.text(step)
-            time.sleep(0.5)
+        st.session_state.current_process['status'] = 'extracting'
+        text = st.session_state.current_process['text_content']
 
-        st.success("Data succesvol geëxtraheerd!")
+        with st.spinner("Extraheer ordergegevens..."), self.document_span("extracting"):
+            result = self.client.extract_purchase_order_data(text)
 
-        # Sample extracted data voor demo
-        st.session_state.current_process['extracted_data'] = {
-            "order_number": "APO-00199",
-            "date": "2024-01-15",
-            "supplier": "JASA Packaging Solutions B.V.",
-            "items": [
-                {"product": "Product A", "quantity": 100, "unit_price": 25.00, "total": 2500.00},
-                {"product": "Product B", "quantity": 50, "unit_price": 15.00, "total": 750.00}
-            ],
-            "subtotal": 3250.00,
-            "vat_rate": 0.21,
-            "vat_amount": 682.50,
-            "total": 3932.50,
-            "delivery_address": {
-                "company": "HSO Nederland B.V.",
-                "address": "Postbus 12345, 1234 AB Amsterdam"
-            }
-        }
+        if not result.get("success"):
+            st.session_state.current_process['status'] = 'failed'
+            st.error(f"Extractie mislukt: {result.get('error', 'onbekende fout')}")
+            return
 
-        time.sleep(1)
+        st.success("Data succesvol geëxtraheerd!")
+        st.session_state.current_process['extracted_data'] = result["extracted_data"]
+        st.session_state.current_process['status'] = 'ready_for_check'
         st.session_state.current_process['step'] = 4
         st.rerun()
     
@@ -536,34 +513,20 @@ class DataExtractorApp:
         </div>
         """, unsafe_allow_html=True)
         
+        trace = st.session_state.current_process.get('trace')
+        if trace is not None:
+            st.caption(f"Trace ID: {trace.trace_id}")
+        
         # Vergelijking tussen origineel en extracted data
         col1, col2 = st.columns(2)
         
         with col1:
             st.markdown("### Original Document")
-            st.markdown("""
+            text = st.session_state.current_process.get('text_content') or ""
+            st.markdown(f"""
             <div class="comparison-side">
                 <h4>Originele tekst:</h4>
-                <pre style="background: rgba(255,255,255,0.04); color: var(--text); padding: 1rem; border-radius: 6px; font-size: 0.85em; border:1px solid var(--border);">
-PURCHASE ORDER
-
-Order Number: APO-00199
-Date: 2024-01-15
-Supplier: JASA Packaging Solutions B.V.
-
-Items:
-- Product A: 100 units @ €25.00 = €2,500.00
-- Product B: 50 units @ €15.00 = €750.00
-
-Subtotal: €3,250.00
-VAT (21%): €682.50
-Total: €3,932.50
-
-Delivery Address:
-HSO Nederland B.V.
-Postbus 12345
-1234 AB Amsterdam
-                </pre>
+                <pre style="background: rgba(255,255,255,0.04); color: var(--text); padding: 1rem; border-radius: 6px; font-size: 0.85em; border:1px solid var(--border);">{html.escape(text.strip())}</pre>
             </div>
             """, unsafe_allow_html=True)
         
@@ -572,22 +535,26 @@ Postbus 12345
             
             extracted = st.session_state.current_process['extracted_data']
             
-            # Bewerkbare velden voor correctie
-            st.text_input("Order Number", value=extracted['order_number'], key="edit_order_number")
-            st.date_input("Date", value=datetime.strptime(extracted['date'], '%Y-%m-%d'), key="edit_date")
-            st.text_input("Supplier", value=extracted['supplier'], key="edit_supplier")
+            # Bewerkbare velden voor correctie; velden die de extractie niet vond blijven leeg
+            try:
+                order_date = datetime.strptime(extracted.get('date') or "", '%Y-%m-%d')
+            except ValueError:
+                order_date = datetime.now()
+            st.text_input("Order Number", value=extracted.get('order_number') or "", key="edit_order_number")
+            st.date_input("Date", value=order_date, key="edit_date")
+            st.text_input("Supplier", value=extracted.get('supplier') or "", key="edit_supplier")
             
             st.markdown("**Line Items:**")
-            items_df = pd.DataFrame(extracted['items'])
+            items_df = pd.DataFrame(extracted.get('items') or [])
             edited_items = st.data_editor(items_df, use_container_width=True)
             
             col2a, col2b = st.columns(2)
             with col2a:
-                st.number_input("Subtotal", value=extracted['subtotal'], key="edit_subtotal")
-                st.number_input("VAT Amount", value=extracted['vat_amount'], key="edit_vat")
+                st.number_input("Subtotal", value=float(extracted.get('subtotal') or 0), key="edit_subtotal")
+                st.number_input("VAT Amount", value=float(extracted.get('vat_amount') or 0), key="edit_vat")
             with col2b:
-                st.number_input("VAT Rate", value=extracted['vat_rate'], key="edit_vat_rate")
-                st.number_input("Total", value=extracted['total'], key="edit_total")
+                st.number_input("VAT Rate", value=float(extracted.get('vat_rate') or 0), key="edit_vat_rate")
+                st.number_input("Total", value=float(extracted.get('total') or 0), key="edit_total")
         
         st.markdown("---")
         
@@ -596,20 +563,24 @@ Postbus 12345
         
         with col1:
             if st.button("Approve", type="primary", use_container_width=True):
-                # Simuleer opslaan naar Azure Blob Storage
-                with st.spinner("Opslaan naar database..."):
-                    time.sleep(2)
+                with st.spinner("Opslaan naar database..."), self.document_span("saving"):
+                    saved = self.client.save_processed_document(extracted)
+                if not saved.get("success"):
+                    st.error(f"Opslaan mislukt: {saved.get('error', 'onbekende fout')}")
+                    return
+                self.finish_document_trace("approved")
                 
                 st.success("Order succesvol verwerkt en opgeslagen!")
                 
                 # Voeg toe aan documents lijst
+                document = st.session_state.current_process.get('document')
                 new_doc = {
-                    'id': extracted['order_number'],
-                    'name': extracted['supplier'],
-                    'order_number': extracted['order_number'],
-                    'date_created': extracted['date'],
+                    'id': extracted.get('order_number') or "",
+                    'name': extracted.get('supplier') or "",
+                    'order_number': extracted.get('order_number') or "",
+                    'date_created': extracted.get('date') or datetime.now().strftime('%Y-%m-%d'),
                     'status': 'Completed',
-                    'file_size': "2.1 MB",
+                    'file_size': f"{len(document.getvalue()) / (1024 * 1024):.1f} MB" if document else "-",
                     'document_type': 'Purchase Order'
                 }
                 st.session_state.documents.insert(0, new_doc)
@@ -630,6 +601,7 @@ Postbus 12345
         with col2:
             if st.button("Reject", use_container_width=True):
                 st.error("Order gerejected. Terug naar upload.")
+                self.finish_document_trace("rejected")
                 st.session_state.current_process['step'] = 1
                 st.rerun()
     
@@ -644,5 +616,7 @@ Postbus 12345
             self.render_process_screen()
 
 if __name__ == "__main__":
+    if config.METRICS_PORT:
+        start_metrics_server(config.METRICS_PORT)
     app = DataExtractorApp()
     app.run()
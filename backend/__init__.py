@@ -0,0 +1,57 @@
+"""
+Backend modules (de root van de Function App)
+De Function App importeert zijn modules top-level (metrics, tracing, ...), de
+client, devserver en tests als backend.<naam>. Zonder meer laadt Python dan
+twee kopieën van hetzelfde bestand, elk met een eigen metrics REGISTRY,
+TRACES store en span ContextVar.
+
+Deze package zet backend/ op sys.path (zodat de modules elkaar altijd
+top-level kunnen importeren) en laat beide namen naar hetzelfde module object
+wijzen, ongeacht welke naam als eerste geïmporteerd wordt.
+"""
+
+import importlib.abc
+import importlib.util
+import os
+import sys
+
+_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+_PREFIX = __name__ + "."
+
+if _DIRECTORY not in sys.path:
+    sys.path.append(_DIRECTORY)
+
+
+class _AliasLoader(importlib.abc.Loader):
+    """Geeft een al geladen module terug onder een tweede naam"""
+
+    def __init__(self, module):
+        self.module = module
+        self._spec = module.__spec__
+
+    def create_module(self, spec):
+        return self.module
+
+    def exec_module(self, module):
+        # module_from_spec heeft __spec__ naar de alias gezet; de module blijft zichzelf
+        module.__spec__ = self._spec
+
+
+class _AliasFinder(importlib.abc.MetaPathFinder):
+    """Vindt backend.<naam> als <naam> al geladen is, en andersom"""
+
+    def find_spec(self, fullname, path=None, target=None):
+        if fullname.startswith(_PREFIX):
+            alias = fullname[len(_PREFIX):]
+        elif "." not in fullname and os.path.isfile(os.path.join(_DIRECTORY, fullname + ".py")):
+            alias = _PREFIX + fullname
+        else:
+            return None
+        module = sys.modules.get(alias)
+        if module is None:
+            return None
+        return importlib.util.spec_from_loader(fullname, _AliasLoader(module))
+
+
+if not any(isinstance(finder, _AliasFinder) for finder in sys.meta_path):
+    sys.meta_path.insert(0, _AliasFinder())
@@ -5,46 +5,319 @@ voor PDF naar tekst conversie en data extractie.
 """
 
 import azure.functions as func
+import gzip
 import json
 import logging
-from azure.storage.blob import BlobServiceClient
-from azure.cognitiveservices.vision.computervision import ComputerVisionClient
-from azure.cognitiveservices.vision.computervision.models import OperationStatusCodes
-from msrest.authentication import CognitiveServicesCredentials
+import atexit
+import os
+import threading
 import time
-import re
-from typing import Dict, List, Any
-import io
-import PyPDF2
+import uuid
+from contextlib import ExitStack, closing
+from datetime import timedelta
+from functools import wraps
+from typing import Callable, Dict, Iterable, Iterator, List, Any, Optional
+
+from blob_cleanup import BATCH_DELETE_LIMIT, BlobCleaner
+from blob_writer import WriteBehindUploader
+from batch_conversion import (
+    NDJSON_MIMETYPE, BatchError, iter_completed, read_batch_documents, summary_line, to_ndjson_line
+)
+from conversion_cache import (
+    DEFAULT_TTL_SECONDS, BlobCacheStore, ConversionCache, LocalCacheStore, content_hash
+)
+from extraction_engine import extract_fields
+from job_pipeline import (
+    QUEUE_NAMES, BlobPayloadStore, JobPipeline, LocalPayloadStore
+)
+from metrics import PROMETHEUS_MIMETYPE, REGISTRY
+from ocr_polling import PollingPolicy, read_pages
+from pdf_routing import join_pages, missing_ocr_pages, route_pages, summarize_routes
+from pdf_text import extract_pages as extract_pages_parallel, join_with_offsets
+from request_profiling import RequestProfile, profile_request, profiling_requested, write_profile
+from request_timing import OCR_STAGE_NAMES, RequestTimer, merge_timings, stage_timer
+from tracing import (
+    TRACEPARENT_HEADER, TRACES, current_span, parse_traceparent, start_child_span, start_span,
+    to_chrome_trace, trace_metadata
+)
+from upload_buffer import BytesLike, UploadBuffer, open_view
 
 # Azure Function App
 app = func.FunctionApp()
 
-# Configuratie (zou uit environment variables komen)
-STORAGE_CONNECTION_STRING = "DefaultEndpointsProtocol=https;AccountName=yourstorageaccount;..."
-COMPUTER_VISION_ENDPOINT = "https://yourregion.api.cognitive.microsoft.com/"
-COMPUTER_VISION_KEY = "your_computer_vision_key"
+# Configuratie uit environment variables (App Settings)
+STORAGE_CONNECTION_STRING = os.getenv(
+    "AZURE_STORAGE_CONNECTION_STRING", "DefaultEndpointsProtocol=https;AccountName=yourstorageaccount;..."
+)
+COMPUTER_VISION_ENDPOINT = os.getenv("COMPUTER_VISION_ENDPOINT", "https://yourregion.api.cognitive.microsoft.com/")
+COMPUTER_VISION_KEY = os.getenv("COMPUTER_VISION_KEY", "your_computer_vision_key")
+
+# Minimale kwaliteitsscore van de PyPDF2 tekstlaag voordat een pagina naar OCR gaat
+TEXT_LAYER_MIN_SCORE = float(os.getenv("TEXT_LAYER_MIN_SCORE", "0.6"))
 
-# Initialize Azure services
-blob_service_client = BlobServiceClient.from_connection_string(STORAGE_CONNECTION_STRING)
-cv_client = ComputerVisionClient(
-    COMPUTER_VISION_ENDPOINT, 
-    CognitiveServicesCredentials(COMPUTER_VISION_KEY)
+# Batch conversie limieten per request
+BATCH_MAX_DOCUMENTS = int(os.getenv("BATCH_MAX_DOCUMENTS", "500"))
+BATCH_MAX_BYTES = int(os.getenv("BATCH_MAX_BYTES", str(200 * 1024 * 1024)))
+BATCH_MAX_WORKERS = int(os.getenv("BATCH_MAX_WORKERS", "8"))
+
+# Poll schema voor Computer Vision Read operaties (seconden)
+OCR_POLLING_POLICY = PollingPolicy(
+    first_delay=float(os.getenv("OCR_POLL_FIRST_DELAY", "0.05")),
+    max_delay_per_page=float(os.getenv("OCR_POLL_DELAY_PER_PAGE", "0.1")),
+    max_delay=float(os.getenv("OCR_POLL_MAX_DELAY", "5")),
+    timeout=float(os.getenv("OCR_POLL_TIMEOUT", "300"))
+)
+
+# OCR bron: "stream" stuurt de PDF bytes direct naar de Read API,
+# "blob" uploadt eerst naar temp/ en geeft de blob URL door
+OCR_SOURCE = os.getenv("OCR_SOURCE", "stream")
+
+# Write-behind uploads van resultaten naar Blob Storage (BLOB_WRITE_BEHIND=false: synchroon)
+BLOB_WRITE_BEHIND = os.getenv("BLOB_WRITE_BEHIND", "true").lower() in ("1", "true", "yes")
+BLOB_UPLOAD_WORKERS = int(os.getenv("BLOB_UPLOAD_WORKERS", "4"))
+BLOB_UPLOAD_MAX_PENDING = int(os.getenv("BLOB_UPLOAD_MAX_PENDING", "256"))
+
+# Cleanup van temp/: leeftijd, batch grootte, gelijktijdige batch calls en
+# tijdsbudget per timer run (daarna gaat de volgende run verder vanaf het checkpoint)
+CLEANUP_MAX_AGE_HOURS = float(os.getenv("CLEANUP_MAX_AGE_HOURS", "24"))
+CLEANUP_BATCH_SIZE = int(os.getenv("CLEANUP_BATCH_SIZE", str(BATCH_DELETE_LIMIT)))
+CLEANUP_MAX_CONCURRENCY = int(os.getenv("CLEANUP_MAX_CONCURRENCY", "4"))
+CLEANUP_TIME_BUDGET = float(os.getenv("CLEANUP_TIME_BUDGET", "240"))
+
+# Bewaartermijn van job records (jobs/records/) na de laatste update; gelijk aan de
+# standaard TTL van queue berichten, daarna komt er geen stap meer voor de job
+JOB_RETENTION_DAYS = float(os.getenv("JOB_RETENTION_DAYS", "7"))
+
+# JSON responses vanaf deze grootte gaan gzip gecomprimeerd terug als de client dat accepteert
+GZIP_MIN_BYTES = int(os.getenv("GZIP_MIN_BYTES", "1024"))
+
+# Profiling op aanvraag van convert/extract requests: PROFILE_REQUESTS=true profileert
+# elk request, anders alleen met X-Profile-Request en X-Profile-Key (= PROFILE_ADMIN_KEY).
+# Profielen gaan naast de result blob, of naar PROFILE_DIR (lokale stand-in)
+PROFILE_REQUESTS = os.getenv("PROFILE_REQUESTS", "false").lower() in ("1", "true", "yes")
+PROFILE_ADMIN_KEY = os.getenv("PROFILE_ADMIN_KEY")
+PROFILE_DIR = os.getenv("PROFILE_DIR")
+PROFILE_TOP = int(os.getenv("PROFILE_TOP", "25"))
+
+# Operationele metrics (metrics route); requests en duur per stap komen uit request_timing
+DOCUMENTS_PROCESSED = REGISTRY.counter(
+    "dataextractor_documents_processed_total", "Verwerkte documenten per stap", ("stage",)
+)
+PAGES_ROUTED = REGISTRY.counter(
+    "dataextractor_pages_total", "Geconverteerde pagina's per route (text_layer, ocr, no_text)", ("route",)
 )
+CACHE_LOOKUPS = REGISTRY.counter(
+    "dataextractor_conversion_cache_lookups_total", "Lookups in de conversie cache", ("result",)
+)
+BLOB_BYTES_WRITTEN = REGISTRY.counter(
+    "dataextractor_blob_bytes_written_total", "Naar Blob Storage geschreven bytes per prefix", ("prefix",)
+)
+BLOB_UPLOADS_PENDING = REGISTRY.gauge(
+    "dataextractor_blob_uploads_pending", "Openstaande write-behind uploads"
+)
+
+# Azure clients worden pas bij eerste gebruik aangemaakt en daarna per proces
+# hergebruikt; de SDK imports gebeuren ook pas dan (snellere cold start)
+_services: Dict[str, Any] = {}
+_services_lock = threading.RLock()
+
+def _get_service(name: str, create: Callable[[], Any]) -> Any:
+    service = _services.get(name)
+    if service is None:
+        with _services_lock:
+            service = _services.get(name)
+            if service is None:
+                service = _services[name] = create()
+    return service
+
+def get_blob_service_client():
+    """BlobServiceClient van dit proces"""
+    def create():
+        from azure.storage.blob import BlobServiceClient
+        return BlobServiceClient.from_connection_string(STORAGE_CONNECTION_STRING)
+    return _get_service("blob_storage", create)
+
+def get_cv_client():
+    """ComputerVisionClient van dit proces"""
+    def create():
+        from azure.cognitiveservices.vision.computervision import ComputerVisionClient
+        from msrest.authentication import CognitiveServicesCredentials
+        return ComputerVisionClient(
+            COMPUTER_VISION_ENDPOINT, 
+            CognitiveServicesCredentials(COMPUTER_VISION_KEY)
+        )
+    return _get_service("computer_vision", create)
+
+def get_conversion_cache() -> ConversionCache:
+    """Conversie cache op SHA-256 van de PDF: lokale directory als stand-in, anders Blob Storage"""
+    def create():
+        if os.getenv("CONVERSION_CACHE_DIR"):
+            store = LocalCacheStore(os.environ["CONVERSION_CACHE_DIR"])
+        else:
+            store = BlobCacheStore(get_blob_service_client().get_container_client("documents"))
+        return ConversionCache(
+            store,
+            ttl_seconds=int(os.getenv("CONVERSION_CACHE_TTL", str(DEFAULT_TTL_SECONDS)))
+        )
+    return _get_service("conversion_cache", create)
+
+def get_blob_uploader() -> WriteBehindUploader:
+    """Write-behind uploader naar de documents container"""
+    def upload(blob_name, content):
+        blob_client = get_blob_service_client().get_blob_client(
+            container="documents", 
+            blob=blob_name
+        )
+        data = content.encode("utf-8") if isinstance(content, str) else content
+        with start_child_span("blob_write", blob=blob_name, bytes=len(data)):
+            blob_client.upload_blob(data, overwrite=True, metadata=trace_metadata())
+        BLOB_BYTES_WRITTEN.inc(len(data), prefix=blob_name.split("/")[0])
+    
+    def create():
+        uploader = WriteBehindUploader(
+            upload,
+            max_workers=BLOB_UPLOAD_WORKERS,
+            max_pending=BLOB_UPLOAD_MAX_PENDING,
+            synchronous=not BLOB_WRITE_BEHIND
+        )
+        # Openstaande uploads afmaken als het worker proces netjes stopt
+        atexit.register(uploader.shutdown, 30)
+        return uploader
+    return _get_service("blob_uploader", create)
+
+def get_job_pipeline() -> JobPipeline:
+    """Job pipeline: lokale directory als stand-in (JOB_STORE_DIR), anders Blob Storage"""
+    def create():
+        if os.getenv("JOB_STORE_DIR"):
+            jobs = LocalCacheStore(os.path.join(os.environ["JOB_STORE_DIR"], "records"), max_entries=0)
+            payloads = LocalPayloadStore(os.path.join(os.environ["JOB_STORE_DIR"], "payloads"))
+        else:
+            container_client = get_blob_service_client().get_container_client("documents")
+            jobs = BlobCacheStore(container_client, prefix="jobs/records/")
+            payloads = BlobPayloadStore(container_client, prefix="jobs/payloads/")
+        return JobPipeline(
+            jobs,
+            payloads,
+            convert=convert_pdf_document,
+            extract=lambda text: {"extracted_data": extract_structured_data(text)},
+            validate=validate_job_data
+        )
+    return _get_service("job_pipeline", create)
+
+def flush_uploads(timeout: Optional[float] = None) -> bool:
+    """Wacht tot alle write-behind uploads klaar zijn (shutdown en tests)"""
+    uploader = _services.get("blob_uploader")
+    return uploader.flush(timeout) if uploader is not None else True
+
+def _import_pypdf2() -> None:
+    import PyPDF2  # noqa: F401
+
+# Onderdelen die de warm-up route vooraf initialiseert
+WARMUP_COMPONENTS: Dict[str, Callable[[], Any]] = {
+    "blob_storage": get_blob_service_client,
+    "computer_vision": get_cv_client,
+    "conversion_cache": get_conversion_cache,
+    "blob_uploader": get_blob_uploader,
+    "pypdf2": _import_pypdf2,
+    "job_pipeline": get_job_pipeline,
+}
+
+def warm_up(components: Optional[List[str]] = None) -> Dict[str, float]:
+    """
+    Initialiseer clients en zware imports vooraf
+    
+    Args:
+        components: Namen uit WARMUP_COMPONENTS, None voor alles (een lege lijst initialiseert niets)
+        
+    Returns:
+        Duur per onderdeel in seconden (0 als het al geïnitialiseerd was)
+    """
+    timings = {}
+    for name in list(WARMUP_COMPONENTS) if components is None else components:
+        start = time.perf_counter()
+        WARMUP_COMPONENTS[name]()
+        timings[name] = round(time.perf_counter() - start, 4)
+    return timings
+
+def request_json(req: func.HttpRequest) -> Optional[Dict[str, Any]]:
+    """JSON body van een request; gzip bodies (Content-Encoding: gzip) worden eerst uitgepakt"""
+    body = req.get_body()
+    if req.headers.get("Content-Encoding", "").lower() == "gzip":
+        body = gzip.decompress(body)
+    return json.loads(body) if body else None
+
+def json_response(req: func.HttpRequest, data: Dict[str, Any], status_code: int = 200) -> func.HttpResponse:
+    """JSON response, gzip gecomprimeerd als de client dat accepteert en de body groot genoeg is"""
+    body = json.dumps(data).encode("utf-8")
+    headers = {}
+    if "gzip" in req.headers.get("Accept-Encoding", "").lower() and len(body) >= GZIP_MIN_BYTES:
+        body = gzip.compress(body, compresslevel=5)
+        headers["Content-Encoding"] = "gzip"
+    return func.HttpResponse(
+        body,
+        status_code=status_code,
+        headers=headers,
+        mimetype="application/json"
+    )
+
+class StreamingHttpResponse(func.HttpResponse):
+    """
+    HttpResponse met een body die per chunk uit een iterator komt
+    
+    Een host die kan streamen (de devserver) verstuurt elke chunk via
+    iter_body() zodra hij er is. get_body() leest de iterator in zijn geheel;
+    zo verstuurt de Python worker hem zolang de app geen HTTP streams
+    extensie (FastAPI request/response types voor alle routes) gebruikt.
+    """
+    
+    def __init__(self, chunks: Iterable[bytes], status_code: int = 200, mimetype: Optional[str] = None):
+        super().__init__(status_code=status_code, mimetype=mimetype)
+        self._chunks = iter(chunks)
+        self._body: Optional[bytes] = None
+    
+    def iter_body(self) -> Iterator[bytes]:
+        if self._body is not None:
+            return iter([self._body])
+        return self._chunks
+    
+    def get_body(self) -> bytes:
+        if self._body is None:
+            self._body = b"".join(self._chunks)
+        return self._body
+
+def traced_route(function: Callable[..., func.HttpResponse]) -> Callable[..., func.HttpResponse]:
+    """
+    Draai een HTTP route als span van de trace uit de traceparent header
+    
+    Zonder (geldige) header begint er een nieuwe trace. De response krijgt een
+    traceparent header met de span van deze invocatie.
+    """
+    @wraps(function)
+    def wrapper(req: func.HttpRequest, *args, **kwargs) -> func.HttpResponse:
+        parent = parse_traceparent(req.headers.get(TRACEPARENT_HEADER))
+        with start_span(function.__name__, parent=parent, service="function_app") as span:
+            response = function(req, *args, **kwargs)
+            span.attributes["status"] = response.status_code
+            response.headers[TRACEPARENT_HEADER] = span.traceparent
+            return response
+    return wrapper
 
 @app.route(route="convert_pdf_to_text", auth_level=func.AuthLevel.FUNCTION)
+@traced_route
 def convert_pdf_to_text(req: func.HttpRequest) -> func.HttpResponse:
     """
     Azure Function om PDF documenten te converteren naar tekst
     
     Input: PDF bestand via HTTP POST
-    Output: Geëxtraheerde tekst in JSON formaat
+    Output: Geëxtraheerde tekst en timings per stap in JSON formaat
     """
     logging.info('PDF to text conversion function started.')
+    timer = RequestTimer("convert_pdf_to_text")
     
     try:
         # Krijg bestand uit request
-        files = req.files.getlist('file')
+        with timer.stage("parse"):
+            files = req.files.getlist('file')
         if not files:
             return func.HttpResponse(
                 json.dumps({"error": "Geen bestand gevonden in request"}),
@@ -62,44 +335,94 @@ def convert_pdf_to_text(req: func.HttpRequest) -> func.HttpResponse:
                 mimetype="application/json"
             )
         
-        # Lees PDF content
-        pdf_content = file.read()
-        
-        # Optie 1: Gebruik Azure Computer Vision OCR voor gescande PDFs
-        extracted_text = extract_text_with_computer_vision(pdf_content)
+        # Eén gedeelde buffer (mmap voor grote uploads) voor hasher, parser en uploaders
+        with timer.stage("parse"):
+            upload = UploadBuffer.from_stream(file.stream)
+        with upload, profile_request("convert_pdf_to_text", profiling_enabled(req), PROFILE_TOP) as profile:
+            result = convert_pdf_document(upload.view, file.filename, timer.timings)
+        if profile is not None:
+            result["profile"] = store_profile(profile, result["blob_url"], filename=file.filename)
+        result["timings"] = timer.finish(status=200, filename=file.filename, cache_hit=result["cache"]["hit"])
         
-        # Optie 2: Fallback naar PyPDF2 voor tekst-gebaseerde PDFs
-        if not extracted_text or len(extracted_text.strip()) < 50:
-            extracted_text = extract_text_with_pypdf2(pdf_content)
-        
-        # Sla resultaat op in Blob Storage
-        blob_name = f"extracted_text/{file.filename}_{int(time.time())}.txt"
-        upload_text_to_blob(extracted_text, blob_name)
-        
-        result = {
-            "success": True,
-            "text": extracted_text,
-            "blob_url": f"https://yourstorageaccount.blob.core.windows.net/documents/{blob_name}",
-            "processing_time": time.time()
-        }
-        
-        logging.info(f'PDF conversion completed successfully. Text length: {len(extracted_text)}')
-        
-        return func.HttpResponse(
-            json.dumps(result),
-            status_code=200,
-            mimetype="application/json"
-        )
+        return json_response(req, result)
         
     except Exception as e:
         logging.error(f'Error in PDF conversion: {str(e)}')
+        timer.finish(status=500)
         return func.HttpResponse(
             json.dumps({"error": f"Fout bij conversie: {str(e)}"}),
             status_code=500,
             mimetype="application/json"
         )
 
+@app.route(route="convert_pdf_batch", methods=["POST"], auth_level=func.AuthLevel.FUNCTION)
+@traced_route
+def convert_pdf_batch(req: func.HttpRequest) -> func.HttpResponse:
+    """
+    Azure Function om meerdere PDF documenten in één request te converteren
+    
+    Input: Meerdere 'file' velden met PDFs en/of ZIP archieven met PDFs
+    Output: NDJSON, één regel per document in de volgorde waarin ze klaar zijn,
+            afgesloten met een regel {"summary": {...}}
+    
+    De documenten worden parallel verwerkt binnen de instance. De response
+    is een StreamingHttpResponse: elke regel gaat de deur uit zodra het
+    document klaar is. Een fout na de eerste regel komt als regel
+    {"error": ...}, de status is dan al verstuurd.
+    """
+    logging.info('PDF batch conversion function started.')
+    timer = RequestTimer("convert_pdf_batch")
+    
+    # Elke upload als gedeelde buffer (mmap voor grote uploads) in plaats van file.read()
+    uploads = ExitStack()
+    try:
+        with timer.stage("parse"):
+            buffers = [
+                (file.filename, uploads.enter_context(UploadBuffer.from_stream(file.stream)).view)
+                for file in req.files.getlist('file')
+            ]
+            documents = read_batch_documents(buffers, BATCH_MAX_DOCUMENTS, BATCH_MAX_BYTES)
+    except BatchError as e:
+        uploads.close()
+        return func.HttpResponse(
+            json.dumps({"error": str(e)}),
+            status_code=400,
+            mimetype="application/json"
+        )
+    
+    parent = current_span()
+    
+    def convert(content, filename):
+        # Worker threads erven de actieve span niet: elk document als kind van de route span
+        with start_span("convert_document", parent=parent, filename=filename):
+            return convert_pdf_document(content, filename)
+    
+    def ndjson_lines():
+        # Uploads pas vrijgeven als de workers klaar zijn, ook als de client halverwege afhaakt
+        try:
+            results = []
+            with closing(iter_completed(documents, convert, BATCH_MAX_WORKERS)) as completed:
+                for result in completed:
+                    results.append(result)
+                    if result.get("success"):
+                        merge_timings(timer.timings, {"convert": result["processing_time"]})
+                    yield to_ndjson_line(result).encode("utf-8")
+            yield to_ndjson_line(summary_line(results)).encode("utf-8")
+            
+            logging.info(f'PDF batch conversion completed. Documents: {len(results)}')
+            timer.finish(status=200, documents=len(results))
+            
+        except Exception as e:
+            logging.error(f'Error in PDF batch conversion: {str(e)}')
+            timer.finish(status=500)
+            yield to_ndjson_line({"error": f"Fout bij batch conversie: {str(e)}"}).encode("utf-8")
+        finally:
+            uploads.close()
+    
+    return StreamingHttpResponse(ndjson_lines(), mimetype=NDJSON_MIMETYPE)
+
 @app.route(route="extract_purchase_order_data", auth_level=func.AuthLevel.FUNCTION)
+@traced_route
 def extract_purchase_order_data(req: func.HttpRequest) -> func.HttpResponse:
     """
     Azure Function om gestructureerde data te extraheren uit inkooporder tekst
@@ -108,10 +431,12 @@ def extract_purchase_order_data(req: func.HttpRequest) -> func.HttpResponse:
     Output: Gestructureerde data in JSON formaat
     """
     logging.info('Purchase order data extraction function started.')
+    timer = RequestTimer("extract_purchase_order_data")
     
     try:
         # Krijg tekst uit request
-        req_body = req.get_json()
+        with timer.stage("parse"):
+            req_body = request_json(req)
         if not req_body or 'text' not in req_body:
             return func.HttpResponse(
                 json.dumps({"error": "Geen tekst gevonden in request"}),
@@ -121,174 +446,438 @@ def extract_purchase_order_data(req: func.HttpRequest) -> func.HttpResponse:
         
         text = req_body['text']
         
-        # Extract structured data using regex patterns and AI
-        extracted_data = extract_structured_data(text)
+        with profile_request("extract_purchase_order_data", profiling_enabled(req), PROFILE_TOP) as profile:
+            result = dict(success=True, **extract_document_data(text, timer.timings))
+        if profile is not None:
+            result["profile"] = store_profile(profile, result["blob_url"], text_length=len(text))
+        result["timings"] = timer.finish(status=200, text_length=len(text))
         
-        # Valideer en enrichment data
-        validated_data = validate_and_enrich_data(extracted_data)
+        logging.info('Data extraction completed successfully.')
         
-        # Sla resultaat op in Blob Storage
-        blob_name = f"extracted_data/order_{int(time.time())}.json"
-        upload_json_to_blob(validated_data, blob_name)
+        return json_response(req, result)
         
-        result = {
-            "success": True,
-            "extracted_data": validated_data,
-            "blob_url": f"https://yourstorageaccount.blob.core.windows.net/documents/{blob_name}",
-            "confidence_score": calculate_confidence_score(validated_data)
-        }
+    except Exception as e:
+        logging.error(f'Error in data extraction: {str(e)}')
+        timer.finish(status=500)
+        return func.HttpResponse(
+            json.dumps({"error": f"Fout bij data extractie: {str(e)}"}),
+            status_code=500,
+            mimetype="application/json"
+        )
+
+@app.route(route="process_document", methods=["POST"], auth_level=func.AuthLevel.FUNCTION)
+@traced_route
+def process_document(req: func.HttpRequest) -> func.HttpResponse:
+    """
+    Azure Function die conversie en extractie in één invocatie doet
+    
+    Input: PDF bestand via HTTP POST (?include_text=true stuurt ook de tekst terug)
+    Output: Gestructureerde data, blob URLs en timings per stap in JSON formaat
+    
+    De tekst gaat niet via de client heen en weer zoals bij
+    convert_pdf_to_text gevolgd door extract_purchase_order_data.
+    """
+    logging.info('Document processing function started.')
+    timer = RequestTimer("process_document")
+    
+    try:
+        with timer.stage("parse"):
+            files = req.files.getlist('file')
+        if not files:
+            return func.HttpResponse(
+                json.dumps({"error": "Geen bestand gevonden in request"}),
+                status_code=400,
+                mimetype="application/json"
+            )
         
-        logging.info('Data extraction completed successfully.')
+        file = files[0]
+        if not file.filename.lower().endswith('.pdf'):
+            return func.HttpResponse(
+                json.dumps({"error": "Alleen PDF bestanden worden ondersteund"}),
+                status_code=400,
+                mimetype="application/json"
+            )
+        
+        include_text = req.params.get("include_text", "false").lower() in ("1", "true", "yes")
+        with timer.stage("parse"):
+            upload = UploadBuffer.from_stream(file.stream)
+        with upload:
+            result = process_pdf_document(upload.view, file.filename, include_text, timer.timings)
+        result["timings"] = timer.finish(status=200, filename=file.filename, cache_hit=result["cache"]["hit"])
+        
+        logging.info(f'Document processing completed. Timings: {result["timings"]}')
+        
+        return json_response(req, result)
         
+    except Exception as e:
+        logging.error(f'Error in document processing: {str(e)}')
+        timer.finish(status=500)
+        return func.HttpResponse(
+            json.dumps({"error": f"Fout bij verwerking: {str(e)}"}),
+            status_code=500,
+            mimetype="application/json"
+        )
+
+@app.route(route="warmup", methods=["GET", "POST"], auth_level=func.AuthLevel.FUNCTION)
+def warmup(req: func.HttpRequest) -> func.HttpResponse:
+    """
+    Optionele warm-up: initialiseer alle clients en zware imports
+    
+    Bijvoorbeeld aanroepen na een deployment of vanuit een health check.
+    """
+    try:
         return func.HttpResponse(
-            json.dumps(result),
+            json.dumps({"success": True, "timings": warm_up()}),
             status_code=200,
             mimetype="application/json"
         )
+    except Exception as e:
+        logging.error(f'Error in warm-up: {str(e)}')
+        return func.HttpResponse(
+            json.dumps({"error": f"Fout bij warm-up: {str(e)}"}),
+            status_code=500,
+            mimetype="application/json"
+        )
+
+@app.route(route="conversion_cache_stats", methods=["GET"], auth_level=func.AuthLevel.FUNCTION)
+def conversion_cache_stats(req: func.HttpRequest) -> func.HttpResponse:
+    """Hit/miss tellers van de conversie cache van deze instance"""
+    return func.HttpResponse(
+        json.dumps(get_conversion_cache().stats()),
+        status_code=200,
+        mimetype="application/json"
+    )
+
+@app.route(route="traces/{trace_id}", methods=["GET"], auth_level=func.AuthLevel.FUNCTION)
+def get_trace(req: func.HttpRequest) -> func.HttpResponse:
+    """
+    Spans van één trace op deze instance als trace JSON
+    
+    ?format=chrome geeft Chrome trace events (chrome://tracing, Perfetto).
+    """
+    trace = TRACES.export(req.route_params.get("trace_id", "").lower())
+    if trace is None:
+        return func.HttpResponse(
+            json.dumps({"error": "Trace niet gevonden op deze instance"}),
+            status_code=404,
+            mimetype="application/json"
+        )
+    if req.params.get("format") == "chrome":
+        trace = to_chrome_trace(trace)
+    return json_response(req, trace)
+
+@app.route(route="metrics", methods=["GET"], auth_level=func.AuthLevel.FUNCTION)
+def get_metrics(req: func.HttpRequest) -> func.HttpResponse:
+    """Operationele metrics van deze instance in Prometheus tekstformaat"""
+    uploader = _services.get("blob_uploader")
+    if uploader is not None:
+        BLOB_UPLOADS_PENDING.set(uploader.stats()["pending"])
+    return func.HttpResponse(
+        REGISTRY.render(),
+        status_code=200,
+        mimetype=PROMETHEUS_MIMETYPE
+    )
+
+@app.route(route="jobs", methods=["POST"], auth_level=func.AuthLevel.FUNCTION)
+@app.queue_output(arg_name="convert_queue", queue_name=QUEUE_NAMES["convert"], connection="AzureWebJobsStorage")
+def submit_document_job(req: func.HttpRequest, convert_queue: func.Out[str]) -> func.HttpResponse:
+    """
+    Dien een PDF in voor asynchrone verwerking (convert → extract → validate)
+    
+    Input: PDF bestand via HTTP POST
+    Output: 202 met job_id; de status is op te vragen via GET /api/jobs/{job_id}
+    """
+    logging.info('Document job submission started.')
+    
+    try:
+        files = req.files.getlist('file')
+        if not files:
+            return func.HttpResponse(
+                json.dumps({"error": "Geen bestand gevonden in request"}),
+                status_code=400,
+                mimetype="application/json"
+            )
+        
+        file = files[0]
+        if not file.filename.lower().endswith('.pdf'):
+            return func.HttpResponse(
+                json.dumps({"error": "Alleen PDF bestanden worden ondersteund"}),
+                status_code=400,
+                mimetype="application/json"
+            )
+        
+        with UploadBuffer.from_stream(file.stream) as upload:
+            job, message = get_job_pipeline().create_job(upload.view, file.filename)
+        convert_queue.set(json.dumps(message))
+        
+        logging.info(f'Document job queued: {job["job_id"]}')
+        
+        return func.HttpResponse(
+            json.dumps({
+                "success": True,
+                "job_id": job["job_id"],
+                "status": job["status"],
+                "status_url": f"/api/jobs/{job['job_id']}"
+            }),
+            status_code=202,
+            mimetype="application/json"
+        )
         
     except Exception as e:
-        logging.error(f'Error in data extraction: {str(e)}')
+        logging.error(f'Error in job submission: {str(e)}')
         return func.HttpResponse(
-            json.dumps({"error": f"Fout bij data extractie: {str(e)}"}),
+            json.dumps({"error": f"Fout bij indienen: {str(e)}"}),
             status_code=500,
             mimetype="application/json"
         )
 
-def extract_text_with_computer_vision(pdf_content: bytes) -> str:
+@app.route(route="jobs/{job_id}", methods=["GET"], auth_level=func.AuthLevel.FUNCTION)
+def get_document_job(req: func.HttpRequest) -> func.HttpResponse:
+    """Status en resultaat van een job: één lookup in de job store"""
+    job = get_job_pipeline().status(req.route_params.get("job_id", ""))
+    if job is None:
+        return func.HttpResponse(
+            json.dumps({"error": "Job niet gevonden"}),
+            status_code=404,
+            mimetype="application/json"
+        )
+    return json_response(req, job)
+
+@app.queue_trigger(arg_name="msg", queue_name=QUEUE_NAMES["convert"], connection="AzureWebJobsStorage")
+@app.queue_output(arg_name="next_queue", queue_name=QUEUE_NAMES["extract"], connection="AzureWebJobsStorage")
+def process_convert_job(msg: func.QueueMessage, next_queue: func.Out[str]) -> None:
+    """Convert stap van de job pipeline"""
+    run_job_stage(msg, next_queue)
+
+@app.queue_trigger(arg_name="msg", queue_name=QUEUE_NAMES["extract"], connection="AzureWebJobsStorage")
+@app.queue_output(arg_name="next_queue", queue_name=QUEUE_NAMES["validate"], connection="AzureWebJobsStorage")
+def process_extract_job(msg: func.QueueMessage, next_queue: func.Out[str]) -> None:
+    """Extract stap van de job pipeline"""
+    run_job_stage(msg, next_queue)
+
+@app.queue_trigger(arg_name="msg", queue_name=QUEUE_NAMES["validate"], connection="AzureWebJobsStorage")
+def process_validate_job(msg: func.QueueMessage) -> None:
+    """Validate stap van de job pipeline; schrijft het eindresultaat naar de job"""
+    run_job_stage(msg)
+
+def run_job_stage(msg: func.QueueMessage, next_queue: Optional[func.Out[str]] = None) -> None:
+    """
+    Voer de stap uit het queue bericht uit en zet het vervolgbericht klaar
+    
+    Een tijdelijke fout gaat als exceptie terug naar de runtime, die het
+    bericht opnieuw aflevert (tot maxDequeueCount).
+    """
+    message = json.loads(msg.get_body().decode("utf-8"))
+    dequeue_count = msg.dequeue_count or message.pop("dequeue_count", 1)
+    next_message = get_job_pipeline().handle(message, dequeue_count)
+    if next_message is not None and next_queue is not None:
+        next_queue.set(json.dumps(next_message))
+    # Write-behind uploads afmaken binnen de invocatie (de instance kan daarna bevriezen)
+    flush_uploads()
+
+def process_pdf_document(pdf_content: BytesLike, filename: str, include_text: bool = False,
+                         timings: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    """
+    Conversie, extractie, validatie en beide blob writes voor één PDF, met timings per stap
+    
+    timings krijgt de stappen van convert_pdf_document en extract_document_data;
+    zonder timings komt "total" uit de som van de stappen.
+    """
+    own_timings = timings is None
+    timings = {} if own_timings else timings
+    conversion = convert_pdf_document(pdf_content, filename, timings)
+    extraction = extract_document_data(conversion["text"], timings)
+    if own_timings:
+        timings["total"] = round(sum(timings.values()), 4)
+    
+    result = {
+        "success": True,
+        "filename": filename,
+        "text_blob_url": conversion["blob_url"],
+        "routing": conversion["routing"],
+        "cache": conversion["cache"],
+        "timings": timings
+    }
+    result.update(extraction)
+    if include_text:
+        result["text"] = conversion["text"]
+    return result
+
+def extract_document_data(text: str, timings: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    """
+    Extractie, validatie en opslag van de gestructureerde data uit tekst
+    
+    Gedeeld door extract_purchase_order_data en process_document.
+    """
+    with stage_timer(timings, "extract"):
+        extracted_data = extract_structured_data(text)
+    with stage_timer(timings, "validate"):
+        validated_data = validate_and_enrich_data(extracted_data)
+    with stage_timer(timings, "result_upload"):
+        blob_name = f"extracted_data/order_{int(time.time())}.json"
+        blob_url = upload_json_to_blob(validated_data, blob_name)
+    DOCUMENTS_PROCESSED.inc(stage="extract")
+    return {
+        "extracted_data": validated_data,
+        "blob_url": blob_url,
+        "confidence_score": calculate_confidence_score(validated_data)
+    }
+
+def convert_pdf_document(pdf_content: BytesLike, filename: str,
+                         timings: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    """
+    Converteer één PDF naar tekst: cache, tekstlaag/OCR routering en blob opslag
+    
+    Gedeeld door convert_pdf_to_text, convert_pdf_batch en process_document.
+    De duur per stap gaat in timings (cache_lookup, pypdf2, ocr_* en text_upload)
+    en zonder timings in een eigen dict in het resultaat; processing_time is de
+    duur van de conversie in seconden.
+    """
+    start = time.perf_counter()
+    own_timings = timings is None
+    timings = {} if own_timings else timings
+    
+    # Dezelfde PDF is al eerder geconverteerd: geef het opgeslagen resultaat terug
+    with stage_timer(timings, "cache_lookup"):
+        cache_key = content_hash(pdf_content)
+        cached = get_conversion_cache().get(cache_key)
+    CACHE_LOOKUPS.inc(result="hit" if cached is not None else "miss")
+    if cached is not None:
+        logging.info(f'PDF conversion served from cache: {cache_key}')
+        DOCUMENTS_PROCESSED.inc(stage="convert")
+        result = dict(cached, success=True, processing_time=round(time.perf_counter() - start, 4),
+                      cache={"hit": True, "key": cache_key})
+        if own_timings:
+            result["timings"] = timings
+        return result
+    
+    # Tekstlaag eerst, alleen pagina's zonder bruikbare tekst via OCR
+    ocr_timings: Dict[str, float] = {}
+    pages = extract_pages_routed(pdf_content, ocr_timings, timings)
+    merge_timings(timings, ocr_timings, OCR_STAGE_NAMES)
+    extracted_text = join_pages(pages)
+    
+    # Sla resultaat op in Blob Storage
+    with stage_timer(timings, "text_upload"):
+        blob_name = f"extracted_text/{filename}_{int(time.time())}.txt"
+        blob_url = upload_text_to_blob(extracted_text, blob_name)
+    
+    result = {
+        "success": True,
+        "text": extracted_text,
+        "blob_url": blob_url,
+        "processing_time": round(time.perf_counter() - start, 4),
+        "routing": summarize_routes(pages),
+        "ocr": {"source": OCR_SOURCE, "timings": ocr_timings}
+    }
+    
+    # Alleen volledige resultaten cachen: na een OCR storing zou de lege of
+    # zwakke tekst anders tot de TTL voor elke upload van deze PDF terugkomen
+    missing = missing_ocr_pages(pages)
+    if missing or not pages:
+        logging.warning(f'PDF conversion degraded, result not cached: OCR returned no result for pages '
+                        f'{missing or "all"}')
+        result["degraded"] = {"ocr_missing_pages": missing}
+    else:
+        get_conversion_cache().put(cache_key, {
+            "text": result["text"],
+            "blob_url": result["blob_url"],
+            "routing": result["routing"]
+        })
+    result["cache"] = {"hit": False, "key": cache_key, "stored": "degraded" not in result}
+    if own_timings:
+        result["timings"] = timings
+    DOCUMENTS_PROCESSED.inc(stage="convert")
+    for route, count in result["routing"]["counts"].items():
+        if count:
+            PAGES_ROUTED.inc(count, route=route)
+    
+    logging.info(f'PDF conversion completed successfully. Text length: {len(extracted_text)}')
+    
+    return result
+
+def extract_pages_routed(pdf_content: BytesLike,
+                         ocr_timings: Optional[Dict[str, float]] = None,
+                         timings: Optional[Dict[str, float]] = None) -> List[Dict[str, Any]]:
+    """Tekst per pagina: PyPDF2 tekstlaag waar bruikbaar, anders Computer Vision OCR"""
+    with stage_timer(timings, "pypdf2"):
+        page_texts = extract_pages_with_pypdf2(pdf_content)
+    return route_pages(
+        page_texts,
+        lambda pages: extract_pages_with_computer_vision(pdf_content, pages, timings=ocr_timings),
+        TEXT_LAYER_MIN_SCORE
+    )
+
+def extract_text_with_computer_vision(pdf_content: BytesLike) -> str:
     """Extraheer tekst uit PDF met Azure Computer Vision OCR"""
+    pages = extract_pages_with_computer_vision(pdf_content)
+    return "".join(pages[number] + "\n" for number in sorted(pages))
+
+def extract_pages_with_computer_vision(pdf_content: BytesLike, pages: Optional[List[int]] = None,
+                                       source: Optional[str] = None,
+                                       timings: Optional[Dict[str, float]] = None,
+                                       page_count: Optional[int] = None) -> Dict[int, str]:
+    """
+    Extraheer tekst per pagina met Azure Computer Vision OCR
+    
+    Args:
+        pdf_content: PDF bestand als bytes
+        pages: 1-based paginanummers om te verwerken, None voor alle pagina's
+        source: "stream" of "blob" (standaard OCR_SOURCE)
+        timings: Optionele dict die per stap de duur in seconden krijgt
+            (stream: submit, poll; blob: upload, submit, poll, cleanup)
+        page_count: Aantal pagina's van de PDF, als dat bekend is; bepaalt bij
+            pages=None het poll plafond (onbekend telt als groot document)
+        
+    Returns:
+        Dict van paginanummer naar tekst (leeg bij fouten)
+    """
     try:
+        if (source or OCR_SOURCE) != "blob":
+            # PDF bytes direct naar de Read API, zonder blob round-trip
+            return read_pages(get_cv_client(), pdf_content, pages, OCR_POLLING_POLICY, timings, page_count)
+        
         # Upload naar blob voor Computer Vision processing
-        blob_name = f"temp/pdf_{int(time.time())}.pdf"
-        blob_client = blob_service_client.get_blob_client(
+        blob_name = f"temp/pdf_{int(time.time())}_{uuid.uuid4().hex}.pdf"
+        blob_client = get_blob_service_client().get_blob_client(
             container="documents", 
             blob=blob_name
         )
-        blob_client.upload_blob(pdf_content, overwrite=True)
-        
-        # Start OCR operatie
-        blob_url = blob_client.url
-        ocr_operation = cv_client.read(blob_url, raw=True)
-        
-        # Wacht op voltooiing
-        operation_id = ocr_operation.headers["Operation-Location"].split("/")[-1]
-        
-        while True:
-            result = cv_client.get_read_result(operation_id)
-            if result.status not in [OperationStatusCodes.not_started, OperationStatusCodes.running]:
-                break
-            time.sleep(1)
+        with stage_timer(timings, "upload"):
+            blob_client.upload_blob(open_view(pdf_content), length=len(pdf_content), overwrite=True,
+                                    metadata=trace_metadata())
+        BLOB_BYTES_WRITTEN.inc(len(pdf_content), prefix="temp")
         
-        # Extraheer tekst
-        extracted_text = ""
-        if result.status == OperationStatusCodes.succeeded:
-            for text_result in result.analyze_result.read_results:
-                for line in text_result.lines:
-                    extracted_text += line.text + "\n"
+        # OCR operatie met adaptief pollen (Retry-After van de service gaat voor)
+        page_texts = read_pages(get_cv_client(), blob_client.url, pages, OCR_POLLING_POLICY, timings, page_count)
         
         # Cleanup temp blob
-        blob_client.delete_blob()
+        with stage_timer(timings, "cleanup"):
+            blob_client.delete_blob()
         
-        return extracted_text
+        return page_texts
         
     except Exception as e:
         logging.warning(f'Computer Vision OCR failed: {str(e)}')
-        return ""
+        return {}
 
-def extract_text_with_pypdf2(pdf_content: bytes) -> str:
+def extract_text_with_pypdf2(pdf_content: BytesLike) -> str:
     """Fallback extractie met PyPDF2 voor tekst-gebaseerde PDFs"""
+    text, _ = join_with_offsets(extract_pages_with_pypdf2(pdf_content))
+    return text
+
+def extract_pages_with_pypdf2(pdf_content: BytesLike) -> List[str]:
+    """Extraheer de tekstlaag per pagina met PyPDF2, pagina-parallel voor grote PDFs (lege lijst bij fouten)"""
     try:
-        pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_content))
-        extracted_text = ""
-        
-        for page in pdf_reader.pages:
-            extracted_text += page.extract_text() + "\n"
-        
-        return extracted_text
+        return extract_pages_parallel(pdf_content)
         
     except Exception as e:
         logging.warning(f'PyPDF2 extraction failed: {str(e)}')
-        return ""
+        return []
 
 def extract_structured_data(text: str) -> Dict[str, Any]:
     """Extraheer gestructureerde data uit tekst met regex patterns"""
-    
-    data = {
-        "order_number": None,
-        "date": None,
-        "supplier": None,
-        "items": [],
-        "subtotal": None,
-        "vat_rate": None,
-        "vat_amount": None,
-        "total": None,
-        "delivery_address": {}
-    }
-    
-    # Order number pattern
-    order_patterns = [
-        r"order\s+number[:\s]+([A-Z0-9-]+)",
-        r"purchase\s+order[:\s]+([A-Z0-9-]+)",
-        r"po[:\s]+([A-Z0-9-]+)"
-    ]
-    
-    for pattern in order_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            data["order_number"] = match.group(1)
-            break
-    
-    # Date pattern
-    date_patterns = [
-        r"date[:\s]+(\d{4}-\d{2}-\d{2})",
-        r"date[:\s]+(\d{2}/\d{2}/\d{4})",
-        r"(\d{2}-\d{2}-\d{4})"
-    ]
-    
-    for pattern in date_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            data["date"] = match.group(1)
-            break
-    
-    # Supplier pattern
-    supplier_patterns = [
-        r"supplier[:\s]+([^\n]+)",
-        r"vendor[:\s]+([^\n]+)"
-    ]
-    
-    for pattern in supplier_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            data["supplier"] = match.group(1).strip()
-            break
-    
-    # Line items pattern
-    item_pattern = r"[-*•]\s*([^:]+):\s*(\d+)\s*units?\s*@\s*€?(\d+\.?\d*)\s*=\s*€?(\d+\.?\d*)"
-    items = re.findall(item_pattern, text, re.IGNORECASE)
-    
-    for item in items:
-        data["items"].append({
-            "product": item[0].strip(),
-            "quantity": int(item[1]),
-            "unit_price": float(item[2]),
-            "total": float(item[3])
-        })
-    
-    # Financial totals
-    subtotal_match = re.search(r"subtotal[:\s]+€?(\d+\.?\d*)", text, re.IGNORECASE)
-    if subtotal_match:
-        data["subtotal"] = float(subtotal_match.group(1))
-    
-    vat_match = re.search(r"vat\s*\((\d+)%\)[:\s]+€?(\d+\.?\d*)", text, re.IGNORECASE)
-    if vat_match:
-        data["vat_rate"] = float(vat_match.group(1)) / 100
-        data["vat_amount"] = float(vat_match.group(2))
-    
-    total_match = re.search(r"total[:\s]+€?(\d+\.?\d*)", text, re.IGNORECASE)
-    if total_match:
-        data["total"] = float(total_match.group(1))
-    
-    return data
+    return extract_fields(text)
 
 def validate_and_enrich_data(data: Dict[str, Any]) -> Dict[str, Any]:
     """Valideer en enrichment geëxtraheerde data"""
@@ -333,44 +922,123 @@ def calculate_confidence_score(data: Dict[str, Any]) -> float:
     
     return round(score, 2)
 
-def upload_text_to_blob(text: str, blob_name: str):
-    """Upload tekst naar Azure Blob Storage"""
-    try:
-        blob_client = blob_service_client.get_blob_client(
-            container="documents", 
-            blob=blob_name
-        )
-        blob_client.upload_blob(text, overwrite=True)
-    except Exception as e:
-        logging.error(f'Failed to upload text to blob: {str(e)}')
+def validate_job_data(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate stap van de job pipeline: validatie, confidence en opslag van het resultaat"""
+    validated_data = validate_and_enrich_data(data)
+    blob_name = f"extracted_data/order_{int(time.time())}.json"
+    return {
+        "extracted_data": validated_data,
+        "blob_url": upload_json_to_blob(validated_data, blob_name),
+        "confidence_score": calculate_confidence_score(validated_data)
+    }
 
-def upload_json_to_blob(data: Dict[str, Any], blob_name: str):
-    """Upload JSON data naar Azure Blob Storage"""
-    try:
-        blob_client = blob_service_client.get_blob_client(
-            container="documents", 
-            blob=blob_name
-        )
-        json_content = json.dumps(data, indent=2)
-        blob_client.upload_blob(json_content, overwrite=True)
-    except Exception as e:
-        logging.error(f'Failed to upload JSON to blob: {str(e)}')
+def blob_url_for(blob_name: str) -> str:
+    """Publieke URL van een blob in de documents container"""
+    return f"https://yourstorageaccount.blob.core.windows.net/documents/{blob_name}"
+
+def profiling_enabled(req: func.HttpRequest) -> bool:
+    """Profileer dit request (PROFILE_REQUESTS of de profiling headers met de admin key)"""
+    return profiling_requested(req.headers, PROFILE_ADMIN_KEY, PROFILE_REQUESTS)
+
+def store_profile(profile: RequestProfile, result_blob_url: str, **fields: Any) -> Dict[str, Any]:
+    """Schrijf het profiel naast de result blob (of naar PROFILE_DIR); geeft locatie, duur en piekgeheugen"""
+    blob_name = result_blob_url.split("/documents/", 1)[-1]
+    summary = write_profile(
+        profile,
+        f"{blob_name}.{uuid.uuid4().hex[:8]}",
+        directory=PROFILE_DIR,
+        upload=get_blob_uploader().submit,
+        top=PROFILE_TOP,
+        **fields
+    )
+    return {key: summary[key] for key in ("location", "seconds", "peak_bytes")}
+
+def upload_text_to_blob(text: str, blob_name: str) -> str:
+    """Upload tekst naar Azure Blob Storage (write-behind); geeft direct de blob URL terug"""
+    get_blob_uploader().submit(blob_name, text)
+    return blob_url_for(blob_name)
+
+def upload_json_to_blob(data: Dict[str, Any], blob_name: str) -> str:
+    """Upload JSON data naar Azure Blob Storage (write-behind); geeft direct de blob URL terug"""
+    json_content = json.dumps(data, indent=2)
+    get_blob_uploader().submit(blob_name, json_content)
+    return blob_url_for(blob_name)
 
 # Timer-triggered function voor cleanup van oude bestanden
 @app.timer_trigger(schedule="0 0 2 * * *", arg_name="timer", run_on_startup=False)
 def cleanup_old_files(timer: func.TimerRequest) -> None:
-    """Dagelijkse cleanup van oude temporary bestanden"""
+    """Dagelijkse cleanup van oude temporary bestanden, verlopen conversie cache entries en oude job records"""
     logging.info('Starting cleanup of old files.')
     
-    try:
-        # Cleanup temp files ouder dan 24 uur
-        container_client = blob_service_client.get_container_client("documents")
-        
-        for blob in container_client.list_blobs(name_starts_with="temp/"):
-            # Check of blob ouder is dan 24 uur
-            if blob.last_modified < (datetime.utcnow() - timedelta(days=1)):
-                container_client.delete_blob(blob.name)
-                logging.info(f'Deleted old temp file: {blob.name}')
-                
-    except Exception as e:
-        logging.error(f'Error during cleanup: {str(e)}')
+    budget = CLEANUP_TIME_BUDGET
+    for name, cleanup in (("temp", cleanup_temp_files), ("conversion cache", cleanup_conversion_cache),
+                          ("job records", cleanup_job_records)):
+        try:
+            stats = cleanup(budget)
+            budget = max(0.0, budget - stats.get("seconds", 0.0))
+            logging.info(
+                f'Cleanup of {name} finished: scanned {stats["scanned"]} ({stats["scanned_per_second"]}/s), '
+                f'deleted {stats["deleted"]} ({stats["deleted_per_second"]}/s), failed {stats["failed"]}, '
+                f'abandoned {stats.get("abandoned", 0)}, dropped {stats.get("dropped", 0)}, '
+                f'completed {stats["completed"]}'
+            )
+                    
+        except Exception as e:
+            logging.error(f'Error during cleanup of {name}: {str(e)}')
+
+def _local_cleanup_stats(scanned: int, deleted: int, start: float) -> Dict[str, Any]:
+    seconds = max(time.perf_counter() - start, 1e-9)
+    return {"scanned": scanned, "scanned_per_second": round(scanned / seconds, 1), "deleted": deleted,
+            "deleted_per_second": round(deleted / seconds, 1), "failed": 0, "completed": True,
+            "seconds": round(seconds, 3)}
+
+def _blob_cleaner(container_client, prefix: str, max_age: timedelta, time_budget: float) -> BlobCleaner:
+    return BlobCleaner(
+        container_client,
+        prefix=prefix,
+        max_age=max_age,
+        checkpoint_store=BlobCacheStore(container_client, prefix="cleanup/checkpoints/"),
+        batch_size=CLEANUP_BATCH_SIZE,
+        max_concurrency=CLEANUP_MAX_CONCURRENCY,
+        time_budget=time_budget
+    )
+
+def cleanup_temp_files(time_budget: float = CLEANUP_TIME_BUDGET) -> Dict[str, Any]:
+    """Verwijder temp/ blobs ouder dan CLEANUP_MAX_AGE_HOURS; hervat vanaf het laatste checkpoint"""
+    container_client = get_blob_service_client().get_container_client("documents")
+    return _blob_cleaner(container_client, "temp/", timedelta(hours=CLEANUP_MAX_AGE_HOURS), time_budget).run()
+
+def cleanup_conversion_cache(time_budget: float = CLEANUP_TIME_BUDGET) -> Dict[str, Any]:
+    """
+    Verwijder conversie cache entries ouder dan de TTL
+    
+    In Blob Storage op leeftijd van de blob (een put overschrijft de blob, dus
+    last_modified is het moment van opslaan), lokaal via evict_expired.
+    """
+    cache = get_conversion_cache()
+    if not cache.ttl_seconds:
+        return {"scanned": 0, "scanned_per_second": 0.0, "deleted": 0, "deleted_per_second": 0.0,
+                "failed": 0, "completed": True, "seconds": 0.0}
+    if isinstance(cache.store, BlobCacheStore):
+        return _blob_cleaner(cache.store.container_client, cache.store.prefix,
+                             timedelta(seconds=cache.ttl_seconds), time_budget).run()
+    
+    start = time.perf_counter()
+    scanned = len(cache.store.keys())
+    return _local_cleanup_stats(scanned, cache.evict_expired(), start)
+
+def cleanup_job_records(time_budget: float = CLEANUP_TIME_BUDGET) -> Dict[str, Any]:
+    """
+    Verwijder job records die JOB_RETENTION_DAYS niet bijgewerkt zijn
+    
+    In Blob Storage op leeftijd van de blob (elke stap overschrijft het
+    record), lokaal (JOB_STORE_DIR) via evict_expired op updated_at.
+    """
+    pipeline = get_job_pipeline()
+    max_age = timedelta(days=JOB_RETENTION_DAYS)
+    if isinstance(pipeline.jobs, BlobCacheStore):
+        return _blob_cleaner(pipeline.jobs.container_client, pipeline.jobs.prefix, max_age, time_budget).run()
+    
+    start = time.perf_counter()
+    scanned = len(pipeline.jobs.keys())
+    return _local_cleanup_stats(scanned, pipeline.evict_expired(max_age.total_seconds()), start)
@@ -0,0 +1,111 @@
+"""
+Batch conversie van PDF documenten
+Leest meerdere PDFs (los of in een ZIP) uit een request en verwerkt ze
+parallel; resultaten komen terug in de volgorde waarin ze klaar zijn.
+"""
+
+import json
+import logging
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+
+from upload_buffer import BytesLike, open_view
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+
+
+class BatchError(ValueError):
+    """Ongeldige batch input (geen PDFs, te veel documenten, te groot)"""
+
+
+def read_batch_documents(files: Iterable[Tuple[str, BytesLike]], max_documents: int,
+                         max_total_bytes: int) -> List[Tuple[str, BytesLike]]:
+    """
+    Verzamel de PDF documenten uit losse uploads en ZIP archieven
+
+    Args:
+        files: (bestandsnaam, inhoud) per upload; inhoud mag een memoryview van
+            een UploadBuffer zijn, losse PDFs worden dan niet gekopieerd
+        max_documents: Maximaal aantal PDFs in de batch
+        max_total_bytes: Maximale totale (uitgepakte) grootte
+
+    Returns:
+        Lijst met (bestandsnaam, PDF inhoud)
+    """
+    documents = []
+    total_bytes = 0
+
+    def add(filename: str, size: int, read: Callable[[], BytesLike]) -> None:
+        nonlocal total_bytes
+        if len(documents) >= max_documents:
+            raise BatchError(f"Maximaal {max_documents} documenten per batch")
+        total_bytes += size
+        if total_bytes > max_total_bytes:
+            raise BatchError(f"Batch is groter dan {max_total_bytes} bytes")
+        documents.append((filename, read()))
+
+    for filename, content in files:
+        lower_name = filename.lower()
+        if lower_name.endswith(".zip"):
+            try:
+                archive = zipfile.ZipFile(open_view(content))
+            except zipfile.BadZipFile:
+                raise BatchError(f"Ongeldig ZIP bestand: {filename}")
+            with archive:
+                for info in archive.infolist():
+                    if info.is_dir() or not info.filename.lower().endswith(".pdf"):
+                        continue
+                    # Grootte volgens de ZIP header controleren voordat we uitpakken
+                    add(info.filename, info.file_size, lambda info=info: archive.read(info))
+        elif lower_name.endswith(".pdf"):
+            add(filename, len(content), lambda content=content: content)
+        else:
+            raise BatchError(f"Alleen PDF en ZIP bestanden worden ondersteund: {filename}")
+
+    if not documents:
+        raise BatchError("Geen PDF bestanden gevonden in request")
+
+    return documents
+
+
+def iter_completed(documents: List[Tuple[str, BytesLike]],
+                   convert: Callable[[BytesLike, str], Dict[str, Any]],
+                   max_workers: int) -> Iterator[Dict[str, Any]]:
+    """
+    Converteer documenten parallel en geef elk resultaat zodra het klaar is
+
+    Elke regel bevat de index in de batch en de bestandsnaam; een fout in één
+    document wordt als regel met success=False doorgegeven.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {
+            executor.submit(convert, content, filename): (index, filename)
+            for index, (filename, content) in enumerate(documents)
+        }
+        for future in as_completed(futures):
+            index, filename = futures[future]
+            try:
+                result = dict(future.result())
+            except Exception as e:
+                logging.error(f'Error in batch conversion of {filename}: {str(e)}')
+                result = {"success": False, "error": str(e)}
+            result["index"] = index
+            result["filename"] = filename
+            yield result
+
+
+def summary_line(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Afsluitende NDJSON regel met aantallen"""
+    succeeded = sum(1 for result in results if result.get("success"))
+    return {
+        "summary": {
+            "documents": len(results),
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded
+        }
+    }
+
+
+def to_ndjson_line(record: Dict[str, Any]) -> str:
+    return json.dumps(record) + "\n"
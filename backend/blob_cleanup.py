@@ -0,0 +1,224 @@
+"""
+Opruimen van oude blobs onder een prefix
+De listing gaat per pagina met continuation tokens; oude blobs worden in
+batches (Blob Batch API, maximaal 256 deletes per call) verwijderd met een
+begrensd aantal gelijktijdige calls. Na elke volledig verwerkte pagina wordt
+het continuation token als checkpoint opgeslagen, zodat een run die niet
+binnen het timer venster klaar is de volgende keer verder gaat.
+
+Blobs waarvan de delete mislukte staan met hun aantal pogingen in hetzelfde
+checkpoint; de volgende run probeert die eerst opnieuw, zodat het token wel
+verder kan schuiven. Na MAX_DELETE_ATTEMPTS pogingen wordt een blob
+opgegeven (bijvoorbeeld een blob met een lease, die blijft 409 geven).
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+# Maximum aantal sub-requests per Blob Batch call
+BATCH_DELETE_LIMIT = 256
+
+DEFAULT_PAGE_SIZE = 5000
+
+# Maximum aantal mislukte namen in het checkpoint; de rest wordt gelogd en geteld ("dropped")
+# en pas door een latere volledige listing weer gevonden
+MAX_FAILED_NAMES = 5000
+
+# Pogingen per blob (over runs heen) voordat de cleanup hem opgeeft ("abandoned")
+MAX_DELETE_ATTEMPTS = 5
+
+
+def _chunks(names: List[str], size: int) -> List[List[str]]:
+    return [names[start:start + size] for start in range(0, len(names), size)]
+
+
+class BlobCleaner:
+    """
+    Verwijder blobs ouder dan max_age onder een prefix, hervatbaar via een checkpoint
+
+    Args:
+        container_client: ContainerClient (list_blobs, delete_blobs)
+        prefix: Alleen blobs met deze prefix
+        max_age: Blobs waarvan last_modified ouder is worden verwijderd
+        checkpoint_store: Store (load/save/delete) voor het continuation token; None = niet hervatbaar
+        batch_size: Deletes per batch call (maximaal BATCH_DELETE_LIMIT)
+        max_concurrency: Maximaal aantal gelijktijdige batch calls
+        page_size: Blobs per listing pagina
+        time_budget: Stop na zoveel seconden met listen (checkpoint blijft staan); None = geen limiet
+    """
+
+    def __init__(self, container_client, prefix: str, max_age: timedelta,
+                 checkpoint_store=None, batch_size: int = BATCH_DELETE_LIMIT,
+                 max_concurrency: int = 4, page_size: int = DEFAULT_PAGE_SIZE,
+                 time_budget: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 now: Callable[[], datetime] = lambda: datetime.now(timezone.utc)):
+        if not 1 <= batch_size <= BATCH_DELETE_LIMIT:
+            raise ValueError(f"batch_size moet tussen 1 en {BATCH_DELETE_LIMIT} liggen")
+        self.container_client = container_client
+        self.prefix = prefix
+        self.max_age = max_age
+        self.checkpoint_store = checkpoint_store
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.page_size = page_size
+        self.time_budget = time_budget
+        self.clock = clock
+        self.now = now
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self._counts = {"scanned": 0, "deleted": 0, "missing": 0, "failed": 0, "retried": 0,
+                        "abandoned": 0, "dropped": 0, "pages": 0, "batches": 0}
+
+    @property
+    def checkpoint_key(self) -> str:
+        return "cleanup-" + self.prefix.strip("/").replace("/", "-")
+
+    def _count(self, **amounts: int) -> None:
+        with self._lock:
+            for name, amount in amounts.items():
+                self._counts[name] += amount
+
+    def _load_checkpoint(self) -> Tuple[Optional[str], Dict[str, int]]:
+        """Continuation token en de namen die eerdere runs niet konden verwijderen, met het aantal pogingen"""
+        if self.checkpoint_store is None:
+            return None, {}
+        checkpoint = self.checkpoint_store.load(self.checkpoint_key)
+        if not checkpoint:
+            return None, {}
+        failed = checkpoint.get("failed") or {}
+        if isinstance(failed, list):
+            # Checkpoint van voor het bijhouden van pogingen
+            failed = {name: 1 for name in failed}
+        return checkpoint.get("continuation_token"), dict(failed)
+
+    def _save_checkpoint(self, token: Optional[str], failed: Dict[str, int]) -> None:
+        if self.checkpoint_store is None:
+            return
+        if token is None and not failed:
+            self.checkpoint_store.delete(self.checkpoint_key)
+        else:
+            self.checkpoint_store.save(self.checkpoint_key, {
+                "prefix": self.prefix,
+                "continuation_token": token,
+                "failed": failed,
+                "updated_at": time.time()
+            })
+
+    def _delete_batch(self, names: List[str]) -> List[str]:
+        """Verwijder één batch; geeft de namen terug waarvan de delete mislukte"""
+        try:
+            responses = self.container_client.delete_blobs(*names, raise_on_any_failure=False)
+            statuses = [response.status_code for response in responses]
+            failed = [name for name, status in zip(names, statuses) if status not in (202, 404)]
+            self._count(
+                batches=1,
+                deleted=sum(1 for status in statuses if status == 202),
+                missing=sum(1 for status in statuses if status == 404),
+                failed=len(failed)
+            )
+            return failed
+        except Exception as e:
+            logging.error(f'Batch delete of {len(names)} blobs failed: {str(e)}')
+            self._count(batches=1, failed=len(names))
+            return list(names)
+        finally:
+            self._slots.release()
+
+    def _submit(self, executor: ThreadPoolExecutor, names: List[str]) -> Future:
+        # Backpressure: de listing wacht als er al max_concurrency batches lopen
+        self._slots.acquire()
+        return executor.submit(self._delete_batch, names)
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Voer één cleanup run uit
+
+        Returns:
+            Tellers, duur en doorvoer (scanned/deleted per seconde); "completed"
+            is False als de run door het tijdsbudget gestopt is, "retried" telt
+            de mislukte deletes uit de vorige run die opnieuw geprobeerd zijn,
+            "abandoned" de blobs die na MAX_DELETE_ATTEMPTS pogingen opgegeven
+            zijn en "dropped" de mislukte namen die niet meer in het checkpoint pasten
+        """
+        start = self.clock()
+        cutoff = self.now() - self.max_age
+        token, retry = self._load_checkpoint()
+        resumed = token is not None
+        completed = True
+        # Pagina's waarvan de deletes nog lopen, in listing volgorde: (token na de pagina, futures)
+        in_flight: Deque[Tuple[Optional[str], List[Future]]] = deque()
+        # Mislukte deletes van afgeronde pagina's met hun aantal pogingen; gaan mee in het checkpoint
+        failed: Dict[str, int] = {}
+
+        def record_failures(names: List[str]) -> int:
+            """Zet mislukte namen in failed; geeft het aantal terug dat niet meer in het checkpoint past"""
+            dropped = 0
+            for name in names:
+                attempts = retry.get(name, 0) + 1
+                if attempts >= MAX_DELETE_ATTEMPTS:
+                    # Pas een nieuwe volledige listing probeert hem weer
+                    logging.warning(f'Giving up on deleting blob {name} after {attempts} attempts')
+                    self._count(abandoned=1)
+                elif name in failed or len(failed) < MAX_FAILED_NAMES:
+                    failed[name] = attempts
+                else:
+                    dropped += 1
+            return dropped
+
+        def save_finished_pages(wait: bool) -> None:
+            while in_flight and (wait or all(future.done() for future in in_flight[0][1])):
+                next_token, futures = in_flight.popleft()
+                dropped = sum(record_failures(future.result()) for future in futures)
+                if dropped:
+                    logging.warning(
+                        f'Cleanup checkpoint of {self.prefix} is full ({MAX_FAILED_NAMES} failed names); '
+                        f'dropped {dropped} names, a later full listing finds them again'
+                    )
+                    self._count(dropped=dropped)
+                self._save_checkpoint(next_token, failed)
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            if retry:
+                # Eerst de mislukte deletes van de vorige run; het token blijft waar het was
+                self._count(retried=len(retry))
+                in_flight.append((token, [self._submit(executor, batch)
+                                          for batch in _chunks(list(retry), self.batch_size)]))
+            pages = self.container_client.list_blobs(
+                name_starts_with=self.prefix, results_per_page=self.page_size
+            ).by_page(continuation_token=token)
+            for page in pages:
+                names = []
+                scanned = 0
+                for blob in page:
+                    scanned += 1
+                    # Namen uit het checkpoint zitten al in de retry batches
+                    if blob.last_modified < cutoff and blob.name not in retry:
+                        names.append(blob.name)
+                self._count(scanned=scanned, pages=1)
+
+                futures = [self._submit(executor, batch) for batch in _chunks(names, self.batch_size)]
+                in_flight.append((pages.continuation_token, futures))
+                save_finished_pages(wait=False)
+
+                if pages.continuation_token and self.time_budget is not None \
+                        and self.clock() - start >= self.time_budget:
+                    completed = False
+                    break
+            save_finished_pages(wait=True)
+
+        seconds = max(self.clock() - start, 1e-9)
+        stats = dict(self._counts)
+        stats.update(
+            completed=completed,
+            resumed=resumed,
+            seconds=round(seconds, 3),
+            scanned_per_second=round(stats["scanned"] / seconds, 1),
+            deleted_per_second=round(stats["deleted"] / seconds, 1)
+        )
+        return stats
@@ -0,0 +1,111 @@
+"""
+Write-behind uploads naar Blob Storage
+Resultaten worden in een wachtrij gezet en op de achtergrond met begrensde
+parallelliteit geüpload, zodat een HTTP response niet op de storage write
+hoeft te wachten. Fouten worden (zoals voorheen) gelogd en geteld.
+Een upload draait in de context (contextvars) van de aanroeper, zodat de
+actieve trace ook in de upload thread bekend is.
+"""
+
+import contextvars
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Union
+
+Content = Union[str, bytes]
+
+
+class WriteBehindUploader:
+    """
+    Wachtrij van blob uploads met een vaste pool van upload threads
+
+    Args:
+        upload: Functie (blob_name, content) die de daadwerkelijke upload doet
+        max_workers: Maximaal aantal gelijktijdige uploads
+        max_pending: Maximaal aantal uploads in de wachtrij; submit blokkeert daarboven (backpressure)
+        synchronous: Upload direct in de aanroepende thread (write-behind uit)
+    """
+
+    def __init__(self, upload: Callable[[str, Content], Any], max_workers: int = 4,
+                 max_pending: int = 256, synchronous: bool = False):
+        self._upload = upload
+        self.max_workers = max(1, max_workers)
+        self.synchronous = synchronous
+        self._slots = threading.BoundedSemaphore(max(1, max_pending))
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+        self._stats = {"queued": 0, "uploaded": 0, "failed": 0}
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="blob-writer"
+                )
+            return self._executor
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def _run(self, blob_name: str, content: Content) -> None:
+        try:
+            self._upload(blob_name, content)
+            self._count("uploaded")
+        except Exception as e:
+            logging.error(f'Failed to upload {blob_name} to blob: {str(e)}')
+            self._count("failed")
+
+    def _run_queued(self, blob_name: str, content: Content) -> None:
+        try:
+            self._run(blob_name, content)
+        finally:
+            self._slots.release()
+            with self._idle:
+                self._pending -= 1
+                if not self._pending:
+                    self._idle.notify_all()
+
+    def submit(self, blob_name: str, content: Content) -> None:
+        """Zet een upload in de wachtrij (of voer hem direct uit als synchronous)"""
+        if self.synchronous:
+            self._run(blob_name, content)
+            return
+
+        self._slots.acquire()
+        with self._lock:
+            self._pending += 1
+            self._stats["queued"] += 1
+        try:
+            context = contextvars.copy_context()
+            self._get_executor().submit(context.run, self._run_queued, blob_name, content)
+        except Exception:
+            # Executor is afgesloten: upload dan maar direct
+            self._run_queued(blob_name, content)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wacht tot alle uploads in de wachtrij klaar zijn
+
+        Returns:
+            True als de wachtrij leeg is, False bij een timeout
+        """
+        with self._idle:
+            return self._idle.wait_for(lambda: not self._pending, timeout)
+
+    def shutdown(self, timeout: Optional[float] = None) -> bool:
+        """Flush de wachtrij en stop de upload threads (bij afsluiten van het proces)"""
+        drained = self.flush(timeout)
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=drained)
+        return drained
+
+    def stats(self) -> Dict[str, int]:
+        """Tellers van de uploader, inclusief het aantal openstaande uploads"""
+        with self._lock:
+            return dict(self._stats, pending=self._pending)
@@ -0,0 +1,256 @@
+"""
+Cache voor PDF conversie resultaten op basis van de SHA-256 van de PDF bytes
+Leveranciers sturen dezelfde PDF vaak opnieuw; bij een hit wordt de eerder
+geëxtraheerde tekst teruggegeven zonder nieuwe OCR round-trip.
+
+Stores:
+    MemoryCacheStore  - in-process LRU (client, tests)
+    LocalCacheStore   - JSON bestanden in een directory (lokale stand-in)
+    BlobCacheStore    - JSON blobs in Azure Blob Storage (Function App)
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+
+
+def content_hash(content: bytes) -> str:
+    """SHA-256 hex digest van de bestandsinhoud"""
+    return hashlib.sha256(content).hexdigest()
+
+
+class MemoryCacheStore:
+    """In-memory store met LRU eviction bij max_entries"""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def save(self, key: str, entry: Dict[str, Any]) -> int:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            evicted = 0
+            while self.max_entries and len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+            return evicted
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return list(self._entries)
+
+
+class LocalCacheStore:
+    """
+    Store met één JSON bestand per entry; oudste bestanden wijken bij max_entries
+
+    Het aantal entries wordt bijgehouden in plaats van bij elke save de
+    directory te listen. Pas boven max_entries wordt er gelist en gesorteerd,
+    en dan wordt er teruggesnoeid tot prune_ratio * max_entries, zodat dat
+    niet bij elke volgende save opnieuw gebeurt.
+    """
+
+    def __init__(self, directory: str, max_entries: int = 10000, prune_ratio: float = 0.9):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.prune_ratio = prune_ratio
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._entry_count: Optional[int] = None
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as handle:
+                return json.load(handle)
+        except FileNotFoundError:
+            return None
+
+    def save(self, key: str, entry: Dict[str, Any]) -> int:
+        path = self._path(key)
+        temp_path = path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as handle:
+            json.dump(entry, handle)
+        with self._lock:
+            is_new = not os.path.exists(path)
+            os.replace(temp_path, path)
+            if not self.max_entries:
+                return 0
+            if self._entry_count is None:
+                self._entry_count = len(self.keys())
+            elif is_new:
+                self._entry_count += 1
+            if self._entry_count <= self.max_entries:
+                return 0
+            return self._prune()
+
+    def _prune(self) -> int:
+        keys = self.keys()
+        target = math.ceil(self.max_entries * self.prune_ratio)
+        keys.sort(key=lambda name: os.path.getmtime(self._path(name)))
+        removed = keys[:max(0, len(keys) - target)]
+        for name in removed:
+            self._remove(name)
+        self._entry_count = len(keys) - len(removed)
+        return len(removed)
+
+    def _remove(self, key: str) -> bool:
+        try:
+            os.remove(self._path(key))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            if self._remove(key) and self._entry_count:
+                self._entry_count -= 1
+
+    def keys(self) -> List[str]:
+        return [name[:-5] for name in os.listdir(self.directory) if name.endswith(".json")]
+
+
+class BlobCacheStore:
+    """
+    Store in Azure Blob Storage
+
+    Verlopen entries worden bij get verwijderd; de rest ruimt de dagelijkse
+    cleanup op (BlobCleaner op de prefix, op leeftijd van de blob).
+    """
+
+    def __init__(self, container_client, prefix: str = "cache/conversions/"):
+        self.container_client = container_client
+        self.prefix = prefix
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        from azure.core.exceptions import ResourceNotFoundError
+
+        try:
+            content = self.container_client.download_blob(self.prefix + key + ".json").readall()
+        except ResourceNotFoundError:
+            return None
+        return json.loads(content)
+
+    def save(self, key: str, entry: Dict[str, Any]) -> int:
+        self.container_client.upload_blob(
+            self.prefix + key + ".json", json.dumps(entry), overwrite=True
+        )
+        return 0
+
+    def delete(self, key: str) -> None:
+        from azure.core.exceptions import ResourceNotFoundError
+
+        try:
+            self.container_client.delete_blob(self.prefix + key + ".json")
+        except ResourceNotFoundError:
+            pass
+
+    def keys(self) -> List[str]:
+        return [
+            blob.name[len(self.prefix):-5]
+            for blob in self.container_client.list_blobs(name_starts_with=self.prefix)
+            if blob.name.endswith(".json")
+        ]
+
+
+class ConversionCache:
+    """
+    Cache van conversie resultaten met TTL en hit/miss tellers
+
+    Fouten in de store worden gelogd en als miss behandeld; de cache mag een
+    conversie nooit laten mislukken.
+    """
+
+    def __init__(self, store, ttl_seconds: int = DEFAULT_TTL_SECONDS,
+                 clock: Callable[[], float] = time.time):
+        self.store = store
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0, "writes": 0, "errors": 0}
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._stats[name] += amount
+
+    def _is_expired(self, entry: Dict[str, Any]) -> bool:
+        return bool(self.ttl_seconds) and self.clock() - entry.get("created_at", 0) > self.ttl_seconds
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Geef het gecachte resultaat terug, of None bij een miss"""
+        try:
+            entry = self.store.load(key)
+        except Exception as e:
+            logging.warning(f'Conversion cache read failed: {str(e)}')
+            self._count("errors")
+            entry = None
+
+        if entry is not None and self._is_expired(entry):
+            self._count("expired")
+            try:
+                self.store.delete(key)
+            except Exception as e:
+                logging.warning(f'Conversion cache delete failed: {str(e)}')
+            entry = None
+
+        if entry is None:
+            self._count("misses")
+            return None
+
+        self._count("hits")
+        return entry["result"]
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """Sla een conversie resultaat op"""
+        entry = {"key": key, "created_at": self.clock(), "result": result}
+        try:
+            evicted = self.store.save(key, entry)
+        except Exception as e:
+            logging.warning(f'Conversion cache write failed: {str(e)}')
+            self._count("errors")
+            return
+        self._count("writes")
+        if evicted:
+            self._count("evictions", evicted)
+
+    def evict_expired(self) -> int:
+        """Verwijder alle verlopen entries; geeft het aantal verwijderde entries terug"""
+        removed = 0
+        for key in self.store.keys():
+            entry = self.store.load(key)
+            if entry is not None and self._is_expired(entry):
+                self.store.delete(key)
+                removed += 1
+        self._count("evictions", removed)
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss tellers en hit ratio"""
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        return stats
@@ -0,0 +1,130 @@
+"""
+Extractie engine voor inkooporder tekst
+Alle veldregels worden één keer bij import gecompileerd. De tekst wordt één
+keer naar lowercase omgezet; daarin worden de sleutelwoorden van de regels met
+str.find opgezocht en een regel wordt alleen op die posities geprobeerd, in
+plaats van per regel de hele tekst met de regex engine te scannen.
+"""
+
+import re
+from typing import Any, Dict, List, NamedTuple, Optional, Pattern
+
+_FLAGS = re.IGNORECASE
+
+
+class FieldRule(NamedTuple):
+    """Eén extractieregel: veld, sleutelwoord waarmee een match begint en pattern"""
+    field: str
+    anchor: Optional[str]
+    pattern: Pattern[str]
+
+
+def _rule(field: str, anchor: Optional[str], pattern: str) -> FieldRule:
+    return FieldRule(field, anchor, re.compile(pattern, _FLAGS))
+
+
+# Regels per veld in prioriteitsvolgorde: de eerste regel die ergens matcht wint
+FIELD_RULES = (
+    _rule("order_number", "order", r"order\s+number[:\s]+([A-Z0-9-]+)"),
+    _rule("order_number", "purchase", r"purchase\s+order[:\s]+([A-Z0-9-]+)"),
+    _rule("order_number", "po", r"po[:\s]+([A-Z0-9-]+)"),
+    _rule("date", "date", r"date[:\s]+(\d{4}-\d{2}-\d{2})"),
+    _rule("date", "date", r"date[:\s]+(\d{2}/\d{2}/\d{4})"),
+    _rule("date", None, r"(\d{2}-\d{2}-\d{4})"),
+    _rule("supplier", "supplier", r"supplier[:\s]+([^\n]+)"),
+    _rule("supplier", "vendor", r"vendor[:\s]+([^\n]+)"),
+    _rule("subtotal", "subtotal", r"subtotal[:\s]+€?(\d+\.?\d*)"),
+    _rule("vat", "vat", r"vat\s*\((\d+)%\)[:\s]+€?(\d+\.?\d*)"),
+    _rule("total", "total", r"total[:\s]+€?(\d+\.?\d*)"),
+)
+
+ITEM_PATTERN = re.compile(
+    r"[-*•]\s*([^:]+):\s*(\d+)\s*units?\s*@\s*€?(\d+\.?\d*)\s*=\s*€?(\d+\.?\d*)",
+    _FLAGS
+)
+
+# Niet-ASCII tekens die met IGNORECASE een ASCII letter matchen (bv. 'ſ' en 'ı').
+# Staat er zo'n teken in de tekst, dan klopt str.lower() niet met de regex
+# semantiek en vallen we terug op een gewone search per regel.
+_CASE_ALIASES = re.compile(
+    "[" + "".join(re.findall("[a-z]", "".join(map(chr, range(0x80, 0x3000))), _FLAGS)) + "]"
+)
+
+
+def _empty_result() -> Dict[str, Any]:
+    return {
+        "order_number": None,
+        "date": None,
+        "supplier": None,
+        "items": [],
+        "subtotal": None,
+        "vat_rate": None,
+        "vat_amount": None,
+        "total": None,
+        "delivery_address": {}
+    }
+
+
+def _first_match(rule: FieldRule, text: str, folded: Optional[str]) -> Optional[re.Match]:
+    """Zoek de meest linkse match van een regel, alleen op posities van het anker"""
+    if rule.anchor is None or folded is None:
+        return rule.pattern.search(text)
+
+    find = folded.find
+    match = rule.pattern.match
+    anchor = rule.anchor
+    position = find(anchor)
+    while position != -1:
+        found = match(text, position)
+        if found is not None:
+            return found
+        position = find(anchor, position + 1)
+    return None
+
+
+def _apply(data: Dict[str, Any], field: str, match: re.Match) -> None:
+    if field == "supplier":
+        data["supplier"] = match.group(1).strip()
+    elif field == "vat":
+        data["vat_rate"] = float(match.group(1)) / 100
+        data["vat_amount"] = float(match.group(2))
+    elif field in ("subtotal", "total"):
+        data[field] = float(match.group(1))
+    else:
+        data[field] = match.group(1)
+
+
+def extract_fields(text: str) -> Dict[str, Any]:
+    """
+    Extraheer gestructureerde data uit tekst
+
+    Geeft exact dezelfde dict terug als de oorspronkelijke regex extractie
+    (referentie in benchmarks/bench_extraction.py).
+    """
+    data = _empty_result()
+
+    folded = None
+    if _CASE_ALIASES.search(text) is None:
+        folded = text.lower()
+        if len(folded) != len(text):
+            folded = None
+
+    resolved = set()
+    for rule in FIELD_RULES:
+        if rule.field in resolved:
+            continue
+        match = _first_match(rule, text, folded)
+        if match is not None:
+            _apply(data, rule.field, match)
+            resolved.add(rule.field)
+
+    items: List[Dict[str, Any]] = data["items"]
+    for product, quantity, unit_price, total in ITEM_PATTERN.findall(text):
+        items.append({
+            "product": product.strip(),
+            "quantity": int(quantity),
+            "unit_price": float(unit_price),
+            "total": float(total)
+        })
+
+    return data
@@ -0,0 +1,25 @@
+"""
+Gedeelde parsing van HTTP headers
+Zonder afhankelijkheden, zodat zowel de Function App (ocr_polling) als de
+client (services.resilience, via backend.http_headers) hem kan importeren.
+"""
+
+import email.utils
+import time
+from typing import Callable, Optional
+
+
+def parse_retry_after(value: Optional[str], now: Callable[[], float] = time.time) -> Optional[float]:
+    """Retry-After als seconden of HTTP datum; None als de header ontbreekt of ongeldig is"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        moment = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, moment.timestamp() - now())
@@ -0,0 +1,446 @@
+"""
+Job-gebaseerde verwerkingspipeline
+Een document wordt als job ingediend en krijgt direct een job ID; de stappen
+convert → extract → validate draaien los van elkaar vanuit queues en schrijven
+hun voortgang naar een job store. De status opvragen is één lookup.
+
+Onderdelen:
+    JobPipeline          - stap logica, onafhankelijk van queue of runtime
+    MemoryPayloadStore   - PDF/tekst/data per job in het geheugen (client, tests)
+    LocalPayloadStore    - payloads als bestanden in een directory (lokale stand-in)
+    BlobPayloadStore     - payloads in Azure Blob Storage (Function App)
+    MemoryQueue          - in-process queue (stand-in voor Azure Storage Queues)
+    StorageQueue         - Azure Storage Queue, ook tegen Azurite
+    LocalPipelineRunner  - draait de stappen met worker threads buiten Azure Functions
+
+Als job store dienen de stores uit conversion_cache (MemoryCacheStore,
+LocalCacheStore, BlobCacheStore): één JSON record per job.
+
+Een tijdelijke fout (netwerk, timeout, 429 of 5xx) in een stap gaat als
+exceptie terug naar de queue, zodat het bericht opnieuw afgeleverd wordt; pas
+bij een permanente fout of de laatste aflevering wordt de job FAILED. De
+payloads van een job worden verwijderd zodra hij COMPLETED of FAILED is.
+"""
+
+import copy
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from upload_buffer import BytesLike, open_view
+
+STAGES = ("convert", "extract", "validate")
+
+# Queue per stap (ook de queue namen van de Function App triggers)
+QUEUE_NAMES = {
+    "convert": "convert-jobs",
+    "extract": "extract-jobs",
+    "validate": "validate-jobs",
+}
+
+QUEUED = "queued"
+PROCESSING = "processing"
+COMPLETED = "completed"
+FAILED = "failed"
+PENDING = "pending"
+
+# Afleveringen per bericht voordat de job FAILED wordt (maxDequeueCount van de queue trigger)
+MAX_DEQUEUE_COUNT = 5
+
+PAYLOAD_NAMES = ("input.pdf", "text.txt", "extracted.json")
+
+
+def is_transient_error(error: Exception) -> bool:
+    """Tijdelijke fout die een nieuwe aflevering verdient: netwerk, timeout, 429 of 5xx"""
+    import requests
+    from azure.core.exceptions import HttpResponseError, ServiceRequestError, ServiceResponseError
+
+    if isinstance(error, (ConnectionError, TimeoutError, requests.ConnectionError, requests.Timeout,
+                          ServiceRequestError, ServiceResponseError)):
+        return True
+    if isinstance(error, HttpResponseError):
+        status = error.status_code
+    elif isinstance(error, requests.HTTPError) and error.response is not None:
+        status = error.response.status_code
+    else:
+        return False
+    return status is not None and (status == 429 or status >= 500)
+
+
+class MemoryPayloadStore:
+    """Payloads per job in het geheugen"""
+
+    def __init__(self):
+        self._payloads: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def put(self, name: str, content: Union[str, BytesLike]) -> None:
+        data = content.encode("utf-8") if isinstance(content, str) else bytes(content)
+        with self._lock:
+            self._payloads[name] = data
+
+    def get(self, name: str) -> bytes:
+        with self._lock:
+            return self._payloads[name]
+
+    def delete(self, name: str) -> None:
+        with self._lock:
+            self._payloads.pop(name, None)
+
+
+class LocalPayloadStore:
+    """Payloads als bestanden in een directory"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, *name.split("/"))
+
+    def put(self, name: str, content: Union[str, BytesLike]) -> None:
+        path = self._path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = content.encode("utf-8") if isinstance(content, str) else content
+        with open(path + ".tmp", "wb") as handle:
+            handle.write(data)
+        os.replace(path + ".tmp", path)
+
+    def get(self, name: str) -> bytes:
+        with open(self._path(name), "rb") as handle:
+            return handle.read()
+
+    def delete(self, name: str) -> None:
+        try:
+            os.remove(self._path(name))
+        except FileNotFoundError:
+            pass
+
+
+class BlobPayloadStore:
+    """Payloads in Azure Blob Storage"""
+
+    def __init__(self, container_client, prefix: str = "jobs/payloads/"):
+        self.container_client = container_client
+        self.prefix = prefix
+
+    def put(self, name: str, content: Union[str, BytesLike]) -> None:
+        if isinstance(content, str):
+            self.container_client.upload_blob(self.prefix + name, content, overwrite=True)
+        else:
+            self.container_client.upload_blob(
+                self.prefix + name, open_view(content), length=len(content), overwrite=True
+            )
+
+    def get(self, name: str) -> bytes:
+        return self.container_client.download_blob(self.prefix + name).readall()
+
+    def delete(self, name: str) -> None:
+        from azure.core.exceptions import ResourceNotFoundError
+
+        try:
+            self.container_client.delete_blob(self.prefix + name)
+        except ResourceNotFoundError:
+            pass
+
+
+class MemoryQueue:
+    """In-process queue met dezelfde JSON berichten als Azure Storage Queues"""
+
+    def __init__(self):
+        self._queue: "queue.Queue[str]" = queue.Queue()
+
+    def send(self, message: Dict[str, Any]) -> None:
+        self._queue.put(json.dumps(message))
+
+    def receive(self, timeout: float = 0.0) -> Optional[Dict[str, Any]]:
+        try:
+            return json.loads(self._queue.get(timeout=timeout) if timeout else self._queue.get_nowait())
+        except queue.Empty:
+            return None
+
+    def __len__(self) -> int:
+        return self._queue.qsize()
+
+
+class StorageQueue:
+    """
+    Azure Storage Queue (of Azurite) via azure-storage-queue
+
+    Berichten worden bij ontvangst verwijderd (at-most-once); bedoeld voor
+    lokale ontwikkeling. In de Function App regelen de queue bindings dit.
+    """
+
+    def __init__(self, connection_string: str, queue_name: str, poll_interval: float = 0.2):
+        from azure.core.exceptions import ResourceExistsError
+        from azure.storage.queue import QueueClient
+
+        self.poll_interval = poll_interval
+        self.client = QueueClient.from_connection_string(connection_string, queue_name)
+        try:
+            self.client.create_queue()
+        except ResourceExistsError:
+            pass
+
+    def send(self, message: Dict[str, Any]) -> None:
+        self.client.send_message(json.dumps(message))
+
+    def receive(self, timeout: float = 0.0) -> Optional[Dict[str, Any]]:
+        deadline = time.monotonic() + timeout
+        while True:
+            for message in self.client.receive_messages(max_messages=1):
+                self.client.delete_message(message)
+                return json.loads(message.content)
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(self.poll_interval)
+
+    def __len__(self) -> int:
+        return self.client.get_queue_properties().approximate_message_count
+
+
+class JobPipeline:
+    """
+    Stap logica van de document pipeline
+
+    Args:
+        jobs: Job store (load/save) met één record per job
+        payloads: Opslag voor PDF, tekst en geëxtraheerde data per job
+        convert: (pdf_content, filename) -> conversie resultaat met "text"
+        extract: text -> extractie resultaat met "extracted_data"
+        validate: extracted_data -> eindresultaat (gevalideerde data, confidence, blob URL)
+        max_dequeue_count: Afleveringen waarna een tijdelijke fout de job toch FAILED maakt
+    """
+
+    def __init__(self, jobs, payloads,
+                 convert: Callable[[BytesLike, str], Dict[str, Any]],
+                 extract: Callable[[str], Dict[str, Any]],
+                 validate: Callable[[Dict[str, Any]], Dict[str, Any]],
+                 clock: Callable[[], float] = time.time,
+                 max_dequeue_count: int = MAX_DEQUEUE_COUNT):
+        self.jobs = jobs
+        self.payloads = payloads
+        self.clock = clock
+        self.max_dequeue_count = max_dequeue_count
+        self._handlers = {"convert": convert, "extract": extract, "validate": validate}
+
+    def create_job(self, pdf_content: BytesLike, filename: str):
+        """
+        Sla de PDF op en maak een job record aan
+
+        Returns:
+            (job record, bericht voor de convert queue)
+        """
+        job_id = uuid.uuid4().hex
+        self.payloads.put(f"{job_id}/input.pdf", pdf_content)
+        now = self.clock()
+        job = {
+            "job_id": job_id,
+            "filename": filename,
+            "status": QUEUED,
+            "created_at": now,
+            "updated_at": now,
+            "processing_steps": dict({"upload": COMPLETED}, **{stage: PENDING for stage in STAGES}),
+            "timings": {},
+            "result": {},
+            "error": None
+        }
+        self.jobs.save(job_id, job)
+        return job, {"job_id": job_id, "stage": STAGES[0]}
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Job record, of None als de job niet bestaat"""
+        return self._load(job_id)
+
+    def evict_expired(self, max_age: float) -> int:
+        """Verwijder jobs (record en payloads) die max_age seconden niet bijgewerkt zijn; geeft het aantal terug"""
+        cutoff = self.clock() - max_age
+        removed = 0
+        for job_id in self.jobs.keys():
+            job = self.jobs.load(job_id)
+            if job is None or job["updated_at"] >= cutoff:
+                continue
+            self._delete_payloads(job_id)
+            self.jobs.delete(job_id)
+            removed += 1
+        return removed
+
+    def _load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        # Kopie: de in-memory store deelt zijn records met andere threads
+        return copy.deepcopy(self.jobs.load(job_id))
+
+    def _save(self, job: Dict[str, Any], **changes) -> None:
+        job.update(changes, updated_at=self.clock())
+        self.jobs.save(job["job_id"], job)
+
+    def _delete_payloads(self, job_id: str) -> None:
+        for name in PAYLOAD_NAMES:
+            try:
+                self.payloads.delete(f"{job_id}/{name}")
+            except Exception as e:
+                logging.warning(f'Could not delete payload {name} of job {job_id}: {str(e)}')
+
+    def handle(self, message: Dict[str, Any], dequeue_count: int = 1) -> Optional[Dict[str, Any]]:
+        """
+        Voer één stap uit voor het bericht uit een queue
+
+        Args:
+            message: Queue bericht met job_id en stage
+            dequeue_count: Hoe vaak dit bericht nu afgeleverd is (1 = eerste keer)
+
+        Returns:
+            Bericht voor de volgende stap, of None als de job klaar of mislukt is
+
+        Raises:
+            De tijdelijke fout van de stap zolang dequeue_count onder
+            max_dequeue_count ligt; de queue levert het bericht dan opnieuw af
+        """
+        job_id, stage = message["job_id"], message["stage"]
+        job = self._load(job_id)
+        if job is None:
+            logging.warning(f'Job {job_id} not found for stage {stage}')
+            return None
+        if job["processing_steps"].get(stage) == COMPLETED or job["status"] == FAILED:
+            # Opnieuw afgeleverd bericht: de stap is al verwerkt
+            return None
+
+        job["processing_steps"][stage] = PROCESSING
+        self._save(job, status=PROCESSING)
+
+        start = time.perf_counter()
+        try:
+            getattr(self, f"_run_{stage}")(job)
+        except Exception as e:
+            job["timings"][stage] = round(time.perf_counter() - start, 4)
+            if is_transient_error(e) and dequeue_count < self.max_dequeue_count:
+                logging.warning(f'Job {job_id} stage {stage} failed (attempt {dequeue_count}), retrying: {str(e)}')
+                job["processing_steps"][stage] = PENDING
+                self._save(job, status=QUEUED)
+                raise
+            logging.error(f'Job {job_id} failed in stage {stage}: {str(e)}')
+            job["processing_steps"][stage] = FAILED
+            self._save(job, status=FAILED, error=f"{stage}: {str(e)}")
+            self._delete_payloads(job_id)
+            return None
+
+        job["processing_steps"][stage] = COMPLETED
+        job["timings"][stage] = round(time.perf_counter() - start, 4)
+        index = STAGES.index(stage)
+        if index + 1 == len(STAGES):
+            self._save(job, status=COMPLETED)
+            self._delete_payloads(job_id)
+            return None
+        self._save(job)
+        return {"job_id": job_id, "stage": STAGES[index + 1]}
+
+    def _run_convert(self, job: Dict[str, Any]) -> None:
+        result = self._handlers["convert"](self.payloads.get(f"{job['job_id']}/input.pdf"), job["filename"])
+        if not result.get("success", True):
+            raise RuntimeError(result.get("error", "Conversie mislukt"))
+        self.payloads.put(f"{job['job_id']}/text.txt", result["text"])
+        job["result"]["text_blob_url"] = result.get("blob_url")
+
+    def _run_extract(self, job: Dict[str, Any]) -> None:
+        text = self.payloads.get(f"{job['job_id']}/text.txt").decode("utf-8")
+        result = self._handlers["extract"](text)
+        if not result.get("success", True):
+            raise RuntimeError(result.get("error", "Extractie mislukt"))
+        self.payloads.put(f"{job['job_id']}/extracted.json", json.dumps(result["extracted_data"]))
+
+    def _run_validate(self, job: Dict[str, Any]) -> None:
+        data = json.loads(self.payloads.get(f"{job['job_id']}/extracted.json"))
+        job["result"].update(self._handlers["validate"](data))
+
+
+class LocalPipelineRunner:
+    """
+    Draait de pipeline buiten Azure Functions: één worker thread per stap
+
+    Args:
+        pipeline: JobPipeline
+        queues: Queue per stap (MemoryQueue of StorageQueue); standaard MemoryQueues
+    """
+
+    def __init__(self, pipeline: JobPipeline, queues: Optional[Dict[str, Any]] = None):
+        self.pipeline = pipeline
+        self.queues = queues or {stage: MemoryQueue() for stage in STAGES}
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    def submit(self, pdf_content: BytesLike, filename: str) -> Dict[str, Any]:
+        """Dien een document in; geeft direct het job record terug"""
+        job, message = self.pipeline.create_job(pdf_content, filename)
+        self.queues[message["stage"]].send(message)
+        return job
+
+    def process_one(self, stage: str, timeout: float = 0.0) -> bool:
+        """
+        Verwerk hooguit één bericht van de queue van een stap
+
+        Bij een tijdelijke fout gaat het bericht met een opgehoogde
+        dequeue_count terug in de queue (de queues verwijderen bij ontvangst).
+        """
+        message = self.queues[stage].receive(timeout)
+        if message is None:
+            return False
+        dequeue_count = message.pop("dequeue_count", 1)
+        try:
+            next_message = self.pipeline.handle(message, dequeue_count)
+        except Exception as e:
+            logging.warning(f'Redelivering {stage} message for job {message["job_id"]}: {str(e)}')
+            self.queues[stage].send(dict(message, dequeue_count=dequeue_count + 1))
+            return True
+        if next_message is not None:
+            self.queues[next_message["stage"]].send(next_message)
+        return True
+
+    def run_until_idle(self) -> int:
+        """Verwerk alle berichten synchroon tot alle queues leeg zijn (tests)"""
+        processed = 0
+        while True:
+            handled = sum(self.process_one(stage) for stage in STAGES)
+            if not handled:
+                return processed
+            processed += handled
+
+    def _worker(self, stage: str) -> None:
+        while not self._stop.is_set():
+            try:
+                self.process_one(stage, timeout=0.1)
+            except Exception as e:
+                logging.error(f'Pipeline worker for {stage} failed: {str(e)}')
+
+    def start(self) -> "LocalPipelineRunner":
+        """Start de worker threads (idempotent)"""
+        with self._lock:
+            if not self._threads:
+                self._stop.clear()
+                self._threads = [
+                    threading.Thread(target=self._worker, args=(stage,), name=f"pipeline-{stage}", daemon=True)
+                    for stage in STAGES
+                ]
+                for thread in self._threads:
+                    thread.start()
+        return self
+
+    def stop(self) -> None:
+        with self._lock:
+            self._stop.set()
+            for thread in self._threads:
+                thread.join()
+            self._threads = []
+
+    def wait(self, job_id: str, timeout: float = 60.0, poll_interval: float = 0.05) -> Optional[Dict[str, Any]]:
+        """Wacht tot een job klaar of mislukt is; geeft het laatste record terug"""
+        deadline = time.monotonic() + timeout
+        while True:
+            job = self.pipeline.status(job_id)
+            if job is None or job["status"] in (COMPLETED, FAILED) or time.monotonic() >= deadline:
+                return job
+            time.sleep(poll_interval)
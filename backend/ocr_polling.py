@@ -0,0 +1,185 @@
+"""
+Adaptief pollen van Azure Computer Vision Read operaties
+Korte eerste intervallen, daarna exponentiële backoff met een plafond dat
+meegroeit met het aantal pagina's; een Retry-After header van de service
+gaat altijd voor. Naast de blokkerende variant is er een asyncio variant
+zodat één instance op veel OCR operaties tegelijk kan wachten.
+
+De bron is een URL (read) of de PDF bytes zelf (read_in_stream), zodat de
+upload naar blob storage overgeslagen kan worden.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from http_headers import parse_retry_after
+from request_timing import stage_timer
+from upload_buffer import BytesLike, open_view
+
+# Statussen van een Read operatie die nog niet klaar is (OperationStatusCodes)
+PENDING_STATUSES = ("notStarted", "running")
+
+# fetch() -> (ReadOperationResult, Retry-After in seconden of None)
+Fetch = Callable[[], Tuple[Any, Optional[float]]]
+AsyncFetch = Callable[[], Awaitable[Tuple[Any, Optional[float]]]]
+
+
+class OcrTimeoutError(TimeoutError):
+    """OCR operatie is niet binnen de timeout klaar"""
+
+
+class PollingPolicy(NamedTuple):
+    """
+    Poll schema voor Read operaties (alle tijden in seconden)
+
+    Het interval begint op first_delay en groeit met multiplier tot het
+    plafond base_max_delay + max_delay_per_page * pagina's (maximaal max_delay).
+    Een onbekend aantal pagina's (None, bijvoorbeeld OCR van het hele document)
+    krijgt meteen het plafond max_delay.
+    """
+    first_delay: float = 0.05
+    multiplier: float = 1.5
+    base_max_delay: float = 0.5
+    max_delay_per_page: float = 0.1
+    max_delay: float = 5.0
+    timeout: float = 300.0
+
+    def max_delay_for(self, page_count: Optional[int]) -> float:
+        if page_count is None:
+            return self.max_delay
+        return min(self.max_delay, self.base_max_delay + self.max_delay_per_page * max(page_count, 1))
+
+    def delays(self, page_count: Optional[int]) -> Iterator[float]:
+        """Oneindige reeks wachttijden tussen polls"""
+        cap = self.max_delay_for(page_count)
+        delay = self.first_delay
+        while True:
+            yield min(delay, cap)
+            delay *= self.multiplier
+
+
+def _next_delay(delay: float, retry_after: Optional[float], deadline: float, now: float) -> float:
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    remaining = deadline - now
+    if remaining <= 0:
+        raise OcrTimeoutError("OCR operatie niet binnen de timeout voltooid")
+    return min(delay, remaining)
+
+
+def wait_for_read_result(fetch: Fetch, page_count: Optional[int], policy: PollingPolicy = PollingPolicy(),
+                         sleep: Callable[[float], None] = time.sleep,
+                         clock: Callable[[], float] = time.monotonic) -> Any:
+    """
+    Poll tot de Read operatie klaar is
+
+    Returns:
+        Het laatste ReadOperationResult (succeeded of failed)
+    """
+    deadline = clock() + policy.timeout
+    for delay in policy.delays(page_count):
+        result, retry_after = fetch()
+        if result.status not in PENDING_STATUSES:
+            return result
+        sleep(_next_delay(delay, retry_after, deadline, clock()))
+
+
+async def wait_for_read_result_async(fetch: AsyncFetch, page_count: Optional[int],
+                                     policy: PollingPolicy = PollingPolicy(),
+                                     sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+                                     clock: Callable[[], float] = time.monotonic) -> Any:
+    """Asyncio variant van wait_for_read_result; houdt geen thread vast tijdens het wachten"""
+    deadline = clock() + policy.timeout
+    for delay in policy.delays(page_count):
+        result, retry_after = await fetch()
+        if result.status not in PENDING_STATUSES:
+            return result
+        await sleep(_next_delay(delay, retry_after, deadline, clock()))
+
+
+def operation_id_from(raw_response) -> str:
+    """Operation id uit de Operation-Location header van een read(..., raw=True) response"""
+    return raw_response.headers["Operation-Location"].split("/")[-1]
+
+
+def fetch_read_result(cv_client, operation_id: str) -> Tuple[Any, Optional[float]]:
+    """Eén poll via de Computer Vision SDK, inclusief Retry-After header"""
+    raw = cv_client.get_read_result(operation_id, raw=True)
+    return raw.output, parse_retry_after(raw.response.headers.get("Retry-After"))
+
+
+def pages_from_result(result) -> Dict[int, str]:
+    """Tekst per pagina uit een geslaagd ReadOperationResult"""
+    page_texts = {}
+    if result.status == "succeeded":
+        for text_result in result.analyze_result.read_results:
+            page_texts[text_result.page] = "\n".join(line.text for line in text_result.lines)
+    return page_texts
+
+
+def start_read(cv_client, source: Union[str, BytesLike], pages: Optional[List[int]] = None) -> str:
+    """
+    Start een Read operatie en geef het operation id terug
+
+    Een URL gaat via read, bytes worden direct gestreamd via read_in_stream.
+    """
+    page_selection = [str(number) for number in pages] if pages else None
+    if not isinstance(source, str):
+        raw = cv_client.read_in_stream(open_view(source), pages=page_selection, raw=True)
+    else:
+        raw = cv_client.read(source, pages=page_selection, raw=True)
+    return operation_id_from(raw)
+
+
+def polling_page_count(pages: Optional[List[int]], page_count: Optional[int] = None) -> Optional[int]:
+    """Aantal pagina's voor het poll schema: de selectie, anders page_count van het document (None = onbekend)"""
+    return len(pages) if pages else page_count
+
+
+def read_pages(cv_client, source: Union[str, BytesLike], pages: Optional[List[int]] = None,
+               policy: PollingPolicy = PollingPolicy(),
+               timings: Optional[Dict[str, float]] = None,
+               page_count: Optional[int] = None) -> Dict[int, str]:
+    """
+    Voer een Read operatie uit en wacht adaptief op het resultaat
+
+    Args:
+        cv_client: ComputerVisionClient
+        source: Bron URL (bijvoorbeeld een blob URL) of de PDF bytes
+        pages: 1-based paginanummers, None voor alle pagina's
+        policy: Poll schema
+        timings: Optionele dict waarin de duur van "submit" en "poll" wordt bijgehouden
+        page_count: Aantal pagina's van het document als pages None is
+            (onbekend telt als groot document)
+
+    Returns:
+        Dict van paginanummer naar tekst (leeg als de operatie mislukt)
+    """
+    with stage_timer(timings, "submit"):
+        operation_id = start_read(cv_client, source, pages)
+    with stage_timer(timings, "poll"):
+        result = wait_for_read_result(
+            lambda: fetch_read_result(cv_client, operation_id), polling_page_count(pages, page_count), policy
+        )
+    return pages_from_result(result)
+
+
+async def read_pages_async(cv_client, source: Union[str, BytesLike], pages: Optional[List[int]] = None,
+                           policy: PollingPolicy = PollingPolicy(),
+                           timings: Optional[Dict[str, float]] = None,
+                           page_count: Optional[int] = None) -> Dict[int, str]:
+    """
+    Asyncio variant van read_pages
+
+    De SDK is synchroon: elke HTTP call loopt kort in een thread, het wachten
+    tussen polls gebeurt op de event loop.
+    """
+    with stage_timer(timings, "submit"):
+        operation_id = await asyncio.to_thread(start_read, cv_client, source, pages)
+    with stage_timer(timings, "poll"):
+        result = await wait_for_read_result_async(
+            lambda: asyncio.to_thread(fetch_read_result, cv_client, operation_id),
+            polling_page_count(pages, page_count), policy
+        )
+    return pages_from_result(result)
@@ -0,0 +1,130 @@
+"""
+Routering van PDF pagina's tussen de PyPDF2 tekstlaag en OCR
+Per pagina wordt de kwaliteit van de tekstlaag gescoord; alleen pagina's
+zonder bruikbare tekst gaan naar Computer Vision OCR.
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+
+from pdf_text import join_with_offsets, page_offsets
+
+TEXT_LAYER = "text_layer"
+OCR = "ocr"
+NO_TEXT = "none"
+
+# Onder dit aantal tekens telt een pagina niet als volledig gevuld
+MIN_PAGE_CHARACTERS = 40
+
+# OCR functie: 1-based paginanummers (None = alle pagina's) -> tekst per pagina
+OcrPages = Callable[[Optional[List[int]]], Dict[int, str]]
+
+
+def score_text_layer(text: str) -> float:
+    """
+    Score de bruikbaarheid van de tekstlaag van één pagina (0.0 - 1.0)
+
+    Combineert de hoeveelheid tekst, het aandeel leesbare tekens en het aandeel
+    letters/cijfers. Gescande pagina's geven meestal lege tekst; kapotte
+    font-mappings geven '�', '(cid:NN)' of control characters.
+    """
+    stripped = text.strip()
+    if not stripped:
+        return 0.0
+
+    visible = [c for c in stripped if not c.isspace()]
+    if not visible:
+        return 0.0
+
+    garbage = stripped.count("(cid:") * 6
+    alnum = 0
+    for c in visible:
+        if c == "�" or not c.isprintable() or 0xE000 <= ord(c) <= 0xF8FF:
+            garbage += 1
+        elif c.isalnum():
+            alnum += 1
+
+    clean_ratio = max(0.0, 1.0 - garbage / len(visible))
+    alnum_ratio = min(1.0, (alnum / len(visible)) / 0.5)
+    coverage = min(1.0, len(visible) / MIN_PAGE_CHARACTERS)
+
+    return round(clean_ratio * alnum_ratio * coverage, 3)
+
+
+def route_pages(page_texts: List[str], ocr_pages: OcrPages, min_score: float) -> List[Dict[str, Any]]:
+    """
+    Bepaal per pagina de bron van de tekst
+
+    Args:
+        page_texts: Tekstlaag per pagina (leeg als PyPDF2 de PDF niet kon lezen)
+        ocr_pages: Functie die voor 1-based paginanummers de OCR tekst teruggeeft
+        min_score: Minimale score waarmee de tekstlaag gebruikt wordt
+
+    Returns:
+        Lijst met per pagina: page, route, score en text; pagina's die naar OCR
+        gingen maar niet in het OCR resultaat zitten (OCR fout) krijgen
+        ocr_missing=True
+    """
+    if not page_texts:
+        # Geen tekstlaag beschikbaar: volledig document via OCR
+        ocr_texts = ocr_pages(None)
+        return [
+            {"page": number, "route": OCR if ocr_texts[number].strip() else NO_TEXT,
+             "score": 0.0, "text": ocr_texts[number]}
+            for number in sorted(ocr_texts)
+        ]
+
+    pages = []
+    for number, text in enumerate(page_texts, start=1):
+        score = score_text_layer(text)
+        pages.append({
+            "page": number,
+            "route": TEXT_LAYER if score >= min_score else OCR,
+            "score": score,
+            "text": text
+        })
+
+    ocr_numbers = [page["page"] for page in pages if page["route"] == OCR]
+    if ocr_numbers:
+        ocr_texts = ocr_pages(ocr_numbers)
+        for page in pages:
+            if page["route"] != OCR:
+                continue
+            if page["page"] not in ocr_texts:
+                page["ocr_missing"] = True
+            ocr_text = ocr_texts.get(page["page"], "")
+            if ocr_text.strip():
+                page["text"] = ocr_text
+            elif page["text"].strip():
+                # OCR leverde niets op: de zwakke tekstlaag is beter dan niets
+                page["route"] = TEXT_LAYER
+            else:
+                page["route"] = NO_TEXT
+
+    return pages
+
+
+def missing_ocr_pages(pages: List[Dict[str, Any]]) -> List[int]:
+    """Paginanummers waarvoor OCR gevraagd is maar geen resultaat gaf"""
+    return [page["page"] for page in pages if page.get("ocr_missing")]
+
+
+def join_pages(pages: List[Dict[str, Any]]) -> str:
+    """Voeg de pagina teksten samen in paginavolgorde (elke pagina gevolgd door een newline)"""
+    text, _ = join_with_offsets([page["text"] for page in pages])
+    return text
+
+
+def summarize_routes(pages: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Routering per pagina zonder tekst, voor de HTTP response"""
+    counts = {TEXT_LAYER: 0, OCR: 0, NO_TEXT: 0}
+    for page in pages:
+        counts[page["route"]] += 1
+
+    return {
+        "counts": counts,
+        "pages": [
+            {"page": page["page"], "route": page["route"], "score": page["score"],
+             "offset": offset, "characters": len(page["text"])}
+            for page, offset in zip(pages, page_offsets([page["text"] for page in pages]))
+        ]
+    }
@@ -0,0 +1,142 @@
+"""
+Pagina-parallelle tekstextractie met PyPDF2
+Grote PDFs worden in paginabereiken over een process pool verdeeld; kleine
+PDFs blijven in het huidige proces omdat de pool dan alleen overhead geeft.
+PyPDF2 wordt pas bij eerste gebruik geïmporteerd (snellere cold start).
+
+De pool start zijn workers met spawn, niet met fork: de Functions host is
+multi-threaded en een fork kopieert locks die op dat moment door andere
+threads vastgehouden worden (logging, SDK clients). Een worker importeert
+PyPDF2 één keer bij het starten; per bereik leest PdfReader alleen de xref
+en de pagina's uit dat bereik, niet het hele document. Start of draait de
+pool niet, dan valt extract_pages terug op seriële extractie in dit proces.
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from upload_buffer import BytesLike, open_view
+
+# Vanaf dit aantal pagina's wordt de process pool gebruikt
+PARALLEL_MIN_PAGES = int(os.getenv("PYPDF2_PARALLEL_MIN_PAGES", "16"))
+
+# Aantal worker processen (standaard het aantal cores van de instance)
+PARALLEL_WORKERS = int(os.getenv("PYPDF2_WORKERS", str(os.cpu_count() or 1)))
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """Process pool die tussen requests hergebruikt wordt"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn"), initializer=_init_worker
+            )
+        return _pool
+
+
+def shutdown_pool() -> None:
+    """Stop de process pool (bij afsluiten en in benchmarks)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+            _pool = None
+
+
+def page_ranges(page_count: int, parts: int) -> List[Tuple[int, int]]:
+    """Verdeel pagina's in aaneengesloten, zo gelijk mogelijke bereiken [start, stop)"""
+    parts = max(1, min(parts, page_count))
+    size, remainder = divmod(page_count, parts)
+    ranges = []
+    start = 0
+    for index in range(parts):
+        stop = start + size + (1 if index < remainder else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
+def _pdf_reader(pdf_content: BytesLike):
+    import PyPDF2
+
+    return PyPDF2.PdfReader(open_view(pdf_content))
+
+
+def _init_worker() -> None:
+    """Worker initializer: PyPDF2 één keer per worker importeren in plaats van bij de eerste taak"""
+    import PyPDF2  # noqa: F401
+
+
+def _extract_range(pdf_content: bytes, start: int, stop: int) -> List[str]:
+    """Worker: tekstlaag van de pagina's in [start, stop)"""
+    reader = _pdf_reader(pdf_content)
+    return [reader.pages[index].extract_text() or "" for index in range(start, stop)]
+
+
+def extract_pages(pdf_content: BytesLike, workers: Optional[int] = None,
+                  min_pages: Optional[int] = None) -> List[str]:
+    """
+    Extraheer de tekstlaag per pagina, parallel voor grote documenten
+
+    Args:
+        pdf_content: PDF bestand als bytes, memoryview of mmap
+        workers: Aantal processen (standaard PYPDF2_WORKERS)
+        min_pages: Minimaal aantal pagina's voor parallelle extractie
+
+    Returns:
+        Tekst per pagina in paginavolgorde
+    """
+    workers = PARALLEL_WORKERS if workers is None else workers
+    min_pages = PARALLEL_MIN_PAGES if min_pages is None else min_pages
+
+    reader = _pdf_reader(pdf_content)
+    page_count = len(reader.pages)
+
+    if workers <= 1 or page_count < min_pages:
+        return [page.extract_text() or "" for page in reader.pages]
+
+    try:
+        pool = _get_pool(workers)
+        # Workers krijgen de PDF via pickle; een memoryview moet daarvoor eenmalig naar bytes
+        payload = pdf_content if isinstance(pdf_content, bytes) else bytes(pdf_content)
+        futures = [
+            pool.submit(_extract_range, payload, start, stop)
+            for start, stop in page_ranges(page_count, workers)
+        ]
+        pages: List[str] = []
+        for future in futures:
+            pages.extend(future.result())
+        return pages
+    except Exception as e:
+        # Bijvoorbeeld een kapotte pool of een omgeving zonder fork/spawn
+        logging.warning(f'Parallel PyPDF2 extraction failed, falling back to serial: {str(e)}')
+        shutdown_pool()
+        return [page.extract_text() or "" for page in reader.pages]
+
+
+def page_offsets(page_texts: List[str]) -> List[int]:
+    """Startoffset van elke pagina in de tekst van join_with_offsets"""
+    offsets = []
+    position = 0
+    for text in page_texts:
+        offsets.append(position)
+        position += len(text) + 1
+    return offsets
+
+
+def join_with_offsets(page_texts: List[str]) -> Tuple[str, List[int]]:
+    """
+    Voeg pagina's samen in lineaire tijd (elke pagina gevolgd door een newline)
+
+    Returns:
+        (tekst, startoffset van elke pagina in de tekst)
+    """
+    return "".join(text + "\n" for text in page_texts), page_offsets(page_texts)
@@ -0,0 +1,173 @@
+"""
+Profiling van losse requests op aanvraag (cProfile en tracemalloc)
+Een request wordt geprofileerd als PROFILE_REQUESTS aan staat, of als hij de
+header X-Profile-Request: true meestuurt samen met de admin key uit
+PROFILE_ADMIN_KEY in X-Profile-Key. Zonder admin key wordt de header genegeerd.
+
+Per geprofileerd request komen er twee bestanden naast de result blob:
+<naam>.prof (pstats formaat, te openen met pstats of snakeviz) en
+<naam>.profile.json met de duurste functies en de grootste allocatie sites.
+
+cProfile meet alleen de thread van het request; tracemalloc is proces-breed,
+dus er wordt maar één request tegelijk geprofileerd.
+"""
+
+import cProfile
+import hmac
+import json
+import logging
+import marshal
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional
+
+PROFILE_HEADER = "X-Profile-Request"
+ADMIN_KEY_HEADER = "X-Profile-Key"
+
+PROFILE_SUFFIX = ".prof"
+SUMMARY_SUFFIX = ".profile.json"
+
+# Traces van tracemalloc en cProfile zelf horen niet in de allocatie top
+_IGNORED_ALLOCATIONS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, __file__),
+)
+
+_profile_lock = threading.Lock()
+
+
+def profiling_requested(headers: Mapping[str, str], admin_key: Optional[str], always: bool = False) -> bool:
+    """Moet dit request geprofileerd worden (env vlag, of header met geldige admin key)"""
+    if always:
+        return True
+    if headers.get(PROFILE_HEADER, "").lower() not in ("1", "true", "yes"):
+        return False
+    if not admin_key:
+        logging.warning('Profiling requested but PROFILE_ADMIN_KEY is not set')
+        return False
+    return hmac.compare_digest(headers.get(ADMIN_KEY_HEADER, ""), admin_key)
+
+
+class RequestProfile:
+    """Resultaat van één geprofileerd request"""
+
+    def __init__(self, route: str):
+        self.route = route
+        self.created = datetime.now(timezone.utc).isoformat()
+        self.seconds = 0.0
+        self.peak_bytes = 0
+        self.stats: Dict[Any, Any] = {}
+        self.allocations: List[Dict[str, Any]] = []
+
+    def top_functions(self, top: int) -> List[Dict[str, Any]]:
+        """Duurste functies op cumulatieve tijd"""
+        rows = sorted(self.stats.items(), key=lambda item: item[1][3], reverse=True)[:top]
+        return [
+            {
+                "function": name,
+                "file": filename,
+                "line": line,
+                "calls": calls,
+                "tottime": round(tottime, 6),
+                "cumtime": round(cumtime, 6),
+            }
+            for (filename, line, name), (_, calls, tottime, cumtime, _) in rows
+        ]
+
+    def summary(self, top: int = 25, **fields: Any) -> Dict[str, Any]:
+        result = {
+            "route": self.route,
+            "created": self.created,
+            "seconds": round(self.seconds, 4),
+            "peak_bytes": self.peak_bytes,
+            "functions": self.top_functions(top),
+            "allocations": self.allocations[:top],
+        }
+        result.update(fields)
+        return result
+
+    def dump_stats(self) -> bytes:
+        """Stats in het formaat van cProfile.Profile.dump_stats (leesbaar voor pstats.Stats)"""
+        return marshal.dumps(self.stats)
+
+
+@contextmanager
+def profile_request(route: str, enabled: bool = True, top: int = 25,
+                    frames: int = 1) -> Iterator[Optional[RequestProfile]]:
+    """
+    Profileer het blok met cProfile en tracemalloc
+
+    Geeft None als profiling niet gevraagd is of al een ander request
+    geprofileerd wordt; het blok draait dan gewoon zonder profiler.
+    """
+    if not enabled:
+        yield None
+        return
+    if not _profile_lock.acquire(blocking=False):
+        logging.warning(f'Profiling skipped for {route}: another request is being profiled')
+        yield None
+        return
+
+    profile = RequestProfile(route)
+    started_tracing = not tracemalloc.is_tracing()
+    try:
+        if started_tracing:
+            tracemalloc.start(frames)
+        tracemalloc.reset_peak()
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            yield profile
+        finally:
+            profiler.disable()
+            profile.seconds = time.perf_counter() - start
+            profile.peak_bytes = tracemalloc.get_traced_memory()[1]
+            snapshot = tracemalloc.take_snapshot().filter_traces(_IGNORED_ALLOCATIONS)
+            profiler.create_stats()
+            profile.stats = profiler.stats
+            profile.allocations = [
+                {
+                    "file": stat.traceback[0].filename,
+                    "line": stat.traceback[0].lineno,
+                    "size_bytes": stat.size,
+                    "count": stat.count,
+                }
+                for stat in snapshot.statistics("lineno")[:top]
+            ]
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+        _profile_lock.release()
+
+
+def write_profile(profile: RequestProfile, name: str, directory: Optional[str] = None,
+                  upload: Optional[Callable[[str, bytes], Any]] = None, top: int = 25,
+                  **fields: Any) -> Dict[str, Any]:
+    """
+    Schrijf <name>.prof en <name>.profile.json naar directory of via upload(blob_name, data)
+
+    Geeft de samenvatting terug met de locatie van beide bestanden.
+    """
+    summary = profile.summary(top, **fields)
+    if directory:
+        base = os.path.join(directory, name)
+        os.makedirs(os.path.dirname(base), exist_ok=True)
+        with open(base + PROFILE_SUFFIX, "wb") as handle:
+            handle.write(profile.dump_stats())
+        summary["location"] = {"directory": directory, "stats": base + PROFILE_SUFFIX,
+                               "summary": base + SUMMARY_SUFFIX}
+        with open(base + SUMMARY_SUFFIX, "w") as handle:
+            json.dump(summary, handle, indent=2)
+    elif upload is not None:
+        summary["location"] = {"stats": name + PROFILE_SUFFIX, "summary": name + SUMMARY_SUFFIX}
+        upload(name + PROFILE_SUFFIX, profile.dump_stats())
+        upload(name + SUMMARY_SUFFIX, json.dumps(summary, indent=2).encode("utf-8"))
+    logging.info(f'Request profile written for {profile.route}: {name} '
+                 f'({summary["seconds"]}s, peak {summary["peak_bytes"]} bytes)')
+    return summary
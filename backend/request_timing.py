@@ -0,0 +1,97 @@
+"""
+Timings per request voor de Function App
+Een RequestTimer verzamelt de duur (seconden) van de stappen van één
+invocatie in een platte dict: parse, cache_lookup, pypdf2, blob_upload,
+ocr_submit, ocr_wait, blob_cleanup, text_upload, extract, validate en
+result_upload. "total" is de wall-clock duur van de hele invocatie, niet de
+som van de stappen (write-behind uploads en overhead vallen er tussen).
+
+Aan het eind gaat er één gestructureerd log record uit (event "timings")
+op de "timings" logger: de message is een JSON regel en dezelfde velden
+staan in custom_dimensions, zodat Application Insights of een log parser
+per route en per stap kan aggregeren. Dezelfde duren gaan in de
+dataextractor_stage_seconds histogram van de metrics registry.
+"""
+
+import json
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, ContextManager, Dict, Iterator, Mapping, Optional
+
+from metrics import REGISTRY
+from tracing import current_span, start_child_span
+
+TIMINGS_LOGGER = logging.getLogger("timings")
+
+REQUESTS = REGISTRY.counter("dataextractor_requests_total", "Invocaties per operatie en status",
+                            ("operation", "status"))
+STAGE_SECONDS = REGISTRY.histogram("dataextractor_stage_seconds", "Duur per stap van een invocatie (seconden)",
+                                   ("operation", "stage"))
+
+# Stappen van read_pages / extract_pages_with_computer_vision -> namen in de request timings
+OCR_STAGE_NAMES = {
+    "upload": "blob_upload",
+    "submit": "ocr_submit",
+    "poll": "ocr_wait",
+    "cleanup": "blob_cleanup",
+}
+
+
+@contextmanager
+def stage_timer(timings: Optional[Dict[str, float]], stage: str) -> Iterator[None]:
+    """Tel de duur van een stap (seconden) op in timings, als die is meegegeven; binnen een trace ook als span"""
+    start = time.perf_counter()
+    with start_child_span(stage):
+        try:
+            yield
+        finally:
+            if timings is not None:
+                timings[stage] = round(timings.get(stage, 0.0) + time.perf_counter() - start, 4)
+
+
+def merge_timings(timings: Optional[Dict[str, float]], stages: Mapping[str, float],
+                  names: Optional[Mapping[str, str]] = None) -> None:
+    """Tel de stappen uit stages op in timings, eventueel onder een andere naam"""
+    if timings is None:
+        return
+    for stage, seconds in stages.items():
+        name = names.get(stage, stage) if names else stage
+        timings[name] = round(timings.get(name, 0.0) + seconds, 4)
+
+
+def log_timings(operation: str, timings: Mapping[str, float], **fields: Any) -> Dict[str, Any]:
+    """Schrijf één gestructureerd log record met de timings van een invocatie (met trace id binnen een trace)"""
+    record = {"event": "timings", "operation": operation, "timings": dict(timings)}
+    span = current_span()
+    if span is not None:
+        record.update(trace_id=span.trace_id, span_id=span.span_id)
+    record.update(fields)
+    TIMINGS_LOGGER.info(json.dumps(record, sort_keys=True, default=str),
+                        extra={"custom_dimensions": record})
+    return record
+
+
+class RequestTimer:
+    """Timings van één invocatie; stage() meet een stap, finish() zet total en logt"""
+
+    def __init__(self, operation: str):
+        self.operation = operation
+        self.timings: Dict[str, float] = {}
+        self._start = time.perf_counter()
+
+    def stage(self, name: str) -> ContextManager[None]:
+        """Context manager die de duur van de stap optelt bij timings[name]"""
+        return stage_timer(self.timings, name)
+
+    def elapsed(self) -> float:
+        return round(time.perf_counter() - self._start, 4)
+
+    def finish(self, **fields: Any) -> Dict[str, float]:
+        """Zet total, log het record (met extra velden zoals status), werk de metrics bij en geef de timings terug"""
+        self.timings["total"] = self.elapsed()
+        log_timings(self.operation, self.timings, **fields)
+        REQUESTS.inc(operation=self.operation, status=fields.get("status", ""))
+        for stage, seconds in self.timings.items():
+            STAGE_SECONDS.observe(seconds, operation=self.operation, stage=stage)
+        return dict(self.timings)
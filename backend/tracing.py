@@ -0,0 +1,217 @@
+"""
+Trace correlatie van één document over Streamlit, client, Function routes en blobs
+Bij de upload ontstaat een trace id (32 hex) dat als W3C traceparent header
+(00-<trace id>-<span id>-01) van de client naar de Function App meereist.
+Elke stap is een span met naam, starttijd, duur en attributen; spans van dit
+proces komen in een begrensde TraceStore en zijn te exporteren als trace JSON
+(eigen formaat, of Chrome trace events voor chrome://tracing en Perfetto).
+
+De actieve span staat in een ContextVar, zodat stage_timer, write-behind
+uploads (die de context meenemen) en de HTTP transport hem vinden zonder
+extra parameters. Zonder actieve trace maakt start_child_span geen spans.
+"""
+
+import os
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any, ContextManager, Dict, Iterator, List, NamedTuple, Optional, Union
+
+TRACEPARENT_HEADER = "traceparent"
+
+DEFAULT_SERVICE = os.getenv("TRACE_SERVICE_NAME", "dataextractor")
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+
+def new_trace_id() -> str:
+    return uuid.uuid4().hex
+
+
+def new_span_id() -> str:
+    return os.urandom(8).hex()
+
+
+class SpanContext(NamedTuple):
+    """Trace en span id van een (remote) parent span"""
+    trace_id: str
+    span_id: str
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[SpanContext]:
+    """SpanContext uit een traceparent header; None als de header ontbreekt of ongeldig is"""
+    match = _TRACEPARENT.match((value or "").strip().lower())
+    if match is None or set(match.group(1)) == {"0"} or set(match.group(2)) == {"0"}:
+        return None
+    return SpanContext(match.group(1), match.group(2))
+
+
+class Span:
+    """Eén stap binnen een trace; end() zet de duur"""
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str] = None,
+                 service: str = DEFAULT_SERVICE, attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = new_span_id()
+        self.parent_id = parent_id
+        self.service = service
+        self.attributes = dict(attributes or {})
+        self.status = "ok"
+        self.start = time.time()
+        self.duration: Optional[float] = None
+        self._perf_start = time.perf_counter()
+
+    @property
+    def context(self) -> SpanContext:
+        return SpanContext(self.trace_id, self.span_id)
+
+    @property
+    def traceparent(self) -> str:
+        return self.context.traceparent
+
+    def end(self) -> "Span":
+        if self.duration is None:
+            self.duration = round(time.perf_counter() - self._perf_start, 6)
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "service": self.service,
+            "start": round(self.start, 6),
+            "duration": self.duration,
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class TraceStore:
+    """Afgeronde spans per trace id; de oudste traces vallen eruit boven max_traces"""
+
+    def __init__(self, max_traces: int = 1000):
+        self.max_traces = max_traces
+        self._traces: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(self, span: Span) -> None:
+        entry = span.end().to_dict()
+        with self._lock:
+            spans = self._traces.get(span.trace_id)
+            if spans is None:
+                spans = self._traces[span.trace_id] = []
+                while len(self._traces) > self.max_traces:
+                    self._traces.popitem(last=False)
+            spans.append(entry)
+
+    def export(self, trace_id: str) -> Optional[Dict[str, Any]]:
+        """Trace JSON: alle spans van trace_id op starttijd, of None als de trace onbekend is"""
+        with self._lock:
+            spans = list(self._traces.get(trace_id, ()))
+        if not spans:
+            return None
+        return {"trace_id": trace_id, "spans": sorted(spans, key=lambda span: span["start"])}
+
+
+# Spans van dit proces
+TRACES = TraceStore(int(os.getenv("TRACE_MAX_TRACES", "1000")))
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+@contextmanager
+def start_span(name: str, parent: Optional[Union[Span, SpanContext]] = None, service: Optional[str] = None,
+               store: TraceStore = TRACES, **attributes: Any) -> Iterator[Span]:
+    """
+    Open een span als kind van parent (of van de actieve span) en maak hem actief
+
+    Zonder parent en zonder actieve span begint er een nieuwe trace.
+    Een exception in het blok zet status op "error".
+    """
+    active = current_span()
+    parent = parent or active
+    span = Span(
+        name,
+        parent.trace_id if parent else new_trace_id(),
+        parent.span_id if parent else None,
+        service or (active.service if active else DEFAULT_SERVICE),
+        attributes
+    )
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.status = "error"
+        span.attributes.setdefault("error", str(e))
+        raise
+    finally:
+        _current_span.reset(token)
+        store.record(span)
+
+
+def start_child_span(name: str, **attributes: Any) -> ContextManager[Optional[Span]]:
+    """Span onder de actieve span; zonder actieve trace een lege context (geeft None)"""
+    if current_span() is None:
+        return nullcontext()
+    return start_span(name, **attributes)
+
+
+def trace_metadata() -> Optional[Dict[str, str]]:
+    """Blob metadata met trace en span id van de actieve span (None zonder trace)"""
+    span = current_span()
+    if span is None:
+        return None
+    return {"trace_id": span.trace_id, "span_id": span.span_id}
+
+
+def merge_traces(*exports: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Voeg exports van verschillende processen (client, Function App) samen tot één trace"""
+    spans: Dict[str, Dict[str, Any]] = {}
+    trace_id = None
+    for export in exports:
+        if not export:
+            continue
+        trace_id = trace_id or export["trace_id"]
+        for span in export["spans"]:
+            spans[span["span_id"]] = span
+    if trace_id is None:
+        return None
+    return {"trace_id": trace_id, "spans": sorted(spans.values(), key=lambda span: span["start"])}
+
+
+def to_chrome_trace(export: Dict[str, Any]) -> Dict[str, Any]:
+    """Trace JSON in Chrome trace event formaat (één proces per service)"""
+    services = sorted({span["service"] for span in export["spans"]})
+    pids = {service: index + 1 for index, service in enumerate(services)}
+    events = [
+        {"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": service}}
+        for service, pid in pids.items()
+    ]
+    for span in export["spans"]:
+        events.append({
+            "name": span["name"],
+            "cat": span["service"],
+            "ph": "X",
+            "ts": round(span["start"] * 1e6),
+            "dur": round((span["duration"] or 0) * 1e6),
+            "pid": pids[span["service"]],
+            "tid": 0,
+            "args": dict(span["attributes"], span_id=span["span_id"], parent_id=span["parent_id"],
+                         status=span["status"]),
+        })
+    return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": {"trace_id": export["trace_id"]}}
@@ -0,0 +1,140 @@
+"""
+Zero-copy toegang tot geüploade PDFs
+Een upload wordt niet meer met file.read() in zijn geheel gekopieerd: grote
+uploads worden (via het al gespoolde temp bestand van de form parser) met
+mmap geopend en als één memoryview gedeeld met de PDF parser, de hasher en de
+uploaders. Alleen kleine uploads worden in het geheugen gelezen.
+"""
+
+import io
+import logging
+import mmap
+import shutil
+import tempfile
+from typing import IO, Optional, Union
+
+# Uploads tot deze grootte worden gewoon in het geheugen gelezen
+SPOOL_MEMORY_LIMIT = 512 * 1024
+
+# Blokgrootte bij het spoolen van streams zonder bestandsdescriptor
+SPOOL_CHUNK_SIZE = 1024 * 1024
+
+BytesLike = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+
+class _MemoryViewIO(io.RawIOBase):
+    """Seekable, read-only raw stream over een memoryview (geen kopie van de data)"""
+
+    def __init__(self, view: memoryview):
+        self._view = view.cast("B") if view.format != "B" or view.ndim != 1 else view
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        chunk = self._view[self._position:self._position + len(buffer)]
+        size = len(chunk)
+        buffer[:size] = chunk
+        self._position += size
+        return size
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        if offset < 0:
+            raise ValueError(f"negative seek position {offset}")
+        self._position = offset
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
+
+
+def open_view(data: BytesLike) -> IO[bytes]:
+    """
+    Seekable file-like object over bytes, memoryview of mmap zonder de data te kopiëren
+
+    BytesIO deelt een bytes object zolang het niet beschreven wordt; andere
+    buffers krijgen een gebufferde reader over een memoryview.
+    """
+    if isinstance(data, bytes):
+        return io.BytesIO(data)
+    return io.BufferedReader(_MemoryViewIO(memoryview(data)))
+
+
+class UploadBuffer:
+    """
+    Eén gedeelde, read-only buffer met de inhoud van een upload
+
+    Gebruik:
+        with UploadBuffer.from_stream(file.stream) as upload:
+            content_hash(upload.view)
+            PyPDF2.PdfReader(open_view(upload.view))
+    """
+
+    def __init__(self, view: memoryview, mapping: Optional[mmap.mmap] = None,
+                 spool_file: Optional[IO[bytes]] = None):
+        self.view = view
+        self._mapping = mapping
+        self._spool_file = spool_file
+
+    @property
+    def size(self) -> int:
+        return self.view.nbytes
+
+    @property
+    def memory_mapped(self) -> bool:
+        return self._mapping is not None
+
+    @classmethod
+    def from_bytes(cls, content: bytes) -> "UploadBuffer":
+        return cls(memoryview(content))
+
+    @classmethod
+    def from_stream(cls, stream: IO[bytes], memory_limit: int = SPOOL_MEMORY_LIMIT) -> "UploadBuffer":
+        """
+        Open een upload stream als buffer
+
+        Kleine uploads worden gelezen; grote uploads worden gemapt vanuit het
+        bestand achter de stream, of eerst in blokken naar een temp bestand gespoold.
+        """
+        size = stream.seek(0, io.SEEK_END)
+        stream.seek(0)
+        if size <= memory_limit:
+            return cls(memoryview(stream.read()))
+
+        spool_file = None
+        try:
+            fileno = stream.fileno()
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            spool_file = tempfile.TemporaryFile()
+            shutil.copyfileobj(stream, spool_file, SPOOL_CHUNK_SIZE)
+            spool_file.flush()
+            fileno = spool_file.fileno()
+
+        mapping = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+        return cls(memoryview(mapping), mapping, spool_file)
+
+    def close(self) -> None:
+        """Geef de mapping en het temp bestand vrij"""
+        try:
+            self.view.release()
+            if self._mapping is not None:
+                self._mapping.close()
+        except BufferError:
+            # Er leeft nog een afgeleide view (bijvoorbeeld in een parser); de GC ruimt hem op
+            logging.debug('Upload buffer still referenced, leaving cleanup to garbage collection')
+        if self._spool_file is not None:
+            self._spool_file.close()
+
+    def __enter__(self) -> "UploadBuffer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Meting van de cold start kosten van de Function App per route
+Elke Function van de app (routes, queue en timer triggers) wordt in een vers
+Python proces gemeten: eerst de import van azure_functions (betaalt elke
+route), daarna het initialiseren van de clients en zware imports die de
+Function bij zijn eerste aanroep nodig heeft.
+
+De kolom "eager" is de oude situatie waarin alles bij import werd opgebouwd.
+
+Gebruik:
+    python benchmarks/bench_cold_start.py
+    python benchmarks/bench_cold_start.py --repeat 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Azurite development connection string: de client maakt bij constructie geen verbinding
+DEV_STORAGE_CONNECTION_STRING = (
+    "DefaultEndpointsProtocol=http;AccountName=devstoreaccount1;"
+    "AccountKey=Eby8vdM02xNOcqFlqUwJPLlmEtlCDXJ1OUzFT50uSRZ6IFsuFq2UVErCz4I6tq/K1SZFPTOtr/KBHBeksoGMGw==;"
+    "BlobEndpoint=http://127.0.0.1:10000/devstoreaccount1;"
+)
+
+# Onderdelen die een Function bij zijn eerste aanroep initialiseert (worst case: met OCR);
+# None is alles (warmup). Elke Function van de app moet hier staan, zie function_names()
+CONVERT_COMPONENTS = ["conversion_cache", "pypdf2", "blob_storage", "computer_vision", "blob_uploader"]
+ROUTE_COMPONENTS = {
+    "convert_pdf_to_text": CONVERT_COMPONENTS,
+    "convert_pdf_batch": CONVERT_COMPONENTS,
+    "extract_purchase_order_data": ["blob_storage", "blob_uploader"],
+    "process_document": CONVERT_COMPONENTS,
+    "warmup": None,
+    "conversion_cache_stats": ["conversion_cache"],
+    "get_trace": [],
+    "get_metrics": [],
+    "submit_document_job": ["blob_storage", "job_pipeline"],
+    "get_document_job": ["blob_storage", "job_pipeline"],
+    "process_convert_job": ["job_pipeline"] + CONVERT_COMPONENTS,
+    "process_extract_job": ["blob_storage", "job_pipeline"],
+    "process_validate_job": ["blob_storage", "job_pipeline", "blob_uploader"],
+    "cleanup_old_files": ["blob_storage", "conversion_cache", "job_pipeline"],
+}
+
+MEASURE_SCRIPT = """
+import json, sys, time
+sys.path.insert(0, {backend!r})
+start = time.perf_counter()
+import azure_functions
+import_seconds = time.perf_counter() - start
+timings = azure_functions.warm_up({components!r})
+print(json.dumps({{"import": import_seconds, "init": sum(timings.values())}}))
+"""
+
+
+def function_names() -> List[str]:
+    """Namen van alle Functions van de app (HTTP, queue en timer triggers), zoals de devserver ze leest"""
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    from devserver.function_app import app_functions
+    import azure_functions
+    return [function.get_function_name() for function in app_functions(azure_functions.app)]
+
+
+def measure(components) -> dict:
+    """Meet import + initialisatie in een vers proces"""
+    env = dict(os.environ)
+    env.setdefault("AZURE_STORAGE_CONNECTION_STRING", DEV_STORAGE_CONNECTION_STRING)
+    code = MEASURE_SCRIPT.format(backend=os.path.join(ROOT, "backend"), components=components)
+    output = subprocess.check_output([sys.executable, "-c", code], env=env, cwd=ROOT)
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Cold start kosten per route")
+    parser.add_argument("--repeat", type=int, default=3, help="Metingen per route (mediaan wordt getoond)")
+    args = parser.parse_args()
+
+    names = function_names()
+    missing = [name for name in names if name not in ROUTE_COMPONENTS]
+    if missing:
+        parser.error(f"Geen onderdelen in ROUTE_COMPONENTS voor: {', '.join(missing)}")
+
+    eager = [measure(None) for _ in range(args.repeat)]
+    eager_ms = statistics.median(run["import"] + run["init"] for run in eager) * 1000
+
+    print(f"{'route':<30} {'import ms':>10} {'init ms':>10} {'total ms':>10} {'eager ms':>10}")
+    for route in names:
+        components = ROUTE_COMPONENTS[route]
+        runs = [measure(components) for _ in range(args.repeat)]
+        import_ms = statistics.median(run["import"] for run in runs) * 1000
+        init_ms = statistics.median(run["init"] for run in runs) * 1000
+        print(f"{route:<30} {import_ms:>10.1f} {init_ms:>10.1f} {import_ms + init_ms:>10.1f} {eager_ms:>10.1f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Benchmark voor extract_structured_data
+Vergelijkt de oorspronkelijke regex extractie met de extractie engine en
+rapporteert de doorvoer in documenten per seconde per documentgrootte.
+
+Gebruik:
+    python benchmarks/bench_extraction.py
+    python benchmarks/bench_extraction.py --items 5 50 500 5000 --seconds 2
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+from typing import Any, Dict
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+from extraction_engine import extract_fields
+
+
+def extract_fields_reference(text: str) -> Dict[str, Any]:
+    """
+    Oorspronkelijke extractie met een losse re.search per pattern.
+    Referentie voor deze benchmark en de pariteitstests van de engine.
+    """
+    data = {
+        "order_number": None,
+        "date": None,
+        "supplier": None,
+        "items": [],
+        "subtotal": None,
+        "vat_rate": None,
+        "vat_amount": None,
+        "total": None,
+        "delivery_address": {}
+    }
+
+    order_patterns = [
+        r"order\s+number[:\s]+([A-Z0-9-]+)",
+        r"purchase\s+order[:\s]+([A-Z0-9-]+)",
+        r"po[:\s]+([A-Z0-9-]+)"
+    ]
+
+    for pattern in order_patterns:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            data["order_number"] = match.group(1)
+            break
+
+    date_patterns = [
+        r"date[:\s]+(\d{4}-\d{2}-\d{2})",
+        r"date[:\s]+(\d{2}/\d{2}/\d{4})",
+        r"(\d{2}-\d{2}-\d{4})"
+    ]
+
+    for pattern in date_patterns:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            data["date"] = match.group(1)
+            break
+
+    supplier_patterns = [
+        r"supplier[:\s]+([^\n]+)",
+        r"vendor[:\s]+([^\n]+)"
+    ]
+
+    for pattern in supplier_patterns:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            data["supplier"] = match.group(1).strip()
+            break
+
+    item_pattern = r"[-*•]\s*([^:]+):\s*(\d+)\s*units?\s*@\s*€?(\d+\.?\d*)\s*=\s*€?(\d+\.?\d*)"
+    items = re.findall(item_pattern, text, re.IGNORECASE)
+
+    for item in items:
+        data["items"].append({
+            "product": item[0].strip(),
+            "quantity": int(item[1]),
+            "unit_price": float(item[2]),
+            "total": float(item[3])
+        })
+
+    subtotal_match = re.search(r"subtotal[:\s]+€?(\d+\.?\d*)", text, re.IGNORECASE)
+    if subtotal_match:
+        data["subtotal"] = float(subtotal_match.group(1))
+
+    vat_match = re.search(r"vat\s*\((\d+)%\)[:\s]+€?(\d+\.?\d*)", text, re.IGNORECASE)
+    if vat_match:
+        data["vat_rate"] = float(vat_match.group(1)) / 100
+        data["vat_amount"] = float(vat_match.group(2))
+
+    total_match = re.search(r"total[:\s]+€?(\d+\.?\d*)", text, re.IGNORECASE)
+    if total_match:
+        data["total"] = float(total_match.group(1))
+
+    return data
+
+
+def build_purchase_order(item_count: int) -> str:
+    """Bouw een inkooporder tekst met het opgegeven aantal regels"""
+    lines = [
+        "PURCHASE ORDER",
+        "",
+        "Order Number: APO-00199",
+        "Date: 2024-01-15",
+        "Supplier: JASA Packaging Solutions B.V.",
+        "Contact: +31 20 1234567",
+        "",
+        "Ship To:",
+        "HSO Nederland B.V.",
+        "Postbus 12345",
+        "1234 AB Amsterdam",
+        "",
+        "Items:",
+    ]
+    subtotal = 0.0
+    for i in range(item_count):
+        quantity = i % 90 + 1
+        unit_price = 1.25 + (i % 40)
+        total = quantity * unit_price
+        subtotal += total
+        lines.append(f"- Product {i} (Type {i % 7}): {quantity} units @ €{unit_price:.2f} = €{total:.2f}")
+    vat = subtotal * 0.21
+    lines += [
+        "",
+        f"Subtotal: €{subtotal:.2f}",
+        f"VAT (21%): €{vat:.2f}",
+        f"Total: €{subtotal + vat:.2f}",
+        "",
+        "Payment Terms: Net 30 days",
+    ]
+    return "\n".join(lines)
+
+
+def measure(func, text: str, seconds: float) -> float:
+    """Meet documenten per seconde voor een extractie functie"""
+    runs = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while True:
+        func(text)
+        runs += 1
+        now = time.perf_counter()
+        if now >= deadline:
+            return runs / (now - start)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark extract_structured_data")
+    parser.add_argument("--items", type=int, nargs="+", default=[5, 50, 500, 5000],
+                        help="Aantal regels per document")
+    parser.add_argument("--seconds", type=float, default=1.0,
+                        help="Meetduur per functie per documentgrootte")
+    args = parser.parse_args()
+
+    print(f"{'items':>7} {'kB':>8} {'reference docs/s':>17} {'engine docs/s':>14} {'speedup':>8}")
+    for item_count in args.items:
+        text = build_purchase_order(item_count)
+        if extract_fields(text) != extract_fields_reference(text):
+            print(f"Resultaat wijkt af van referentie bij {item_count} items")
+            return 1
+
+        reference = measure(extract_fields_reference, text, args.seconds)
+        engine = measure(extract_fields, text, args.seconds)
+        print(f"{item_count:>7} {len(text) / 1024:>8.1f} {reference:>17.1f} {engine:>14.1f} {engine / reference:>7.2f}x")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
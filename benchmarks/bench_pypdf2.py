@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Benchmark voor PyPDF2 tekstextractie
+Vergelijkt de oorspronkelijke seriële extractie (string += per pagina) met de
+pagina-parallelle extractie op documenten van 10/100/500 pagina's.
+
+Elke meting draait in een eigen subprocess zodat de piek RSS per variant
+zuiver gemeten wordt; voor de parallelle variant wordt ook de piek RSS van de
+grootste worker gerapporteerd.
+
+Gebruik:
+    python benchmarks/bench_pypdf2.py
+    python benchmarks/bench_pypdf2.py --pages 10 100 500 --workers 4
+"""
+
+import argparse
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "backend"))
+
+from benchmarks.pdf_builder import LINES_PER_PAGE, build_pdf
+
+
+def build_document(page_count: int) -> bytes:
+    """PDF met volle pagina's inkooporder regels"""
+    pages = []
+    for page in range(page_count):
+        pages.append([
+            f"- Product {page}-{line} (Type {line % 7}): {line + 1} units @ €{line + 1.25:.2f} = €{(line + 1) * (line + 1.25):.2f}"
+            for line in range(LINES_PER_PAGE)
+        ])
+    return build_pdf(pages)
+
+
+def extract_serial_concat(pdf_content: bytes) -> str:
+    """Oorspronkelijke extract_text_with_pypdf2"""
+    import PyPDF2
+
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_content))
+    extracted_text = ""
+    for page in pdf_reader.pages:
+        extracted_text += page.extract_text() + "\n"
+    return extracted_text
+
+
+def extract_parallel(pdf_content: bytes, workers: int) -> str:
+    from pdf_text import extract_pages, join_with_offsets, shutdown_pool
+
+    try:
+        text, _ = join_with_offsets(extract_pages(pdf_content, workers=workers, min_pages=1))
+        return text
+    finally:
+        shutdown_pool()
+
+
+def peak_rss_mb(who: int) -> float:
+    # ru_maxrss is in kB op Linux
+    return resource.getrusage(who).ru_maxrss / 1024
+
+
+def run_one(variant: str, path: str, workers: int) -> None:
+    """Subprocess: meet één variant en print het resultaat als JSON"""
+    with open(path, "rb") as handle:
+        pdf_content = handle.read()
+
+    start = time.perf_counter()
+    if variant == "serial":
+        text = extract_serial_concat(pdf_content)
+    else:
+        text = extract_parallel(pdf_content, workers)
+    elapsed = time.perf_counter() - start
+
+    print(json.dumps({
+        "seconds": elapsed,
+        "characters": len(text),
+        "peak_rss_mb": peak_rss_mb(resource.RUSAGE_SELF),
+        "worker_peak_rss_mb": peak_rss_mb(resource.RUSAGE_CHILDREN),
+    }))
+
+
+def measure(variant: str, path: str, workers: int) -> dict:
+    output = subprocess.check_output(
+        [sys.executable, os.path.abspath(__file__), "--run-one", variant, path, "--workers", str(workers)]
+    )
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark PyPDF2 tekstextractie")
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--run-one", nargs=2, metavar=("VARIANT", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_one:
+        run_one(args.run_one[0], args.run_one[1], args.workers)
+        return 0
+
+    print(f"workers: {args.workers}")
+    print(f"{'pages':>6} {'variant':>9} {'seconds':>9} {'peak RSS MB':>12} {'worker RSS MB':>14}")
+    for page_count in args.pages:
+        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as handle:
+            handle.write(build_document(page_count))
+            path = handle.name
+        try:
+            results = {variant: measure(variant, path, args.workers) for variant in ("serial", "parallel")}
+        finally:
+            os.remove(path)
+
+        if results["serial"]["characters"] != results["parallel"]["characters"]:
+            print(f"Tekstlengte wijkt af bij {page_count} pagina's")
+            return 1
+
+        for variant, result in results.items():
+            worker_rss = f"{result['worker_peak_rss_mb']:.1f}" if variant == "parallel" else "-"
+            print(f"{page_count:>6} {variant:>9} {result['seconds']:>9.3f} "
+                  f"{result['peak_rss_mb']:>12.1f} {worker_rss:>14}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark suite voor extractie en conversie met regressiedrempels
+Meet per functie en invoergrootte de doorvoer (ops/s), latency percentielen
+en allocaties, en slaat het resultaat op als JSON baseline. De compare modus
+meet opnieuw (of leest een tweede JSON bestand) en faalt (exit code 1) als
+een case meer dan de drempel trager wordt of meer geheugen alloceert.
+
+Gemeten functies:
+    extract_structured_data, validate_and_enrich_data, calculate_confidence_score,
+    AzureServicesClient._extract_mock_data, extract_text_with_pypdf2
+
+Gebruik:
+    python benchmarks/bench_suite.py run --output benchmarks/baseline.json
+    python benchmarks/bench_suite.py compare --baseline benchmarks/baseline.json --threshold 0.2
+    python benchmarks/bench_suite.py compare --baseline oud.json --current nieuw.json
+    python benchmarks/bench_suite.py run --filter pypdf2 --seconds 2
+"""
+
+import argparse
+import copy
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "backend"))
+
+import azure_functions
+from benchmarks.bench_extraction import build_purchase_order
+from benchmarks.pdf_builder import build_pdf, paginate
+from services.azure_client import AzureServicesClient
+
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+
+# Metrics die meetellen voor een regressie: True = hoger is slechter
+REGRESSION_METRICS = {
+    "p50_us": True,
+    "ops_per_sec": False,
+    "alloc_peak_bytes": True,
+}
+
+# Allocatieverschillen kleiner dan dit zijn ruis (interne caches, dict resizes)
+ALLOC_NOISE_BYTES = 1024
+
+EXTRACTION_SIZES = (5, 50, 500)
+PDF_PAGE_COUNTS = (1, 8, 40)
+
+
+class Case(NamedTuple):
+    """Eén gemeten functie met vaste invoer; prepare levert de argumenten per aanroep"""
+    name: str
+    func: Callable[..., Any]
+    prepare: Callable[[], tuple]
+
+
+def build_cases() -> List[Case]:
+    """Alle cases, van kleine naar grote invoer"""
+    cases: List[Case] = []
+    mock_client = AzureServicesClient()
+
+    for item_count in EXTRACTION_SIZES:
+        text = build_purchase_order(item_count)
+        extracted = azure_functions.extract_structured_data(text)
+        validated = azure_functions.validate_and_enrich_data(copy.deepcopy(extracted))
+        cases += [
+            Case(f"extract_structured_data[items={item_count}]",
+                 azure_functions.extract_structured_data, lambda text=text: (text,)),
+            # validate_and_enrich_data wijzigt zijn invoer: elke aanroep krijgt een verse kopie
+            Case(f"validate_and_enrich_data[items={item_count}]",
+                 azure_functions.validate_and_enrich_data,
+                 lambda extracted=extracted: (copy.deepcopy(extracted),)),
+            Case(f"calculate_confidence_score[items={item_count}]",
+                 azure_functions.calculate_confidence_score, lambda validated=validated: (validated,)),
+            Case(f"extract_mock_data[items={item_count}]",
+                 mock_client._extract_mock_data, lambda text=text: (text,)),
+        ]
+
+    for page_count in PDF_PAGE_COUNTS:
+        lines = build_purchase_order(page_count * 60).splitlines()
+        pdf_content = build_pdf(paginate(lines)[:page_count])
+        cases.append(Case(f"extract_text_with_pypdf2[pages={page_count}]",
+                          azure_functions.extract_text_with_pypdf2, lambda pdf_content=pdf_content: (pdf_content,)))
+    return cases
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def measure_case(case: Case, seconds: float = 1.0, min_runs: int = 5,
+                 warmup_runs: int = 3, alloc_runs: int = 5) -> Dict[str, Any]:
+    """
+    Meet één case
+
+    Eerst warmup_runs aanroepen (imports, regex caches), dan aanroepen tot
+    seconds verstreken is (minstens min_runs) voor de latencies, en daarna
+    alloc_runs aanroepen onder tracemalloc voor de piekallocatie per aanroep.
+    Werk in child processen (PyPDF2 process pool) valt buiten de allocaties.
+    """
+    for _ in range(warmup_runs):
+        case.func(*case.prepare())
+
+    latencies: List[float] = []
+    deadline = time.perf_counter() + seconds
+    while len(latencies) < min_runs or time.perf_counter() < deadline:
+        args = case.prepare()
+        start = time.perf_counter()
+        case.func(*args)
+        latencies.append(time.perf_counter() - start)
+
+    peaks: List[int] = []
+    tracemalloc.start()
+    try:
+        for _ in range(alloc_runs):
+            args = case.prepare()
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            case.func(*args)
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+    finally:
+        tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "runs": len(latencies),
+        "ops_per_sec": round(len(latencies) / sum(latencies), 2),
+        "mean_us": round(statistics.fmean(latencies) * 1e6, 2),
+        "p50_us": round(percentile(latencies, 0.50) * 1e6, 2),
+        "p95_us": round(percentile(latencies, 0.95) * 1e6, 2),
+        "p99_us": round(percentile(latencies, 0.99) * 1e6, 2),
+        "alloc_peak_bytes": int(statistics.median(peaks)) if peaks else 0,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        output = subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                         stderr=subprocess.DEVNULL)
+        return output.decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(cases: List[Case], seconds: float = 1.0, **options) -> Dict[str, Any]:
+    """Meet alle cases; resultaat in het JSON baseline formaat"""
+    results = {}
+    for case in cases:
+        results[case.name] = measure_case(case, seconds, **options)
+        print(format_result(case.name, results[case.name]), flush=True)
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "seconds_per_case": seconds,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    """
+    Vergelijk twee runs per case en metric
+
+    Returns:
+        Regels met case, metric, baseline, current, change (relatief) en regression
+    """
+    rows = []
+    for name, result in current["results"].items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            rows.append({"case": name, "metric": None, "baseline": None, "current": None,
+                         "change": None, "regression": False})
+            continue
+        for metric, higher_is_worse in REGRESSION_METRICS.items():
+            old, new = previous.get(metric), result.get(metric)
+            if old is None or new is None:
+                continue
+            change = (new - old) / old if old else 0.0
+            worse = change if higher_is_worse else -change
+            regression = worse > threshold
+            if metric == "alloc_peak_bytes" and abs(new - old) < ALLOC_NOISE_BYTES:
+                regression = False
+            rows.append({"case": name, "metric": metric, "baseline": old, "current": new,
+                         "change": round(change, 4), "regression": regression})
+    return rows
+
+
+def format_result(name: str, result: Dict[str, Any]) -> str:
+    return (f"{name:<42} {result['ops_per_sec']:>11.1f} ops/s  p50 {result['p50_us']:>10.1f}us  "
+            f"p95 {result['p95_us']:>10.1f}us  p99 {result['p99_us']:>10.1f}us  "
+            f"alloc {result['alloc_peak_bytes'] / 1024:>9.1f}kB")
+
+
+def select_cases(pattern: Optional[str]) -> List[Case]:
+    cases = build_cases()
+    if pattern:
+        cases = [case for case in cases if re.search(pattern, case.name)]
+    return cases
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Micro-benchmarks met JSON baselines en regressiedrempels")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Meet en sla op als baseline")
+    run_parser.add_argument("--output", default=DEFAULT_BASELINE, help="JSON bestand voor de resultaten")
+
+    compare_parser = subparsers.add_parser("compare", help="Vergelijk met een baseline")
+    compare_parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    compare_parser.add_argument("--current", help="JSON van een eerdere run in plaats van opnieuw meten")
+    compare_parser.add_argument("--threshold", type=float, default=0.2,
+                                help="Toegestane relatieve verslechtering (0.2 = 20%%)")
+    compare_parser.add_argument("--output", help="Sla de nieuwe meting ook op")
+
+    for sub in (run_parser, compare_parser):
+        sub.add_argument("--filter", help="Regex op de case namen")
+        sub.add_argument("--seconds", type=float, default=1.0, help="Meetduur per case")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "run":
+            suite = run_suite(select_cases(args.filter), args.seconds)
+            with open(args.output, "w") as handle:
+                json.dump(suite, handle, indent=2)
+            print(f"Baseline opgeslagen in {args.output}")
+            return 0
+
+        with open(args.baseline) as handle:
+            baseline = json.load(handle)
+        if args.current:
+            with open(args.current) as handle:
+                current = json.load(handle)
+        else:
+            current = run_suite(select_cases(args.filter), args.seconds)
+            if args.output:
+                with open(args.output, "w") as handle:
+                    json.dump(current, handle, indent=2)
+    finally:
+        from pdf_text import shutdown_pool
+        shutdown_pool()
+
+    rows = compare(baseline, current, args.threshold)
+    print(f"\n{'case':<42} {'metric':<17} {'baseline':>12} {'current':>12} {'change':>8}")
+    for row in rows:
+        if row["metric"] is None:
+            print(f"{row['case']:<42} {'(nieuw)':<17}")
+            continue
+        marker = "  REGRESSIE" if row["regression"] else ""
+        print(f"{row['case']:<42} {row['metric']:<17} {row['baseline']:>12} {row['current']:>12} "
+              f"{row['change']:>+8.1%}{marker}")
+
+    regressions = [row for row in rows if row["regression"]]
+    if regressions:
+        print(f"\n{len(regressions)} regressie(s) boven {args.threshold:.0%}")
+        return 1
+    print(f"\nGeen regressies boven {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Benchmark van het geheugengebruik bij het verwerken van een PDF upload
+Vergelijkt de oude aanpak (file.read() naar bytes, BytesIO voor PyPDF2, bytes
+naar de uploader) met één gedeelde UploadBuffer (mmap + memoryview).
+
+Elke variant draait in een eigen subprocess met een echt multipart request
+(azure.functions.HttpRequest). Na het parsen van het request wordt de piek
+RSS gereset (Linux: /proc/self/clear_refs), zodat alleen de piek van hashen,
+tekstextractie en upload gemeten wordt; RSS na parse is het vertrekpunt.
+
+Gebruik:
+    python benchmarks/bench_upload_memory.py
+    python benchmarks/bench_upload_memory.py --pages 40 --scan-mb 2
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "backend"))
+
+from benchmarks.pdf_builder import build_pdf
+
+BOUNDARY = "bench-boundary"
+
+# Blokgrootte waarmee de blob SDK een stream uploadt
+UPLOAD_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+def build_request_body(page_count: int, scan_bytes_per_page: int) -> bytes:
+    pages = [[f"Order Number: APO-{page:05d}", "Scanned page"] for page in range(page_count)]
+    pdf_content = build_pdf(pages, scan_bytes_per_page=scan_bytes_per_page)
+    return (
+        f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"scan.pdf\"\r\n"
+        f"Content-Type: application/pdf\r\n\r\n".encode()
+        + pdf_content + f"\r\n--{BOUNDARY}--\r\n".encode()
+    )
+
+
+def consume_upload(stream) -> int:
+    """Stand-in voor upload_blob: leest de stream in blokken"""
+    total = 0
+    while True:
+        chunk = stream.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            return total
+        total += len(chunk)
+
+
+def _status_mb(field: str) -> float:
+    with open("/proc/self/status") as handle:
+        for line in handle:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) / 1024
+    raise KeyError(field)
+
+
+def current_rss_mb() -> float:
+    try:
+        return _status_mb("VmRSS")
+    except (OSError, KeyError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def rss_breakdown_mb() -> dict:
+    """Huidige RSS per soort: anoniem (heap) en file-backed (page cache van mmap/temp bestanden)"""
+    try:
+        return {"anon": _status_mb("RssAnon"), "file": _status_mb("RssFile") + _status_mb("RssShmem")}
+    except (OSError, KeyError):
+        return {"anon": current_rss_mb(), "file": 0.0}
+
+
+def reset_peak_rss() -> None:
+    """Zet de piek RSS (VmHWM) terug naar de huidige RSS; alleen op Linux"""
+    try:
+        with open("/proc/self/clear_refs", "w") as handle:
+            handle.write("5")
+    except OSError:
+        pass
+
+
+def peak_rss_mb() -> float:
+    try:
+        return _status_mb("VmHWM")
+    except (OSError, KeyError):
+        # ru_maxrss is in kB op Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_one(variant: str, body_path: str) -> None:
+    """Subprocess: verwerk het request met één variant en print het resultaat als JSON"""
+    import io
+
+    import azure.functions as func
+
+    from conversion_cache import content_hash
+    from pdf_text import extract_pages
+    from upload_buffer import UploadBuffer, open_view
+
+    with open(body_path, "rb") as handle:
+        body = handle.read()
+    request = func.HttpRequest(
+        "POST", "/api/convert_pdf_to_text",
+        headers={"Content-Type": f"multipart/form-data; boundary={BOUNDARY}"}, body=body
+    )
+    file = request.files.getlist("file")[0]
+    import PyPDF2  # noqa: F401  (importkosten niet meetellen)
+    reset_peak_rss()
+    after_parse = current_rss_mb()
+    anon_after_parse = rss_breakdown_mb()["anon"]
+
+    if variant == "before":
+        pdf_content = file.read()
+        key = content_hash(pdf_content)
+        pages = extract_pages(pdf_content, workers=1)
+        uploaded = consume_upload(io.BytesIO(pdf_content))
+        memory_mapped = False
+        breakdown = rss_breakdown_mb()
+    else:
+        with UploadBuffer.from_stream(file.stream) as upload:
+            key = content_hash(upload.view)
+            pages = extract_pages(upload.view, workers=1)
+            uploaded = consume_upload(open_view(upload.view))
+            memory_mapped = upload.memory_mapped
+            breakdown = rss_breakdown_mb()
+
+    print(json.dumps({
+        "key": key,
+        "pages": len(pages),
+        "uploaded": uploaded,
+        "memory_mapped": memory_mapped,
+        "after_parse_mb": after_parse,
+        "anon_after_parse_mb": anon_after_parse,
+        "breakdown": breakdown,
+        "peak_mb": peak_rss_mb(),
+    }))
+
+
+def measure(variant: str, body_path: str) -> dict:
+    output = subprocess.check_output(
+        [sys.executable, os.path.abspath(__file__), "--run-one", variant, body_path],
+        stderr=subprocess.DEVNULL
+    )
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Piek RSS bij verwerking van een PDF upload")
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--scan-mb", type=float, default=2.0, help="Grootte van de scan per pagina in MB")
+    parser.add_argument("--run-one", nargs=2, metavar=("VARIANT", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_one:
+        run_one(*args.run_one)
+        return 0
+
+    with tempfile.NamedTemporaryFile(suffix=".multipart", delete=False) as handle:
+        handle.write(build_request_body(args.pages, int(args.scan_mb * 1024 * 1024)))
+        body_path = handle.name
+    try:
+        size_mb = os.path.getsize(body_path) / (1024 * 1024)
+        results = {variant: measure(variant, body_path) for variant in ("before", "after")}
+    finally:
+        os.remove(body_path)
+
+    if results["before"]["key"] != results["after"]["key"]:
+        print("Hash wijkt af tussen de varianten")
+        return 1
+
+    print(f"request: {size_mb:.1f} MB, {args.pages} pagina's")
+    print(f"{'variant':>8} {'na parse MB':>12} {'piek MB':>9} {'extra MB':>9} "
+          f"{'extra heap MB':>14} {'file-backed MB':>15} {'mmap':>5}")
+    for variant, result in results.items():
+        extra = result["peak_mb"] - result["after_parse_mb"]
+        extra_heap = result["breakdown"]["anon"] - result["anon_after_parse_mb"]
+        print(f"{variant:>8} {result['after_parse_mb']:>12.1f} {result['peak_mb']:>9.1f} {extra:>9.1f} "
+              f"{extra_heap:>14.1f} {result['breakdown']['file']:>15.1f} {str(result['memory_mapped']):>5}")
+    print("extra heap: anoniem geheugen tijdens verwerking; file-backed pagina's zijn page cache "
+          "die de kernel kan terugnemen (op tmpfs telt /tmp als shmem)")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+"""
+Load test van de volledige upload → convert → extract → save keten
+Stuurt documenten met een vast aankomsttempo (open loop: nieuwe gebruikers
+komen ook als eerdere nog bezig zijn) naar een AzureServicesClient en meet
+per stap en end-to-end de p50/p95/p99 latency, doorvoer en foutpercentage.
+End-to-end telt vanaf het geplande aankomstmoment, zodat wachten op een vrije
+gebruiker (verzadiging) meetelt in plaats van weg te vallen.
+
+Clients:
+    mock       - AzureServicesClient met gesimuleerde delays (--mock-latency, zie services/latency.py)
+    devserver  - AzureFunctionsClient tegen een lokale FunctionAppServer in dit proces
+    http       - AzureFunctionsClient tegen --url (bv. python -m devserver.function_app)
+
+Bij devserver en http valt de save stap weg: AzureFunctionsClient heeft
+daarvoor geen Function route en zou de mock save (met zijn gesimuleerde
+vertraging) meten, wat end-to-end en het verzadigingspunt vertekent.
+
+De ramp modus verhoogt het tempo per stap tot de p95 boven de SLO komt, het
+foutpercentage boven de grens komt of de doorvoer achterblijft: het
+verzadigingspunt.
+
+Gebruik:
+    python benchmarks/load_test.py --client mock --users 50 --rate 10 --duration 30
+    python benchmarks/load_test.py --client devserver --users 200 --rate 40 --duration 20 --error-rate 0.01
+    python benchmarks/load_test.py --client http --url http://127.0.0.1:7071 --ramp 5:100:5 --step-seconds 15
+    python benchmarks/load_test.py --flow fused --report-dir reports/
+    python benchmarks/load_test.py --client mock --mock-latency empirical --latency-samples timings.log --rate 20
+"""
+
+import argparse
+import html
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "backend"))
+
+from benchmarks.po_corpus import Options, iter_corpus
+
+STAGES = {
+    "staged": ("convert", "extract", "save"),
+    "fused": ("process", "save"),
+}
+
+PERCENTILES = (("p50", 0.50), ("p95", 0.95), ("p99", 0.99))
+
+
+class Sample(NamedTuple):
+    """Eén document door de keten (tijden in seconden sinds de start van de run)"""
+    scheduled: float
+    started: float
+    finished: float
+    success: bool
+    timings: Dict[str, float]
+    failed_stage: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def latency(self) -> float:
+        return self.finished - self.scheduled
+
+    @property
+    def wait(self) -> float:
+        return self.started - self.scheduled
+
+
+class SloPolicy(NamedTuple):
+    """Wanneer een ramp stap als verzadigd geldt"""
+    p95_seconds: float = 10.0
+    max_error_rate: float = 0.01
+    min_throughput_ratio: float = 0.9
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def latency_stats(values: List[float]) -> Dict[str, Optional[float]]:
+    values = sorted(values)
+    stats: Dict[str, Optional[float]] = {
+        name: _round(percentile(values, fraction)) for name, fraction in PERCENTILES
+    }
+    stats["mean"] = _round(sum(values) / len(values)) if values else None
+    stats["max"] = _round(values[-1]) if values else None
+    return stats
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value, 4)
+
+
+def load_documents(count: int, seed: int, max_items: int = 50) -> List[Tuple[bytes, str]]:
+    """PDFs uit het synthetische corpus"""
+    return [(document.pdf(), document.doc_id + ".pdf")
+            for document in iter_corpus(count, seed, Options(max_items=max_items))]
+
+
+def run_session(client, file_content: bytes, filename: str, flow: str,
+                save: bool = True) -> Tuple[bool, Dict[str, float], Optional[str], Optional[str]]:
+    """Eén gebruiker: upload → convert → extract (→ save); geeft (success, timings, failed_stage, error)"""
+    timings: Dict[str, float] = {}
+
+    def stage(name: str, call: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        start = time.perf_counter()
+        try:
+            outcome = call()
+        except Exception as e:
+            outcome = {"success": False, "error": str(e)}
+        timings[name] = round(time.perf_counter() - start, 4)
+        return outcome
+
+    if flow == "fused":
+        steps = [("process", lambda previous: client.process_document(file_content, filename))]
+    else:
+        steps = [
+            ("convert", lambda previous: client.convert_pdf_to_text(file_content, filename)),
+            ("extract", lambda previous: client.extract_purchase_order_data(previous["text"])),
+        ]
+    if save:
+        steps.append(("save", lambda previous: client.save_processed_document(previous["extracted_data"])))
+
+    outcome: Dict[str, Any] = {}
+    for name, call in steps:
+        outcome = stage(name, lambda: call(outcome))
+        if not outcome.get("success"):
+            return False, timings, name, outcome.get("error")
+    return True, timings, None, None
+
+
+def arrival_times(rate: float, duration: float, arrivals: str, rng: random.Random) -> List[float]:
+    """Aankomstmomenten binnen duration: vast interval of Poisson proces"""
+    times = []
+    now = 0.0
+    while True:
+        now += rng.expovariate(rate) if arrivals == "poisson" else 1.0 / rate
+        if now >= duration:
+            return times
+        times.append(now)
+
+
+def run_load(client, documents: List[Tuple[bytes, str]], rate: float, duration: float, users: int,
+             flow: str = "staged", arrivals: str = "poisson", seed: int = 0,
+             drain_timeout: float = 120.0, save: bool = True) -> Dict[str, Any]:
+    """
+    Draai één load stap en vat het resultaat samen
+
+    Args:
+        client: AzureServicesClient (of iets met dezelfde methodes)
+        documents: (PDF bytes, bestandsnaam); elk request krijgt unieke bytes (geen cache hits)
+        rate: Aankomsten per seconde
+        duration: Duur van de stap in seconden
+        users: Maximaal aantal gelijktijdige gebruikers
+        drain_timeout: Hoe lang na de stap gewacht wordt op lopende documenten
+        save: Voer de save stap uit (alleen zinvol als die echt iets aanroept)
+    """
+    rng = random.Random(seed)
+    schedule = arrival_times(rate, duration, arrivals, rng)
+    samples: List[Sample] = []
+    lock = threading.Lock()
+    start = time.perf_counter()
+
+    def session(number: int, scheduled: float) -> None:
+        file_content, filename = documents[number % len(documents)]
+        # Bytes na %%EOF negeert een PDF reader; zo raakt geen request de conversie cache
+        file_content = file_content + f"\n%load-{seed}-{number}\n".encode()
+        started = time.perf_counter() - start
+        success, timings, failed_stage, error = run_session(client, file_content, filename, flow, save)
+        sample = Sample(scheduled, started, time.perf_counter() - start, success, timings, failed_stage, error)
+        with lock:
+            samples.append(sample)
+
+    executor = ThreadPoolExecutor(max_workers=users, thread_name_prefix="load-user")
+    futures = []
+    for number, scheduled in enumerate(schedule):
+        delay = scheduled - (time.perf_counter() - start)
+        if delay > 0:
+            time.sleep(delay)
+        futures.append(executor.submit(session, number, scheduled))
+    wait(futures, timeout=max(0.0, duration - (time.perf_counter() - start)) + drain_timeout)
+    # Wat na drain_timeout nog loopt of wacht telt als niet afgerond
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    elapsed = time.perf_counter() - start
+    with lock:
+        finished = list(samples)
+    stages = STAGES[flow] if save else tuple(stage for stage in STAGES[flow] if stage != "save")
+    summary = summarize(finished, offered=len(schedule), elapsed=elapsed, stages=stages)
+    summary.update(rate=rate, duration=duration, users=users, flow=flow, save=save)
+    return summary
+
+
+def summarize(samples: List[Sample], offered: int, elapsed: float, stages: Sequence[str]) -> Dict[str, Any]:
+    """Percentielen, doorvoer, foutpercentage en een tijdlijn per seconde"""
+    succeeded = [sample for sample in samples if sample.success]
+    failed = [sample for sample in samples if not sample.success]
+    unfinished = offered - len(samples)
+
+    latencies: Dict[str, Any] = {
+        "end_to_end": latency_stats([sample.latency for sample in succeeded]),
+        "wait": latency_stats([sample.wait for sample in samples]),
+    }
+    for stage in stages:
+        latencies[stage] = latency_stats([sample.timings[stage] for sample in samples if stage in sample.timings])
+
+    timeline = []
+    for second in range(int(math.ceil(elapsed))):
+        bucket = [sample for sample in samples if second <= sample.finished < second + 1]
+        ok = sorted(sample.latency for sample in bucket if sample.success)
+        timeline.append({
+            "second": second,
+            "completed": len(ok),
+            "failed": len(bucket) - len(ok),
+            "p95": _round(percentile(ok, 0.95)),
+        })
+
+    errors = Counter(f"{sample.failed_stage}: {sample.error}" if sample.error else sample.failed_stage
+                     for sample in failed)
+    return {
+        "offered": offered,
+        "completed": len(succeeded),
+        "failed": len(failed) + unfinished,
+        "unfinished": unfinished,
+        "error_rate": round((len(failed) + unfinished) / offered, 4) if offered else 0.0,
+        "elapsed": round(elapsed, 3),
+        "throughput": round(len(succeeded) / elapsed, 3) if elapsed else 0.0,
+        "latency": latencies,
+        "errors": dict(errors.most_common(10)),
+        "timeline": timeline,
+    }
+
+
+def is_saturated(step: Dict[str, Any], slo: SloPolicy) -> bool:
+    p95 = step["latency"]["end_to_end"]["p95"]
+    return (
+        step["error_rate"] > slo.max_error_rate
+        or p95 is None or p95 > slo.p95_seconds
+        or step["throughput"] < slo.min_throughput_ratio * step["completed_rate_target"]
+    )
+
+
+def run_ramp(client, documents: List[Tuple[bytes, str]], rates: Sequence[float], step_seconds: float,
+             users: int, slo: SloPolicy = SloPolicy(), **options) -> Dict[str, Any]:
+    """
+    Verhoog het tempo per stap tot de keten verzadigd is
+
+    Returns:
+        steps (samenvatting per tempo) en saturation: het eerste verzadigde
+        tempo en het hoogste tempo dat nog binnen de SLO bleef
+    """
+    steps = []
+    last_good = None
+    saturated_at = None
+    for rate in rates:
+        step = run_load(client, documents, rate, step_seconds, users, **options)
+        # Doorvoer die bij dit tempo haalbaar had moeten zijn (aankomsten die binnen de stap vielen)
+        step["completed_rate_target"] = round(step["offered"] / step["elapsed"], 3) if step["elapsed"] else rate
+        step["saturated"] = is_saturated(step, slo)
+        steps.append(step)
+        print(format_step(step), flush=True)
+        if step["saturated"]:
+            saturated_at = rate
+            break
+        last_good = rate
+    return {
+        "steps": steps,
+        "saturation": {"saturated_at": saturated_at, "last_good_rate": last_good, "slo": slo._asdict()},
+    }
+
+
+def format_step(step: Dict[str, Any]) -> str:
+    end_to_end = step["latency"]["end_to_end"]
+
+    def seconds(value: Optional[float]) -> str:
+        return f"{value:8.3f}s" if value is not None else "       -"
+
+    marker = "  VERZADIGD" if step.get("saturated") else ""
+    return (f"rate {step['rate']:>7.2f}/s  users {step['users']:>4}  done {step['completed']:>6}  "
+            f"errors {step['error_rate']:>6.1%}  thr {step['throughput']:>7.2f}/s  "
+            f"p50 {seconds(end_to_end['p50'])}  p95 {seconds(end_to_end['p95'])}  "
+            f"p99 {seconds(end_to_end['p99'])}{marker}")
+
+
+def _latency_table(latency: Dict[str, Dict[str, Optional[float]]]) -> str:
+    rows = []
+    for stage, stats in latency.items():
+        cells = "".join(f"<td>{'-' if stats[key] is None else f'{stats[key]:.3f}'}</td>"
+                        for key in ("p50", "p95", "p99", "mean", "max"))
+        rows.append(f"<tr><th>{html.escape(stage)}</th>{cells}</tr>")
+    return ("<table><tr><th>stap (s)</th><th>p50</th><th>p95</th><th>p99</th><th>mean</th><th>max</th></tr>"
+            + "".join(rows) + "</table>")
+
+
+def _timeline_svg(timeline: List[Dict[str, Any]], width: int = 720, height: int = 160) -> str:
+    """p95 per seconde als lijn, voltooide documenten per seconde als staven"""
+    if not timeline:
+        return ""
+    max_p95 = max((point["p95"] or 0) for point in timeline) or 1
+    max_done = max(point["completed"] + point["failed"] for point in timeline) or 1
+    step = width / len(timeline)
+    bars, points = [], []
+    for index, point in enumerate(timeline):
+        bar = (point["completed"] + point["failed"]) / max_done * height
+        colour = "#e57373" if point["failed"] else "#90caf9"
+        bars.append(f'<rect x="{index * step:.1f}" y="{height - bar:.1f}" width="{max(step - 1, 1):.1f}" '
+                    f'height="{bar:.1f}" fill="{colour}"/>')
+        if point["p95"] is not None:
+            points.append(f"{index * step + step / 2:.1f},{height - point['p95'] / max_p95 * height:.1f}")
+    line = f'<polyline points="{" ".join(points)}" fill="none" stroke="#1a237e" stroke-width="2"/>' if points else ""
+    return (f'<svg width="{width}" height="{height}" style="border:1px solid #ddd">{"".join(bars)}{line}</svg>'
+            f"<p class=\"legend\">staven: documenten per seconde (rood: met fouten), lijn: p95 end-to-end "
+            f"(max {max_p95:.2f}s)</p>")
+
+
+def _summary_html(title: str, summary: Dict[str, Any]) -> str:
+    facts = [("tempo", f"{summary['rate']}/s"), ("gebruikers", summary["users"]), ("flow", summary["flow"]),
+             ("aangeboden", summary["offered"]), ("voltooid", summary["completed"]),
+             ("fouten", f"{summary['error_rate']:.2%}"), ("doorvoer", f"{summary['throughput']}/s")]
+    fact_rows = "".join(f"<tr><th>{name}</th><td>{html.escape(str(value))}</td></tr>" for name, value in facts)
+    errors = "".join(f"<li>{html.escape(str(error))}: {count}</li>" for error, count in summary["errors"].items())
+    return (f"<h2>{html.escape(title)}</h2><table>{fact_rows}</table>{_latency_table(summary['latency'])}"
+            f"{_timeline_svg(summary['timeline'])}" + (f"<ul>{errors}</ul>" if errors else ""))
+
+
+def write_reports(report: Dict[str, Any], directory: str, name: str = "load_test") -> Tuple[str, str]:
+    """Schrijf <name>.json en een zelfstandige <name>.html"""
+    os.makedirs(directory, exist_ok=True)
+    json_path = os.path.join(directory, name + ".json")
+    with open(json_path, "w") as handle:
+        json.dump(report, handle, indent=2)
+
+    sections = []
+    if "ramp" in report:
+        saturation = report["ramp"]["saturation"]
+        rows = "".join(
+            f"<tr><td>{step['rate']}</td><td>{step['completed']}</td><td>{step['error_rate']:.2%}</td>"
+            f"<td>{step['throughput']}</td><td>{step['latency']['end_to_end']['p95']}</td>"
+            f"<td>{'ja' if step['saturated'] else 'nee'}</td></tr>"
+            for step in report["ramp"]["steps"]
+        )
+        sections.append(
+            f"<h2>Ramp</h2><p>Hoogste tempo binnen de SLO: <b>{saturation['last_good_rate']}</b>/s, "
+            f"verzadigd bij: <b>{saturation['saturated_at']}</b>/s</p>"
+            "<table><tr><th>tempo</th><th>voltooid</th><th>fouten</th><th>doorvoer</th>"
+            f"<th>p95 (s)</th><th>verzadigd</th></tr>{rows}</table>"
+        )
+        sections += [_summary_html(f"Stap {step['rate']}/s", step) for step in report["ramp"]["steps"]]
+    else:
+        sections.append(_summary_html("Resultaat", report["result"]))
+
+    html_path = os.path.join(directory, name + ".html")
+    with open(html_path, "w") as handle:
+        handle.write(
+            "<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>Load test</title><style>"
+            "body{font-family:sans-serif;margin:2em}table{border-collapse:collapse;margin:1em 0}"
+            "td,th{border:1px solid #ccc;padding:4px 8px;text-align:right}.legend{color:#666;font-size:90%}"
+            "</style></head><body>"
+            f"<h1>Load test ({html.escape(report['meta']['client'])})</h1>"
+            f"<p>{html.escape(report['meta']['created'])}</p>" + "".join(sections) + "</body></html>"
+        )
+    return json_path, html_path
+
+
+def parse_ramp(value: str) -> List[float]:
+    """"start:stop:step" naar een lijst tempo's"""
+    start, stop, step = (float(part) for part in value.split(":"))
+    count = int(round((stop - start) / step)) + 1
+    return [round(start + index * step, 6) for index in range(count)]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Load test van upload → convert → extract → save")
+    parser.add_argument("--client", choices=("mock", "devserver", "http"), default="mock")
+    parser.add_argument("--url", help="Function App URL voor --client http")
+    parser.add_argument("--flow", choices=sorted(STAGES), default="staged",
+                        help="staged: convert + extract + save, fused: process_document + save "
+                             "(save alleen bij --client mock)")
+    parser.add_argument("--users", type=int, default=10, help="Maximaal aantal gelijktijdige gebruikers")
+    parser.add_argument("--rate", type=float, default=2.0, help="Aankomsten per seconde")
+    parser.add_argument("--duration", type=float, default=30.0, help="Duur in seconden")
+    parser.add_argument("--arrivals", choices=("poisson", "constant"), default="poisson")
+    parser.add_argument("--ramp", help="Ramp modus: start:stop:step in aankomsten per seconde")
+    parser.add_argument("--step-seconds", type=float, default=15.0, help="Duur per ramp stap")
+    parser.add_argument("--slo-p95", type=float, default=10.0, help="p95 end-to-end grens (s) in ramp modus")
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--documents", type=int, default=50, help="Aantal verschillende PDFs uit het corpus")
+    parser.add_argument("--max-items", type=int, default=50, help="Maximaal aantal regels per PDF")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--report-dir", default="reports")
+    parser.add_argument("--mock-latency", choices=("fixed", "zero", "size", "lognormal", "empirical"),
+                        default="fixed", help="Latency model van de mock client (bij devserver/http valt de save stap weg)")
+    parser.add_argument("--latency-samples", help="Log met \"timings\" records voor lognormal/empirical")
+    parser.add_argument("--latency", type=float, default=0.0, help="devserver: extra latency per request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="devserver: kans op een foutstatus")
+    args = parser.parse_args()
+
+    from services.azure_client import AzureFunctionsClient, AzureServicesClient
+    from services.http_transport import FunctionHttpTransport
+    from services.latency import latency_model
+
+    server = None
+    transport = None
+    try:
+        latency = latency_model(args.mock_latency, args.latency_samples, args.seed)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.client == "mock":
+        client = AzureServicesClient(latency=latency)
+    else:
+        url = args.url
+        if args.client == "devserver":
+            from devserver.faults import FaultInjector
+            from devserver.function_app import FunctionAppServer
+            server = FunctionAppServer(faults=FaultInjector(latency=args.latency, error_rate=args.error_rate,
+                                                            seed=args.seed)).start()
+            url = server.url
+        if not url:
+            parser.error("--client http vereist --url")
+        transport = FunctionHttpTransport(url, pool_size=args.users)
+        # --mock-latency geldt hier niet: de enige mock stap (save) wordt overgeslagen
+        client = AzureFunctionsClient(url, transport=transport)
+
+    documents = load_documents(args.documents, args.seed, args.max_items)
+    report: Dict[str, Any] = {"meta": {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "client": args.client, "url": args.url, "arrivals": args.arrivals, "seed": args.seed,
+        "documents": args.documents,
+    }}
+    report["meta"]["mock_latency"] = args.mock_latency
+    # Save heeft geen Function route: alleen de mock client meet daar iets zinvols
+    options = dict(flow=args.flow, arrivals=args.arrivals, seed=args.seed, save=args.client == "mock")
+    try:
+        if args.ramp:
+            slo = SloPolicy(p95_seconds=args.slo_p95, max_error_rate=args.max_error_rate)
+            report["ramp"] = run_ramp(client, documents, parse_ramp(args.ramp), args.step_seconds,
+                                      args.users, slo, **options)
+        else:
+            report["result"] = run_load(client, documents, args.rate, args.duration, args.users, **options)
+            print(format_step(report["result"]))
+    finally:
+        if transport is not None:
+            transport.close()
+        if server is not None:
+            server.stop()
+
+    json_path, html_path = write_reports(report, args.report_dir)
+    print(f"Rapport: {json_path}, {html_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
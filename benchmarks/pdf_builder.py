@@ -0,0 +1,100 @@
+"""
+Minimale PDF writer voor benchmarks en tests
+Maakt echte PDFs met een tekstlaag (Helvetica, WinAnsi) zonder externe
+dependencies, zodat PyPDF2 er tekst uit kan halen.
+"""
+
+from typing import List
+
+PAGE_WIDTH = 595
+PAGE_HEIGHT = 842
+FONT_SIZE = 10
+LINE_HEIGHT = 12
+MARGIN = 40
+
+# Regels die op één A4 pagina passen bij de standaard lettergrootte
+LINES_PER_PAGE = (PAGE_HEIGHT - 2 * MARGIN) // LINE_HEIGHT
+
+# Inkooporder van twee pagina's met genoeg tekst dat de tekstlaag gebruikt wordt (geen OCR)
+SAMPLE_ORDER_PAGES = [
+    ["PURCHASE ORDER", "Order Number: APO-12345", "Date: 2024-01-15", "Supplier: HSO Test B.V."],
+    ["Items:", "- Product A: 100 units @ EUR 25.00 = EUR 2,500.00", "Subtotal: EUR 2,500.00"],
+]
+
+
+def _escape(line: str) -> bytes:
+    encoded = line.encode("cp1252", errors="replace")
+    return encoded.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+def _content_stream(lines: List[str]) -> bytes:
+    parts = [b"BT", f"/F1 {FONT_SIZE} Tf {LINE_HEIGHT} TL {MARGIN} {PAGE_HEIGHT - MARGIN} Td".encode()]
+    for line in lines:
+        parts.append(b"(" + _escape(line) + b") Tj T*")
+    parts.append(b"ET")
+    return b"\n".join(parts)
+
+
+def build_pdf(pages: List[List[str]], scan_bytes_per_page: int = 0) -> bytes:
+    """
+    Bouw een PDF met per pagina de opgegeven tekstregels
+
+    Een lege regellijst geeft een pagina zonder tekstlaag (zoals een scan).
+    Met scan_bytes_per_page krijgt elke pagina een afbeelding van die grootte,
+    zodat de PDF zo groot wordt als een gescand document.
+    """
+    if not pages:
+        pages = [[]]
+
+    objects: List[bytes] = []
+    page_count = len(pages)
+    font_id = 3
+    first_page_id = 4
+
+    objects_per_page = 3 if scan_bytes_per_page else 2
+    page_ids = [first_page_id + objects_per_page * index for index in range(page_count)]
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {page_count} >>".encode())
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+
+    for index, lines in enumerate(pages):
+        content_id = page_ids[index] + 1
+        image = f"/XObject << /Im1 {content_id + 1} 0 R >> " if scan_bytes_per_page else ""
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> {image}>> /Contents {content_id} 0 R >>".encode()
+        )
+        stream = _content_stream(lines) if lines else b""
+        objects.append(b"<< /Length " + str(len(stream)).encode() + b" >>\nstream\n" + stream + b"\nendstream")
+        if scan_bytes_per_page:
+            # Grijswaarden afbeelding met ruis, één byte per pixel
+            width = 1000
+            height = max(1, scan_bytes_per_page // width)
+            pixels = bytes((index * 7919 + offset * 104729) % 251 for offset in range(width)) * height
+            objects.append(
+                f"<< /Type /XObject /Subtype /Image /Width {width} /Height {height} "
+                f"/ColorSpace /DeviceGray /BitsPerComponent 8 /Length {len(pixels)} >>\nstream\n".encode()
+                + pixels + b"\nendstream"
+            )
+
+    output = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+
+    xref_offset = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n".encode()
+    output += b"0000000000 65535 f \n"
+    for offset in offsets:
+        output += f"{offset:010d} 00000 n \n".encode()
+    output += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode()
+
+    return bytes(output)
+
+
+def paginate(lines: List[str], lines_per_page: int = LINES_PER_PAGE) -> List[List[str]]:
+    """Verdeel tekstregels over pagina's"""
+    return [lines[start:start + lines_per_page] for start in range(0, len(lines), lines_per_page)] or [[]]
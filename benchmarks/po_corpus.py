@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Synthetische inkooporders met ground truth
+Genereert reproduceerbare (seed) corpora van inkooporders met variatie in
+leverancier, aantal regels (1 tot 5000), valuta, getalnotatie, datumnotatie,
+taal, opmaak en aantal pagina's. Per document komt er platte tekst, een echte
+PDF (met tekstlaag) en een JSON bestand met de juiste waarden.
+
+Elk document heeft zijn eigen Random op (seed, index), zodat document N altijd
+hetzelfde is, ongeacht hoeveel documenten er gegenereerd worden.
+
+Gebruik:
+    python benchmarks/po_corpus.py generate --count 1000 --seed 42 --output corpus/
+    python benchmarks/po_corpus.py generate --count 20 --min-items 500 --max-items 5000 --languages nl de
+    python benchmarks/po_corpus.py evaluate corpus/
+
+    for document in iter_corpus(100, seed=1):
+        document.text, document.truth, document.pdf()
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.pdf_builder import build_pdf, paginate
+
+CENT = Decimal("0.01")
+
+# Labels per taal
+LABELS = {
+    "en": {
+        "title": "PURCHASE ORDER", "order_number": "Order Number", "date": "Date",
+        "supplier": "Supplier", "ship_to": "Ship To", "items": "Items", "unit": "units",
+        "subtotal": "Subtotal", "vat": "VAT", "total": "Total", "payment": "Payment Terms: Net {days} days",
+        "header": ("Qty", "Description", "Unit price", "Amount"), "terms": "Terms and Conditions",
+    },
+    "nl": {
+        "title": "INKOOPORDER", "order_number": "Ordernummer", "date": "Datum",
+        "supplier": "Leverancier", "ship_to": "Afleveradres", "items": "Artikelen", "unit": "stuks",
+        "subtotal": "Subtotaal", "vat": "BTW", "total": "Totaal", "payment": "Betaling binnen {days} dagen",
+        "header": ("Aantal", "Omschrijving", "Stukprijs", "Bedrag"), "terms": "Algemene voorwaarden",
+    },
+    "de": {
+        "title": "BESTELLUNG", "order_number": "Bestellnummer", "date": "Datum",
+        "supplier": "Lieferant", "ship_to": "Lieferadresse", "items": "Positionen", "unit": "Stück",
+        "subtotal": "Zwischensumme", "vat": "MwSt", "total": "Gesamtbetrag", "payment": "Zahlbar innerhalb {days} Tagen",
+        "header": ("Menge", "Bezeichnung", "Einzelpreis", "Betrag"), "terms": "Allgemeine Geschäftsbedingungen",
+    },
+}
+
+VAT_RATES = {"en": (20, 21, 0), "nl": (21, 9), "de": (19, 7)}
+
+CURRENCIES = {"EUR": "€", "USD": "$", "GBP": "£", "CHF": "CHF"}
+
+# Getalnotaties: (scheidingsteken duizendtallen, decimaalteken)
+NUMBER_FORMATS = {"en": (",", "."), "eu": (".", ","), "plain": ("", ".")}
+
+DATE_FORMATS = {"iso": "%Y-%m-%d", "dmy_slash": "%d/%m/%Y", "dmy_dash": "%d-%m-%Y"}
+
+LAYOUTS = ("list", "table")
+
+SUPPLIER_PREFIXES = ("JASA", "Noord", "Delta", "Van Dijk", "Alpen", "Hansen", "Rijn", "Euro",
+                     "Atlas", "Kessler", "De Vries", "Polder", "Nordic", "Brabant", "Meyer")
+SUPPLIER_NOUNS = ("Packaging", "Logistics", "Industrial Supplies", "Office Solutions", "Chemicals",
+                  "Food Ingredients", "Metaalwerken", "Verpakkingen", "Technik", "Elektro", "Textiles")
+LEGAL_FORMS = {"en": ("Ltd.", "Inc.", "B.V.", "PLC"), "nl": ("B.V.", "N.V.", "V.O.F."),
+               "de": ("GmbH", "AG", "KG", "GmbH & Co. KG")}
+
+PRODUCTS = ("Cardboard box", "Pallet wrap", "Label roll", "Safety gloves", "Printer paper",
+            "Steel bracket", "Bubble wrap", "Hex bolt M8", "Kartonnen doos", "Etiketten",
+            "Schrauben", "Klebeband", "Cleaning agent", "Packing tape", "Foam insert")
+VARIANTS = ("S", "M", "L", "XL", "Type A", "Type B", "Blue", "Recycled", "Premium", "Bulk")
+
+STREETS = ("Keizersgracht", "Industrieweg", "Hauptstraße", "High Street", "Stationsplein", "Havenstraat")
+CITIES = {"en": (("London", "GB"), ("Manchester", "GB"), ("Dublin", "IE")),
+          "nl": (("Amsterdam", "NL"), ("Utrecht", "NL"), ("Eindhoven", "NL")),
+          "de": (("Berlin", "DE"), ("München", "DE"), ("Köln", "DE"))}
+
+TERMS_SENTENCE = ("Delivery is subject to the general terms and conditions of the buyer; "
+                  "invoices must state the order number.")
+
+
+class Options(NamedTuple):
+    """Instellingen voor de variatie in een corpus"""
+    min_items: int = 1
+    max_items: int = 200
+    languages: Sequence[str] = tuple(LABELS)
+    currencies: Sequence[str] = tuple(CURRENCIES)
+    number_formats: Sequence[str] = tuple(NUMBER_FORMATS)
+    date_formats: Sequence[str] = tuple(DATE_FORMATS)
+    terms_rate: float = 0.2
+
+
+class Document(NamedTuple):
+    """Eén gegenereerde inkooporder"""
+    doc_id: str
+    text: str
+    pages: List[List[str]]
+    truth: Dict[str, Any]
+
+    def pdf(self) -> bytes:
+        return build_pdf(self.pages)
+
+
+def format_amount(value: Decimal, number_format: str) -> str:
+    """Bedrag met twee decimalen in de gegeven notatie (en: 1,234.56, eu: 1.234,56, plain: 1234.56)"""
+    thousands, decimal_mark = NUMBER_FORMATS[number_format]
+    whole, cents = f"{value.quantize(CENT):.2f}".split(".")
+    sign = "-" if whole.startswith("-") else ""
+    digits = whole.lstrip("-")
+    groups = []
+    while len(digits) > 3:
+        groups.insert(0, digits[-3:])
+        digits = digits[:-3]
+    groups.insert(0, digits)
+    return f"{sign}{thousands.join(groups)}{decimal_mark}{cents}"
+
+
+def format_money(value: Decimal, currency: str, number_format: str) -> str:
+    """Bedrag met valuta: symbool ervoor voor €/$/£, code erachter voor de rest"""
+    symbol = CURRENCIES[currency]
+    amount = format_amount(value, number_format)
+    return f"{symbol}{amount}" if len(symbol) == 1 else f"{amount} {symbol}"
+
+
+def _item_count(rng: random.Random, options: Options) -> int:
+    # Log-uniform: veel korte orders, af en toe een hele lange
+    low, high = max(1, options.min_items), max(options.min_items, options.max_items)
+    return min(high, int(math.exp(rng.uniform(math.log(low), math.log(high + 1)))))
+
+
+def generate_document(seed: int, index: int, options: Options = Options()) -> Document:
+    """Genereer document `index` van het corpus met deze seed"""
+    rng = random.Random(f"{seed}:{index}")
+    language = rng.choice(list(options.languages))
+    currency = rng.choice(list(options.currencies))
+    number_format = rng.choice(list(options.number_formats))
+    date_format = rng.choice(list(options.date_formats))
+    layout = rng.choice(LAYOUTS)
+    labels = LABELS[language]
+
+    order_number = f"{rng.choice(('APO', 'PO', 'ORD'))}-{rng.randint(1, 99999):05d}"
+    order_date = date(2023, 1, 1) + timedelta(days=rng.randint(0, 730))
+    supplier = (f"{rng.choice(SUPPLIER_PREFIXES)} {rng.choice(SUPPLIER_NOUNS)} "
+                f"{rng.choice(LEGAL_FORMS[language])}")
+    city, country = rng.choice(CITIES[language])
+    address = {
+        "company": "HSO Nederland B.V." if language == "nl" else f"HSO {city}",
+        "street": f"{rng.choice(STREETS)} {rng.randint(1, 250)}",
+        "postal_code": f"{rng.randint(1000, 9999)} {rng.choice('ABCDEFGH')}{rng.choice('JKLMNPRS')}"
+                       if country == "NL" else f"{rng.randint(10000, 99999)}",
+        "city": city,
+        "country": country,
+    }
+
+    items = []
+    for _ in range(_item_count(rng, options)):
+        quantity = rng.choice((1, 2, 5, 10, 12, 24, 50, 100, 250, 1000)) * rng.randint(1, 4)
+        unit_price = (Decimal(rng.randint(5, 250000)) / 100).quantize(CENT)
+        items.append({
+            "product": f"{rng.choice(PRODUCTS)} {rng.choice(VARIANTS)}",
+            "quantity": quantity,
+            "unit_price": unit_price,
+            "total": (unit_price * quantity).quantize(CENT),
+        })
+    subtotal = sum((item["total"] for item in items), Decimal("0"))
+    vat_percent = rng.choice(VAT_RATES[language])
+    vat_amount = (subtotal * vat_percent / 100).quantize(CENT, ROUND_HALF_UP)
+    total = subtotal + vat_amount
+
+    def money(value: Decimal) -> str:
+        return format_money(value, currency, number_format)
+
+    lines = [
+        labels["title"],
+        "",
+        f"{labels['order_number']}: {order_number}",
+        f"{labels['date']}: {order_date.strftime(DATE_FORMATS[date_format])}",
+        f"{labels['supplier']}: {supplier}",
+        "",
+        f"{labels['ship_to']}:",
+        address["company"],
+        address["street"],
+        f"{address['postal_code']} {address['city']}",
+        "",
+        f"{labels['items']}:",
+    ]
+    if layout == "table":
+        lines.append("   ".join(labels["header"]))
+    for item in items:
+        if layout == "list":
+            lines.append(f"- {item['product']}: {item['quantity']} {labels['unit']} @ "
+                         f"{money(item['unit_price'])} = {money(item['total'])}")
+        else:
+            lines.append(f"{item['quantity']:>6}   {item['product']:<28} "
+                         f"{money(item['unit_price']):>14} {money(item['total']):>16}")
+    lines += [
+        "",
+        f"{labels['subtotal']}: {money(subtotal)}",
+        f"{labels['vat']} ({vat_percent}%): {money(vat_amount)}",
+        f"{labels['total']}: {money(total)}",
+        "",
+        labels["payment"].format(days=rng.choice((14, 30, 60))),
+    ]
+    if rng.random() < options.terms_rate:
+        lines += ["", labels["terms"]] + [f"{number}. {TERMS_SENTENCE}" for number in range(1, rng.randint(20, 120))]
+
+    pages = paginate(lines)
+    truth = {
+        "order_number": order_number,
+        "date": order_date.isoformat(),
+        "supplier": supplier,
+        "items": [dict(item, unit_price=float(item["unit_price"]), total=float(item["total"])) for item in items],
+        "subtotal": float(subtotal),
+        "vat_rate": vat_percent / 100,
+        "vat_amount": float(vat_amount),
+        "total": float(total),
+        "delivery_address": address,
+        "document": {
+            "language": language,
+            "currency": currency,
+            "number_format": number_format,
+            "date_format": date_format,
+            "layout": layout,
+            "item_count": len(items),
+            "page_count": len(pages),
+        },
+    }
+    return Document(f"po-{seed}-{index:06d}", "\n".join(lines), pages, truth)
+
+
+def iter_corpus(count: int, seed: int = 0, options: Options = Options(), start: int = 0) -> Iterator[Document]:
+    """Documenten start..start+count-1 van het corpus, één voor één (geschikt voor grote corpora)"""
+    for index in range(start, start + count):
+        yield generate_document(seed, index, options)
+
+
+def write_corpus(directory: str, count: int, seed: int = 0, options: Options = Options(),
+                 formats: Sequence[str] = ("txt", "pdf")) -> Dict[str, Any]:
+    """
+    Schrijf een corpus naar een directory
+
+    Per document <id>.json (ground truth) en per formaat <id>.txt / <id>.pdf,
+    plus manifest.json met de seed, de opties en een samenvatting per document.
+    """
+    os.makedirs(directory, exist_ok=True)
+    documents = []
+    for document in iter_corpus(count, seed, options):
+        with open(os.path.join(directory, document.doc_id + ".json"), "w", encoding="utf-8") as handle:
+            json.dump(document.truth, handle, indent=2, ensure_ascii=False)
+        if "txt" in formats:
+            with open(os.path.join(directory, document.doc_id + ".txt"), "w", encoding="utf-8") as handle:
+                handle.write(document.text)
+        if "pdf" in formats:
+            with open(os.path.join(directory, document.doc_id + ".pdf"), "wb") as handle:
+                handle.write(document.pdf())
+        documents.append(dict(id=document.doc_id, **document.truth["document"]))
+
+    manifest = {"seed": seed, "count": count, "options": options._asdict(),
+                "formats": list(formats), "documents": documents}
+    with open(os.path.join(directory, "manifest.json"), "w", encoding="utf-8") as handle:
+        json.dump(manifest, handle, indent=2, ensure_ascii=False)
+    return manifest
+
+
+def load_corpus(directory: str) -> Iterator[Dict[str, Any]]:
+    """Ground truth en tekst van een geschreven corpus"""
+    with open(os.path.join(directory, "manifest.json"), encoding="utf-8") as handle:
+        manifest = json.load(handle)
+    for entry in manifest["documents"]:
+        base = os.path.join(directory, entry["id"])
+        with open(base + ".json", encoding="utf-8") as handle:
+            truth = json.load(handle)
+        text = None
+        if os.path.exists(base + ".txt"):
+            with open(base + ".txt", encoding="utf-8") as handle:
+                text = handle.read()
+        yield {"id": entry["id"], "truth": truth, "text": text, "pdf_path": base + ".pdf"}
+
+
+def _normalize_date(value: Optional[str]) -> Optional[str]:
+    for pattern in DATE_FORMATS.values():
+        try:
+            return datetime.strptime(value or "", pattern).date().isoformat()
+        except ValueError:
+            continue
+    return value
+
+
+def _close(expected: Optional[float], actual: Optional[float]) -> bool:
+    return expected is not None and actual is not None and abs(expected - actual) < 0.01
+
+
+def score_extraction(truth: Dict[str, Any], extracted: Dict[str, Any]) -> Dict[str, bool]:
+    """Per veld of de extractie de ground truth geeft (datums genormaliseerd, bedragen op 1 cent)"""
+    expected_items = truth["items"]
+    actual_items = extracted.get("items") or []
+    return {
+        "order_number": extracted.get("order_number") == truth["order_number"],
+        "date": _normalize_date(extracted.get("date")) == truth["date"],
+        "supplier": extracted.get("supplier") == truth["supplier"],
+        "items": len(actual_items) == len(expected_items) and all(
+            actual.get("quantity") == expected["quantity"] and _close(expected["total"], actual.get("total"))
+            for expected, actual in zip(expected_items, actual_items)
+        ),
+        "subtotal": _close(truth["subtotal"], extracted.get("subtotal")),
+        "vat_amount": _close(truth["vat_amount"], extracted.get("vat_amount")),
+        "total": _close(truth["total"], extracted.get("total")),
+    }
+
+
+def evaluate_corpus(directory: str, extract=None) -> Dict[str, Any]:
+    """
+    Draai de extractie over een corpus en geef de nauwkeurigheid per veld,
+    totaal en per taal (aandeel documenten waarvoor het veld klopt)
+    """
+    if extract is None:
+        sys.path.insert(0, os.path.join(ROOT, "backend"))
+        from azure_functions import extract_structured_data as extract
+
+    hits: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    counts: Dict[str, int] = defaultdict(int)
+    for document in load_corpus(directory):
+        if document["text"] is None:
+            continue
+        language = document["truth"]["document"]["language"]
+        for field, correct in score_extraction(document["truth"], extract(document["text"])).items():
+            for group in ("all", language):
+                hits[group][field] += correct
+        counts["all"] += 1
+        counts[language] += 1
+
+    return {
+        group: {"documents": counts[group],
+                **{field: round(hits[group][field] / counts[group], 4) for field in hits[group]}}
+        for group in counts
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Synthetische inkooporders met ground truth")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    generate = subparsers.add_parser("generate", help="Schrijf een corpus")
+    generate.add_argument("--count", type=int, default=100)
+    generate.add_argument("--seed", type=int, default=0)
+    generate.add_argument("--output", default="corpus")
+    generate.add_argument("--min-items", type=int, default=1)
+    generate.add_argument("--max-items", type=int, default=200, help="Maximaal aantal regels (tot 5000)")
+    generate.add_argument("--languages", nargs="+", choices=sorted(LABELS), default=sorted(LABELS))
+    generate.add_argument("--currencies", nargs="+", choices=sorted(CURRENCIES), default=sorted(CURRENCIES))
+    generate.add_argument("--formats", nargs="+", choices=("txt", "pdf"), default=["txt", "pdf"])
+
+    evaluate = subparsers.add_parser("evaluate", help="Nauwkeurigheid van extract_structured_data op een corpus")
+    evaluate.add_argument("directory")
+    args = parser.parse_args()
+
+    if args.command == "generate":
+        options = Options(min_items=args.min_items, max_items=min(args.max_items, 5000),
+                          languages=args.languages, currencies=args.currencies)
+        manifest = write_corpus(args.output, args.count, args.seed, options, args.formats)
+        pages = sum(entry["page_count"] for entry in manifest["documents"])
+        items = sum(entry["item_count"] for entry in manifest["documents"])
+        print(f"{args.count} documenten ({pages} pagina's, {items} regels) geschreven naar {args.output}")
+        return 0
+
+    report = evaluate_corpus(args.directory)
+    fields = [field for field in report["all"] if field != "documents"]
+    print(f"{'groep':<6} {'docs':>6} " + " ".join(f"{field:>12}" for field in fields))
+    for group, scores in sorted(report.items()):
+        print(f"{group:<6} {scores['documents']:>6} " + " ".join(f"{scores[field]:>12.1%}" for field in fields))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Samenvatting van request profielen (PROFILE_DIR of gedownloade blobs)
+Leest alle <naam>.profile.json bestanden met hun <naam>.prof en toont per
+route het aantal profielen, de duur en het piekgeheugen, de duurste
+functies over alle profielen samen (pstats) en de grootste allocatie sites.
+
+Gebruik:
+    python benchmarks/profile_report.py profiles/
+    python benchmarks/profile_report.py profiles/ --route convert_pdf_to_text --sort tottime --top 15
+    python benchmarks/profile_report.py profiles/ --json > profiles.json
+"""
+
+import argparse
+import json
+import os
+import pstats
+import statistics
+import sys
+from typing import Any, Dict, List, Optional
+
+PROFILE_SUFFIX = ".prof"
+SUMMARY_SUFFIX = ".profile.json"
+
+# pstats kolommen: (primitive calls, calls, tottime, cumtime, callers)
+SORT_COLUMNS = {"cumulative": 3, "tottime": 2, "calls": 1}
+
+
+def find_profiles(paths: List[str]) -> List[str]:
+    """Alle .profile.json bestanden in de opgegeven bestanden en directories (recursief)"""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for directory, _, filenames in os.walk(path):
+                found.extend(os.path.join(directory, name) for name in filenames if name.endswith(SUMMARY_SUFFIX))
+        elif path.endswith(SUMMARY_SUFFIX):
+            found.append(path)
+    return sorted(found)
+
+
+def summarize_profiles(summary_paths: List[str], top: int = 20, route: Optional[str] = None,
+                       sort: str = "cumulative") -> Dict[str, Any]:
+    """Tel de profielen op per route, over functies (pstats) en over allocatie sites"""
+    routes: Dict[str, List[Dict[str, Any]]] = {}
+    allocations: Dict[tuple, Dict[str, Any]] = {}
+    stats_paths = []
+    for path in summary_paths:
+        with open(path) as handle:
+            summary = json.load(handle)
+        if route and summary["route"] != route:
+            continue
+        summary["path"] = path
+        routes.setdefault(summary["route"], []).append(summary)
+        for site in summary.get("allocations", []):
+            total = allocations.setdefault((site["file"], site["line"]),
+                                           {"file": site["file"], "line": site["line"], "size_bytes": 0, "count": 0})
+            total["size_bytes"] += site["size_bytes"]
+            total["count"] += site["count"]
+        stats_path = path[:-len(SUMMARY_SUFFIX)] + PROFILE_SUFFIX
+        if os.path.exists(stats_path):
+            stats_paths.append(stats_path)
+
+    functions = []
+    if stats_paths:
+        column = SORT_COLUMNS[sort]
+        rows = sorted(pstats.Stats(*stats_paths).stats.items(), key=lambda item: item[1][column], reverse=True)
+        functions = [
+            {
+                "function": pstats.func_std_string(key),
+                "calls": calls,
+                "tottime": round(tottime, 6),
+                "cumtime": round(cumtime, 6),
+            }
+            for key, (_, calls, tottime, cumtime, _) in rows[:top]
+        ]
+
+    return {
+        "profiles": sum(len(summaries) for summaries in routes.values()),
+        "routes": {
+            name: {
+                "count": len(summaries),
+                "seconds_p50": round(statistics.median(summary["seconds"] for summary in summaries), 4),
+                "seconds_max": max(summary["seconds"] for summary in summaries),
+                "peak_bytes_max": max(summary["peak_bytes"] for summary in summaries),
+                "slowest": max(summaries, key=lambda summary: summary["seconds"])["path"],
+            }
+            for name, summaries in sorted(routes.items())
+        },
+        "functions": functions,
+        "allocations": sorted(allocations.values(), key=lambda site: site["size_bytes"], reverse=True)[:top],
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = [f"Profielen: {report['profiles']}", ""]
+    for name, route in report["routes"].items():
+        lines.append(f"{name}: {route['count']} requests, p50 {route['seconds_p50']:.3f}s, "
+                     f"max {route['seconds_max']:.3f}s, piek {route['peak_bytes_max'] / 1024:.0f} KiB")
+        lines.append(f"  traagste: {route['slowest']}")
+    lines += ["", f"{'cumtime':>10} {'tottime':>10} {'calls':>8}  functie"]
+    for function in report["functions"]:
+        lines.append(f"{function['cumtime']:>10.4f} {function['tottime']:>10.4f} {function['calls']:>8}  "
+                     f"{function['function']}")
+    lines += ["", f"{'KiB':>10} {'blocks':>8}  allocatie site"]
+    for site in report["allocations"]:
+        lines.append(f"{site['size_bytes'] / 1024:>10.1f} {site['count']:>8}  {site['file']}:{site['line']}")
+    return "\n".join(lines)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Samenvatting van request profielen (cProfile en tracemalloc)")
+    parser.add_argument("paths", nargs="+", help="Directories of .profile.json bestanden")
+    parser.add_argument("--route", help="Alleen profielen van deze route")
+    parser.add_argument("--top", type=int, default=20, help="Aantal functies en allocatie sites")
+    parser.add_argument("--sort", choices=sorted(SORT_COLUMNS), default="cumulative")
+    parser.add_argument("--json", action="store_true", help="Rapport als JSON")
+    args = parser.parse_args()
+
+    summary_paths = find_profiles(args.paths)
+    if not summary_paths:
+        print("Geen profielen gevonden", file=sys.stderr)
+        return 1
+    report = summarize_profiles(summary_paths, args.top, args.route, args.sort)
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -39,6 +39,13 @@ def _get_int(name: str, default: int) -> int:
         return default
 
 
+def _get_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except Exception:
+        return default
+
+
 @dataclass(frozen=True)
 class AppConfig:
     ENV: str = "development"  # development | staging | production
@@ -49,9 +56,37 @@ class AppConfig:
     USE_MOCK_AZURE: bool = True
     AZURE_FUNCTION_URL: Optional[str] = None
     AZURE_STORAGE_ACCOUNT: Optional[str] = None
+    AZURE_FUNCTION_KEY: Optional[str] = None
+
+    # Vertraging van de mock client: fixed, zero, size, lognormal of empirical (laatste twee met timings log)
+    MOCK_LATENCY: str = "fixed"
+    MOCK_LATENCY_SAMPLES: Optional[str] = None
+    MOCK_LATENCY_SEED: Optional[int] = None
+
+    # HTTP transport naar de Function App (gedeelde, gepoolde sessie)
+    HTTP_POOL_SIZE: int = 10
+    HTTP_TIMEOUT: int = 120
+    HTTP_GZIP_MIN_BYTES: int = 1024
+
+    # Retries (exponentiële backoff met jitter), circuit breaker per endpoint en hedging
+    HTTP_MAX_ATTEMPTS: int = 3
+    HTTP_BACKOFF_BASE: float = 0.2
+    HTTP_BACKOFF_MAX: float = 5.0
+    HTTP_HEDGING: bool = False
+    CIRCUIT_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_RESET_SECONDS: int = 30
+
+    # Conversie cache (SHA-256 van de PDF bytes)
+    CONVERSION_CACHE_TTL: int = 7 * 24 * 3600
+    CONVERSION_CACHE_MAX_ENTRIES: int = 256
+
+    # In-memory job records van de client pipeline (submit_document); oudste wijken
+    JOB_STORE_MAX_ENTRIES: int = 1000
 
     # App
     APP_PORT: int = 8501
+    # Poort voor GET /metrics (Prometheus) van het Streamlit proces; 0 = uit
+    METRICS_PORT: int = 0
 
     @staticmethod
     def from_env() -> "AppConfig":
@@ -62,8 +97,28 @@ class AppConfig:
         use_mock = _get_bool("USE_MOCK_AZURE", True)
         function_url = os.getenv("AZURE_FUNCTION_URL")
         storage_account = os.getenv("AZURE_STORAGE_ACCOUNT")
+        function_key = os.getenv("AZURE_FUNCTION_KEY")
+
+        mock_latency = os.getenv("MOCK_LATENCY", "fixed").lower()
+        mock_latency_samples = os.getenv("MOCK_LATENCY_SAMPLES") or None
+        mock_latency_seed = _get_int("MOCK_LATENCY_SEED", 0) if os.getenv("MOCK_LATENCY_SEED") else None
+
+        http_pool_size = _get_int("HTTP_POOL_SIZE", 10)
+        http_timeout = _get_int("HTTP_TIMEOUT", 120)
+        http_gzip_min_bytes = _get_int("HTTP_GZIP_MIN_BYTES", 1024)
+        http_max_attempts = _get_int("HTTP_MAX_ATTEMPTS", 3)
+        http_backoff_base = _get_float("HTTP_BACKOFF_BASE", 0.2)
+        http_backoff_max = _get_float("HTTP_BACKOFF_MAX", 5.0)
+        http_hedging = _get_bool("HTTP_HEDGING", False)
+        circuit_failure_threshold = _get_int("CIRCUIT_FAILURE_THRESHOLD", 5)
+        circuit_reset_seconds = _get_int("CIRCUIT_RESET_SECONDS", 30)
+
+        cache_ttl = _get_int("CONVERSION_CACHE_TTL", 7 * 24 * 3600)
+        cache_max_entries = _get_int("CONVERSION_CACHE_MAX_ENTRIES", 256)
+        job_store_max_entries = _get_int("JOB_STORE_MAX_ENTRIES", 1000)
 
         app_port = _get_int("APP_PORT", 8501)
+        metrics_port = _get_int("METRICS_PORT", 0)
 
         return AppConfig(
             ENV=env,
@@ -72,7 +127,24 @@ class AppConfig:
             USE_MOCK_AZURE=use_mock,
             AZURE_FUNCTION_URL=function_url,
             AZURE_STORAGE_ACCOUNT=storage_account,
+            AZURE_FUNCTION_KEY=function_key,
+            MOCK_LATENCY=mock_latency,
+            MOCK_LATENCY_SAMPLES=mock_latency_samples,
+            MOCK_LATENCY_SEED=mock_latency_seed,
+            HTTP_POOL_SIZE=http_pool_size,
+            HTTP_TIMEOUT=http_timeout,
+            HTTP_GZIP_MIN_BYTES=http_gzip_min_bytes,
+            HTTP_MAX_ATTEMPTS=http_max_attempts,
+            HTTP_BACKOFF_BASE=http_backoff_base,
+            HTTP_BACKOFF_MAX=http_backoff_max,
+            HTTP_HEDGING=http_hedging,
+            CIRCUIT_FAILURE_THRESHOLD=circuit_failure_threshold,
+            CIRCUIT_RESET_SECONDS=circuit_reset_seconds,
+            CONVERSION_CACHE_TTL=cache_ttl,
+            CONVERSION_CACHE_MAX_ENTRIES=cache_max_entries,
+            JOB_STORE_MAX_ENTRIES=job_store_max_entries,
             APP_PORT=app_port,
+            METRICS_PORT=metrics_port,
         )
 
 
@@ -0,0 +1,209 @@
+"""
+Lokale fake van de Azure Computer Vision Read API (v3.2)
+Spreekt hetzelfde HTTP contract als de echte service, zodat de echte
+ComputerVisionClient ertegen kan draaien in tests en lokale ontwikkeling.
+
+Ondersteund:
+    POST /vision/v3.2/read/analyze                     - url (JSON) of PDF bytes (stream)
+    GET  /vision/v3.2/read/analyzeResults/{operationId} - status en resultaat
+
+Gebruik:
+    server = FakeComputerVisionServer(processing_seconds=0.3).start()
+    client = ComputerVisionClient(server.endpoint, CognitiveServicesCredentials("fake"))
+    ...
+    server.stop()
+"""
+
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Union
+from urllib.parse import parse_qs, urlparse
+
+API_PREFIX = "/vision/v3.2"
+
+# Responder: (bron, paginanummers of None) -> {paginanummer: regels}
+Responder = Callable[[Dict[str, Any], Optional[List[int]]], Dict[int, List[str]]]
+
+
+def default_responder(source: Dict[str, Any], pages: Optional[List[int]]) -> Dict[int, List[str]]:
+    """Eén herkenbare regel per gevraagde pagina"""
+    return {number: [f"Fake OCR page {number}"] for number in (pages or [1])}
+
+
+def parse_pages(value: Optional[str]) -> Optional[List[int]]:
+    """Parse de pages query parameter ("1,3-5") naar paginanummers"""
+    if not value:
+        return None
+    numbers: List[int] = []
+    for part in value.split(","):
+        if "-" in part:
+            first, last = part.split("-", 1)
+            numbers.extend(range(int(first), int(last) + 1))
+        else:
+            numbers.append(int(part))
+    return numbers
+
+
+class FakeOperation:
+    """Eén Read operatie met tijdstippen van aanmaken, gereed zijn en alle polls"""
+
+    def __init__(self, operation_id: str, source: Dict[str, Any], pages: Optional[List[int]],
+                 ready_at: float, fail: bool):
+        self.operation_id = operation_id
+        self.source = source
+        self.pages = pages
+        self.created_at = time.monotonic()
+        self.ready_at = ready_at
+        self.fail = fail
+        self.polls: List[float] = []
+
+
+class FakeComputerVisionServer:
+    """
+    Threaded HTTP server die de Read API nabootst
+
+    Args:
+        processing_seconds: Verwerkingstijd per operatie, of functie van het aantal pagina's
+        retry_after: Retry-After header (seconden) op responses van lopende operaties
+        responder: Levert de tekstregels per pagina
+        fail_rate: Aandeel operaties dat met status "failed" eindigt (deterministisch per n-de operatie)
+    """
+
+    def __init__(self, processing_seconds: Union[float, Callable[[int], float]] = 0.2,
+                 retry_after: Optional[float] = None,
+                 responder: Responder = default_responder,
+                 fail_rate: float = 0.0,
+                 host: str = "127.0.0.1", port: int = 0):
+        self.processing_seconds = processing_seconds
+        self.retry_after = retry_after
+        self.responder = responder
+        self.fail_rate = fail_rate
+        self.operations: Dict[str, FakeOperation] = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def endpoint(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeComputerVisionServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "FakeComputerVisionServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _processing_time(self, page_count: int) -> float:
+        if callable(self.processing_seconds):
+            return self.processing_seconds(page_count)
+        return self.processing_seconds
+
+    def create_operation(self, source: Dict[str, Any], pages: Optional[List[int]]) -> FakeOperation:
+        with self._lock:
+            number = len(self.operations) + 1
+            fail = bool(self.fail_rate) and number % max(1, round(1 / self.fail_rate)) == 0
+            operation = FakeOperation(
+                uuid.uuid4().hex, source, pages,
+                time.monotonic() + self._processing_time(len(pages or [1])), fail
+            )
+            self.operations[operation.operation_id] = operation
+        return operation
+
+    def operation_body(self, operation: FakeOperation) -> Dict[str, Any]:
+        operation.polls.append(time.monotonic())
+        if time.monotonic() < operation.ready_at:
+            return {"status": "running"}
+        if operation.fail:
+            return {"status": "failed"}
+
+        read_results = []
+        for number, lines in sorted(self.responder(operation.source, operation.pages).items()):
+            read_results.append({
+                "page": number, "angle": 0, "width": 8.5, "height": 11, "unit": "inch",
+                "lines": [{"boundingBox": [0, 0, 1, 0, 1, 1, 0, 1], "text": line, "words": []}
+                          for line in lines]
+            })
+        return {
+            "status": "succeeded",
+            "analyzeResult": {"version": "3.2.0", "readResults": read_results}
+        }
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, status: int, body: Optional[Dict[str, Any]],
+                           headers: Optional[Dict[str, str]] = None) -> None:
+                payload = json.dumps(body).encode() if body is not None else b""
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _read_body(self) -> bytes:
+                # De SDK streamt read_in_stream bodies met chunked transfer encoding
+                if "chunked" not in self.headers.get("Transfer-Encoding", "").lower():
+                    return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                chunks = []
+                while True:
+                    size = int(self.rfile.readline().split(b";")[0].strip() or b"0", 16)
+                    if size == 0:
+                        self.rfile.readline()
+                        return b"".join(chunks)
+                    chunks.append(self.rfile.read(size))
+                    self.rfile.readline()
+
+            def do_POST(self):
+                parsed = urlparse(self.path)
+                if parsed.path != API_PREFIX + "/read/analyze":
+                    self._send_json(404, {"error": {"code": "NotFound", "message": parsed.path}})
+                    return
+
+                body = self._read_body()
+                if self.headers.get("Content-Type", "").startswith("application/json"):
+                    source = {"url": json.loads(body or b"{}").get("url")}
+                else:
+                    source = {"data": body}
+
+                query = parse_qs(parsed.query)
+                operation = server.create_operation(source, parse_pages((query.get("pages") or [None])[0]))
+                location = f"{server.endpoint}{API_PREFIX}/read/analyzeResults/{operation.operation_id}"
+                self._send_json(202, None, {"Operation-Location": location})
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                prefix = API_PREFIX + "/read/analyzeResults/"
+                operation = server.operations.get(parsed.path[len(prefix):]) if parsed.path.startswith(prefix) else None
+                if operation is None:
+                    self._send_json(404, {"error": {"code": "NotFound", "message": parsed.path}})
+                    return
+
+                body = server.operation_body(operation)
+                headers = {}
+                if body["status"] == "running" and server.retry_after is not None:
+                    headers["Retry-After"] = f"{server.retry_after:g}"
+                self._send_json(200, body, headers)
+
+        return Handler
@@ -0,0 +1,71 @@
+"""
+Fout- en latency injectie voor de lokale stand-in servers
+Per request bepaalt een FaultInjector of er vertraging, een foutstatus of
+een verbroken verbinding komt: eerst volgens een vast script (deterministische
+tests), daarna willekeurig volgens de ingestelde kansen (met seed).
+
+Gebruik:
+    faults = FaultInjector(script=[Fault(status=503), Fault(delay=1.0)])
+    faults = FaultInjector(error_rate=0.05, slow_rate=0.01, slow_latency=2.0, seed=42)
+"""
+
+import random
+import threading
+from typing import List, NamedTuple, Optional
+
+
+class Fault(NamedTuple):
+    """Wat er met één request gebeurt"""
+    delay: float = 0.0
+    status: Optional[int] = None
+    drop: bool = False
+    retry_after: Optional[float] = None
+
+
+NO_FAULT = Fault()
+
+
+class FaultInjector:
+    """
+    Bepaal per request de fout of vertraging
+
+    Args:
+        latency: Vaste extra vertraging per request (seconden)
+        error_rate: Kans op een foutstatus
+        error_status: Status bij een willekeurige fout
+        slow_rate: Kans op een trage request (staart latency)
+        slow_latency: Extra vertraging van een trage request
+        drop_rate: Kans dat de verbinding zonder response gesloten wordt
+        script: Faults voor de eerste requests, in volgorde
+        seed: Seed voor reproduceerbare willekeurige faults
+    """
+
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0, error_status: int = 503,
+                 slow_rate: float = 0.0, slow_latency: float = 1.0, drop_rate: float = 0.0,
+                 script: Optional[List[Fault]] = None, seed: Optional[int] = None):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.drop_rate = drop_rate
+        self.script = list(script or [])
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def next_fault(self) -> Fault:
+        with self._lock:
+            self.requests += 1
+            if self.script:
+                fault = self.script.pop(0)
+                return fault._replace(delay=fault.delay + self.latency)
+            roll = self._random.random()
+            delay = self.latency
+            if self._random.random() < self.slow_rate:
+                delay += self.slow_latency
+            if roll < self.drop_rate:
+                return Fault(delay=delay, drop=True)
+            if roll < self.drop_rate + self.error_rate:
+                return Fault(delay=delay, status=self.error_status)
+            return Fault(delay=delay)
@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""
+Lokale stand-in voor de Azure Function App
+Serveert dezelfde routes en JSON contracten als backend/azure_functions.py en
+draait daarvoor de echte Function code (PyPDF2, extract_structured_data,
+validate_and_enrich_data). Alleen de randen zijn vervangen:
+
+    Blob Storage     -> LocalBlobServiceClient (een directory)
+    Computer Vision  -> FakeComputerVisionServer, of een eigen cv_client
+    Storage Queues   -> in-process MemoryQueues met een worker per queue trigger
+
+De routes, methodes en queue bindings worden uit de FunctionApp zelf gelezen,
+zodat een nieuwe route zonder aanpassingen hier beschikbaar is. Latency en
+fouten per HTTP request komen uit een FaultInjector. Een StreamingHttpResponse
+(convert_pdf_batch) gaat chunked over de lijn, één chunk per regel.
+
+Gebruik:
+    python -m devserver.function_app --port 7071 --storage-dir /tmp/devstorage
+    python -m devserver.function_app --latency 0.05 --error-rate 0.01 --slow-rate 0.02 --seed 1
+
+    with FunctionAppServer(faults=FaultInjector(error_rate=0.1)) as server:
+        client = AzureFunctionsClient(server.url)
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Deque, Dict, Iterable, List, NamedTuple, Optional, Pattern, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if os.path.join(ROOT, "backend") not in sys.path:
+    sys.path.append(os.path.join(ROOT, "backend"))
+
+import azure.functions as func
+
+import azure_functions
+from job_pipeline import MAX_DEQUEUE_COUNT, MemoryQueue
+
+from devserver.fake_computer_vision import FakeComputerVisionServer, Responder, default_responder
+from devserver.faults import NO_FAULT, FaultInjector
+from devserver.local_blob_storage import LocalBlobServiceClient
+
+API_PREFIX = "/api/"
+
+# Aantal requests dat in het access log bewaard blijft
+ACCESS_LOG_SIZE = 10000
+
+
+class HttpRoute(NamedTuple):
+    """HTTP trigger uit de FunctionApp"""
+    name: str
+    pattern: Pattern[str]
+    methods: Optional[Tuple[str, ...]]
+    function: Callable[..., func.HttpResponse]
+    request_arg: str
+    outputs: Dict[str, str]
+
+
+class QueueHandler(NamedTuple):
+    """Queue trigger uit de FunctionApp"""
+    name: str
+    queue_name: str
+    function: Callable[..., None]
+    message_arg: str
+    outputs: Dict[str, str]
+
+
+class OutputBinding:
+    """Stand-in voor func.Out: bewaart het bericht voor de output queue"""
+
+    def __init__(self):
+        self.value: Optional[str] = None
+
+    def set(self, value: str) -> None:
+        self.value = value
+
+    def get(self) -> Optional[str]:
+        return self.value
+
+
+def route_pattern(route: str) -> Pattern[str]:
+    """Route template ("jobs/{job_id}") naar een regex met named groups"""
+    parts = re.split(r"\{([^}]+)\}", route)
+    regex = ""
+    for index, part in enumerate(parts):
+        if index % 2:
+            regex += f"(?P<{part.split(':')[0]}>[^/]+)"
+        else:
+            regex += re.escape(part)
+    return re.compile(f"^{regex}$")
+
+
+@lru_cache(maxsize=None)
+def app_functions(app: func.FunctionApp) -> tuple:
+    """Functions van de app; get_functions() mag maar één keer per app aangeroepen worden"""
+    return tuple(app.get_functions())
+
+
+def _queue_outputs(function) -> Dict[str, str]:
+    return {binding.name: binding.queue_name for binding in function.get_bindings()
+            if type(binding).__name__ == "QueueOutput"}
+
+
+def http_routes(app: func.FunctionApp) -> List[HttpRoute]:
+    """Alle HTTP triggers van de app, in registratievolgorde"""
+    routes = []
+    for function in app_functions(app):
+        trigger = function.get_trigger()
+        if type(trigger).__name__ != "HttpTrigger":
+            continue
+        route = trigger.route or function.get_function_name()
+        methods = tuple(str(method.value) for method in trigger.methods) if trigger.methods else None
+        routes.append(HttpRoute(
+            function.get_function_name(), route_pattern(route), methods,
+            function.get_user_function(), trigger.name, _queue_outputs(function)
+        ))
+    return routes
+
+
+def queue_handlers(app: func.FunctionApp) -> List[QueueHandler]:
+    """Alle queue triggers van de app"""
+    handlers = []
+    for function in app_functions(app):
+        trigger = function.get_trigger()
+        if type(trigger).__name__ != "QueueTrigger":
+            continue
+        handlers.append(QueueHandler(
+            function.get_function_name(), trigger.queue_name,
+            function.get_user_function(), trigger.name, _queue_outputs(function)
+        ))
+    return handlers
+
+
+class FunctionAppServer:
+    """
+    Threaded HTTP/1.1 server (keep-alive) voor de Function App routes
+
+    De server neemt de services van azure_functions in dit proces over
+    (blob_storage en computer_vision) en zet ze bij stop() terug.
+
+    Args:
+        host, port: Adres; port 0 kiest een vrije poort
+        storage_dir: Directory voor de blob containers (standaard een tijdelijke directory)
+        faults: Latency- en foutinjectie per HTTP request
+        cv_client: Eigen Computer Vision client; anders een FakeComputerVisionServer
+        cv_processing_seconds: Verwerkingstijd van de fake OCR per operatie
+        cv_responder: Tekstregels per pagina van de fake OCR
+        app: FunctionApp waarvan de routes geserveerd worden
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, storage_dir: Optional[str] = None,
+                 faults: Optional[FaultInjector] = None, cv_client: Any = None,
+                 cv_processing_seconds: float = 0.2, cv_responder: Responder = default_responder,
+                 app: func.FunctionApp = azure_functions.app):
+        self.storage_dir = storage_dir or tempfile.mkdtemp(prefix="devstorage-")
+        self.blob_service = LocalBlobServiceClient(self.storage_dir)
+        self.faults = faults
+        self.routes = http_routes(app)
+        self.queue_handlers = queue_handlers(app)
+        self.queues: Dict[str, MemoryQueue] = {}
+        for handler in self.queue_handlers:
+            self.queues[handler.queue_name] = MemoryQueue()
+        for route in self.routes:
+            for queue_name in route.outputs.values():
+                self.queues.setdefault(queue_name, MemoryQueue())
+        self.requests: Deque[Dict[str, Any]] = deque(maxlen=ACCESS_LOG_SIZE)
+
+        self.cv_server: Optional[FakeComputerVisionServer] = None
+        if cv_client is None:
+            self.cv_server = FakeComputerVisionServer(processing_seconds=cv_processing_seconds,
+                                                      responder=cv_responder)
+        self.cv_client = cv_client
+
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._threads: List[threading.Thread] = []
+        self._stopping = threading.Event()
+        self._previous_services: Optional[Dict[str, Any]] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _create_cv_client(self):
+        from azure.cognitiveservices.vision.computervision import ComputerVisionClient
+        from msrest.authentication import CognitiveServicesCredentials
+        return ComputerVisionClient(self.cv_server.endpoint, CognitiveServicesCredentials("devserver"))
+
+    def start(self) -> "FunctionAppServer":
+        if self.cv_server is not None:
+            self.cv_server.start()
+            self.cv_client = self._create_cv_client()
+
+        with azure_functions._services_lock:
+            self._previous_services = dict(azure_functions._services)
+            azure_functions._services.update(blob_storage=self.blob_service, computer_vision=self.cv_client)
+
+        self._stopping.clear()
+        for handler in self.queue_handlers:
+            thread = threading.Thread(target=self._consume, args=(handler,),
+                                      name=f"queue-{handler.queue_name}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        thread = threading.Thread(target=self._httpd.serve_forever, args=(0.1,), daemon=True)
+        thread.start()
+        self._threads.append(thread)
+        return self
+
+    def stop(self) -> None:
+        self._stopping.set()
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        azure_functions.flush_uploads(30)
+        if self.cv_server is not None:
+            self.cv_server.stop()
+        if self._previous_services is not None:
+            with azure_functions._services_lock:
+                azure_functions._services.clear()
+                azure_functions._services.update(self._previous_services)
+            self._previous_services = None
+
+    def serve_forever(self) -> None:
+        """Start de server en blokkeer tot Ctrl+C"""
+        self.start()
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def __enter__(self) -> "FunctionAppServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def queue_depths(self) -> Dict[str, int]:
+        return {name: len(queue) for name, queue in self.queues.items()}
+
+    def _forward(self, outputs: Dict[str, str], bindings: Dict[str, OutputBinding]) -> None:
+        """Berichten van de output bindings naar hun queues"""
+        for arg_name, queue_name in outputs.items():
+            value = bindings[arg_name].get()
+            if value:
+                self.queues[queue_name].send(json.loads(value))
+
+    def _consume(self, handler: QueueHandler) -> None:
+        queue = self.queues[handler.queue_name]
+        while not self._stopping.is_set():
+            message = queue.receive(timeout=0.1)
+            if message is None:
+                continue
+            bindings = {name: OutputBinding() for name in handler.outputs}
+            try:
+                handler.function(**{handler.message_arg: func.QueueMessage(body=json.dumps(message))}, **bindings)
+            except Exception as e:
+                # Opnieuw afleveren tot MAX_DEQUEUE_COUNT (de aflevering telt mee in het bericht);
+                # geen poison queue: daarna wordt het bericht gelogd en laten vallen
+                dequeue_count = message.get("dequeue_count", 1)
+                logging.error(f'Error in queue trigger {handler.name} (attempt {dequeue_count}): {str(e)}')
+                if dequeue_count < MAX_DEQUEUE_COUNT:
+                    queue.send(dict(message, dequeue_count=dequeue_count + 1))
+                continue
+            self._forward(handler.outputs, bindings)
+
+    def dispatch(self, method: str, path: str, headers: Dict[str, str], body: bytes) -> func.HttpResponse:
+        """Voer de Function van de route uit; 404/405 als er geen route is"""
+        parts = urlsplit(path)
+        if not parts.path.startswith(API_PREFIX):
+            return error_response("Route niet gevonden", 404)
+        route_path = parts.path[len(API_PREFIX):]
+
+        allowed = False
+        for route in self.routes:
+            match = route.pattern.match(route_path)
+            if match is None:
+                continue
+            if route.methods is not None and method not in route.methods:
+                allowed = True
+                continue
+            bindings = {name: OutputBinding() for name in route.outputs}
+            req = func.HttpRequest(
+                method, parts.path, headers=headers, params=dict(parse_qsl(parts.query)),
+                route_params=match.groupdict(), body=body
+            )
+            try:
+                response = route.function(**{route.request_arg: req}, **bindings)
+            except Exception as e:
+                logging.error(f'Error in route {route.name}: {str(e)}')
+                return error_response(str(e), 500)
+            self._forward(route.outputs, bindings)
+            return response
+
+        if allowed:
+            return error_response("Methode niet toegestaan", 405)
+        return error_response("Route niet gevonden", 404)
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _read_body(self) -> bytes:
+                if "chunked" not in self.headers.get("Transfer-Encoding", "").lower():
+                    return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                chunks = []
+                while True:
+                    size = int(self.rfile.readline().split(b";")[0].strip() or b"0", 16)
+                    if size == 0:
+                        self.rfile.readline()
+                        return b"".join(chunks)
+                    chunks.append(self.rfile.read(size))
+                    self.rfile.readline()
+
+            def _send(self, status: int, payload: bytes, headers: Dict[str, str]) -> None:
+                self.send_response(status)
+                for name, value in headers.items():
+                    if name.lower() not in ("content-length", "content-type"):
+                        self.send_header(name, value)
+                self.send_header("Content-Type", headers.get("Content-Type", "application/json"))
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _stream(self, status: int, chunks: Iterable[bytes], headers: Dict[str, str]) -> None:
+                """Chunked response: elke chunk (bij NDJSON een regel) direct naar de client"""
+                self.send_response(status)
+                for name, value in headers.items():
+                    if name.lower() not in ("content-length", "content-type", "transfer-encoding"):
+                        self.send_header(name, value)
+                self.send_header("Content-Type", headers.get("Content-Type", "application/json"))
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for chunk in chunks:
+                    if chunk:
+                        self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                        self.wfile.flush()
+                self.wfile.write(b"0\r\n\r\n")
+                self.wfile.flush()
+
+            def _handle(self):
+                start = time.perf_counter()
+                body = self._read_body()
+                fault = server.faults.next_fault() if server.faults is not None else NO_FAULT
+                if fault.delay:
+                    time.sleep(fault.delay)
+
+                entry = {
+                    "method": self.command,
+                    "route": urlsplit(self.path).path[len(API_PREFIX):],
+                    "port": self.client_address[1],
+                    "headers": dict(self.headers),
+                    "size": len(body),
+                    "fault": fault,
+                }
+                if fault.drop:
+                    entry.update(status=None, seconds=round(time.perf_counter() - start, 4))
+                    server.requests.append(entry)
+                    self.close_connection = True
+                    return
+
+                if fault.status is not None:
+                    response = error_response("Geïnjecteerde fout", fault.status)
+                    if fault.retry_after is not None:
+                        response.headers["Retry-After"] = f"{fault.retry_after:g}"
+                else:
+                    response = server.dispatch(self.command, self.path, dict(self.headers), body)
+
+                # Loggen voor het versturen: de client kan het log lezen zodra hij de response heeft
+                entry.update(status=response.status_code, seconds=round(time.perf_counter() - start, 4))
+                server.requests.append(entry)
+                headers = dict(response.headers)
+                headers["Content-Type"] = response.mimetype or "text/plain"
+                if hasattr(response, "iter_body"):
+                    self._stream(response.status_code, response.iter_body(), headers)
+                else:
+                    self._send(response.status_code, response.get_body(), headers)
+
+            do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+        return Handler
+
+
+def error_response(message: str, status_code: int) -> func.HttpResponse:
+    return func.HttpResponse(
+        json.dumps({"error": message}),
+        status_code=status_code,
+        mimetype="application/json"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Lokale stand-in voor de Azure Function App")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7071)
+    parser.add_argument("--storage-dir", help="Directory voor de blob containers (standaard tijdelijk)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Extra vertraging per request (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Kans op een foutstatus")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="Kans op een trage request")
+    parser.add_argument("--slow-latency", type=float, default=1.0, help="Vertraging van een trage request (s)")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="Kans op een verbroken verbinding")
+    parser.add_argument("--cv-seconds", type=float, default=0.2, help="Verwerkingstijd van de fake OCR (s)")
+    parser.add_argument("--seed", type=int, help="Seed voor reproduceerbare faults")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    faults = FaultInjector(
+        latency=args.latency, error_rate=args.error_rate, error_status=args.error_status,
+        slow_rate=args.slow_rate, slow_latency=args.slow_latency, drop_rate=args.drop_rate, seed=args.seed
+    )
+    server = FunctionAppServer(args.host, args.port, storage_dir=args.storage_dir, faults=faults,
+                               cv_processing_seconds=args.cv_seconds)
+    print(f"Function App stand-in op {server.url}{API_PREFIX} (blobs in {server.storage_dir})")
+    print(f"Gebruik: AZURE_FUNCTION_URL={server.url} USE_MOCK_AZURE=false streamlit run app.py")
+    server.serve_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,225 @@
+"""
+Lokale stand-in voor Azure Blob Storage
+Implementeert het deel van BlobServiceClient/ContainerClient/BlobClient dat de
+Function App gebruikt, met één bestand per blob onder een directory
+(<root>/<container>/<blob naam>). Blob namen met "/" worden subdirectories.
+Blob metadata staat in een <blob naam>.metadata.json bestand ernaast.
+
+Gebruik:
+    service = LocalBlobServiceClient("/tmp/devstorage")
+    container = service.get_container_client("documents")
+    container.upload_blob("temp/a.pdf", b"%PDF", overwrite=True)
+"""
+
+import json
+import os
+import shutil
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
+
+DEFAULT_PAGE_SIZE = 5000
+
+TEMP_SUFFIX = ".uploading"
+METADATA_SUFFIX = ".metadata.json"
+
+
+class LocalBlobProperties(NamedTuple):
+    name: str
+    size: int
+    last_modified: datetime
+    metadata: Dict[str, str] = {}
+
+
+class LocalBatchResponse(NamedTuple):
+    """Sub-response van een delete_blobs batch"""
+    status_code: int
+
+
+class LocalDownload:
+    def __init__(self, path: str):
+        self.path = path
+
+    def readall(self) -> bytes:
+        with open(self.path, "rb") as handle:
+            return handle.read()
+
+
+class LocalBlobPages:
+    """Pagina's van een listing; continuation_token is de naam van de eerste blob van de volgende pagina"""
+
+    def __init__(self, container: "LocalContainerClient", prefix: str, page_size: int,
+                 continuation_token: Optional[str]):
+        self.container = container
+        self.prefix = prefix
+        self.page_size = page_size
+        self.continuation_token = continuation_token
+        self._done = False
+
+    def __iter__(self) -> "LocalBlobPages":
+        return self
+
+    def __next__(self) -> Iterator[LocalBlobProperties]:
+        if self._done:
+            raise StopIteration
+        names = [name for name in self.container.blob_names(self.prefix)
+                 if self.continuation_token is None or name >= self.continuation_token]
+        page = names[:self.page_size]
+        self.continuation_token = names[self.page_size] if len(names) > self.page_size else None
+        self._done = self.continuation_token is None
+        return iter([properties for properties in map(self.container.get_properties, page) if properties])
+
+
+class LocalBlobListing:
+    """Resultaat van list_blobs: itereerbaar, of per pagina via by_page"""
+
+    def __init__(self, container: "LocalContainerClient", prefix: str, page_size: int):
+        self.container = container
+        self.prefix = prefix
+        self.page_size = page_size
+
+    def by_page(self, continuation_token: Optional[str] = None) -> LocalBlobPages:
+        return LocalBlobPages(self.container, self.prefix, self.page_size, continuation_token)
+
+    def __iter__(self) -> Iterator[LocalBlobProperties]:
+        for page in self.by_page():
+            yield from page
+
+
+class LocalContainerClient:
+    """ContainerClient op een directory"""
+
+    def __init__(self, directory: str, container_name: str):
+        self.directory = directory
+        self.container_name = container_name
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, name: str) -> str:
+        path = os.path.normpath(os.path.join(self.directory, *name.split("/")))
+        if not path.startswith(os.path.normpath(self.directory) + os.sep):
+            raise ValueError(f"Ongeldige blob naam: {name}")
+        return path
+
+    def blob_names(self, prefix: str = "") -> List[str]:
+        names = []
+        for folder, _, files in os.walk(self.directory):
+            for filename in files:
+                if filename.endswith((TEMP_SUFFIX, METADATA_SUFFIX)):
+                    continue
+                relative = os.path.relpath(os.path.join(folder, filename), self.directory)
+                name = relative.replace(os.sep, "/")
+                if name.startswith(prefix):
+                    names.append(name)
+        return sorted(names)
+
+    def get_properties(self, name: str) -> Optional[LocalBlobProperties]:
+        path = self._path(name)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        metadata = {}
+        if os.path.exists(path + METADATA_SUFFIX):
+            with open(path + METADATA_SUFFIX) as handle:
+                metadata = json.load(handle)
+        return LocalBlobProperties(name, stat.st_size, datetime.fromtimestamp(stat.st_mtime, timezone.utc), metadata)
+
+    def upload_blob(self, name: str, data: Any, overwrite: bool = False,
+                    length: Optional[int] = None, metadata: Optional[Dict[str, str]] = None, **kwargs) -> dict:
+        path = self._path(name)
+        if not overwrite and os.path.exists(path):
+            raise ResourceExistsError(f"Blob bestaat al: {name}")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = path + TEMP_SUFFIX
+        with open(temp_path, "wb") as handle:
+            if isinstance(data, str):
+                handle.write(data.encode("utf-8"))
+            elif hasattr(data, "read"):
+                shutil.copyfileobj(data, handle)
+            else:
+                handle.write(data)
+        os.replace(temp_path, path)
+        if metadata:
+            with open(path + METADATA_SUFFIX, "w") as handle:
+                json.dump(metadata, handle)
+        elif os.path.exists(path + METADATA_SUFFIX):
+            os.remove(path + METADATA_SUFFIX)
+        return {"name": name}
+
+    def download_blob(self, name: str, **kwargs) -> LocalDownload:
+        path = self._path(name)
+        if not os.path.exists(path):
+            raise ResourceNotFoundError(f"Blob niet gevonden: {name}")
+        return LocalDownload(path)
+
+    def delete_blob(self, name: str, **kwargs) -> None:
+        path = self._path(name)
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            raise ResourceNotFoundError(f"Blob niet gevonden: {name}")
+        if os.path.exists(path + METADATA_SUFFIX):
+            os.remove(path + METADATA_SUFFIX)
+
+    def delete_blobs(self, *names: str, raise_on_any_failure: bool = True, **kwargs) -> List[LocalBatchResponse]:
+        responses = []
+        for name in names:
+            try:
+                self.delete_blob(name)
+                responses.append(LocalBatchResponse(202))
+            except ResourceNotFoundError:
+                if raise_on_any_failure:
+                    raise
+                responses.append(LocalBatchResponse(404))
+        return responses
+
+    def list_blobs(self, name_starts_with: Optional[str] = None,
+                   results_per_page: Optional[int] = None, **kwargs) -> LocalBlobListing:
+        return LocalBlobListing(self, name_starts_with or "", results_per_page or DEFAULT_PAGE_SIZE)
+
+    def get_blob_client(self, blob: str) -> "LocalBlobClient":
+        return LocalBlobClient(self, blob)
+
+
+class LocalBlobClient:
+    """BlobClient voor één blob in een LocalContainerClient"""
+
+    def __init__(self, container: LocalContainerClient, blob_name: str):
+        self.container = container
+        self.blob_name = blob_name
+
+    @property
+    def url(self) -> str:
+        return "file://" + self.container._path(self.blob_name)
+
+    def upload_blob(self, data: Any, overwrite: bool = False, length: Optional[int] = None,
+                    metadata: Optional[Dict[str, str]] = None, **kwargs) -> dict:
+        return self.container.upload_blob(self.blob_name, data, overwrite=overwrite, length=length,
+                                          metadata=metadata)
+
+    def get_blob_properties(self, **kwargs) -> LocalBlobProperties:
+        properties = self.container.get_properties(self.blob_name)
+        if properties is None:
+            raise ResourceNotFoundError(f"Blob niet gevonden: {self.blob_name}")
+        return properties
+
+    def download_blob(self, **kwargs) -> LocalDownload:
+        return self.container.download_blob(self.blob_name)
+
+    def delete_blob(self, **kwargs) -> None:
+        self.container.delete_blob(self.blob_name)
+
+
+class LocalBlobServiceClient:
+    """BlobServiceClient met één subdirectory per container"""
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def get_container_client(self, container: str) -> LocalContainerClient:
+        return LocalContainerClient(os.path.join(self.root, container), container)
+
+    def get_blob_client(self, container: str, blob: str) -> LocalBlobClient:
+        return self.get_container_client(container).get_blob_client(blob)
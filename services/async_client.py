@@ -0,0 +1,145 @@
+"""
+Asyncio variant van de Azure services client
+De calls zelf zijn I/O wachttijd (HTTP of gesimuleerde delays); ze draaien in
+een eigen thread pool zodat één event loop veel documenten tegelijk kan
+verwerken. Een semaphore begrenst het aantal gelijktijdige calls.
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from services.azure_client import AzureServicesClient, config, get_azure_client
+
+
+class AsyncAzureServicesClient:
+    """
+    Async client bovenop een AzureServicesClient (mock of AzureFunctionsClient)
+
+    Args:
+        client: Onderliggende client; standaard get_azure_client()
+        max_concurrency: Maximaal aantal gelijktijdige calls naar de services
+    """
+
+    def __init__(self, client: Optional[AzureServicesClient] = None,
+                 max_concurrency: Optional[int] = None):
+        self.client = client or get_azure_client()
+        self.max_concurrency = max_concurrency or getattr(config, "HTTP_POOL_SIZE", 10)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                            thread_name_prefix="azure-client")
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _limit(self) -> asyncio.Semaphore:
+        # Een semaphore hoort bij één event loop (asyncio.run maakt telkens een nieuwe)
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._semaphore
+
+    async def _call(self, method: Callable[..., Dict[str, Any]], *args, **kwargs) -> Dict[str, Any]:
+        async with self._limit():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, lambda: method(*args, **kwargs))
+
+    async def convert_pdf_to_text(self, file_content: bytes, filename: str) -> Dict[str, Any]:
+        return await self._call(self.client.convert_pdf_to_text, file_content, filename)
+
+    async def extract_purchase_order_data(self, text: str) -> Dict[str, Any]:
+        return await self._call(self.client.extract_purchase_order_data, text)
+
+    async def save_processed_document(self, document_data: Dict[str, Any]) -> Dict[str, Any]:
+        return await self._call(self.client.save_processed_document, document_data)
+
+    async def get_document_status(self, document_id: str) -> Dict[str, Any]:
+        return await self._call(self.client.get_document_status, document_id)
+
+    async def process_document(self, file_content: bytes, filename: str,
+                               include_text: bool = False) -> Dict[str, Any]:
+        return await self._call(self.client.process_document, file_content, filename, include_text)
+
+    async def _process_one(self, index: int, file_content: bytes, filename: str) -> Dict[str, Any]:
+        """Convert → extract → save voor één document, met timings per stap"""
+        result: Dict[str, Any] = {"index": index, "filename": filename, "timings": {}}
+
+        async def stage(name: str, call: Awaitable[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+            start = time.perf_counter()
+            outcome = await call
+            result["timings"][name] = round(time.perf_counter() - start, 4)
+            if not outcome.get("success"):
+                result.update(success=False, failed_stage=name, error=outcome.get("error"))
+                return None
+            return outcome
+
+        conversion = await stage("convert", self.convert_pdf_to_text(file_content, filename))
+        if conversion is None:
+            return result
+        extraction = await stage("extract", self.extract_purchase_order_data(conversion["text"]))
+        if extraction is None:
+            return result
+        saved = await stage("save", self.save_processed_document(extraction["extracted_data"]))
+        if saved is None:
+            return result
+
+        result.update(
+            success=True,
+            text_blob_url=conversion.get("blob_url"),
+            extracted_data=extraction["extracted_data"],
+            confidence_score=extraction.get("confidence_score"),
+            blob_url=saved["blob_url"]
+        )
+        return result
+
+    async def process_many(self, documents: List[Tuple[bytes, str]],
+                           on_result: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
+        """
+        Verwerk meerdere PDFs met de stappen gepipelined over de documenten
+
+        Elk document doorloopt convert → extract → save; terwijl het ene
+        document geëxtraheerd wordt, wordt het volgende al geconverteerd.
+        Er zijn maximaal max_concurrency documenten tegelijk onderweg, zodat
+        de eerste documenten klaar zijn voordat de laatste aan de beurt zijn.
+
+        Args:
+            documents: Lijst met (bestand als bytes, bestandsnaam)
+            on_result: Optionele callback per document zodra het klaar is
+
+        Returns:
+            Resultaten in de volgorde van documents, met "index", "filename" en "timings"
+        """
+        logging.info(f"Processing {len(documents)} documents with concurrency {self.max_concurrency}")
+
+        in_flight = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(index: int, file_content: bytes, filename: str) -> Dict[str, Any]:
+            try:
+                async with in_flight:
+                    result = await self._process_one(index, file_content, filename)
+            except Exception as e:
+                logging.error(f"Error processing {filename}: {str(e)}")
+                result = {"index": index, "filename": filename, "success": False, "error": str(e)}
+            if on_result is not None:
+                on_result(result)
+            return result
+
+        return list(await asyncio.gather(*(
+            run(index, file_content, filename) for index, (file_content, filename) in enumerate(documents)
+        )))
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    async def __aenter__(self) -> "AsyncAzureServicesClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+
+def get_async_azure_client(use_mock: Optional[bool] = None,
+                           max_concurrency: Optional[int] = None) -> AsyncAzureServicesClient:
+    """Async client bovenop get_azure_client(use_mock)"""
+    return AsyncAzureServicesClient(get_azure_client(use_mock), max_concurrency=max_concurrency)
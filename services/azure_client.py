@@ -6,8 +6,19 @@ In productie zou dit echte Azure SDK calls maken
 import time
 import json
 import requests
-from typing import Dict, List, Any, Optional
+from functools import wraps
+from typing import Callable, Dict, Iterator, List, Any, Optional, Tuple
 import logging
+
+from backend.batch_conversion import iter_completed, read_batch_documents
+from backend.conversion_cache import ConversionCache, MemoryCacheStore, content_hash
+from backend.job_pipeline import JobPipeline, LocalPipelineRunner, MemoryPayloadStore
+from backend.metrics import REGISTRY
+from backend.tracing import TRACES, merge_traces, start_span, to_chrome_trace
+from services.http_transport import FunctionHttpTransport, get_transport
+from services.latency import Clock, FixedLatency, LatencyModel, SystemClock, latency_model
+from services.resilience import ResilientCaller, RetryPolicy
+
 try:
     from config import config
 except Exception:
@@ -15,12 +26,75 @@ except Exception:
         USE_MOCK_AZURE = True
         AZURE_FUNCTION_URL = None
         AZURE_STORAGE_ACCOUNT = None
+        CONVERSION_CACHE_TTL = 7 * 24 * 3600
+        CONVERSION_CACHE_MAX_ENTRIES = 256
+        JOB_STORE_MAX_ENTRIES = 1000
+        AZURE_FUNCTION_KEY = None
+        HTTP_POOL_SIZE = 10
+        HTTP_TIMEOUT = 120
+        HTTP_GZIP_MIN_BYTES = 1024
+        HTTP_MAX_ATTEMPTS = 3
+        HTTP_BACKOFF_BASE = 0.2
+        HTTP_BACKOFF_MAX = 5.0
+        HTTP_HEDGING = False
+        CIRCUIT_FAILURE_THRESHOLD = 5
+        CIRCUIT_RESET_SECONDS = 30
+        MOCK_LATENCY = "fixed"
+        MOCK_LATENCY_SAMPLES = None
+        MOCK_LATENCY_SEED = None
     config = _Fallback()
 
+# Client metrics in de registry van dit proces (start_metrics_server of METRICS_PORT in de app)
+CLIENT_REQUESTS = REGISTRY.counter(
+    "dataextractor_client_requests_total", "Client calls per operatie en status", ("operation", "status")
+)
+CLIENT_SECONDS = REGISTRY.histogram(
+    "dataextractor_client_request_seconds", "Duur van client calls (seconden)", ("operation",)
+)
+CLIENT_CACHE_LOOKUPS = REGISTRY.counter(
+    "dataextractor_client_cache_lookups_total", "Lookups in de conversie cache van de client", ("result",)
+)
+CLIENT_BLOB_BYTES = REGISTRY.counter(
+    "dataextractor_client_blob_bytes_written_total", "Door de client opgeslagen document bytes"
+)
+
+def observed(operation: str) -> Callable:
+    """
+    Tel client calls (status uit result["success"]), meet hun duur en draai ze als span
+    
+    De span hangt onder de actieve trace (bijvoorbeeld die van de upload in de app);
+    het resultaat krijgt het trace_id mee.
+    """
+    def decorator(method: Callable[..., Dict[str, Any]]) -> Callable[..., Dict[str, Any]]:
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            status = "error"
+            try:
+                with start_span(operation, service="client") as span:
+                    result = method(*args, **kwargs)
+                    span.attributes["success"] = bool(result.get("success"))
+                if result.get("success"):
+                    status = "ok"
+                result.setdefault("trace_id", span.trace_id)
+                return result
+            finally:
+                CLIENT_SECONDS.observe(time.perf_counter() - start, operation=operation)
+                CLIENT_REQUESTS.inc(operation=operation, status=status)
+        return wrapper
+    return decorator
+
 class AzureServicesClient:
-    """Mock client voor Azure services communicatie"""
+    """
+    Mock client voor Azure services communicatie
+    
+    De vertraging van de mock stappen komt uit latency (standaard vast 1s/2s/1s)
+    en wordt gewacht via clock; met een VirtualClock draaien tests direct.
+    """
     
-    def __init__(self, function_app_url: Optional[str] = None, storage_account: Optional[str] = None):
+    def __init__(self, function_app_url: Optional[str] = None, storage_account: Optional[str] = None,
+                 conversion_cache: Optional[ConversionCache] = None,
+                 latency: Optional[LatencyModel] = None, clock: Optional[Clock] = None):
         self.function_app_url = (
             function_app_url or config.AZURE_FUNCTION_URL or "https://your-function-app.azurewebsites.net"
         )
@@ -28,7 +102,23 @@ class AzureServicesClient:
             storage_account or config.AZURE_STORAGE_ACCOUNT or "yourstorageaccount"
         )
         self.api_key = "mock_api_key"  # In productie uit Key Vault
+        # Dezelfde PDF bytes worden maar één keer geconverteerd
+        self.conversion_cache = conversion_cache or ConversionCache(
+            MemoryCacheStore(max_entries=config.CONVERSION_CACHE_MAX_ENTRIES),
+            ttl_seconds=config.CONVERSION_CACHE_TTL
+        )
+        # In-process job pipeline (stand-in voor de queues van de Function App)
+        self._job_runner: Optional[LocalPipelineRunner] = None
+        self.latency = latency or FixedLatency()
+        self.clock = clock or SystemClock()
+    
+    def _simulate(self, operation: str, size: int = 0) -> None:
+        """Wacht de gesimuleerde API vertraging van de mock stap"""
+        delay = self.latency.delay(operation, size)
+        if delay > 0:
+            self.clock.sleep(delay)
         
+    @observed("convert")
     def convert_pdf_to_text(self, file_content: bytes, filename: str) -> Dict[str, Any]:
         """
         Convert PDF naar tekst via Azure Function
@@ -41,25 +131,21 @@ class AzureServicesClient:
             Dict met resultaat van conversie
         """
         try:
-            # Mock implementatie - in productie zou dit een echte HTTP call zijn
-            logging.info(f"Converting PDF to text: {filename}")
-            
-            # Simuleer API call delay
-            time.sleep(1)
+            start = time.perf_counter()
+            cache_key = content_hash(file_content)
+            cached = self.conversion_cache.get(cache_key)
+            CLIENT_CACHE_LOOKUPS.inc(result="hit" if cached is not None else "miss")
+            if cached is not None:
+                logging.info(f"PDF conversion served from cache: {filename}")
+                return dict(cached, processing_time=round(time.perf_counter() - start, 4),
+                            cache={"hit": True, "key": cache_key})
             
-            # Mock response gebaseerd op filename
-            if "sample" in filename.lower():
-                mock_text = self._get_sample_pdf_text()
-            else:
-                mock_text = self._generate_mock_text(filename)
-            
-            return {
-                "success": True,
-                "text": mock_text,
-                "blob_url": f"https://{self.storage_account}.blob.core.windows.net/documents/extracted_text/{filename}_{int(time.time())}.txt",
-                "processing_time": time.time(),
-                "confidence": 0.95
-            }
+            logging.info(f"Converting PDF to text: {filename}")
+            result = self._convert_document(file_content, filename)
+            # Gedegradeerde resultaten (OCR storing in de Function App) niet cachen
+            if result.get("success") and not result.get("degraded"):
+                self.conversion_cache.put(cache_key, result)
+            return dict(result, cache={"hit": False, "key": cache_key})
             
         except Exception as e:
             logging.error(f"Error in PDF conversion: {str(e)}")
@@ -68,6 +154,51 @@ class AzureServicesClient:
                 "error": str(e)
             }
     
+    def _convert_document(self, file_content: bytes, filename: str) -> Dict[str, Any]:
+        """Mock conversie; AzureFunctionsClient roept hier de Function aan"""
+        start = self.clock.now()
+        # Simuleer API call delay
+        self._simulate("convert", len(file_content))
+        
+        # Mock response gebaseerd op filename
+        if "sample" in filename.lower():
+            mock_text = self._get_sample_pdf_text()
+        else:
+            mock_text = self._generate_mock_text(filename)
+        
+        return {
+            "success": True,
+            "text": mock_text,
+            "blob_url": f"https://{self.storage_account}.blob.core.windows.net/documents/extracted_text/{filename}_{int(time.time())}.txt",
+            "processing_time": round(self.clock.now() - start, 4),
+            "confidence": 0.95
+        }
+    
+    def convert_pdf_batch(self, documents: List[Tuple[bytes, str]], max_workers: int = 4,
+                          max_documents: int = 500,
+                          max_total_bytes: int = 200 * 1024 * 1024) -> Iterator[Dict[str, Any]]:
+        """
+        Converteer meerdere PDFs (of ZIP archieven met PDFs) parallel
+        
+        Args:
+            documents: Lijst met (bestand als bytes, bestandsnaam)
+            max_workers: Aantal gelijktijdige conversies
+            max_documents: Maximaal aantal PDFs in de batch
+            max_total_bytes: Maximale totale grootte van de batch
+            
+        Returns:
+            Iterator die per document een resultaat geeft zodra het klaar is,
+            met "index" (positie in de batch) en "filename"
+        """
+        pdfs = read_batch_documents(
+            [(filename, content) for content, filename in documents],
+            max_documents,
+            max_total_bytes
+        )
+        logging.info(f"Converting PDF batch: {len(pdfs)} documents")
+        return iter_completed(pdfs, self.convert_pdf_to_text, max_workers)
+    
+    @observed("extract")
     def extract_purchase_order_data(self, text: str) -> Dict[str, Any]:
         """
         Extraheer gestructureerde data uit tekst via Azure Function
@@ -82,7 +213,7 @@ class AzureServicesClient:
             logging.info("Extracting structured data from text")
             
             # Simuleer API call delay
-            time.sleep(2)
+            self._simulate("extract", len(text.encode("utf-8")))
             
             # Mock extractie gebaseerd op tekst content
             extracted_data = self._extract_mock_data(text)
@@ -101,6 +232,62 @@ class AzureServicesClient:
                 "error": str(e)
             }
     
+    @observed("process")
+    def process_document(self, file_content: bytes, filename: str,
+                         include_text: bool = False) -> Dict[str, Any]:
+        """
+        Converteer en extraheer een PDF in één Azure Function call (process_document)
+        
+        Args:
+            file_content: PDF bestand als bytes
+            filename: Naam van het bestand
+            include_text: Ook de geconverteerde tekst teruggeven
+            
+        Returns:
+            Dict met geëxtraheerde data, blob URLs en timings per stap
+        """
+        try:
+            logging.info(f"Processing document: {filename}")
+            timings: Dict[str, float] = {}
+            
+            start = time.perf_counter()
+            conversion = self.convert_pdf_to_text(file_content, filename)
+            timings["convert"] = round(time.perf_counter() - start, 4)
+            if not conversion["success"]:
+                return conversion
+            
+            # Geen tweede API call: de extractie draait in dezelfde invocatie
+            start = time.perf_counter()
+            extracted_data = self._extract_mock_data(conversion["text"])
+            timings["extract"] = round(time.perf_counter() - start, 4)
+            
+            start = time.perf_counter()
+            confidence_score = self._calculate_mock_confidence(extracted_data)
+            timings["validate"] = round(time.perf_counter() - start, 4)
+            timings["total"] = round(sum(timings.values()), 4)
+            
+            result = {
+                "success": True,
+                "filename": filename,
+                "text_blob_url": conversion["blob_url"],
+                "extracted_data": extracted_data,
+                "blob_url": f"https://{self.storage_account}.blob.core.windows.net/documents/extracted_data/order_{int(time.time())}.json",
+                "confidence_score": confidence_score,
+                "cache": conversion["cache"],
+                "timings": timings
+            }
+            if include_text:
+                result["text"] = conversion["text"]
+            return result
+            
+        except Exception as e:
+            logging.error(f"Error in document processing: {str(e)}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    @observed("save")
     def save_processed_document(self, document_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Sla verwerkt document op in Azure Blob Storage
@@ -114,16 +301,19 @@ class AzureServicesClient:
         try:
             logging.info("Saving processed document to blob storage")
             
+            size_bytes = len(json.dumps(document_data))
+            
             # Simuleer opslag delay
-            time.sleep(1)
+            self._simulate("save", size_bytes)
             
             blob_name = f"processed_orders/{document_data.get('order_number', 'unknown')}_{int(time.time())}.json"
+            CLIENT_BLOB_BYTES.inc(size_bytes)
             
             return {
                 "success": True,
                 "blob_name": blob_name,
                 "blob_url": f"https://{self.storage_account}.blob.core.windows.net/documents/{blob_name}",
-                "size_bytes": len(json.dumps(document_data))
+                "size_bytes": size_bytes
             }
             
         except Exception as e:
@@ -133,34 +323,100 @@ class AzureServicesClient:
                 "error": str(e)
             }
     
+    def export_trace(self, trace_id: str, chrome: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Trace JSON van één document: de spans van dit proces
+        
+        Args:
+            trace_id: Trace ID (resultaat["trace_id"] of de Trace ID in de app)
+            chrome: Chrome trace events (chrome://tracing, Perfetto) in plaats van het eigen formaat
+        """
+        trace = merge_traces(TRACES.export(trace_id), *self._remote_traces(trace_id))
+        if trace is not None and chrome:
+            return to_chrome_trace(trace)
+        return trace
+    
+    def _remote_traces(self, trace_id: str) -> List[Dict[str, Any]]:
+        """Spans van dezelfde trace buiten dit proces (de mock heeft er geen)"""
+        return []
+    
+    @property
+    def job_runner(self) -> LocalPipelineRunner:
+        """Job pipeline met dezelfde stappen als de Function App, met de mock stappen"""
+        if self._job_runner is None:
+            pipeline = JobPipeline(
+                MemoryCacheStore(max_entries=config.JOB_STORE_MAX_ENTRIES),
+                MemoryPayloadStore(),
+                convert=lambda content, filename: self.convert_pdf_to_text(content, filename),
+                extract=self.extract_purchase_order_data,
+                validate=self._validate_mock_data
+            )
+            self._job_runner = LocalPipelineRunner(pipeline).start()
+        return self._job_runner
+    
+    def submit_document(self, file_content: bytes, filename: str) -> Dict[str, Any]:
+        """
+        Dien een PDF in voor asynchrone verwerking (convert → extract → validate)
+        
+        Args:
+            file_content: PDF bestand als bytes
+            filename: Naam van het bestand
+            
+        Returns:
+            Dict met document_id; de voortgang is op te vragen met get_document_status
+        """
+        try:
+            job = self.job_runner.submit(file_content, filename)
+            return {
+                "success": True,
+                "document_id": job["job_id"],
+                "status": job["status"]
+            }
+            
+        except Exception as e:
+            logging.error(f"Error submitting document: {str(e)}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    def wait_for_document(self, document_id: str, timeout: float = 60.0,
+                          poll_interval: float = 0.05) -> Dict[str, Any]:
+        """Wacht tot een ingediend document klaar of mislukt is en geef de status terug"""
+        self.job_runner.wait(document_id, timeout=timeout, poll_interval=poll_interval)
+        return self.get_document_status(document_id)
+    
     def get_document_status(self, document_id: str) -> Dict[str, Any]:
         """
         Krijg status van document verwerking
         
         Args:
-            document_id: Unieke document identifier
+            document_id: Job ID uit submit_document
             
         Returns:
-            Dict met document status
+            Dict met document status, stappen en (zodra klaar) het resultaat
         """
         try:
-            # Mock status gebaseerd op document_id
-            if document_id.startswith("APO"):
-                status = "completed" if int(document_id[-1]) % 2 == 0 else "processing"
-            else:
-                status = "pending"
+            job = self._job_runner.pipeline.status(document_id) if self._job_runner else None
+            if job is None:
+                return {
+                    "success": False,
+                    "document_id": document_id,
+                    "status": "not_found",
+                    "error": "Document niet gevonden"
+                }
             
             return {
+                "success": True,
                 "document_id": document_id,
-                "status": status,
-                "created_at": time.time() - 3600,  # 1 uur geleden
-                "updated_at": time.time(),
-                "processing_steps": {
-                    "upload": "completed",
-                    "convert": "completed" if status != "pending" else "pending",
-                    "extract": "completed" if status == "completed" else "pending",
-                    "validate": "completed" if status == "completed" else "pending"
-                }
+                "filename": job["filename"],
+                "status": job["status"],
+                "created_at": job["created_at"],
+                "updated_at": job["updated_at"],
+                "processing_steps": job["processing_steps"],
+                "timings": job["timings"],
+                "result": job["result"],
+                "error": job["error"]
             }
             
         except Exception as e:
@@ -170,6 +426,17 @@ class AzureServicesClient:
                 "error": str(e)
             }
     
+    def _validate_mock_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate stap van de job pipeline: confidence en opslag van het resultaat"""
+        saved = self.save_processed_document(data)
+        if not saved["success"]:
+            raise RuntimeError(saved["error"])
+        return {
+            "extracted_data": data,
+            "blob_url": saved["blob_url"],
+            "confidence_score": self._calculate_mock_confidence(data)
+        }
+    
     def _get_sample_pdf_text(self) -> str:
         """Geef sample PDF tekst terug voor demo"""
         return """
@@ -319,6 +586,156 @@ Postbus 12345
             
         return round(score, 2)
 
+class AzureFunctionsClient(AzureServicesClient):
+    """
+    Client die de Azure Function routes echt aanroept via een gedeelde, gepoolde HTTP sessie
+    
+    save_processed_document heeft (nog) geen Function route en blijft de mock gebruiken;
+    latency en clock gelden daarom ook hier voor die mock stap. wait_for_document
+    pollt via dezelfde clock.
+    """
+    
+    def __init__(self, function_app_url: Optional[str] = None, storage_account: Optional[str] = None,
+                 conversion_cache: Optional[ConversionCache] = None,
+                 transport: Optional[FunctionHttpTransport] = None,
+                 latency: Optional[LatencyModel] = None, clock: Optional[Clock] = None):
+        super().__init__(function_app_url, storage_account, conversion_cache, latency, clock)
+        self.transport = transport or get_transport(
+            self.function_app_url,
+            function_key=getattr(config, "AZURE_FUNCTION_KEY", None),
+            pool_size=getattr(config, "HTTP_POOL_SIZE", 10),
+            timeout=getattr(config, "HTTP_TIMEOUT", 120),
+            gzip_min_bytes=getattr(config, "HTTP_GZIP_MIN_BYTES", 1024),
+            resilience=ResilientCaller(
+                RetryPolicy(
+                    max_attempts=getattr(config, "HTTP_MAX_ATTEMPTS", 3),
+                    base_delay=getattr(config, "HTTP_BACKOFF_BASE", 0.2),
+                    max_delay=getattr(config, "HTTP_BACKOFF_MAX", 5.0)
+                ),
+                failure_threshold=getattr(config, "CIRCUIT_FAILURE_THRESHOLD", 5),
+                reset_timeout=getattr(config, "CIRCUIT_RESET_SECONDS", 30),
+                hedging=getattr(config, "HTTP_HEDGING", False)
+            )
+        )
+    
+    def resilience_stats(self) -> Dict[str, Any]:
+        """Tellers van retries, circuit breakers en hedged requests"""
+        return self.transport.resilience.stats()
+    
+    def _remote_traces(self, trace_id: str) -> List[Dict[str, Any]]:
+        """Spans van de Function App instance (alleen als de trace daar nog in het geheugen staat)"""
+        try:
+            return [self.transport.get_json(f"traces/{trace_id}")]
+        except Exception as e:
+            logging.warning(f"Trace {trace_id} not available from Function App: {str(e)}")
+            return []
+    
+    def _convert_document(self, file_content: bytes, filename: str) -> Dict[str, Any]:
+        return self.transport.post_file("convert_pdf_to_text", file_content, filename, idempotent=True)
+    
+    def convert_pdf_batch(self, documents: List[Tuple[bytes, str]], max_workers: int = 4,
+                          max_documents: int = 500,
+                          max_total_bytes: int = 200 * 1024 * 1024) -> Iterator[Dict[str, Any]]:
+        """Converteer meerdere PDFs in één convert_pdf_batch call; resultaten per NDJSON regel"""
+        response = self.transport.post_files(
+            "convert_pdf_batch", [(filename, content) for content, filename in documents], stream=True
+        )
+        for line in self.transport.iter_ndjson(response):
+            if "summary" not in line:
+                yield line
+    
+    @observed("extract")
+    def extract_purchase_order_data(self, text: str) -> Dict[str, Any]:
+        try:
+            logging.info("Extracting structured data from text")
+            return self.transport.post_json("extract_purchase_order_data", {"text": text}, idempotent=True)
+            
+        except Exception as e:
+            logging.error(f"Error in data extraction: {str(e)}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    @observed("process")
+    def process_document(self, file_content: bytes, filename: str,
+                         include_text: bool = False) -> Dict[str, Any]:
+        try:
+            logging.info(f"Processing document: {filename}")
+            return self.transport.post_file(
+                "process_document", file_content, filename,
+                params={"include_text": "true"} if include_text else None,
+                idempotent=True
+            )
+            
+        except Exception as e:
+            logging.error(f"Error in document processing: {str(e)}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    def submit_document(self, file_content: bytes, filename: str) -> Dict[str, Any]:
+        try:
+            job = self.transport.post_file("jobs", file_content, filename)
+            return {
+                "success": True,
+                "document_id": job["job_id"],
+                "status": job["status"]
+            }
+            
+        except Exception as e:
+            logging.error(f"Error submitting document: {str(e)}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    def wait_for_document(self, document_id: str, timeout: float = 60.0,
+                          poll_interval: float = 0.5) -> Dict[str, Any]:
+        deadline = self.clock.now() + timeout
+        while True:
+            status = self.get_document_status(document_id)
+            if status.get("status") not in ("queued", "processing") or self.clock.now() >= deadline:
+                return status
+            self.clock.sleep(poll_interval)
+    
+    def get_document_status(self, document_id: str) -> Dict[str, Any]:
+        try:
+            job = self.transport.get_json(f"jobs/{document_id}")
+            return {
+                "success": True,
+                "document_id": document_id,
+                "filename": job["filename"],
+                "status": job["status"],
+                "created_at": job["created_at"],
+                "updated_at": job["updated_at"],
+                "processing_steps": job["processing_steps"],
+                "timings": job["timings"],
+                "result": job["result"],
+                "error": job["error"]
+            }
+            
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                return {
+                    "success": False,
+                    "document_id": document_id,
+                    "status": "not_found",
+                    "error": "Document niet gevonden"
+                }
+            logging.error(f"Error getting document status: {str(e)}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+        except Exception as e:
+            logging.error(f"Error getting document status: {str(e)}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
 # Factory function voor productie vs mock
 def get_azure_client(use_mock: Optional[bool] = None) -> AzureServicesClient:
     """
@@ -334,11 +751,17 @@ def get_azure_client(use_mock: Optional[bool] = None) -> AzureServicesClient:
     if use_mock is None:
         use_mock = getattr(config, "USE_MOCK_AZURE", True)
 
+    # Ook de HTTP client heeft een mock stap (save), met hetzelfde latency model
+    latency = latency_model(
+        getattr(config, "MOCK_LATENCY", "fixed"),
+        getattr(config, "MOCK_LATENCY_SAMPLES", None),
+        getattr(config, "MOCK_LATENCY_SEED", None)
+    )
     if use_mock:
-        return AzureServicesClient()
+        return AzureServicesClient(latency=latency)
     else:
-        # In productie zou dit echte Azure configuratie laden
-        return AzureServicesClient(
+        return AzureFunctionsClient(
             function_app_url=config.AZURE_FUNCTION_URL or "https://your-real-function-app.azurewebsites.net",
-            storage_account=config.AZURE_STORAGE_ACCOUNT or "yourrealstorage"
+            storage_account=config.AZURE_STORAGE_ACCOUNT or "yourrealstorage",
+            latency=latency
         )
@@ -0,0 +1,218 @@
+"""
+HTTP transport naar de Azure Function routes
+Eén gedeelde requests.Session per proces: keep-alive verbindingen uit een
+pool van configureerbare grootte, gzip voor request en response bodies, en
+multipart uploads die de PDF bytes in blokken versturen zonder de hele body
+eerst in het geheugen op te bouwen. Elke call is een span en stuurt de
+traceparent header mee, zodat de Function App in dezelfde trace logt.
+"""
+
+import gzip
+import json
+import threading
+import uuid
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from backend.tracing import TRACEPARENT_HEADER, start_span
+from services.resilience import ResilientCaller
+
+# Blokgrootte waarmee multipart bodies verstuurd worden
+UPLOAD_CHUNK_SIZE = 256 * 1024
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_TIMEOUT = 120.0
+DEFAULT_GZIP_MIN_BYTES = 1024
+
+
+def quote_filename(filename: str) -> str:
+    """
+    Bestandsnaam veilig binnen de quotes van Content-Disposition
+
+    CR/LF gaan eruit (anders eindigt de header halverwege de naam); backslash
+    en quote worden ge-escaped zoals in een quoted-string.
+    """
+    filename = filename.replace("\r", "").replace("\n", "")
+    return filename.replace("\\", "\\\\").replace('"', '\\"')
+
+
+class MultipartStream:
+    """
+    Read-only stream over een multipart/form-data body
+
+    De delen (headers en bestandsinhoud) worden niet samengevoegd; de body
+    wordt in blokken van UPLOAD_CHUNK_SIZE uit memoryviews gelezen. Omdat de
+    lengte vooraf bekend is stuurt requests een Content-Length in plaats van
+    chunked encoding.
+    """
+
+    def __init__(self, files: Sequence[Tuple[str, str, Union[bytes, bytearray, memoryview]]],
+                 boundary: Optional[str] = None):
+        self.boundary = boundary or uuid.uuid4().hex
+        self._parts: List[memoryview] = []
+        for field, filename, content in files:
+            self._parts.append(memoryview(
+                f"--{self.boundary}\r\nContent-Disposition: form-data; name=\"{field}\"; "
+                f"filename=\"{quote_filename(filename)}\"\r\nContent-Type: application/pdf\r\n\r\n".encode()
+            ))
+            self._parts.append(memoryview(content).cast("B"))
+            self._parts.append(memoryview(b"\r\n"))
+        self._parts.append(memoryview(f"--{self.boundary}--\r\n".encode()))
+        self._length = sum(part.nbytes for part in self._parts)
+        self._index = 0
+        self._offset = 0
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[bytes]:
+        while True:
+            chunk = self.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = self._length
+        chunks = []
+        while size > 0 and self._index < len(self._parts):
+            part = self._parts[self._index]
+            chunk = part[self._offset:self._offset + size]
+            chunks.append(chunk)
+            size -= chunk.nbytes
+            self._offset += chunk.nbytes
+            if self._offset >= part.nbytes:
+                self._index += 1
+                self._offset = 0
+        return b"".join(chunks)
+
+
+class FunctionHttpTransport:
+    """
+    Gedeelde, gepoolde HTTP sessie naar de Function App
+
+    Args:
+        base_url: Basis URL van de Function App (zonder /api)
+        function_key: Function key (x-functions-key header)
+        pool_size: Maximaal aantal open verbindingen; verdere requests wachten op een vrije verbinding
+        timeout: Timeout per request in seconden
+        gzip_min_bytes: JSON bodies vanaf deze grootte worden gzip gecomprimeerd verstuurd
+        resilience: Retries, circuit breakers en hedging; standaard ResilientCaller()
+    """
+
+    def __init__(self, base_url: str, function_key: Optional[str] = None,
+                 pool_size: int = DEFAULT_POOL_SIZE, timeout: float = DEFAULT_TIMEOUT,
+                 gzip_min_bytes: int = DEFAULT_GZIP_MIN_BYTES,
+                 resilience: Optional[ResilientCaller] = None):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.gzip_min_bytes = gzip_min_bytes
+        self.resilience = resilience or ResilientCaller()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, pool_block=True)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"Accept-Encoding": "gzip", "Connection": "keep-alive"})
+        if function_key:
+            self.session.headers["x-functions-key"] = function_key
+
+    def url(self, route: str) -> str:
+        return f"{self.base_url}/api/{route}"
+
+    def _request(self, method: str, route: str, idempotent: Optional[bool] = None,
+                 body: Optional[Callable[[], Any]] = None, **kwargs) -> requests.Response:
+        """
+        Verstuur een request via de resilience laag
+
+        Args:
+            idempotent: Mag na verzenden opnieuw geprobeerd of gehedged worden; standaard alleen GET
+            body: Maakt per poging een nieuwe body (streams zijn na één poging gelezen)
+        """
+        endpoint = f"{method} {route.split('/')[0]}"
+
+        with start_span(endpoint, service="client", route=route) as span:
+            kwargs["headers"] = dict(kwargs.get("headers") or {}, **{TRACEPARENT_HEADER: span.traceparent})
+
+            def send() -> requests.Response:
+                request_kwargs = dict(kwargs, data=body()) if body is not None else kwargs
+                return self.session.request(method, self.url(route), timeout=self.timeout, **request_kwargs)
+
+            response = self.resilience.call(endpoint, send, method == "GET" if idempotent is None else idempotent)
+            span.attributes["status"] = response.status_code
+            response.raise_for_status()
+            return response
+
+    def get_json(self, route: str, params: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        return self._request("GET", route, params=params).json()
+
+    def post_json(self, route: str, payload: Dict[str, Any], idempotent: bool = False) -> Dict[str, Any]:
+        """POST een JSON body; vanaf gzip_min_bytes gecomprimeerd"""
+        body = json.dumps(payload).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        if len(body) >= self.gzip_min_bytes:
+            body = gzip.compress(body, compresslevel=5)
+            headers["Content-Encoding"] = "gzip"
+        return self._request("POST", route, idempotent=idempotent, data=body, headers=headers).json()
+
+    def post_files(self, route: str, files: Sequence[Tuple[str, bytes]],
+                   params: Optional[Dict[str, str]] = None, stream: bool = False,
+                   idempotent: bool = False) -> requests.Response:
+        """POST bestanden als streaming multipart body; files is een lijst (bestandsnaam, inhoud)"""
+        parts = [("file", filename, content) for filename, content in files]
+        boundary = uuid.uuid4().hex
+        return self._request(
+            "POST", route, idempotent=idempotent, body=lambda: MultipartStream(parts, boundary),
+            params=params, stream=stream,
+            headers={"Content-Type": f"multipart/form-data; boundary={boundary}"}
+        )
+
+    def post_file(self, route: str, content: bytes, filename: str,
+                  params: Optional[Dict[str, str]] = None, idempotent: bool = False) -> Dict[str, Any]:
+        return self.post_files(route, [(filename, content)], params=params, idempotent=idempotent).json()
+
+    def iter_ndjson(self, response: requests.Response) -> Iterator[Dict[str, Any]]:
+        """Regels van een NDJSON response (bijvoorbeeld convert_pdf_batch) zodra ze binnenkomen"""
+        try:
+            for line in response.iter_lines():
+                if line:
+                    yield json.loads(line)
+        finally:
+            response.close()
+
+    def close(self) -> None:
+        self.session.close()
+
+
+_transports: Dict[Tuple[Any, ...], FunctionHttpTransport] = {}
+_transports_lock = threading.Lock()
+
+
+def get_transport(base_url: str, function_key: Optional[str] = None,
+                  pool_size: int = DEFAULT_POOL_SIZE, timeout: float = DEFAULT_TIMEOUT,
+                  gzip_min_bytes: int = DEFAULT_GZIP_MIN_BYTES,
+                  resilience: Optional[ResilientCaller] = None) -> FunctionHttpTransport:
+    """
+    Gedeelde transport per Function App en instellingen (één connection pool per combinatie)
+
+    Alle instellingen, ook die van de resilience laag, horen bij de sleutel:
+    een caller met andere instellingen krijgt een eigen transport. Bij gelijke
+    instellingen wordt de bestaande transport (met zijn ResilientCaller, en dus
+    de circuit breakers) gedeeld en is het meegegeven resilience object ongebruikt.
+    """
+    resilience = resilience or ResilientCaller()
+    key = (base_url.rstrip("/"), function_key, pool_size, timeout, gzip_min_bytes, resilience.settings)
+    with _transports_lock:
+        transport = _transports.get(key)
+        if transport is None:
+            transport = _transports[key] = FunctionHttpTransport(
+                base_url, function_key=function_key, pool_size=pool_size, timeout=timeout,
+                gzip_min_bytes=gzip_min_bytes, resilience=resilience
+            )
+        return transport
@@ -0,0 +1,201 @@
+"""
+Latency modellen en klokken voor de mock client
+De mock stappen (convert, extract, save) vragen hun vertraging aan een
+latency model en wachten via een klok:
+
+    ZeroLatency       - geen vertraging
+    FixedLatency      - vaste vertraging per stap (standaard 1s/2s/1s, zoals voorheen)
+    SizeLatency       - basis plus een deel per KiB invoer (PDF bytes, tekst, JSON)
+    LogNormalLatency  - lognormale verdeling per stap, gefit op productie timings
+    EmpiricalLatency  - trekt uit de gemeten timings zelf (behoudt de echte staart)
+
+SystemClock wacht echt; VirtualClock laat de tijd alleen verspringen, zodat
+tests direct klaar zijn en de gemeten duren toch de gesimuleerde latency tonen.
+Productie timings komen uit de "timings" log records van de Function App
+(één JSON record per regel, eventueel na een log prefix).
+"""
+
+import json
+import math
+import random
+import statistics
+import threading
+import time
+from typing import Dict, Iterable, List, Mapping, Optional, Protocol, Sequence
+
+# Operaties van de mock client en de bijbehorende Function App operaties in de timings records
+OPERATIONS = ("convert", "extract", "save")
+FUNCTION_OPERATIONS = {
+    "convert_pdf_to_text": "convert",
+    "extract_purchase_order_data": "extract",
+}
+
+DEFAULT_DELAYS = {"convert": 1.0, "extract": 2.0, "save": 1.0}
+
+
+class LatencyModel(Protocol):
+    def delay(self, operation: str, size: int = 0) -> float:
+        """Vertraging in seconden voor operation met size bytes invoer"""
+
+
+class Clock(Protocol):
+    def now(self) -> float: ...
+
+    def sleep(self, seconds: float) -> None: ...
+
+
+class SystemClock:
+    """Echte tijd (time.monotonic / time.sleep)"""
+
+    def now(self) -> float:
+        return time.monotonic()
+
+    def sleep(self, seconds: float) -> None:
+        time.sleep(seconds)
+
+
+class VirtualClock:
+    """
+    Klok die bij sleep direct vooruit springt
+
+    Elke thread heeft een eigen tijdlijn: een sleep verschuift alleen de klok
+    van de slapende thread, zoals gelijktijdige echte sleeps elkaar ook niet
+    ophouden. Een nieuwe thread begint op de gedeelde tijd (start plus
+    advance); advance verschuift alle tijdlijnen. slept en sleeps tellen
+    over alle threads.
+    """
+
+    def __init__(self, start: float = 0.0):
+        self._now = start
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.slept = 0.0
+        self.sleeps = 0
+
+    def now(self) -> float:
+        with self._lock:
+            return self._now + getattr(self._local, "offset", 0.0)
+
+    def sleep(self, seconds: float) -> None:
+        seconds = max(0.0, seconds)
+        self._local.offset = getattr(self._local, "offset", 0.0) + seconds
+        with self._lock:
+            self.slept += seconds
+            self.sleeps += 1
+
+    def advance(self, seconds: float) -> None:
+        with self._lock:
+            self._now += seconds
+
+
+class ZeroLatency:
+    def delay(self, operation: str, size: int = 0) -> float:
+        return 0.0
+
+
+class FixedLatency:
+    """Vaste vertraging per operatie; onbekende operaties krijgen default"""
+
+    def __init__(self, delays: Optional[Mapping[str, float]] = None, default: float = 0.0):
+        self.delays = dict(DEFAULT_DELAYS if delays is None else delays)
+        self.default = default
+
+    def delay(self, operation: str, size: int = 0) -> float:
+        return self.delays.get(operation, self.default)
+
+
+class SizeLatency:
+    """Basis vertraging plus per_kib seconden per KiB invoer, per operatie"""
+
+    def __init__(self, base: Optional[Mapping[str, float]] = None, per_kib: Optional[Mapping[str, float]] = None):
+        self.base = dict({"convert": 0.3, "extract": 0.1, "save": 0.05} if base is None else base)
+        self.per_kib = dict({"convert": 0.004, "extract": 0.0005, "save": 0.0002} if per_kib is None else per_kib)
+
+    def delay(self, operation: str, size: int = 0) -> float:
+        return self.base.get(operation, 0.0) + self.per_kib.get(operation, 0.0) * size / 1024
+
+
+class LogNormalLatency:
+    """Lognormale vertraging per operatie (mu en sigma van ln(seconden)), met vaste seed"""
+
+    def __init__(self, parameters: Mapping[str, Sequence[float]], seed: Optional[int] = None):
+        self.parameters = {operation: (float(mu), float(sigma)) for operation, (mu, sigma) in parameters.items()}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def fit(cls, samples: Mapping[str, Iterable[float]], seed: Optional[int] = None) -> "LogNormalLatency":
+        """Fit mu en sigma per operatie op gemeten duren (seconden, > 0)"""
+        parameters = {}
+        for operation, values in samples.items():
+            logs = [math.log(value) for value in values if value > 0]
+            if logs:
+                parameters[operation] = (statistics.fmean(logs), statistics.pstdev(logs))
+        return cls(parameters, seed)
+
+    def delay(self, operation: str, size: int = 0) -> float:
+        if operation not in self.parameters:
+            return 0.0
+        mu, sigma = self.parameters[operation]
+        with self._lock:
+            return self._rng.lognormvariate(mu, sigma)
+
+
+class EmpiricalLatency:
+    """Trekt (met vaste seed) uit de gemeten duren per operatie"""
+
+    def __init__(self, samples: Mapping[str, Iterable[float]], seed: Optional[int] = None):
+        self.samples = {operation: sorted(values) for operation, values in samples.items() if values}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def delay(self, operation: str, size: int = 0) -> float:
+        values = self.samples.get(operation)
+        if not values:
+            return 0.0
+        with self._lock:
+            return self._rng.choice(values)
+
+
+def samples_from_timings(lines: Iterable[str]) -> Dict[str, List[float]]:
+    """
+    Duren per mock operatie uit "timings" log records (één JSON record per regel)
+
+    Alleen records van convert_pdf_to_text en extract_purchase_order_data met
+    status 200 tellen mee; de duur is timings["total"]. Regels zonder JSON
+    record worden overgeslagen.
+    """
+    samples: Dict[str, List[float]] = {operation: [] for operation in OPERATIONS}
+    for line in lines:
+        start = line.find("{")
+        if start < 0:
+            continue
+        try:
+            record = json.loads(line[start:])
+        except ValueError:
+            continue
+        operation = FUNCTION_OPERATIONS.get(record.get("operation"))
+        total = record.get("timings", {}).get("total")
+        if record.get("event") == "timings" and operation and total and record.get("status", 200) == 200:
+            samples[operation].append(total)
+    return {operation: values for operation, values in samples.items() if values}
+
+
+def latency_model(name: str = "fixed", samples_path: Optional[str] = None,
+                  seed: Optional[int] = None) -> LatencyModel:
+    """Latency model op naam: zero, fixed, size, lognormal of empirical (de laatste twee met samples_path)"""
+    if name == "zero":
+        return ZeroLatency()
+    if name == "fixed":
+        return FixedLatency()
+    if name == "size":
+        return SizeLatency()
+    if name in ("lognormal", "empirical"):
+        if not samples_path:
+            raise ValueError(f"Latency model {name} heeft een bestand met timings records nodig")
+        with open(samples_path) as handle:
+            samples = samples_from_timings(handle)
+        if name == "lognormal":
+            return LogNormalLatency.fit(samples, seed)
+        return EmpiricalLatency(samples, seed)
+    raise ValueError(f"Onbekend latency model: {name}")
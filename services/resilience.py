@@ -0,0 +1,327 @@
+"""
+Retries, circuit breakers en hedged requests voor de HTTP transport
+
+    RetryPolicy      - exponentiële backoff met full jitter, Retry-After wint als die langer is
+    CircuitBreaker   - per endpoint: na N fouten op rij open, na reset_timeout één proefrequest
+    LatencyTracker   - glijdend venster van latencies per endpoint (p95 als hedge vertraging)
+    ResilientCaller  - combineert het bovenstaande en houdt tellers bij
+
+Alleen idempotente calls worden na een verstuurd request opnieuw geprobeerd of
+gehedged; niet-idempotente calls alleen als de server ze aantoonbaar niet
+verwerkt heeft (connect fout, 429, 503).
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, NamedTuple, Optional
+
+import requests
+from urllib3.exceptions import NewConnectionError
+
+from backend.http_headers import parse_retry_after
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Statussen waarbij de server het request niet verwerkt heeft
+NOT_PROCESSED_STATUSES = (429, 503)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """De circuit breaker van het endpoint staat open; er is geen request verstuurd"""
+
+
+def connect_failed(error: requests.RequestException) -> bool:
+    """De verbinding kwam niet tot stand (connect timeout of geweigerd); het request is niet verstuurd"""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    # requests maakt van een geweigerde verbinding een ConnectionError rond urllib3's NewConnectionError
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(error, requests.ConnectionError) and isinstance(reason, NewConnectionError)
+
+
+class RetryPolicy(NamedTuple):
+    """Exponentiële backoff met full jitter (seconden)"""
+    max_attempts: int = 3
+    base_delay: float = 0.2
+    multiplier: float = 2.0
+    max_delay: float = 5.0
+
+    def delay(self, retry: int, rng: random.Random, retry_after: Optional[float] = None) -> float:
+        """Wachttijd voor de zoveelste retry (0-based)"""
+        delay = rng.uniform(0, min(self.max_delay, self.base_delay * self.multiplier ** retry))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker voor één endpoint
+
+    Args:
+        failure_threshold: Aantal fouten op rij waarna het circuit open gaat
+        reset_timeout: Seconden dat het circuit open blijft voor een proefrequest
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = OPEN
+                self.opened_at = self.clock()
+                self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """Geef het proefrequest vrij zonder uitkomst (de call faalde voordat het endpoint antwoordde)"""
+        with self._lock:
+            self._trial_in_flight = False
+
+
+class LatencyTracker:
+    """Laatste `window` latencies van geslaagde requests van één endpoint"""
+
+    def __init__(self, window: int = 200):
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+
+class ResilientCaller:
+    """
+    Voer HTTP requests uit met retries, een circuit breaker per endpoint en optioneel hedging
+
+    Args:
+        policy: Retry policy
+        failure_threshold, reset_timeout: Instellingen van de circuit breakers
+        hedging: Stuur voor idempotente calls een tweede request als de eerste
+            langer duurt dan de p95 latency van het endpoint
+        hedge_min_samples: Aantal metingen voordat er gehedged wordt
+        hedge_min_delay: Minimale wachttijd voor een hedge request
+    """
+
+    COUNTERS = ("requests", "attempts", "successes", "failures", "retries",
+                "circuit_rejections", "hedges_sent", "hedges_won")
+
+    def __init__(self, policy: RetryPolicy = RetryPolicy(), failure_threshold: int = 5,
+                 reset_timeout: float = 30.0, hedging: bool = False,
+                 hedge_min_samples: int = 20, hedge_min_delay: float = 0.05,
+                 sleep: Callable[[float], None] = time.sleep,
+                 clock: Callable[[], float] = time.monotonic, seed: Optional[int] = None):
+        self.policy = policy
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.hedging = hedging
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_min_delay = hedge_min_delay
+        self.sleep = sleep
+        self.clock = clock
+        self.seed = seed
+        self._random = random.Random(seed)
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._latencies: Dict[str, LatencyTracker] = {}
+        self._counts = {name: 0 for name in self.COUNTERS}
+        self._lock = threading.Lock()
+        self._hedge_pool: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def settings(self) -> tuple:
+        """Alle instellingen (zonder toestand); gelijke settings mogen één caller delen"""
+        return (self.policy, self.failure_threshold, self.reset_timeout, self.hedging,
+                self.hedge_min_samples, self.hedge_min_delay, self.sleep, self.clock, self.seed)
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counts[name] += amount
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(endpoint)
+            if breaker is None:
+                breaker = self._breakers[endpoint] = CircuitBreaker(
+                    self.failure_threshold, self.reset_timeout, self.clock
+                )
+            return breaker
+
+    def latency(self, endpoint: str) -> LatencyTracker:
+        with self._lock:
+            tracker = self._latencies.get(endpoint)
+            if tracker is None:
+                tracker = self._latencies[endpoint] = LatencyTracker()
+            return tracker
+
+    def hedge_delay(self, endpoint: str) -> Optional[float]:
+        """p95 latency van het endpoint, of None zolang er te weinig metingen zijn"""
+        tracker = self.latency(endpoint)
+        if len(tracker) < self.hedge_min_samples:
+            return None
+        return max(self.hedge_min_delay, tracker.percentile(0.95))
+
+    def stats(self) -> Dict[str, Any]:
+        """Tellers en de toestand van de circuit breakers per endpoint"""
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._counts)
+            breakers = dict(self._breakers)
+            latencies = dict(self._latencies)
+        stats["endpoints"] = {
+            endpoint: {
+                "circuit": breaker.state,
+                "consecutive_failures": breaker.failures,
+                "p95_seconds": latencies[endpoint].percentile(0.95) if endpoint in latencies else None
+            }
+            for endpoint, breaker in breakers.items()
+        }
+        return stats
+
+    def _send_hedged(self, endpoint: str, send: Callable[[], requests.Response]) -> requests.Response:
+        delay = self.hedge_delay(endpoint)
+        if delay is None:
+            return send()
+        with self._lock:
+            if self._hedge_pool is None:
+                self._hedge_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="hedge")
+            pool = self._hedge_pool
+
+        primary = pool.submit(send)
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+
+        self._count("hedges_sent")
+        hedge = pool.submit(send)
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = future.exception()
+                    continue
+                if future is hedge:
+                    self._count("hedges_won")
+                # De trage kopie loopt nog door; sluit zijn response zodra hij klaar is
+                for loser in pending:
+                    loser.add_done_callback(_close_response)
+                return future.result()
+        raise error
+
+    def call(self, endpoint: str, send: Callable[[], requests.Response],
+             idempotent: bool) -> requests.Response:
+        """
+        Verstuur een request via send() met retries, circuit breaker en hedging
+
+        Returns:
+            De laatste response (ook als die een foutstatus heeft)
+
+        Raises:
+            CircuitOpenError als het circuit van het endpoint open staat,
+            of de laatste requests exception als alle pogingen mislukken
+        """
+        self._count("requests")
+        breaker = self.breaker(endpoint)
+        retry = 0
+        while True:
+            if not breaker.allow():
+                self._count("circuit_rejections")
+                raise CircuitOpenError(f"Circuit voor {endpoint} staat open")
+            self._count("attempts")
+
+            start = self.clock()
+            retry_after = None
+            response = None
+            try:
+                if self.hedging and idempotent:
+                    response = self._send_hedged(endpoint, send)
+                else:
+                    response = send()
+            except requests.RequestException as e:
+                breaker.record_failure()
+                error: Optional[BaseException] = e
+                retryable = idempotent or connect_failed(e)
+            except BaseException:
+                # Geen requests fout (bijvoorbeeld bij het opbouwen van de body): geen uitkomst
+                # voor het endpoint, maar een lopend proefrequest moet wel vrijkomen
+                breaker.release_trial()
+                self._count("failures")
+                raise
+            else:
+                error = None
+                status = response.status_code
+                if status not in RETRY_STATUSES:
+                    if status < 500:
+                        breaker.record_success()
+                        self.latency(endpoint).record(self.clock() - start)
+                    else:
+                        breaker.record_failure()
+                    self._count("successes" if status < 400 else "failures")
+                    return response
+                # 429 is backpressure van de server, geen storing
+                if status != 429:
+                    breaker.record_failure()
+                retryable = idempotent or status in NOT_PROCESSED_STATUSES
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+
+            if not retryable or retry + 1 >= self.policy.max_attempts:
+                self._count("failures")
+                if error is not None:
+                    raise error
+                return response
+
+            if response is not None:
+                response.close()
+            self.sleep(self.policy.delay(retry, self._random, retry_after))
+            self._count("retries")
+            retry += 1
+
+
+def _close_response(future: Future) -> None:
+    if future.exception() is None:
+        future.result().close()
@@ -0,0 +1,118 @@
+"""
+Unit tests voor de asyncio Azure services client
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+import sys
+import os
+from unittest.mock import patch
+
+# Add parent directory to path voor imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.async_client import AsyncAzureServicesClient, get_async_azure_client
+from services.azure_client import AzureServicesClient
+
+
+class SlowClient(AzureServicesClient):
+    """Client waarvan elke call even blokkeert en die gelijktijdige calls en volgorde bijhoudt"""
+
+    def __init__(self, delay=0.05, fail_filename=None):
+        super().__init__()
+        self.delay = delay
+        self.fail_filename = fail_filename
+        self.active = 0
+        self.max_active = 0
+        self.events = []
+        self._lock = threading.Lock()
+
+    def _enter(self, event):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            self.events.append(event)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+
+    def convert_pdf_to_text(self, file_content, filename):
+        self._enter(("convert", filename))
+        if filename == self.fail_filename:
+            return {"success": False, "error": "conversie mislukt"}
+        return {"success": True, "text": f"Order Number: APO-{filename[:-4]}", "blob_url": "text"}
+
+    def extract_purchase_order_data(self, text):
+        self._enter(("extract", text))
+        return {"success": True, "extracted_data": {"order_number": text.split()[-1]}, "confidence_score": 0.25}
+
+    def save_processed_document(self, document_data):
+        self._enter(("save", document_data["order_number"]))
+        return {"success": True, "blob_url": f"processed/{document_data['order_number']}.json"}
+
+
+class TestAsyncAzureServicesClient(unittest.TestCase):
+    """Test cases voor AsyncAzureServicesClient"""
+
+    def test_process_many_pipelines_documents(self):
+        client = SlowClient(delay=0.05)
+        async_client = AsyncAzureServicesClient(client, max_concurrency=4)
+        self.addCleanup(async_client.close)
+        documents = [(b"%PDF", f"{number:05d}.pdf") for number in range(12)]
+
+        start = time.perf_counter()
+        results = asyncio.run(async_client.process_many(documents))
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual([result["index"] for result in results], list(range(12)))
+        self.assertTrue(all(result["success"] for result in results))
+        self.assertEqual(results[3]["extracted_data"]["order_number"], "APO-00003")
+        self.assertEqual(sorted(results[0]["timings"]), ["convert", "extract", "save"])
+        # 36 calls van 0.05s: serieel 1.8s, met 4 tegelijk ongeveer 0.45s
+        self.assertLess(elapsed, 1.2)
+        self.assertLessEqual(client.max_active, 4)
+        self.assertGreater(client.max_active, 1)
+        # Pipelining: het eerste document is al opgeslagen voordat het laatste geconverteerd wordt
+        self.assertLess(client.events.index(("save", "APO-00000")), client.events.index(("convert", "00011.pdf")))
+
+    def test_failed_stage_stops_document(self):
+        client = SlowClient(delay=0, fail_filename="00001.pdf")
+        async_client = AsyncAzureServicesClient(client, max_concurrency=2)
+        self.addCleanup(async_client.close)
+        seen = []
+
+        results = asyncio.run(async_client.process_many(
+            [(b"%PDF", "00000.pdf"), (b"%PDF", "00001.pdf")], on_result=seen.append
+        ))
+
+        self.assertTrue(results[0]["success"])
+        self.assertFalse(results[1]["success"])
+        self.assertEqual(results[1]["failed_stage"], "convert")
+        self.assertNotIn(("extract", "Order Number: APO-00001"), client.events)
+        self.assertEqual(len(seen), 2)
+
+    @patch('services.azure_client.time.sleep')
+    def test_single_calls_on_mock_client(self, mock_sleep):
+        async_client = get_async_azure_client(use_mock=True, max_concurrency=2)
+        self.addCleanup(async_client.close)
+
+        async def run():
+            conversion = await async_client.convert_pdf_to_text(b"%PDF", "sample_order.pdf")
+            extraction = await async_client.extract_purchase_order_data(conversion["text"])
+            saved = await async_client.save_processed_document(extraction["extracted_data"])
+            status = await async_client.get_document_status("onbekend")
+            return conversion, extraction, saved, status
+
+        # Twee keer asyncio.run: de semaphore hoort bij de event loop van de aanroep
+        for _ in range(2):
+            conversion, extraction, saved, status = asyncio.run(run())
+            self.assertTrue(conversion["success"])
+            self.assertEqual(extraction["extracted_data"]["order_number"], "APO-00199")
+            self.assertTrue(saved["success"])
+            self.assertEqual(status["status"], "not_found")
+
+
+if __name__ == '__main__':
+    unittest.main()
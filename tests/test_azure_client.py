@@ -8,19 +8,22 @@ from unittest.mock import Mock, patch, MagicMock
 import sys
 import os
 import json
+import threading
 import time
 
 # Add parent directory to path voor imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from services.azure_client import AzureServicesClient, get_azure_client
+from services.latency import VirtualClock
 
 class TestAzureServicesClient(unittest.TestCase):
     """Test cases voor AzureServicesClient"""
     
     def setUp(self):
-        """Setup voor elke test"""
-        self.client = AzureServicesClient()
+        """Setup voor elke test (virtuele klok: de gesimuleerde delays kosten geen tijd)"""
+        self.clock = VirtualClock()
+        self.client = AzureServicesClient(clock=self.clock)
         self.sample_pdf_content = b"Mock PDF content"
         self.sample_text = """
         PURCHASE ORDER
@@ -80,6 +83,21 @@ class TestAzureServicesClient(unittest.TestCase):
         self.assertEqual(data["subtotal"], 3250.00)
         self.assertEqual(data["total"], 3932.50)
     
+    def test_process_document_in_one_call(self):
+        """Test dat process_document conversie en extractie in één call doet"""
+        result = self.client.process_document(self.sample_pdf_content, "sample_order.pdf")
+        
+        self.assertTrue(result["success"])
+        self.assertEqual(result["extracted_data"]["order_number"], "APO-00199")
+        self.assertNotIn("text", result)
+        self.assertEqual(sorted(result["timings"]), ["convert", "extract", "total", "validate"])
+        # Eén gesimuleerde API call in plaats van convert + extract
+        self.assertEqual(self.clock.sleeps, 1)
+        
+        with_text = self.client.process_document(self.sample_pdf_content, "sample_order.pdf", include_text=True)
+        self.assertIn("APO-00199", with_text["text"])
+        self.assertTrue(with_text["cache"]["hit"])
+    
     def test_extract_purchase_order_data_items_parsing(self):
         """Test dat line items correct geparsed worden"""
         result = self.client.extract_purchase_order_data(self.sample_text)
@@ -117,12 +135,16 @@ class TestAzureServicesClient(unittest.TestCase):
         self.assertIn("size_bytes", result)
         self.assertIn("APO-00199", result["blob_name"])
     
-    def test_get_document_status_completed(self):
-        """Test document status voor completed documents"""
-        # Even numbers should return completed status
-        result = self.client.get_document_status("APO-00198")
+    @patch('services.azure_client.time.sleep')
+    def test_get_document_status_completed(self, mock_sleep):
+        """Test document status na verwerking van een ingediend document"""
+        submitted = self.client.submit_document(self.sample_pdf_content, "sample_order.pdf")
+        self.assertTrue(submitted["success"])
+        
+        result = self.client.wait_for_document(submitted["document_id"], timeout=10)
+        self.client.job_runner.stop()
         
-        self.assertEqual(result["document_id"], "APO-00198")
+        self.assertEqual(result["document_id"], submitted["document_id"])
         self.assertEqual(result["status"], "completed")
         self.assertIn("processing_steps", result)
         
@@ -131,14 +153,38 @@ class TestAzureServicesClient(unittest.TestCase):
         self.assertEqual(steps["convert"], "completed")
         self.assertEqual(steps["extract"], "completed")
         self.assertEqual(steps["validate"], "completed")
+        self.assertEqual(result["result"]["extracted_data"]["order_number"], "APO-00199")
+        self.assertIn("confidence_score", result["result"])
     
-    def test_get_document_status_processing(self):
-        """Test document status voor processing documents"""
-        # Odd numbers should return processing status
-        result = self.client.get_document_status("APO-00199")
+    @patch('services.azure_client.time.sleep')
+    def test_get_document_status_processing(self, mock_sleep):
+        """Test document status terwijl een stap nog loopt"""
+        self.addCleanup(lambda: self.client.job_runner.stop())
+        with patch.object(self.client, 'convert_pdf_to_text') as mock_convert:
+            started = threading.Event()
+            release = threading.Event()
+            
+            def slow_convert(content, filename):
+                started.set()
+                release.wait(5)
+                return {"success": True, "text": self.sample_text}
+            mock_convert.side_effect = slow_convert
+            
+            submitted = self.client.submit_document(self.sample_pdf_content, "order.pdf")
+            self.assertTrue(started.wait(5))
+            result = self.client.get_document_status(submitted["document_id"])
+            release.set()
         
-        self.assertEqual(result["document_id"], "APO-00199")
         self.assertEqual(result["status"], "processing")
+        self.assertEqual(result["processing_steps"]["convert"], "processing")
+        self.assertEqual(result["processing_steps"]["extract"], "pending")
+    
+    def test_get_document_status_unknown(self):
+        """Test dat een onbekend document niet als verwerkt gemeld wordt"""
+        result = self.client.get_document_status("APO-00198")
+        
+        self.assertFalse(result["success"])
+        self.assertEqual(result["status"], "not_found")
     
     def test_calculate_mock_confidence_full_data(self):
         """Test confidence calculation met complete data"""
@@ -182,6 +228,50 @@ class TestAzureServicesClient(unittest.TestCase):
         self.assertEqual(result["order_number"], "CUSTOM-12345")
         self.assertEqual(result["date"], "2024-02-01")
 
+class TestConversionCaching(unittest.TestCase):
+    """Test cases voor de conversie cache in de client"""
+    
+    def setUp(self):
+        self.client = AzureServicesClient()
+    
+    @patch('services.azure_client.time.sleep')
+    def test_same_pdf_is_served_from_cache(self, mock_sleep):
+        """Test dat dezelfde PDF bytes maar één keer geconverteerd worden"""
+        first = self.client.convert_pdf_to_text(b"%PDF same bytes", "order_1.pdf")
+        second = self.client.convert_pdf_to_text(b"%PDF same bytes", "order_1_resend.pdf")
+        
+        self.assertFalse(first["cache"]["hit"])
+        self.assertTrue(second["cache"]["hit"])
+        self.assertEqual(first["text"], second["text"])
+        self.assertEqual(mock_sleep.call_count, 1)
+        self.assertEqual(self.client.conversion_cache.stats()["hits"], 1)
+    
+    @patch('services.azure_client.time.sleep')
+    def test_different_pdf_is_a_miss(self, mock_sleep):
+        """Test dat andere bytes opnieuw geconverteerd worden"""
+        self.client.convert_pdf_to_text(b"%PDF one", "one.pdf")
+        result = self.client.convert_pdf_to_text(b"%PDF two", "two.pdf")
+        
+        self.assertFalse(result["cache"]["hit"])
+        self.assertEqual(self.client.conversion_cache.stats()["misses"], 2)
+
+class TestBatchConversion(unittest.TestCase):
+    """Test cases voor convert_pdf_batch"""
+    
+    def setUp(self):
+        self.client = AzureServicesClient()
+    
+    @patch('services.azure_client.time.sleep')
+    def test_batch_returns_one_result_per_document(self, mock_sleep):
+        """Test dat elke PDF in de batch een resultaat krijgt"""
+        documents = [(f"%PDF {i}".encode(), f"APO-{i}.pdf") for i in range(3)]
+        results = list(self.client.convert_pdf_batch(documents, max_workers=3))
+        
+        self.assertEqual(sorted(result["index"] for result in results), [0, 1, 2])
+        for result in results:
+            self.assertTrue(result["success"])
+            self.assertIn(result["filename"].replace(".pdf", "").upper(), result["text"])
+
 class TestAzureClientFactory(unittest.TestCase):
     """Test cases voor de factory function"""
     
@@ -237,7 +327,7 @@ class TestDataExtractionRegex(unittest.TestCase):
     """Test cases voor regex patterns in data extractie"""
     
     def setUp(self):
-        self.client = AzureServicesClient()
+        self.client = AzureServicesClient(clock=VirtualClock())
     
     def test_order_number_variations(self):
         """Test verschillende order number formaten"""
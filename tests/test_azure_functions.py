@@ -0,0 +1,393 @@
+"""
+Unit tests voor lazy initialisatie in de Azure Functions module
+"""
+
+import hashlib
+import json
+import subprocess
+import tempfile
+import unittest
+import sys
+import os
+from unittest.mock import Mock, patch
+
+# Add parent and backend directory to path voor imports
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "backend"))
+
+import azure.functions as func
+
+import azure_functions
+from benchmarks.bench_cold_start import DEV_STORAGE_CONNECTION_STRING, ROUTE_COMPONENTS, function_names
+from benchmarks.pdf_builder import SAMPLE_ORDER_PAGES, build_pdf
+from conversion_cache import BlobCacheStore, ConversionCache, LocalCacheStore, MemoryCacheStore
+from job_pipeline import JobPipeline, LocalPayloadStore
+from upload_buffer import UploadBuffer
+
+HEAVY_MODULES = [
+    "PyPDF2",
+    "azure.storage.blob",
+    "azure.cognitiveservices.vision.computervision",
+    "msrest",
+]
+
+
+def run_in_fresh_process(code):
+    """Voer code uit in een vers proces (schone sys.modules) en parse de laatste regel als JSON"""
+    env = dict(os.environ, AZURE_STORAGE_CONNECTION_STRING=DEV_STORAGE_CONNECTION_STRING)
+    script = f"import json, sys\nsys.path.insert(0, {os.path.join(ROOT, 'backend')!r})\n{code}"
+    output = subprocess.check_output([sys.executable, "-c", script], env=env, cwd=ROOT)
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+class TestLazyInitialization(unittest.TestCase):
+    """Test cases voor lazy clients en uitgestelde imports"""
+
+    def test_import_does_not_load_heavy_modules(self):
+        """Test dat importeren geen SDKs of PyPDF2 laadt en geen clients bouwt"""
+        loaded = run_in_fresh_process(
+            "import azure_functions\n"
+            f"print(json.dumps([name for name in {HEAVY_MODULES!r} if name in sys.modules]))"
+        )
+        self.assertEqual(loaded, [])
+
+    def test_warm_up_initializes_once(self):
+        """Test dat warm_up alles initialiseert en clients per proces hergebruikt worden"""
+        result = run_in_fresh_process(
+            "import azure_functions\n"
+            "timings = azure_functions.warm_up()\n"
+            "client = azure_functions.get_blob_service_client()\n"
+            "print(json.dumps({\n"
+            "    'components': sorted(timings),\n"
+            "    'same_client': client is azure_functions.get_blob_service_client(),\n"
+            f"    'loaded': [name for name in {HEAVY_MODULES!r} if name in sys.modules],\n"
+            "}))"
+        )
+        self.assertEqual(result["components"], ["blob_storage", "blob_uploader", "computer_vision",
+                                                "conversion_cache", "job_pipeline", "pypdf2"])
+        self.assertTrue(result["same_client"])
+        self.assertEqual(result["loaded"], HEAVY_MODULES)
+
+    def test_cold_start_benchmark_covers_every_function(self):
+        """Test dat bench_cold_start voor elke geregistreerde Function bekende onderdelen heeft"""
+        self.assertEqual(sorted(ROUTE_COMPONENTS), sorted(function_names()))
+        for components in ROUTE_COMPONENTS.values():
+            self.assertLessEqual(set(components or []), set(azure_functions.WARMUP_COMPONENTS))
+
+
+def multipart_request(filename, content, *more_files, url="/api/convert_pdf_to_text"):
+    """HttpRequest met één of meer bestanden ((naam, inhoud) in more_files) in een multipart body"""
+    boundary = "test-boundary"
+    body = b""
+    for name, data in ((filename, content),) + more_files:
+        body += (
+            f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"{name}\"\r\n"
+            f"Content-Type: application/pdf\r\n\r\n".encode()
+            + data + b"\r\n"
+        )
+    body += f"--{boundary}--\r\n".encode()
+    return func.HttpRequest(
+        "POST", url,
+        headers={"Content-Type": f"multipart/form-data; boundary={boundary}"}, body=body
+    )
+
+
+class TestConvertPdfRoute(unittest.TestCase):
+    """Test cases voor convert_pdf_to_text met een gedeelde upload buffer"""
+
+    def setUp(self):
+        services = {
+            "blob_storage": Mock(),
+            "conversion_cache": ConversionCache(MemoryCacheStore()),
+        }
+        patcher = patch.dict(azure_functions._services, services, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(azure_functions.flush_uploads, 5)
+
+    def test_large_upload(self):
+        """Test dat een grote (gemapte) upload dezelfde hash en tekst oplevert"""
+        pdf_content = build_pdf(SAMPLE_ORDER_PAGES, scan_bytes_per_page=1024 * 1024)
+
+        response = azure_functions.convert_pdf_to_text(multipart_request("scan.pdf", pdf_content))
+        result = json.loads(response.get_body())
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("APO-12345", result["text"])
+        self.assertEqual(result["cache"]["key"], hashlib.sha256(pdf_content).hexdigest())
+        self.assertEqual(result["routing"]["counts"]["text_layer"], 2)
+
+    def test_degraded_ocr_result_is_not_cached(self):
+        """Test dat een conversie zonder OCR resultaat (storing) niet in de cache komt"""
+        pdf_content = build_pdf([SAMPLE_ORDER_PAGES[0], []])
+
+        def convert():
+            response = azure_functions.convert_pdf_to_text(multipart_request("scan.pdf", pdf_content))
+            return json.loads(response.get_body())
+
+        with patch.object(azure_functions, "extract_pages_with_computer_vision", return_value={}) as ocr:
+            first = convert()
+            second = convert()
+
+        self.assertEqual(first["degraded"], {"ocr_missing_pages": [2]})
+        self.assertFalse(first["cache"]["stored"])
+        self.assertFalse(second["cache"]["hit"])
+        self.assertEqual(ocr.call_count, 2)
+
+        with patch.object(azure_functions, "extract_pages_with_computer_vision", return_value={2: "Scan"}):
+            recovered = convert()
+        self.assertNotIn("degraded", recovered)
+        self.assertTrue(recovered["cache"]["stored"])
+    
+    def test_timings_block_and_log_record(self):
+        """Test dat de response echte duren per stap bevat en er één timings record gelogd wordt"""
+        pdf_content = build_pdf(SAMPLE_ORDER_PAGES)
+
+        with self.assertLogs("timings", level="INFO") as logs:
+            response = azure_functions.convert_pdf_to_text(multipart_request("order.pdf", pdf_content))
+        result = json.loads(response.get_body())
+
+        timings = result["timings"]
+        self.assertEqual(sorted(timings), ["cache_lookup", "parse", "pypdf2", "text_upload", "total"])
+        self.assertLess(result["processing_time"], 60)
+        self.assertLessEqual(result["processing_time"], timings["total"])
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record["operation"], "convert_pdf_to_text")
+        self.assertEqual(record["timings"], timings)
+        self.assertEqual(logs.records[0].custom_dimensions["status"], 200)
+
+    def test_metrics_route(self):
+        """Test dat de metrics route documenten, pagina's, cache lookups en stap duren exporteert"""
+        pdf_content = build_pdf(SAMPLE_ORDER_PAGES)
+        pages_before = azure_functions.PAGES_ROUTED.value(route="text_layer")
+        hits_before = azure_functions.CACHE_LOOKUPS.value(result="hit")
+
+        for _ in range(2):
+            azure_functions.convert_pdf_to_text(multipart_request("order.pdf", pdf_content))
+        azure_functions.flush_uploads(5)
+        response = azure_functions.get_metrics(func.HttpRequest("GET", "/api/metrics", body=b""))
+        text = response.get_body().decode()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(azure_functions.PAGES_ROUTED.value(route="text_layer") - pages_before, 2)
+        self.assertEqual(azure_functions.CACHE_LOOKUPS.value(result="hit") - hits_before, 1)
+        self.assertIn('dataextractor_stage_seconds_count{operation="convert_pdf_to_text",stage="pypdf2"}', text)
+        self.assertIn('dataextractor_blob_bytes_written_total{prefix="extracted_text"}', text)
+        self.assertIn("dataextractor_blob_uploads_pending 0", text)
+
+
+class TestConvertPdfBatchRoute(unittest.TestCase):
+    """Test cases voor convert_pdf_batch met gedeelde upload buffers"""
+
+    def setUp(self):
+        services = {
+            "blob_storage": Mock(),
+            "conversion_cache": ConversionCache(MemoryCacheStore()),
+        }
+        patcher = patch.dict(azure_functions._services, services, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(azure_functions.flush_uploads, 5)
+
+    def test_uploads_are_buffered_and_released(self):
+        first = build_pdf(SAMPLE_ORDER_PAGES)
+        second = build_pdf([["Order Number: APO-2", "Total: 10.00"]], scan_bytes_per_page=1024 * 1024)
+        request = multipart_request("a.pdf", first, ("b.pdf", second), url="/api/convert_pdf_batch")
+        buffers = []
+        original = UploadBuffer.from_stream
+
+        def from_stream(stream):
+            buffers.append(original(stream))
+            return buffers[-1]
+
+        with patch.object(azure_functions.UploadBuffer, "from_stream", side_effect=from_stream):
+            response = azure_functions.convert_pdf_batch(request)
+        lines = [json.loads(line) for line in response.get_body().decode().splitlines()]
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(lines[-1]["summary"], {"documents": 2, "succeeded": 2, "failed": 0})
+        texts = {line["filename"]: line["text"] for line in lines[:-1]}
+        self.assertIn("APO-12345", texts["a.pdf"])
+        self.assertIn("APO-2", texts["b.pdf"])
+        self.assertEqual([buffer.memory_mapped for buffer in buffers], [False, True])
+        # Buffers zijn na de response vrijgegeven
+        with self.assertRaises(ValueError):
+            buffers[1].view.tobytes()
+
+
+class TestConversionCacheCleanup(unittest.TestCase):
+    """Test cases voor het opruimen van verlopen conversie cache entries"""
+
+    def use_cache(self, cache):
+        patcher = patch.dict(azure_functions._services, {"conversion_cache": cache}, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_local_store_evicts_expired_entries(self):
+        now = [1000.0]
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ConversionCache(LocalCacheStore(directory), ttl_seconds=60, clock=lambda: now[0])
+            self.use_cache(cache)
+            cache.put("oud", {"text": "a"})
+            now[0] += 50
+            cache.put("nieuw", {"text": "b"})
+            now[0] += 20
+
+            stats = azure_functions.cleanup_conversion_cache()
+            self.assertEqual((stats["scanned"], stats["deleted"]), (2, 1))
+            self.assertEqual(cache.store.keys(), ["nieuw"])
+
+    def test_blob_store_uses_prefix_cleanup(self):
+        container_client = Mock()
+        self.use_cache(ConversionCache(BlobCacheStore(container_client), ttl_seconds=3600))
+
+        with patch.object(azure_functions, "BlobCleaner") as cleaner:
+            azure_functions.cleanup_conversion_cache(30)
+
+        args, kwargs = cleaner.call_args
+        self.assertIs(args[0], container_client)
+        self.assertEqual((kwargs["prefix"], kwargs["max_age"].total_seconds(), kwargs["time_budget"]),
+                         ("cache/conversions/", 3600, 30))
+        cleaner.return_value.run.assert_called_once_with()
+
+
+class TestJobRecordCleanup(unittest.TestCase):
+    """Test cases voor het opruimen van oude job records"""
+
+    def use_pipeline(self, pipeline):
+        patcher = patch.dict(azure_functions._services, {"job_pipeline": pipeline}, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_local_store_evicts_old_jobs(self):
+        now = [1000.0]
+        retention = azure_functions.JOB_RETENTION_DAYS * 24 * 3600
+        with tempfile.TemporaryDirectory() as directory:
+            pipeline = JobPipeline(
+                LocalCacheStore(os.path.join(directory, "records"), max_entries=0),
+                LocalPayloadStore(os.path.join(directory, "payloads")),
+                convert=Mock(), extract=Mock(), validate=Mock(), clock=lambda: now[0]
+            )
+            self.use_pipeline(pipeline)
+            old, _ = pipeline.create_job(b"%PDF oud", "oud.pdf")
+            now[0] += retention / 2
+            recent, _ = pipeline.create_job(b"%PDF nieuw", "nieuw.pdf")
+            now[0] += retention / 2 + 1
+
+            stats = azure_functions.cleanup_job_records()
+
+            self.assertEqual((stats["scanned"], stats["deleted"]), (2, 1))
+            self.assertEqual(pipeline.jobs.keys(), [recent["job_id"]])
+            with self.assertRaises(FileNotFoundError):
+                pipeline.payloads.get(f"{old['job_id']}/input.pdf")
+            self.assertEqual(pipeline.payloads.get(f"{recent['job_id']}/input.pdf"), b"%PDF nieuw")
+
+    def test_blob_store_uses_prefix_cleanup(self):
+        container_client = Mock()
+        self.use_pipeline(JobPipeline(BlobCacheStore(container_client, prefix="jobs/records/"), Mock(),
+                                      convert=Mock(), extract=Mock(), validate=Mock()))
+
+        with patch.object(azure_functions, "BlobCleaner") as cleaner:
+            azure_functions.cleanup_job_records(30)
+
+        args, kwargs = cleaner.call_args
+        self.assertIs(args[0], container_client)
+        self.assertEqual((kwargs["prefix"], kwargs["max_age"].days, kwargs["time_budget"]),
+                         ("jobs/records/", azure_functions.JOB_RETENTION_DAYS, 30))
+        cleaner.return_value.run.assert_called_once_with()
+
+
+class TestProcessDocumentRoute(unittest.TestCase):
+    """Test cases voor de gecombineerde convert + extract route"""
+
+    def setUp(self):
+        self.blob_storage = Mock()
+        services = {
+            "blob_storage": self.blob_storage,
+            "conversion_cache": ConversionCache(MemoryCacheStore()),
+        }
+        patcher = patch.dict(azure_functions._services, services, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_convert_and_extract_in_one_invocation(self):
+        pdf_content = build_pdf(SAMPLE_ORDER_PAGES)
+
+        response = azure_functions.process_document(multipart_request("order.pdf", pdf_content))
+        result = json.loads(response.get_body())
+        azure_functions.flush_uploads(5)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(result["extracted_data"]["order_number"], "APO-12345")
+        self.assertNotIn("text", result)
+        self.assertEqual(sorted(result["timings"]),
+                         ["cache_lookup", "extract", "parse", "pypdf2", "result_upload", "text_upload",
+                          "total", "validate"])
+        uploaded = sorted(call.kwargs["blob"].split("/")[0]
+                          for call in self.blob_storage.get_blob_client.call_args_list)
+        self.assertEqual(uploaded, ["extracted_data", "extracted_text"])
+
+
+class FakeOut:
+    """Stand-in voor func.Out: bewaart het bericht voor de volgende queue"""
+
+    def __init__(self):
+        self.value = None
+
+    def set(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+
+class TestDocumentJobRoutes(unittest.TestCase):
+    """Test cases voor de job routes en queue triggers met een lokale job store"""
+
+    def setUp(self):
+        services = {
+            "blob_storage": Mock(),
+            "conversion_cache": ConversionCache(MemoryCacheStore()),
+        }
+        patchers = [
+            patch.dict(azure_functions._services, services, clear=True),
+            patch.dict(os.environ, {"JOB_STORE_DIR": tempfile.mkdtemp()}),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(azure_functions.flush_uploads, 5)
+
+    def test_job_through_queue_triggers(self):
+        pdf_content = build_pdf(SAMPLE_ORDER_PAGES)
+
+        convert_queue = FakeOut()
+        response = azure_functions.submit_document_job(multipart_request("order.pdf", pdf_content), convert_queue)
+        submitted = json.loads(response.get_body())
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(submitted["status_url"], f"/api/jobs/{submitted['job_id']}")
+
+        extract_queue, validate_queue = FakeOut(), FakeOut()
+        azure_functions.process_convert_job(func.QueueMessage(body=convert_queue.get()), extract_queue)
+        azure_functions.process_extract_job(func.QueueMessage(body=extract_queue.get()), validate_queue)
+        azure_functions.process_validate_job(func.QueueMessage(body=validate_queue.get()))
+
+        response = azure_functions.get_document_job(func.HttpRequest(
+            "GET", f"/api/jobs/{submitted['job_id']}", route_params={"job_id": submitted["job_id"]}, body=b""
+        ))
+        job = json.loads(response.get_body())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(job["status"], "completed")
+        self.assertEqual(job["result"]["extracted_data"]["order_number"], "APO-12345")
+        self.assertIn("confidence_score", job["result"])
+
+    def test_unknown_job_returns_404(self):
+        response = azure_functions.get_document_job(func.HttpRequest(
+            "GET", "/api/jobs/onbekend", route_params={"job_id": "onbekend"}, body=b""
+        ))
+        self.assertEqual(response.status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+"""
+Unit tests voor batch conversie
+Tests voor het inlezen van PDFs/ZIPs en parallelle verwerking
+"""
+
+import unittest
+import io
+import json
+import threading
+import time
+import zipfile
+import sys
+import os
+
+# Add parent directory to path voor imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.batch_conversion import (
+    BatchError, iter_completed, read_batch_documents, summary_line, to_ndjson_line
+)
+
+
+def make_zip(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, content in members.items():
+            archive.writestr(name, content)
+    return buffer.getvalue()
+
+
+class TestReadBatchDocuments(unittest.TestCase):
+    """Test cases voor read_batch_documents"""
+
+    def test_loose_pdfs_and_zip(self):
+        """Test dat losse PDFs en PDFs uit een ZIP samen de batch vormen"""
+        archive = make_zip({"a.pdf": b"%PDF a", "map/b.PDF": b"%PDF b", "readme.txt": b"x", "map/": b""})
+        documents = read_batch_documents(
+            [("los.pdf", b"%PDF los"), ("orders.zip", archive)], 10, 10000
+        )
+
+        self.assertEqual(documents, [("los.pdf", b"%PDF los"), ("a.pdf", b"%PDF a"), ("map/b.PDF", b"%PDF b")])
+
+    def test_rejects_other_file_types(self):
+        """Test dat alleen PDF en ZIP geaccepteerd worden"""
+        with self.assertRaises(BatchError):
+            read_batch_documents([("order.docx", b"x")], 10, 10000)
+
+    def test_rejects_empty_batch(self):
+        """Test dat een batch zonder PDFs geweigerd wordt"""
+        with self.assertRaises(BatchError):
+            read_batch_documents([("leeg.zip", make_zip({"a.txt": b"x"}))], 10, 10000)
+
+    def test_limits(self):
+        """Test de limieten op aantal documenten en totale grootte"""
+        with self.assertRaises(BatchError):
+            read_batch_documents([("a.pdf", b"1"), ("b.pdf", b"2")], 1, 10000)
+        with self.assertRaises(BatchError):
+            read_batch_documents([("groot.zip", make_zip({"a.pdf": b"x" * 2000}))], 10, 1000)
+
+    def test_invalid_zip(self):
+        """Test dat een kapot ZIP bestand een BatchError geeft"""
+        with self.assertRaises(BatchError):
+            read_batch_documents([("kapot.zip", b"geen zip")], 10, 10000)
+
+
+class TestIterCompleted(unittest.TestCase):
+    """Test cases voor iter_completed"""
+
+    def test_results_in_completion_order(self):
+        """Test dat snelle documenten eerder terugkomen dan trage"""
+        delays = {"traag.pdf": 0.2, "snel.pdf": 0.0}
+
+        def convert(content, filename):
+            time.sleep(delays[filename])
+            return {"success": True, "text": content.decode()}
+
+        results = list(iter_completed([("traag.pdf", b"t"), ("snel.pdf", b"s")], convert, 2))
+
+        self.assertEqual([result["filename"] for result in results], ["snel.pdf", "traag.pdf"])
+        self.assertEqual([result["index"] for result in results], [1, 0])
+
+    def test_runs_concurrently(self):
+        """Test dat documenten gelijktijdig verwerkt worden"""
+        running = []
+        peak = []
+        lock = threading.Lock()
+
+        def convert(content, filename):
+            with lock:
+                running.append(filename)
+                peak.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.remove(filename)
+            return {"success": True}
+
+        list(iter_completed([(f"{i}.pdf", b"") for i in range(4)], convert, 4))
+        self.assertGreater(max(peak), 1)
+
+    def test_failure_is_reported_per_document(self):
+        """Test dat een fout in één document de batch niet stopt"""
+        def convert(content, filename):
+            if filename == "kapot.pdf":
+                raise ValueError("onleesbaar")
+            return {"success": True}
+
+        results = list(iter_completed([("kapot.pdf", b""), ("goed.pdf", b"")], convert, 2))
+        by_name = {result["filename"]: result for result in results}
+
+        self.assertFalse(by_name["kapot.pdf"]["success"])
+        self.assertIn("onleesbaar", by_name["kapot.pdf"]["error"])
+        self.assertTrue(by_name["goed.pdf"]["success"])
+        self.assertEqual(summary_line(results)["summary"], {"documents": 2, "succeeded": 1, "failed": 1})
+
+    def test_ndjson_line(self):
+        """Test dat elke regel één JSON object met newline is"""
+        line = to_ndjson_line({"index": 0, "text": "a\nb"})
+
+        self.assertTrue(line.endswith("\n"))
+        self.assertEqual(line.count("\n"), 1)
+        self.assertEqual(json.loads(line), {"index": 0, "text": "a\nb"})
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
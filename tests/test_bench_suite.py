@@ -0,0 +1,57 @@
+"""
+Unit tests voor de micro-benchmark suite (meten en regressievergelijking)
+"""
+
+import unittest
+import sys
+import os
+
+# Add parent and backend directory to path voor imports
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "backend"))
+
+from benchmarks.bench_suite import Case, build_cases, compare, measure_case
+
+
+def suite(**results):
+    return {"meta": {}, "results": results}
+
+
+class TestBenchSuite(unittest.TestCase):
+    """Test cases voor measure_case en compare"""
+
+    def test_measure_case_reports_percentiles_and_allocations(self):
+        case = Case("join", lambda parts: "".join(parts), lambda: (["x" * 1000] * 20,))
+
+        result = measure_case(case, seconds=0.05)
+
+        self.assertGreaterEqual(result["runs"], 5)
+        self.assertLessEqual(result["p50_us"], result["p95_us"])
+        self.assertLessEqual(result["p95_us"], result["p99_us"])
+        self.assertGreaterEqual(result["alloc_peak_bytes"], 20000)
+
+    def test_compare_flags_regressions_beyond_threshold(self):
+        baseline = suite(a={"p50_us": 100.0, "ops_per_sec": 1000.0, "alloc_peak_bytes": 50000},
+                         b={"p50_us": 100.0, "ops_per_sec": 1000.0, "alloc_peak_bytes": 100})
+        current = suite(a={"p50_us": 130.0, "ops_per_sec": 770.0, "alloc_peak_bytes": 51000},
+                        b={"p50_us": 110.0, "ops_per_sec": 910.0, "alloc_peak_bytes": 300},
+                        c={"p50_us": 1.0, "ops_per_sec": 1.0, "alloc_peak_bytes": 1})
+
+        rows = compare(baseline, current, threshold=0.2)
+
+        regressions = {(row["case"], row["metric"]) for row in rows if row["regression"]}
+        self.assertEqual(regressions, {("a", "p50_us"), ("a", "ops_per_sec")})
+        self.assertIn({"case": "c", "metric": None, "baseline": None, "current": None,
+                       "change": None, "regression": False}, rows)
+
+    def test_cases_cover_requested_functions(self):
+        names = {case.name.split("[")[0] for case in build_cases()}
+        self.assertEqual(names, {
+            "extract_structured_data", "validate_and_enrich_data", "calculate_confidence_score",
+            "extract_mock_data", "extract_text_with_pypdf2"
+        })
+
+
+if __name__ == '__main__':
+    unittest.main()
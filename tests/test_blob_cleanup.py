@@ -0,0 +1,209 @@
+"""
+Unit tests voor gepagineerde, gebatchte blob cleanup
+"""
+
+import threading
+import time
+import unittest
+import sys
+import os
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Add backend directory to path voor imports
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+import blob_cleanup
+from blob_cleanup import BATCH_DELETE_LIMIT, MAX_DELETE_ATTEMPTS, BlobCleaner
+from conversion_cache import MemoryCacheStore
+
+NOW = datetime(2024, 1, 15, 2, 0, tzinfo=timezone.utc)
+
+
+class FakePages:
+    """Stand-in voor ItemPaged.by_page: continuation token is de naam van de volgende blob"""
+
+    def __init__(self, container, prefix, page_size, token):
+        self.container = container
+        self.prefix = prefix
+        self.page_size = page_size
+        self.continuation_token = token
+        self._started = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._started and self.continuation_token is None:
+            raise StopIteration
+        self._started = True
+        with self.container.lock:
+            names = sorted(name for name in self.container.blobs
+                           if name.startswith(self.prefix) and name >= (self.continuation_token or ""))
+            page = [SimpleNamespace(name=name, last_modified=self.container.blobs[name])
+                    for name in names[:self.page_size]]
+        self.container.list_calls += 1
+        self.continuation_token = names[self.page_size] if len(names) > self.page_size else None
+        return iter(page)
+
+
+class FakeContainer:
+    """ContainerClient met list_blobs(...).by_page en delete_blobs (Blob Batch API)"""
+
+    def __init__(self, blobs, delay=0.0, fail_names=()):
+        self.blobs = dict(blobs)
+        self.delay = delay
+        self.fail_names = set(fail_names)
+        self.lock = threading.Lock()
+        self.list_calls = 0
+        self.batch_sizes = []
+        self.deleted = []
+        self.active = 0
+        self.max_active = 0
+
+    def list_blobs(self, name_starts_with, results_per_page):
+        container = self
+        return SimpleNamespace(by_page=lambda continuation_token=None: FakePages(
+            container, name_starts_with, results_per_page, continuation_token))
+
+    def delete_blobs(self, *names, raise_on_any_failure=True):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            self.batch_sizes.append(len(names))
+        time.sleep(self.delay)
+        responses = []
+        with self.lock:
+            for name in names:
+                if name in self.fail_names:
+                    responses.append(SimpleNamespace(status_code=500))
+                elif self.blobs.pop(name, None) is None:
+                    responses.append(SimpleNamespace(status_code=404))
+                else:
+                    self.deleted.append(name)
+                    responses.append(SimpleNamespace(status_code=202))
+            self.active -= 1
+        return responses
+
+
+def make_blobs(old, recent):
+    blobs = {f"temp/old_{number:05d}.pdf": NOW - timedelta(days=2) for number in range(old)}
+    blobs.update({f"temp/new_{number:05d}.pdf": NOW - timedelta(hours=1) for number in range(recent)})
+    blobs["extracted_text/keep.txt"] = NOW - timedelta(days=30)
+    return blobs
+
+
+def make_cleaner(container, **kwargs):
+    return BlobCleaner(container, "temp/", timedelta(days=1), now=lambda: NOW, **kwargs)
+
+
+class TestBlobCleaner(unittest.TestCase):
+    """Test cases voor BlobCleaner"""
+
+    def test_deletes_old_blobs_in_batches(self):
+        container = FakeContainer(make_blobs(old=1000, recent=50), delay=0.01)
+
+        stats = make_cleaner(container, page_size=300, max_concurrency=3).run()
+
+        self.assertEqual(len(container.deleted), 1000)
+        self.assertTrue(all(name.startswith("temp/old_") for name in container.deleted))
+        self.assertIn("extracted_text/keep.txt", container.blobs)
+        self.assertEqual((stats["scanned"], stats["deleted"], stats["failed"]), (1050, 1000, 0))
+        self.assertEqual(stats["pages"], 4)
+        self.assertTrue(stats["completed"])
+        self.assertLessEqual(max(container.batch_sizes), BATCH_DELETE_LIMIT)
+        self.assertLessEqual(container.max_active, 3)
+        self.assertGreater(stats["deleted_per_second"], 0)
+
+    def test_resumes_from_checkpoint(self):
+        """Test dat een run die door het tijdsbudget stopt de volgende keer verder gaat"""
+        container = FakeContainer(make_blobs(old=900, recent=0))
+        checkpoints = MemoryCacheStore()
+        ticks = iter(range(100))
+
+        first = make_cleaner(container, checkpoint_store=checkpoints, page_size=200,
+                             time_budget=1, clock=lambda: next(ticks)).run()
+
+        self.assertFalse(first["completed"])
+        self.assertEqual(first["scanned"], 200)
+        checkpoint = checkpoints.load("cleanup-temp")
+        self.assertEqual(checkpoint["continuation_token"], "temp/old_00200.pdf")
+
+        second = make_cleaner(container, checkpoint_store=checkpoints, page_size=200).run()
+
+        self.assertTrue(second["completed"])
+        self.assertTrue(second["resumed"])
+        self.assertEqual(second["scanned"], 700)
+        self.assertEqual(len(container.deleted), 900)
+        self.assertEqual(len(set(container.deleted)), 900)
+        self.assertIsNone(checkpoints.load("cleanup-temp"))
+
+    def test_failed_and_missing_blobs_are_counted(self):
+        container = FakeContainer(make_blobs(old=10, recent=0), fail_names=["temp/old_00003.pdf"])
+
+        stats = make_cleaner(container).run()
+
+        self.assertEqual((stats["deleted"], stats["failed"]), (9, 1))
+        self.assertIn("temp/old_00003.pdf", container.blobs)
+
+    def test_failed_deletes_are_retried_next_run(self):
+        """Test dat mislukte deletes in het checkpoint blijven terwijl het token verder schuift"""
+        container = FakeContainer(make_blobs(old=600, recent=0), fail_names=["temp/old_00003.pdf"])
+        checkpoints = MemoryCacheStore()
+
+        first = make_cleaner(container, checkpoint_store=checkpoints, page_size=200).run()
+
+        self.assertEqual((first["deleted"], first["failed"], first["completed"]), (599, 1, True))
+        checkpoint = checkpoints.load("cleanup-temp")
+        self.assertEqual((checkpoint["continuation_token"], checkpoint["failed"]), (None, {"temp/old_00003.pdf": 1}))
+
+        container.fail_names.clear()
+        second = make_cleaner(container, checkpoint_store=checkpoints, page_size=200).run()
+
+        self.assertEqual((second["retried"], second["deleted"], second["failed"]), (1, 1, 0))
+        self.assertNotIn("temp/old_00003.pdf", container.blobs)
+        self.assertIsNone(checkpoints.load("cleanup-temp"))
+
+    def test_permanent_failures_are_abandoned(self):
+        """Test dat een blob die blijft falen na MAX_DELETE_ATTEMPTS runs uit het checkpoint gaat"""
+        container = FakeContainer(make_blobs(old=3, recent=0), fail_names=["temp/old_00001.pdf"])
+        checkpoints = MemoryCacheStore()
+
+        runs = [make_cleaner(container, checkpoint_store=checkpoints).run() for _ in range(MAX_DELETE_ATTEMPTS)]
+
+        self.assertEqual([run["retried"] for run in runs], [0] + [1] * (MAX_DELETE_ATTEMPTS - 1))
+        self.assertIsNone(checkpoints.load("cleanup-temp"))
+        self.assertEqual((runs[-2]["abandoned"], runs[-1]["abandoned"]), (0, 1))
+        self.assertIn("temp/old_00001.pdf", container.blobs)
+
+    def test_overflow_names_are_counted(self):
+        container = FakeContainer(make_blobs(old=10, recent=0),
+                                  fail_names=[f"temp/old_{number:05d}.pdf" for number in range(5)])
+        checkpoints = MemoryCacheStore()
+
+        with patch.object(blob_cleanup, "MAX_FAILED_NAMES", 3):
+            stats = make_cleaner(container, checkpoint_store=checkpoints, page_size=4).run()
+
+        self.assertEqual((stats["failed"], stats["dropped"]), (5, 2))
+        self.assertEqual(len(checkpoints.load("cleanup-temp")["failed"]), 3)
+
+    def test_checkpoint_with_failed_list_is_read(self):
+        """Test dat een checkpoint met een lijst mislukte namen (oud formaat) nog gelezen wordt"""
+        container = FakeContainer(make_blobs(old=2, recent=0))
+        checkpoints = MemoryCacheStore()
+        checkpoints.save("cleanup-temp", {"prefix": "temp/", "continuation_token": None,
+                                          "failed": ["temp/old_00000.pdf"]})
+
+        stats = make_cleaner(container, checkpoint_store=checkpoints).run()
+
+        self.assertEqual((stats["retried"], stats["deleted"], stats["missing"]), (1, 2, 0))
+        self.assertIsNone(checkpoints.load("cleanup-temp"))
+
+    def test_batch_size_limit(self):
+        with self.assertRaises(ValueError):
+            make_cleaner(FakeContainer({}), batch_size=BATCH_DELETE_LIMIT + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+"""
+Unit tests voor write-behind blob uploads
+"""
+
+import threading
+import time
+import unittest
+import sys
+import os
+
+# Add backend directory to path voor imports
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+from blob_writer import WriteBehindUploader
+
+
+class RecordingStore:
+    """Fake upload functie die uploads bijhoudt en optioneel blokkeert of faalt"""
+
+    def __init__(self, delay=0.0, fail_names=()):
+        self.delay = delay
+        self.fail_names = set(fail_names)
+        self.release = threading.Event()
+        self.release.set()
+        self.blobs = {}
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, blob_name, content):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            self.release.wait()
+            time.sleep(self.delay)
+            if blob_name in self.fail_names:
+                raise IOError("storage niet bereikbaar")
+            with self._lock:
+                self.blobs[blob_name] = content
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+class TestWriteBehindUploader(unittest.TestCase):
+    """Test cases voor WriteBehindUploader"""
+
+    def test_submit_returns_before_upload(self):
+        """Test dat submit niet op de storage write wacht en flush de wachtrij leegt"""
+        store = RecordingStore()
+        store.release.clear()
+        uploader = WriteBehindUploader(store, max_workers=2)
+        self.addCleanup(uploader.shutdown)
+
+        uploader.submit("extracted_text/a.txt", "tekst")
+        self.assertEqual(store.blobs, {})
+        self.assertEqual(uploader.stats()["pending"], 1)
+        self.assertFalse(uploader.flush(timeout=0.05))
+
+        store.release.set()
+        self.assertTrue(uploader.flush(timeout=5))
+        self.assertEqual(store.blobs, {"extracted_text/a.txt": "tekst"})
+        self.assertEqual(uploader.stats(), {"queued": 1, "uploaded": 1, "failed": 0, "pending": 0})
+
+    def test_bounded_parallelism(self):
+        """Test dat nooit meer dan max_workers uploads tegelijk lopen"""
+        store = RecordingStore(delay=0.02)
+        uploader = WriteBehindUploader(store, max_workers=3)
+        self.addCleanup(uploader.shutdown)
+
+        for number in range(20):
+            uploader.submit(f"blob_{number}", b"data")
+        self.assertTrue(uploader.flush(timeout=10))
+
+        self.assertEqual(len(store.blobs), 20)
+        self.assertLessEqual(store.max_active, 3)
+        self.assertGreater(store.max_active, 1)
+
+    def test_backpressure_when_queue_full(self):
+        """Test dat submit blokkeert zodra max_pending uploads openstaan"""
+        store = RecordingStore()
+        store.release.clear()
+        uploader = WriteBehindUploader(store, max_workers=1, max_pending=2)
+        self.addCleanup(uploader.shutdown)
+        uploader.submit("a", "1")
+        uploader.submit("b", "2")
+
+        third = threading.Thread(target=uploader.submit, args=("c", "3"))
+        third.start()
+        third.join(timeout=0.1)
+        self.assertTrue(third.is_alive())
+
+        store.release.set()
+        third.join(timeout=5)
+        self.assertTrue(uploader.flush(timeout=5))
+        self.assertEqual(sorted(store.blobs), ["a", "b", "c"])
+
+    def test_failures_are_counted_not_raised(self):
+        store = RecordingStore(fail_names=["kapot"])
+        uploader = WriteBehindUploader(store)
+        self.addCleanup(uploader.shutdown)
+
+        uploader.submit("kapot", "x")
+        uploader.submit("heel", "y")
+        uploader.flush(timeout=5)
+
+        stats = uploader.stats()
+        self.assertEqual((stats["uploaded"], stats["failed"]), (1, 1))
+
+    def test_synchronous_mode(self):
+        """Test dat write-behind uit te zetten is: upload gebeurt in submit"""
+        store = RecordingStore()
+        uploader = WriteBehindUploader(store, synchronous=True)
+
+        uploader.submit("direct", "z")
+        self.assertEqual(store.blobs, {"direct": "z"})
+        self.assertEqual(uploader.stats()["queued"], 0)
+
+    def test_shutdown_drains_queue(self):
+        store = RecordingStore(delay=0.01)
+        uploader = WriteBehindUploader(store, max_workers=2)
+        for number in range(5):
+            uploader.submit(f"blob_{number}", "data")
+
+        self.assertTrue(uploader.shutdown(timeout=5))
+        self.assertEqual(len(store.blobs), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+"""
+Unit tests voor de conversie cache
+Tests voor TTL, eviction, hit/miss tellers en de stores
+"""
+
+import unittest
+import tempfile
+from unittest.mock import patch
+import shutil
+import sys
+import os
+
+# Add parent directory to path voor imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.conversion_cache import (
+    ConversionCache, LocalCacheStore, MemoryCacheStore, content_hash
+)
+
+
+class FakeClock:
+    """Handmatig te verzetten klok"""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class BrokenStore:
+    """Store die altijd faalt"""
+
+    def load(self, key):
+        raise IOError("storage down")
+
+    def save(self, key, entry):
+        raise IOError("storage down")
+
+
+class TestConversionCache(unittest.TestCase):
+    """Test cases voor ConversionCache"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = ConversionCache(MemoryCacheStore(), ttl_seconds=60, clock=self.clock)
+        self.key = content_hash(b"%PDF-1.4 inkooporder")
+
+    def test_content_hash_is_sha256(self):
+        """Test dat de sleutel de SHA-256 hex digest is"""
+        self.assertEqual(
+            content_hash(b"abc"),
+            "ba7816bf8f01cfea414140de5dae2223b00361a396177a9cb410ff61f20015ad"
+        )
+
+    def test_miss_then_hit(self):
+        """Test dat een opgeslagen resultaat bij de volgende lookup een hit is"""
+        self.assertIsNone(self.cache.get(self.key))
+
+        self.cache.put(self.key, {"text": "Order Number: APO-1"})
+        self.assertEqual(self.cache.get(self.key), {"text": "Order Number: APO-1"})
+
+        stats = self.cache.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["writes"], 1)
+        self.assertEqual(stats["hit_ratio"], 0.5)
+
+    def test_entry_expires_after_ttl(self):
+        """Test dat entries na de TTL als miss gelden en verwijderd worden"""
+        self.cache.put(self.key, {"text": "oud"})
+        self.clock.now += 61
+
+        self.assertIsNone(self.cache.get(self.key))
+        self.assertEqual(self.cache.stats()["expired"], 1)
+        self.assertEqual(self.cache.store.keys(), [])
+
+    def test_evict_expired(self):
+        """Test dat evict_expired alleen verlopen entries verwijdert"""
+        self.cache.put("oud", {"text": "a"})
+        self.clock.now += 50
+        self.cache.put("nieuw", {"text": "b"})
+        self.clock.now += 20
+
+        self.assertEqual(self.cache.evict_expired(), 1)
+        self.assertEqual(self.cache.store.keys(), ["nieuw"])
+
+    def test_memory_store_lru_eviction(self):
+        """Test dat de memory store de minst recent gebruikte entry verwijdert"""
+        cache = ConversionCache(MemoryCacheStore(max_entries=2), clock=self.clock)
+        cache.put("a", {"text": "a"})
+        cache.put("b", {"text": "b"})
+        cache.get("a")
+        cache.put("c", {"text": "c"})
+
+        self.assertEqual(sorted(cache.store.keys()), ["a", "c"])
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_store_errors_are_misses(self):
+        """Test dat fouten in de store de conversie niet laten mislukken"""
+        cache = ConversionCache(BrokenStore())
+
+        self.assertIsNone(cache.get(self.key))
+        cache.put(self.key, {"text": "x"})
+        self.assertEqual(cache.stats()["errors"], 2)
+
+
+class TestLocalCacheStore(unittest.TestCase):
+    """Test cases voor LocalCacheStore"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_persists_between_instances(self):
+        """Test dat entries bewaard blijven voor een nieuwe cache instance"""
+        key = content_hash(b"pdf")
+        ConversionCache(LocalCacheStore(self.directory)).put(key, {"text": "tekst", "routing": {"counts": {}}})
+
+        cache = ConversionCache(LocalCacheStore(self.directory))
+        self.assertEqual(cache.get(key), {"text": "tekst", "routing": {"counts": {}}})
+
+    def test_max_entries(self):
+        """Test dat de oudste bestanden verwijderd worden boven max_entries"""
+        store = LocalCacheStore(self.directory, max_entries=2)
+        for index, key in enumerate(["a", "b", "c"]):
+            store.save(key, {"created_at": 0, "result": {}})
+            os.utime(os.path.join(self.directory, f"{key}.json"), (index, index))
+
+        self.assertEqual(sorted(store.keys()), ["b", "c"])
+
+    def test_prunes_below_limit_without_listing_every_save(self):
+        """Test dat er pas boven max_entries gelist wordt en dan tot onder de grens gesnoeid"""
+        store = LocalCacheStore(self.directory, max_entries=10, prune_ratio=0.5)
+        for index in range(10):
+            store.save(f"k{index}", {"created_at": 0, "result": {}})
+            os.utime(os.path.join(self.directory, f"k{index}.json"), (index, index))
+
+        with patch.object(store, "keys", wraps=store.keys) as keys:
+            store.save("k3", {"created_at": 0, "result": {}})
+            self.assertEqual(keys.call_count, 0)
+            self.assertEqual(store.save("k10", {"created_at": 0, "result": {}}), 6)
+            self.assertEqual(keys.call_count, 1)
+
+        self.assertEqual(sorted(store.keys()), ["k10", "k3", "k7", "k8", "k9"])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,140 @@
+"""
+Unit tests voor de lokale stand-in Function App en blob storage
+"""
+
+import json
+import os
+import tempfile
+import time
+import unittest
+import sys
+from datetime import timedelta
+from unittest.mock import patch
+
+import requests
+
+# Add parent and backend directory to path voor imports
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "backend"))
+
+import azure_functions
+from azure.core.exceptions import ResourceNotFoundError
+from benchmarks.pdf_builder import SAMPLE_ORDER_PAGES, build_pdf
+from blob_cleanup import BlobCleaner
+from devserver.faults import Fault, FaultInjector
+from devserver.function_app import FunctionAppServer, route_pattern
+from devserver.local_blob_storage import LocalBlobServiceClient
+from services.azure_client import AzureFunctionsClient
+from services.http_transport import FunctionHttpTransport
+from services.resilience import ResilientCaller, RetryPolicy
+
+
+class TestLocalBlobStorage(unittest.TestCase):
+    """Test cases voor de directory-gebaseerde blob storage"""
+
+    def setUp(self):
+        self.container = LocalBlobServiceClient(tempfile.mkdtemp()).get_container_client("documents")
+
+    def test_upload_download_delete(self):
+        self.container.upload_blob("temp/a.txt", "tekst", overwrite=True)
+        self.container.get_blob_client("temp/b.bin").upload_blob(b"\x00\x01")
+
+        self.assertEqual(self.container.download_blob("temp/a.txt").readall(), b"tekst")
+        self.assertEqual([blob.name for blob in self.container.list_blobs(name_starts_with="temp/")],
+                         ["temp/a.txt", "temp/b.bin"])
+
+        responses = self.container.delete_blobs("temp/a.txt", "temp/onbekend", raise_on_any_failure=False)
+        self.assertEqual([response.status_code for response in responses], [202, 404])
+        with self.assertRaises(ResourceNotFoundError):
+            self.container.download_blob("temp/a.txt")
+
+    def test_cleanup_pages_through_local_container(self):
+        """Test dat BlobCleaner met paginering en checkpoint tegen de lokale container werkt"""
+        for number in range(7):
+            self.container.upload_blob(f"temp/{number}.txt", "oud", overwrite=True)
+        old = time.time() - 48 * 3600
+        for number in range(5):
+            os.utime(os.path.join(self.container.directory, "temp", f"{number}.txt"), (old, old))
+
+        stats = BlobCleaner(self.container, prefix="temp/", max_age=timedelta(hours=24),
+                            batch_size=2, page_size=3).run()
+
+        self.assertEqual((stats["scanned"], stats["deleted"], stats["pages"]), (7, 5, 3))
+        self.assertEqual(self.container.blob_names("temp/"), ["temp/5.txt", "temp/6.txt"])
+
+    def test_route_pattern(self):
+        self.assertEqual(route_pattern("jobs/{job_id}").match("jobs/abc").groupdict(), {"job_id": "abc"})
+        self.assertIsNone(route_pattern("jobs").match("jobs/abc"))
+
+
+class TestFunctionAppServer(unittest.TestCase):
+    """Test cases voor AzureFunctionsClient tegen de lokale Function App"""
+
+    def setUp(self):
+        patcher = patch.dict(azure_functions._services, {}, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.pdf_content = build_pdf(SAMPLE_ORDER_PAGES)
+
+    def start_server(self, **kwargs):
+        server = FunctionAppServer(**kwargs).start()
+        self.addCleanup(server.stop)
+        transport = FunctionHttpTransport(server.url, resilience=ResilientCaller(
+            RetryPolicy(max_attempts=3, base_delay=0.01), seed=1
+        ))
+        self.addCleanup(transport.close)
+        return server, AzureFunctionsClient(server.url, transport=transport)
+
+    def test_routes_and_blobs_in_storage_dir(self):
+        server, client = self.start_server()
+
+        result = client.process_document(self.pdf_content, "order.pdf")
+        extracted = client.extract_purchase_order_data("Order Number: APO-1\nSupplier: HSO Test")
+        azure_functions.flush_uploads(5)
+
+        self.assertEqual(result["extracted_data"]["order_number"], "APO-12345")
+        self.assertEqual(extracted["extracted_data"]["order_number"], "APO-1")
+        container = server.blob_service.get_container_client("documents")
+        prefixes = {name.split("/")[0] for name in container.blob_names()}
+        self.assertTrue({"extracted_text", "extracted_data", "cache"} <= prefixes)
+        self.assertEqual(requests.get(f"{server.url}/api/conversion_cache_stats").status_code, 200)
+        self.assertEqual(requests.get(f"{server.url}/api/onbekend").status_code, 404)
+        self.assertEqual(requests.get(f"{server.url}/api/process_document").status_code, 405)
+
+    def test_jobs_run_through_queue_workers(self):
+        server, client = self.start_server()
+
+        submitted = client.submit_document(self.pdf_content, "order.pdf")
+        status = client.wait_for_document(submitted["document_id"], timeout=10)
+
+        self.assertEqual(status["status"], "completed")
+        self.assertEqual(status["result"]["extracted_data"]["order_number"], "APO-12345")
+        self.assertEqual(sum(server.queue_depths().values()), 0)
+
+    def test_scanned_pdf_uses_fake_ocr(self):
+        server, client = self.start_server(cv_processing_seconds=0.05)
+        scanned = build_pdf([[], []], scan_bytes_per_page=1024)
+
+        result = client.convert_pdf_to_text(scanned, "scan.pdf")
+
+        self.assertTrue(result["success"])
+        self.assertIn("Fake OCR page 1", result["text"])
+        self.assertEqual(len(server.cv_server.operations), 1)
+
+    def test_fault_injection(self):
+        faults = FaultInjector(script=[Fault(status=503), Fault(delay=0.2)])
+        server, client = self.start_server(faults=faults)
+
+        result = client.extract_purchase_order_data("Order Number: APO-1")
+
+        self.assertTrue(result["success"])
+        self.assertEqual([entry["status"] for entry in server.requests], [503, 200])
+        self.assertGreaterEqual(server.requests[-1]["seconds"], 0.2)
+        self.assertEqual(json.loads(requests.post(
+            f"{server.url}/api/extract_purchase_order_data", json={"text": "x"}
+        ).content)["success"], True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+"""
+Unit tests voor de extractie engine
+Controleert dat de engine exact hetzelfde resultaat geeft als de
+oorspronkelijke regex extractie
+"""
+
+import unittest
+import random
+import sys
+import os
+
+# Add parent and backend directory to path voor imports
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "backend"))
+
+from benchmarks.bench_extraction import extract_fields_reference
+from extraction_engine import FIELD_RULES, extract_fields
+
+SAMPLE_TEXT = """
+PURCHASE ORDER
+
+Order Number: APO-00199
+Date: 2024-01-15
+Supplier: JASA Packaging Solutions B.V.
+
+Items:
+- Premium Packaging Boxes (Large): 100 units @ €25.00 = €2500.00
+- Bubble Wrap Rolls (50m): 50 units @ €15.00 = €750.00
+* Shipping Labels: 5 units @ €12.50 = €62.50
+• Tape Dispenser: 2 units @ €8.75 = €17.50
+
+Subtotal: €3330.00
+VAT (21%): €699.30
+Total: €4029.30
+"""
+
+
+class TestExtractionEngine(unittest.TestCase):
+    """Test cases voor extract_fields"""
+
+    def assertSameAsReference(self, text):
+        self.assertEqual(extract_fields(text), extract_fields_reference(text), repr(text))
+
+    def test_sample_purchase_order(self):
+        """Test extractie van een volledige inkooporder"""
+        data = extract_fields(SAMPLE_TEXT)
+
+        self.assertEqual(data["order_number"], "APO-00199")
+        self.assertEqual(data["date"], "2024-01-15")
+        self.assertEqual(data["supplier"], "JASA Packaging Solutions B.V.")
+        self.assertEqual(len(data["items"]), 4)
+        self.assertEqual(data["vat_rate"], 0.21)
+        self.assertSameAsReference(SAMPLE_TEXT)
+
+    def test_empty_text(self):
+        """Test dat lege tekst een leeg resultaat geeft"""
+        data = extract_fields("")
+
+        self.assertIsNone(data["order_number"])
+        self.assertEqual(data["items"], [])
+        self.assertEqual(data["delivery_address"], {})
+        self.assertSameAsReference("")
+
+    def test_rule_priority(self):
+        """Test dat een regel met hogere prioriteit wint, ook als hij later in de tekst staat"""
+        cases = [
+            "PO: FIRST-1\nPurchase Order: SECOND-2\nOrder Number: THIRD-3",
+            "Vendor: Later B.V.\nSupplier: Eerder B.V.",
+            "01-02-2024\nDate: 15/01/2024\nDate: 2024-01-15",
+            "Purchase Order Number: 12345",
+            "Expo: ABC\nUpdate: 2024-03-04",
+        ]
+
+        for text in cases:
+            self.assertSameAsReference(text)
+
+        data = extract_fields(cases[0])
+        self.assertEqual(data["order_number"], "THIRD-3")
+
+    def test_overlapping_keywords(self):
+        """Test sleutelwoorden die in andere woorden voorkomen"""
+        cases = [
+            "Subtotal: €100.00\nTotal: €121.00",
+            "Grand total: €5\nSubtotal 7",
+            "Private label: 3 units @ €1 = €3\nVAT (9%): €0.27",
+            "- Foo-Bar: 5 units @ €1 = €5\n- Baz: 1 unit @ 2 = 2",
+        ]
+
+        for text in cases:
+            self.assertSameAsReference(text)
+
+    def test_case_folding_edge_cases(self):
+        """Test tekens waarvoor lowercase en IGNORECASE van elkaar verschillen"""
+        cases = [
+            "ſupplier: Lange S B.V.\nTOTAL: 10",
+            "Supplıer: Dotless B.V.",
+            "İtem\nSupplier: Dotted B.V.\nOrder Number: A-1",
+            "ORDER NUMBER: K-1\nVAT (21%): 2.10",
+        ]
+
+        for text in cases:
+            self.assertSameAsReference(text)
+
+    def test_randomized_parity(self):
+        """Test pariteit met de referentie op willekeurig samengestelde teksten"""
+        fragments = [
+            "Order Number: APO-1", "order number apo-2", "Purchase Order: PO-3", "po: X4",
+            "Date: 2024-01-15", "date 15/01/2024", "12-05-2024", "Supplier: A B.V.",
+            "Vendor: C", "- Item: 2 units @ €3.50 = €7.00", "* Other: 1 unit @ 4 = 4",
+            "Subtotal: €7.00", "VAT (21%): €1.47", "Total: €8.47", "Postbus 1234",
+            "Expo", "subtotaal", ":", "-", "\n", " ", "€", "ſ", "İ", "ı",
+        ]
+        rng = random.Random(1234)
+
+        for _ in range(300):
+            text = "".join(rng.choice(fragments) + rng.choice(["", " ", "\n"]) for _ in range(rng.randint(1, 25)))
+            self.assertSameAsReference(text)
+
+    def test_rules_are_precompiled(self):
+        """Test dat alle regels bij import gecompileerd zijn"""
+        for rule in FIELD_RULES:
+            self.assertTrue(hasattr(rule.pattern, "search"))
+            if rule.anchor is not None:
+                self.assertTrue(rule.pattern.pattern.startswith(rule.anchor))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,37 @@
+"""
+Unit tests voor de gedeelde HTTP header parsing
+"""
+
+import unittest
+import sys
+import os
+from email.utils import formatdate
+
+# Add parent and backend directory to path voor imports
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "backend"))
+
+from http_headers import parse_retry_after
+
+
+class TestRetryAfter(unittest.TestCase):
+    """Test cases voor parse_retry_after"""
+
+    def test_seconds(self):
+        self.assertEqual(parse_retry_after("2"), 2.0)
+        self.assertEqual(parse_retry_after("0.5"), 0.5)
+
+    def test_http_date(self):
+        """Test dat een HTTP datum wordt omgezet naar seconden vanaf nu"""
+        now = 1_700_000_000.0
+        value = formatdate(now + 30, usegmt=True)
+        self.assertAlmostEqual(parse_retry_after(value, now=lambda: now), 30.0, places=0)
+
+    def test_missing_or_invalid(self):
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after("soon"))
+
+
+if __name__ == '__main__':
+    unittest.main()
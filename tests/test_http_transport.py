@@ -0,0 +1,210 @@
+"""
+Unit tests voor de gepoolde HTTP transport tegen de lokale stand-in Function App
+"""
+
+import gzip
+import json
+import tempfile
+import threading
+import unittest
+import sys
+import os
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+# Add parent and backend directory to path voor imports
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "backend"))
+
+import azure.functions as func
+
+import azure_functions
+from benchmarks.pdf_builder import SAMPLE_ORDER_PAGES, build_pdf
+from conversion_cache import ConversionCache, MemoryCacheStore
+from devserver.function_app import FunctionAppServer
+from services.azure_client import AzureFunctionsClient, get_azure_client
+from services.http_transport import FunctionHttpTransport, MultipartStream, get_transport
+from services.resilience import ResilientCaller, RetryPolicy
+
+
+class TestMultipartStream(unittest.TestCase):
+    """Test cases voor de streaming multipart body"""
+
+    def test_body_matches_manual_multipart(self):
+        content = bytes(range(256)) * 5000
+        body = MultipartStream([("file", "a.pdf", content), ("file", "b.pdf", b"%PDF")], boundary="b")
+        expected = (
+            b"--b\r\nContent-Disposition: form-data; name=\"file\"; filename=\"a.pdf\"\r\n"
+            b"Content-Type: application/pdf\r\n\r\n" + content + b"\r\n"
+            b"--b\r\nContent-Disposition: form-data; name=\"file\"; filename=\"b.pdf\"\r\n"
+            b"Content-Type: application/pdf\r\n\r\n%PDF\r\n--b--\r\n"
+        )
+
+        chunks = list(body)
+
+        self.assertEqual(len(body), len(expected))
+        self.assertEqual(b"".join(chunks), expected)
+        self.assertGreater(len(chunks), 1)
+
+    def test_filename_is_escaped(self):
+        """Test dat quotes en CR/LF in de bestandsnaam geen headers of velden toevoegen"""
+        filename = 'order "1"\\\r\nContent-Type: text/html.pdf'
+        body = MultipartStream([("file", filename, b"%PDF")], boundary="b")
+        payload = body.read()
+
+        self.assertIn(b'filename="order \\"1\\"\\\\Content-Type: text/html.pdf"\r\n', payload)
+        request = func.HttpRequest("POST", "/api/convert_pdf_to_text",
+                                   headers={"Content-Type": body.content_type}, body=payload)
+        files = request.files.getlist("file")
+        self.assertEqual([file.filename for file in files], ['order "1"\\Content-Type: text/html.pdf'])
+        self.assertEqual(files[0].content_type, "application/pdf")
+        self.assertEqual(files[0].read(), b"%PDF")
+
+
+class TestFunctionHttpTransport(unittest.TestCase):
+    """Test cases voor AzureFunctionsClient met de gedeelde sessie tegen de lokale server"""
+
+    def setUp(self):
+        services = {"conversion_cache": ConversionCache(MemoryCacheStore())}
+        patchers = [
+            patch.dict(azure_functions._services, services, clear=True),
+            patch.dict(os.environ, {"JOB_STORE_DIR": tempfile.mkdtemp()}),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.server = FunctionAppServer().start()
+        self.addCleanup(self.server.stop)
+        self.pdf_content = build_pdf(SAMPLE_ORDER_PAGES)
+
+    def make_client(self, **kwargs):
+        transport = FunctionHttpTransport(self.server.url, function_key="test-key", **kwargs)
+        self.addCleanup(transport.close)
+        return AzureFunctionsClient(self.server.url, transport=transport)
+
+    def test_keep_alive_reuses_connection(self):
+        client = self.make_client()
+
+        for number in range(5):
+            result = client.convert_pdf_to_text(self.pdf_content + str(number).encode(), "order.pdf")
+            self.assertIn("APO-12345", result["text"])
+
+        self.assertEqual(len({request["port"] for request in self.server.requests}), 1)
+        self.assertEqual(self.server.requests[0]["headers"]["x-functions-key"], "test-key")
+
+    def test_pool_size_limits_connections(self):
+        client = self.make_client(pool_size=2)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(
+                lambda number: client.convert_pdf_to_text(self.pdf_content + str(number).encode(), "order.pdf"),
+                range(16)
+            ))
+
+        self.assertTrue(all(result["success"] for result in results))
+        self.assertLessEqual(len({request["port"] for request in self.server.requests}), 2)
+
+    def test_gzip_request_and_response(self):
+        client = self.make_client(gzip_min_bytes=100)
+        text = "Order Number: APO-12345\nSupplier: HSO Test\n" + "Regel zonder data\n" * 2000
+
+        result = client.extract_purchase_order_data(text)
+
+        self.assertTrue(result["success"])
+        self.assertEqual(result["extracted_data"]["order_number"], "APO-12345")
+        request = self.server.requests[-1]
+        self.assertEqual(request["headers"]["Content-Encoding"], "gzip")
+        self.assertLess(request["size"], len(json.dumps({"text": text})) / 10)
+
+        with patch.object(azure_functions, "GZIP_MIN_BYTES", 100):
+            response = azure_functions.extract_purchase_order_data(func.HttpRequest(
+                "POST", "/api/extract_purchase_order_data", headers={"Accept-Encoding": "gzip"},
+                body=json.dumps({"text": text}).encode()
+            ))
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertTrue(json.loads(gzip.decompress(response.get_body()))["success"])
+
+    def test_streaming_upload_has_content_length(self):
+        """Test dat een grote PDF in blokken met Content-Length (niet chunked) verstuurd wordt"""
+        large_pdf = build_pdf([["PURCHASE ORDER", "Order Number: APO-77777", "Date: 2024-01-15"]],
+                              scan_bytes_per_page=2 * 1024 * 1024)
+        client = self.make_client()
+
+        result = client.process_document(large_pdf, "scan.pdf", include_text=True)
+
+        self.assertEqual(result["extracted_data"]["order_number"], "APO-77777")
+        self.assertIn("APO-77777", result["text"])
+        headers = self.server.requests[-1]["headers"]
+        self.assertNotIn("Transfer-Encoding", headers)
+        self.assertGreater(int(headers["Content-Length"]), len(large_pdf))
+
+    def test_batch_and_jobs_over_http(self):
+        client = self.make_client()
+        documents = [(self.pdf_content + str(number).encode(), f"order_{number}.pdf") for number in range(3)]
+
+        results = list(client.convert_pdf_batch(documents))
+        self.assertEqual(sorted(result["filename"] for result in results), [name for _, name in documents])
+
+        submitted = client.submit_document(self.pdf_content, "order.pdf")
+        status = client.wait_for_document(submitted["document_id"], timeout=5)
+        self.assertEqual(status["status"], "completed")
+        self.assertEqual(status["result"]["extracted_data"]["order_number"], "APO-12345")
+        self.assertEqual(client.get_document_status("onbekend")["status"], "not_found")
+
+    def test_batch_lines_arrive_before_slow_document(self):
+        """Test dat de eerste NDJSON regel binnen is terwijl een trage PDF nog loopt"""
+        client = self.make_client()
+        release = threading.Event()
+        slow_finished = threading.Event()
+        convert = azure_functions.convert_pdf_document
+
+        def convert_pdf_document(content, filename):
+            if filename == "slow.pdf":
+                release.wait(10)
+                slow_finished.set()
+            return convert(content, filename)
+
+        documents = [(self.pdf_content, "slow.pdf"), (self.pdf_content + b"1", "fast.pdf")]
+        with patch.object(azure_functions, "convert_pdf_document", side_effect=convert_pdf_document):
+            results = client.convert_pdf_batch(documents)
+            first = next(results)
+            self.assertFalse(slow_finished.is_set())
+            release.set()
+            rest = list(results)
+
+        self.assertEqual(first["filename"], "fast.pdf")
+        self.assertEqual([result["filename"] for result in rest], ["slow.pdf"])
+        self.assertTrue(all(result["success"] for result in [first] + rest))
+        self.assertEqual(self.server.requests[-1]["status"], 200)
+
+    def test_factory_returns_http_client(self):
+        self.assertIsInstance(get_azure_client(use_mock=False), AzureFunctionsClient)
+
+
+
+class TestGetTransport(unittest.TestCase):
+    """Test cases voor de gedeelde transports per instellingen"""
+
+    def test_settings_are_part_of_the_key(self):
+        url = "http://transport-key.invalid"
+        first = get_transport(url, timeout=5, resilience=ResilientCaller(RetryPolicy(max_attempts=2)))
+
+        # Gelijke instellingen delen transport en resilience (circuit breakers)
+        same = get_transport(url + "/", timeout=5, resilience=ResilientCaller(RetryPolicy(max_attempts=2)))
+        self.assertIs(same, first)
+
+        for other in (get_transport(url, timeout=30, resilience=ResilientCaller(RetryPolicy(max_attempts=2))),
+                      get_transport(url, timeout=5, gzip_min_bytes=1,
+                                    resilience=ResilientCaller(RetryPolicy(max_attempts=2))),
+                      get_transport(url, timeout=5, resilience=ResilientCaller(RetryPolicy(max_attempts=4)))):
+            self.assertIsNot(other, first)
+
+        transport = get_transport(url, timeout=5, gzip_min_bytes=1,
+                                  resilience=ResilientCaller(RetryPolicy(max_attempts=4)))
+        self.assertEqual((transport.timeout, transport.gzip_min_bytes, transport.resilience.policy.max_attempts),
+                         (5, 1, 4))
+        self.assertIs(get_transport(url), get_transport(url, resilience=ResilientCaller()))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,195 @@
+"""
+Unit tests voor de job pipeline (convert → extract → validate via queues)
+"""
+
+import tempfile
+import threading
+import unittest
+import sys
+import os
+
+# Add parent and backend directory to path voor imports
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "backend"))
+
+from conversion_cache import LocalCacheStore, MemoryCacheStore
+from job_pipeline import (
+    JobPipeline, LocalPayloadStore, LocalPipelineRunner, MemoryPayloadStore, MemoryQueue, is_transient_error
+)
+
+
+class RecordingStages:
+    """Fake stappen die aanroepen tellen en optioneel falen"""
+
+    def __init__(self, fail_stage=None, error=IOError, failures=None):
+        self.fail_stage = fail_stage
+        self.error = error
+        self.failures = failures
+        self.calls = {"convert": 0, "extract": 0, "validate": 0}
+
+    def _call(self, stage):
+        self.calls[stage] += 1
+        if stage == self.fail_stage and (self.failures is None or self.calls[stage] <= self.failures):
+            raise self.error(f"{stage} niet bereikbaar")
+
+    def convert(self, content, filename):
+        self._call("convert")
+        return {"success": True, "text": bytes(content).decode() + f" ({filename})"}
+
+    def extract(self, text):
+        self._call("extract")
+        return {"success": True, "extracted_data": {"order_number": text.split()[0]}}
+
+    def validate(self, data):
+        self._call("validate")
+        return {"extracted_data": data, "confidence_score": 0.25}
+
+
+def make_pipeline(stages, jobs=None, payloads=None):
+    return JobPipeline(
+        jobs or MemoryCacheStore(max_entries=0),
+        payloads or MemoryPayloadStore(),
+        convert=stages.convert,
+        extract=stages.extract,
+        validate=stages.validate
+    )
+
+
+class TestJobPipeline(unittest.TestCase):
+    """Test cases voor JobPipeline en LocalPipelineRunner"""
+
+    def test_job_runs_through_all_stages(self):
+        stages = RecordingStages()
+        runner = LocalPipelineRunner(make_pipeline(stages))
+
+        job = runner.submit(b"APO-00042 order", "order.pdf")
+        self.assertEqual(job["status"], "queued")
+        self.assertEqual(len(runner.queues["convert"]), 1)
+
+        self.assertEqual(runner.run_until_idle(), 3)
+        status = runner.pipeline.status(job["job_id"])
+
+        self.assertEqual(status["status"], "completed")
+        self.assertEqual(set(status["processing_steps"].values()), {"completed"})
+        self.assertEqual(status["result"]["extracted_data"], {"order_number": "APO-00042"})
+        self.assertEqual(sorted(status["timings"]), ["convert", "extract", "validate"])
+        self.assertIsNone(status["error"])
+
+    def test_stage_failure_marks_job_failed(self):
+        stages = RecordingStages(fail_stage="extract")
+        runner = LocalPipelineRunner(make_pipeline(stages))
+        job = runner.submit(b"APO-1", "order.pdf")
+
+        runner.run_until_idle()
+        status = runner.pipeline.status(job["job_id"])
+
+        self.assertEqual(status["status"], "failed")
+        self.assertEqual(status["processing_steps"]["extract"], "failed")
+        self.assertEqual(status["processing_steps"]["validate"], "pending")
+        self.assertIn("extract niet bereikbaar", status["error"])
+        self.assertEqual(stages.calls["validate"], 0)
+        # Permanente fout: geen nieuwe afleveringen, payloads opgeruimd
+        self.assertEqual(stages.calls["extract"], 1)
+        with self.assertRaises(KeyError):
+            runner.pipeline.payloads.get(f"{job['job_id']}/input.pdf")
+
+    def test_transient_failure_is_redelivered(self):
+        """Test dat een tijdelijke fout het bericht terug naar de queue stuurt in plaats van de job te laten falen"""
+        stages = RecordingStages(fail_stage="convert", error=ConnectionError, failures=2)
+        pipeline = make_pipeline(stages)
+        job, message = pipeline.create_job(b"APO-3", "order.pdf")
+
+        with self.assertRaises(ConnectionError):
+            pipeline.handle(message, dequeue_count=1)
+        status = pipeline.status(job["job_id"])
+        self.assertEqual((status["status"], status["processing_steps"]["convert"]), ("queued", "pending"))
+
+        runner = LocalPipelineRunner(pipeline)
+        runner.queues["convert"].send(dict(message, dequeue_count=2))
+        runner.run_until_idle()
+
+        self.assertEqual(pipeline.status(job["job_id"])["status"], "completed")
+        self.assertEqual(stages.calls["convert"], 3)
+
+    def test_transient_failure_fails_after_last_delivery(self):
+        stages = RecordingStages(fail_stage="extract", error=TimeoutError)
+        runner = LocalPipelineRunner(make_pipeline(stages))
+        job = runner.submit(b"APO-4", "order.pdf")
+
+        runner.run_until_idle()
+        status = runner.pipeline.status(job["job_id"])
+
+        self.assertEqual(status["status"], "failed")
+        self.assertEqual(stages.calls["extract"], runner.pipeline.max_dequeue_count)
+
+    def test_transient_error_classification(self):
+        import requests
+        from azure.core.exceptions import HttpResponseError, ResourceNotFoundError
+
+        def http_error(status):
+            response = requests.Response()
+            response.status_code = status
+            return requests.HTTPError(response=response)
+
+        throttled = HttpResponseError("throttled")
+        throttled.status_code = 429
+        missing = ResourceNotFoundError("missing")
+        missing.status_code = 404
+
+        for error in (ConnectionError(), TimeoutError(), requests.ConnectTimeout(), http_error(503), throttled):
+            self.assertTrue(is_transient_error(error), error)
+        for error in (IOError(), ValueError(), http_error(400), missing):
+            self.assertFalse(is_transient_error(error), error)
+
+    def test_redelivered_message_is_skipped(self):
+        """Test dat een opnieuw afgeleverd queue bericht de stap niet nog eens uitvoert"""
+        stages = RecordingStages()
+        pipeline = make_pipeline(stages)
+        job, message = pipeline.create_job(b"APO-7", "order.pdf")
+
+        next_message = pipeline.handle(message)
+        self.assertEqual(next_message, {"job_id": job["job_id"], "stage": "extract"})
+        self.assertIsNone(pipeline.handle(message))
+        self.assertEqual(stages.calls["convert"], 1)
+
+    def test_unknown_job(self):
+        pipeline = make_pipeline(RecordingStages())
+        self.assertIsNone(pipeline.status("onbekend"))
+        self.assertIsNone(pipeline.handle({"job_id": "onbekend", "stage": "convert"}))
+
+    def test_local_stores(self):
+        """Test de pipeline met job records en payloads in een directory (lokale stand-in)"""
+        directory = tempfile.mkdtemp()
+        pipeline = make_pipeline(
+            RecordingStages(),
+            jobs=LocalCacheStore(os.path.join(directory, "records"), max_entries=0),
+            payloads=LocalPayloadStore(os.path.join(directory, "payloads"))
+        )
+        runner = LocalPipelineRunner(pipeline, {stage: MemoryQueue() for stage in ("convert", "extract", "validate")})
+        job = runner.submit(memoryview(b"APO-9 order"), "order.pdf")
+        runner.run_until_idle()
+
+        self.assertEqual(pipeline.status(job["job_id"])["status"], "completed")
+        # Payloads zijn na afloop verwijderd, het job record blijft
+        self.assertEqual(os.listdir(os.path.join(directory, "payloads", job["job_id"])), [])
+
+    def test_worker_threads(self):
+        """Test dat de worker threads ingediende jobs afmaken terwijl de status opvraagbaar blijft"""
+        stages = RecordingStages()
+        release = threading.Event()
+        convert = stages.convert
+        stages.convert = lambda content, filename: release.wait(5) and convert(content, filename)
+        runner = LocalPipelineRunner(make_pipeline(stages)).start()
+        self.addCleanup(runner.stop)
+
+        jobs = [runner.submit(f"APO-{number}".encode(), "order.pdf") for number in range(5)]
+        self.assertEqual(runner.pipeline.status(jobs[0]["job_id"])["processing_steps"]["extract"], "pending")
+        release.set()
+
+        for job in jobs:
+            self.assertEqual(runner.wait(job["job_id"], timeout=10)["status"], "completed")
+
+
+if __name__ == '__main__':
+    unittest.main()
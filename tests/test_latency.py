@@ -0,0 +1,169 @@
+"""
+Unit tests voor de latency modellen en klokken van de mock client
+"""
+
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Add parent directory to path voor imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import azure_client
+from services.azure_client import AzureFunctionsClient, AzureServicesClient, get_azure_client
+from services.latency import (
+    EmpiricalLatency,
+    FixedLatency,
+    LogNormalLatency,
+    SizeLatency,
+    VirtualClock,
+    ZeroLatency,
+    latency_model,
+    samples_from_timings,
+)
+
+
+def timings_line(operation, total, status=200):
+    record = {"event": "timings", "operation": operation, "status": status, "timings": {"total": total}}
+    return "INFO:timings:" + json.dumps(record)
+
+
+class TestLatencyModels(unittest.TestCase):
+    """Test cases voor de modellen en het fitten op timings records"""
+
+    def test_fixed_zero_and_size(self):
+        self.assertEqual([FixedLatency().delay(operation) for operation in ("convert", "extract", "save")],
+                         [1.0, 2.0, 1.0])
+        self.assertEqual(ZeroLatency().delay("convert", 10 ** 6), 0.0)
+
+        model = SizeLatency(base={"convert": 0.5}, per_kib={"convert": 0.01})
+        self.assertAlmostEqual(model.delay("convert", 0), 0.5)
+        self.assertAlmostEqual(model.delay("convert", 100 * 1024), 1.5)
+        self.assertEqual(model.delay("save", 1024), 0.0)
+
+    def test_fit_from_timings_log(self):
+        lines = [timings_line("convert_pdf_to_text", value) for value in (0.8, 1.0, 1.2, 1.1, 9.0)]
+        lines += [timings_line("extract_purchase_order_data", 0.2),
+                  timings_line("extract_purchase_order_data", 30.0, status=500),
+                  timings_line("process_document", 4.0),
+                  "WARNING:root:geen record"]
+        samples = samples_from_timings(lines)
+        self.assertEqual(samples, {"convert": [0.8, 1.0, 1.2, 1.1, 9.0], "extract": [0.2]})
+
+        empirical = EmpiricalLatency(samples, seed=1)
+        draws = [empirical.delay("convert") for _ in range(500)]
+        self.assertEqual(set(draws), set(samples["convert"]))
+        replay = EmpiricalLatency(samples, seed=1)
+        self.assertEqual(draws, [replay.delay("convert") for _ in range(500)])
+        self.assertEqual(empirical.delay("save"), 0.0)
+
+        lognormal = LogNormalLatency.fit(samples, seed=1)
+        draws = [lognormal.delay("convert") for _ in range(5000)]
+        self.assertAlmostEqual(statistics.median(draws), statistics.geometric_mean(samples["convert"]), delta=0.15)
+        self.assertGreater(max(draws), 5.0)
+        replay = LogNormalLatency.fit(samples, seed=1)
+        self.assertEqual(draws[:10], [replay.delay("convert") for _ in range(10)])
+
+    def test_latency_model_by_name(self):
+        self.assertIsInstance(latency_model("zero"), ZeroLatency)
+        self.assertIsInstance(latency_model("size"), SizeLatency)
+        with self.assertRaises(ValueError):
+            latency_model("lognormal")
+        with self.assertRaises(ValueError):
+            latency_model("gamma")
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "timings.log")
+            with open(path, "w") as handle:
+                handle.write("\n".join(timings_line("convert_pdf_to_text", value) for value in (1.0, 2.0)))
+            model = latency_model("empirical", path, seed=3)
+        self.assertIn(model.delay("convert"), (1.0, 2.0))
+
+
+class TestMockClientClock(unittest.TestCase):
+    """Test cases voor de mock client met een virtuele klok"""
+
+    def test_mock_steps_advance_virtual_clock(self):
+        clock = VirtualClock()
+        client = AzureServicesClient(clock=clock)
+
+        conversion = client.convert_pdf_to_text(b"Mock PDF content", "sample.pdf")
+        self.assertEqual(conversion["processing_time"], 1.0)
+        client.extract_purchase_order_data(conversion["text"])
+        client.save_processed_document({"order_number": "APO-00199"})
+        self.assertEqual((clock.sleeps, clock.now()), (3, 4.0))
+
+        # Een cache hit simuleert geen nieuwe API call
+        client.convert_pdf_to_text(b"Mock PDF content", "sample.pdf")
+        self.assertEqual(clock.sleeps, 3)
+
+    def test_size_dependent_latency(self):
+        clock = VirtualClock()
+        client = AzureServicesClient(latency=SizeLatency(base={}, per_kib={"convert": 0.5}), clock=clock)
+
+        small = client.convert_pdf_to_text(b"x" * 1024, "small.pdf")
+        large = client.convert_pdf_to_text(b"y" * 8 * 1024, "large.pdf")
+        self.assertEqual((small["processing_time"], large["processing_time"]), (0.5, 4.0))
+
+        client.save_processed_document({"order_number": "APO-1"})
+        self.assertEqual(clock.sleeps, 2)
+
+    def test_http_client_forwards_latency_and_clock(self):
+        """Test dat de mock stap van de HTTP client (save) dezelfde latency en klok gebruikt"""
+        clock = VirtualClock()
+        client = AzureFunctionsClient("http://127.0.0.1:9", latency=FixedLatency({"save": 0.5}), clock=clock)
+
+        self.assertTrue(client.save_processed_document({"order_number": "APO-1"})["success"])
+        self.assertEqual((clock.sleeps, clock.now()), (1, 0.5))
+
+        settings = SimpleNamespace(**dict(vars(azure_client.config), MOCK_LATENCY="zero"))
+        with patch.object(azure_client, "config", settings):
+            self.assertIsInstance(get_azure_client(use_mock=False).latency, ZeroLatency)
+
+    def test_http_client_polls_jobs_with_clock(self):
+        """Test dat wait_for_document via de klok wacht en niet via time.sleep"""
+        clock = VirtualClock()
+        client = AzureFunctionsClient("http://127.0.0.1:9", clock=clock)
+
+        with patch.object(client, "get_document_status", return_value={"status": "processing"}) as status:
+            result = client.wait_for_document("job-1", timeout=2.0, poll_interval=0.5)
+
+        self.assertEqual(result["status"], "processing")
+        self.assertEqual((clock.sleeps, clock.now(), status.call_count), (4, 2.0, 5))
+
+
+class TestVirtualClock(unittest.TestCase):
+    """Test cases voor de tijdlijnen van de virtuele klok"""
+
+    def test_threads_sleep_on_their_own_timeline(self):
+        clock = VirtualClock(start=10.0)
+        barrier = threading.Barrier(2)
+        seen = {}
+
+        def worker(name, seconds):
+            barrier.wait()
+            clock.sleep(seconds)
+            barrier.wait()
+            seen[name] = clock.now()
+
+        threads = [threading.Thread(target=worker, args=(name, seconds)) for name, seconds in (("a", 1.0), ("b", 3.0))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(seen, {"a": 11.0, "b": 13.0})
+        self.assertEqual((clock.now(), clock.slept, clock.sleeps), (10.0, 4.0, 2))
+
+        clock.advance(5.0)
+        self.assertEqual(clock.now(), 15.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
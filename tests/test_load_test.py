@@ -0,0 +1,107 @@
+"""
+Unit tests voor de load test harness (open loop, percentielen, ramp en rapporten)
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+# Add parent and backend directory to path voor imports
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "backend"))
+
+from benchmarks.load_test import SloPolicy, parse_ramp, run_load, run_ramp, write_reports
+
+
+class FakeClient:
+    """Client met vaste vertraging per stap; elke n-de extractie faalt"""
+
+    def __init__(self, delay=0.01, fail_every=0):
+        self.delay = delay
+        self.fail_every = fail_every
+        self.extractions = 0
+
+    def convert_pdf_to_text(self, file_content, filename):
+        time.sleep(self.delay)
+        return {"success": True, "text": file_content.decode(errors="ignore")}
+
+    def extract_purchase_order_data(self, text):
+        time.sleep(self.delay)
+        self.extractions += 1
+        if self.fail_every and self.extractions % self.fail_every == 0:
+            return {"success": False, "error": "Injected"}
+        return {"success": True, "extracted_data": {"order_number": "APO-1"}}
+
+    def process_document(self, file_content, filename, include_text=False):
+        time.sleep(self.delay)
+        return {"success": True, "extracted_data": {"order_number": "APO-1"}}
+
+    def save_processed_document(self, document_data):
+        time.sleep(self.delay)
+        return {"success": True}
+
+
+DOCUMENTS = [(b"%PDF-1.4 order", "order.pdf")]
+
+
+class TestLoadTest(unittest.TestCase):
+    """Test cases voor run_load, run_ramp en write_reports"""
+
+    def test_run_load_reports_stages_and_errors(self):
+        result = run_load(FakeClient(fail_every=4), DOCUMENTS, rate=40, duration=0.5, users=8,
+                          arrivals="constant")
+
+        self.assertEqual(result["offered"], 19)
+        self.assertEqual(result["completed"] + result["failed"], 19)
+        self.assertEqual(result["errors"], {"extract: Injected": 4})
+        self.assertAlmostEqual(result["error_rate"], 4 / 19, places=3)
+        for stage in ("end_to_end", "wait", "convert", "extract", "save"):
+            self.assertIn("p99", result["latency"][stage])
+        self.assertGreaterEqual(result["latency"]["end_to_end"]["p50"], 0.03)
+
+    def test_fused_flow(self):
+        result = run_load(FakeClient(), DOCUMENTS, rate=20, duration=0.3, users=4, flow="fused")
+
+        self.assertEqual(sorted(result["latency"]), ["end_to_end", "process", "save", "wait"])
+        self.assertEqual(result["failed"], 0)
+
+    def test_without_save_step(self):
+        """Test dat HTTP clients zonder save route de mock save niet in end-to-end meetellen"""
+        client = FakeClient(delay=0.01)
+        client.save_processed_document = None
+
+        result = run_load(client, DOCUMENTS, rate=20, duration=0.3, users=4, save=False)
+
+        self.assertEqual(sorted(result["latency"]), ["convert", "end_to_end", "extract", "wait"])
+        self.assertEqual((result["failed"], result["save"]), (0, False))
+
+    def test_ramp_stops_at_saturation(self):
+        # Eén gebruiker van ~0.1s per document: boven 10/s loopt de wachtrij op
+        ramp = run_ramp(FakeClient(delay=0.033), DOCUMENTS, parse_ramp("2:26:12"), step_seconds=1.0,
+                        users=1, slo=SloPolicy(p95_seconds=0.4), arrivals="constant")
+
+        saturation = ramp["saturation"]
+        self.assertEqual(saturation["last_good_rate"], 2.0)
+        self.assertEqual(saturation["saturated_at"], 14.0)
+        self.assertTrue(ramp["steps"][-1]["saturated"])
+
+    def test_reports_written(self):
+        result = run_load(FakeClient(), DOCUMENTS, rate=20, duration=0.2, users=2)
+        report = {"meta": {"created": "nu", "client": "fake"}, "result": result}
+
+        json_path, html_path = write_reports(report, tempfile.mkdtemp())
+
+        with open(json_path) as handle:
+            self.assertEqual(json.load(handle)["result"]["completed"], result["completed"])
+        with open(html_path) as handle:
+            content = handle.read()
+        self.assertIn("<svg", content)
+        self.assertIn("end_to_end", content)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+"""
+Unit tests voor de metrics registry en het Prometheus tekstformaat
+"""
+
+import json
+import os
+import subprocess
+import sys
+import unittest
+import urllib.request
+from unittest.mock import patch
+
+# Add parent and backend directory to path voor imports
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "backend"))
+
+from metrics import MetricsRegistry, start_metrics_server
+from services import azure_client
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    """Test cases voor counters, gauges, histogrammen en de metrics server"""
+
+    def test_counter_and_gauge_render(self):
+        registry = MetricsRegistry()
+        pages = registry.counter("pages_total", "Pagina's per route", ("route",))
+        pending = registry.gauge("uploads_pending", "Openstaande uploads")
+
+        pages.inc(3, route="ocr")
+        pages.inc(route="text_layer")
+        registry.counter("pages_total", "Pagina's per route", ("route",)).inc(route="ocr")
+        pending.set(5)
+        pending.dec()
+
+        self.assertEqual(pages.value(route="ocr"), 4)
+        text = registry.render()
+        self.assertIn("# TYPE pages_total counter\n", text)
+        self.assertIn('pages_total{route="ocr"} 4.0\n', text)
+        self.assertIn("uploads_pending 4.0\n", text)
+        with self.assertRaises(ValueError):
+            registry.gauge("pages_total", "Ander type")
+        with self.assertRaises(ValueError):
+            pages.inc(-1, route="ocr")
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = MetricsRegistry()
+        seconds = registry.histogram("stage_seconds", "Duur per stap", ("stage",), buckets=(0.1, 1.0))
+
+        for value in (0.05, 0.1, 0.5, 3.0):
+            seconds.observe(value, stage="ocr_wait")
+
+        lines = registry.render().splitlines()
+        self.assertIn('stage_seconds_bucket{stage="ocr_wait",le="0.1"} 2', lines)
+        self.assertIn('stage_seconds_bucket{stage="ocr_wait",le="1.0"} 3', lines)
+        self.assertIn('stage_seconds_bucket{stage="ocr_wait",le="+Inf"} 4', lines)
+        self.assertIn('stage_seconds_sum{stage="ocr_wait"} 3.65', lines)
+        self.assertIn('stage_seconds_count{stage="ocr_wait"} 4', lines)
+
+    def test_metrics_server(self):
+        registry = MetricsRegistry()
+        registry.counter("documents_total", "Documenten").inc(2)
+        server = start_metrics_server(0, host="127.0.0.1", registry=registry)
+        self.addCleanup(server.shutdown)
+
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as response:
+            body = response.read().decode()
+            content_type = response.headers["Content-Type"]
+
+        self.assertIn("documents_total 2.0", body)
+        self.assertTrue(content_type.startswith("text/plain"))
+
+    def test_backend_modules_load_once_under_both_names(self):
+        """Test dat metrics/backend.metrics (en tracing) één module zijn, in beide importvolgordes"""
+        backend = os.path.join(ROOT, "backend")
+        check = ("import backend.metrics, backend.tracing, metrics, tracing\n"
+                 "print(json.dumps([metrics is backend.metrics, metrics.REGISTRY is backend.metrics.REGISTRY,"
+                 " tracing.current_span is backend.tracing.current_span]))")
+        for first in ("import services.azure_client", "import azure_functions"):
+            script = f"import json, sys\nsys.path[:0] = [{ROOT!r}, {backend!r}]\n{first}\n{check}"
+            output = subprocess.check_output([sys.executable, "-c", script], cwd=ROOT)
+            self.assertEqual(json.loads(output.decode().strip().splitlines()[-1]), [True, True, True], first)
+
+    @patch("services.azure_client.time.sleep")
+    def test_client_feeds_registry(self, sleep):
+        client = azure_client.AzureServicesClient()
+        requests_before = azure_client.CLIENT_REQUESTS.value(operation="save", status="ok")
+        hits_before = azure_client.CLIENT_CACHE_LOOKUPS.value(result="hit")
+
+        client.save_processed_document({"order_number": "APO-1"})
+        for _ in range(2):
+            client.convert_pdf_to_text(b"%PDF-1.4 order", "order.pdf")
+
+        self.assertEqual(azure_client.CLIENT_REQUESTS.value(operation="save", status="ok") - requests_before, 1)
+        self.assertEqual(azure_client.CLIENT_CACHE_LOOKUPS.value(result="hit") - hits_before, 1)
+        self.assertGreaterEqual(azure_client.CLIENT_SECONDS.count(operation="convert"), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
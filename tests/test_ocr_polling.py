@@ -0,0 +1,194 @@
+"""
+Unit tests voor adaptief pollen van Computer Vision Read operaties
+De integratietests draaien de echte ComputerVisionClient tegen de lokale fake server.
+"""
+
+import asyncio
+import time
+import unittest
+import sys
+import os
+from types import SimpleNamespace
+
+# Add parent and backend directory to path voor imports
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "backend"))
+
+from azure.cognitiveservices.vision.computervision import ComputerVisionClient
+from msrest.authentication import CognitiveServicesCredentials
+
+from devserver.fake_computer_vision import FakeComputerVisionServer, parse_pages
+from ocr_polling import (
+    OcrTimeoutError, PollingPolicy, polling_page_count, read_pages, read_pages_async,
+    wait_for_read_result
+)
+
+
+class FakeClock:
+    """Klok die alleen vooruit gaat door sleep()"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def scripted_fetch(statuses, retry_after=None):
+    """fetch() die de opgegeven statussen achter elkaar teruggeeft"""
+    remaining = list(statuses)
+
+    def fetch():
+        return SimpleNamespace(status=remaining.pop(0)), retry_after
+    return fetch
+
+
+class TestPollingPolicy(unittest.TestCase):
+    """Test cases voor het poll schema"""
+
+    def test_delays_start_short_and_grow(self):
+        """Test dat het eerste interval kort is en daarna groeit"""
+        policy = PollingPolicy(first_delay=0.05, multiplier=2.0)
+        delays = policy.delays(1)
+        first, second, third = next(delays), next(delays), next(delays)
+        self.assertEqual(first, 0.05)
+        self.assertLess(first, second)
+        self.assertLess(second, third)
+
+    def test_cap_grows_with_page_count(self):
+        """Test dat het plafond meegroeit met het aantal pagina's tot max_delay"""
+        policy = PollingPolicy(base_max_delay=0.5, max_delay_per_page=0.1, max_delay=5.0)
+        self.assertAlmostEqual(policy.max_delay_for(1), 0.6)
+        self.assertAlmostEqual(policy.max_delay_for(20), 2.5)
+        self.assertEqual(policy.max_delay_for(500), 5.0)
+
+        delays = policy.delays(1)
+        self.assertEqual(max(next(delays) for _ in range(50)), policy.max_delay_for(1))
+
+    def test_unknown_page_count_gets_largest_cap(self):
+        """Test dat OCR van het hele document (onbekend aantal pagina's) niet als één pagina telt"""
+        policy = PollingPolicy(base_max_delay=0.5, max_delay_per_page=0.1, max_delay=5.0)
+        self.assertEqual(policy.max_delay_for(None), 5.0)
+        self.assertEqual(polling_page_count([2, 4]), 2)
+        self.assertEqual(polling_page_count(None, 40), 40)
+        self.assertIsNone(polling_page_count(None))
+
+        delays = policy.delays(polling_page_count(None))
+        self.assertEqual(max(next(delays) for _ in range(50)), 5.0)
+
+
+class TestWaitForReadResult(unittest.TestCase):
+    """Test cases voor de poll loop met een fake klok"""
+
+    def test_returns_when_done(self):
+        clock = FakeClock()
+        result = wait_for_read_result(
+            scripted_fetch(["notStarted", "running", "succeeded"]), 1,
+            PollingPolicy(first_delay=0.05, multiplier=2.0), sleep=clock.sleep, clock=clock
+        )
+        self.assertEqual(result.status, "succeeded")
+        self.assertEqual(clock.sleeps, [0.05, 0.1])
+
+    def test_retry_after_takes_precedence(self):
+        """Test dat een Retry-After langer dan het schema wordt gerespecteerd"""
+        clock = FakeClock()
+        wait_for_read_result(
+            scripted_fetch(["running", "running", "succeeded"], retry_after=1.5), 1,
+            PollingPolicy(first_delay=0.05), sleep=clock.sleep, clock=clock
+        )
+        self.assertEqual(clock.sleeps, [1.5, 1.5])
+
+    def test_timeout(self):
+        clock = FakeClock()
+        with self.assertRaises(OcrTimeoutError):
+            wait_for_read_result(
+                scripted_fetch(["running"] * 1000), 1,
+                PollingPolicy(timeout=10.0), sleep=clock.sleep, clock=clock
+            )
+        self.assertLessEqual(clock.now, 10.0)
+
+
+class TestAgainstFakeComputerVision(unittest.TestCase):
+    """Integratietests met de echte SDK tegen de lokale fake Read API"""
+
+    def start_server(self, **options):
+        server = FakeComputerVisionServer(**options).start()
+        self.addCleanup(server.stop)
+        client = ComputerVisionClient(server.endpoint, CognitiveServicesCredentials("fake-key"))
+        return server, client
+
+    def test_read_pages(self):
+        """Test dat geselecteerde pagina's terugkomen en de poll direct na gereedkomen volgt"""
+        server, client = self.start_server(processing_seconds=0.3)
+        policy = PollingPolicy(first_delay=0.02)
+
+        self.assertEqual(
+            read_pages(client, "https://example/doc.pdf", [2, 4], policy),
+            {2: "Fake OCR page 2", 4: "Fake OCR page 4"}
+        )
+
+        operation = next(iter(server.operations.values()))
+        self.assertEqual(operation.pages, [2, 4])
+        self.assertEqual(operation.source, {"url": "https://example/doc.pdf"})
+        # Dode latency na gereedkomen blijft onder het plafond voor 2 pagina's
+        self.assertLess(operation.polls[-1] - operation.ready_at, policy.max_delay_for(2) + 0.1)
+
+    def test_read_pages_in_stream(self):
+        """Test dat PDF bytes direct gestreamd worden en de stappen getimed worden"""
+        server, client = self.start_server(processing_seconds=0.1)
+        pdf_content = b"%PDF-1.4 " + bytes(range(256)) * 1000
+        timings = {}
+
+        pages = read_pages(client, pdf_content, [1], PollingPolicy(first_delay=0.02), timings)
+
+        self.assertEqual(pages, {1: "Fake OCR page 1"})
+        self.assertEqual(next(iter(server.operations.values())).source, {"data": pdf_content})
+        self.assertEqual(set(timings), {"submit", "poll"})
+        self.assertGreaterEqual(timings["poll"], 0.09)
+
+    def test_retry_after_header(self):
+        """Test dat polls niet sneller komen dan de Retry-After header van de service"""
+        server, client = self.start_server(processing_seconds=0.5, retry_after=0.2)
+        read_pages(client, "https://example/doc.pdf", None, PollingPolicy(first_delay=0.01))
+
+        polls = next(iter(server.operations.values())).polls
+        self.assertGreater(len(polls), 1)
+        for previous, current in zip(polls, polls[1:]):
+            self.assertGreaterEqual(current - previous, 0.19)
+
+    def test_failed_operation_returns_no_pages(self):
+        server, client = self.start_server(processing_seconds=0.0, fail_rate=1.0)
+        self.assertEqual(read_pages(client, "https://example/doc.pdf", [1]), {})
+
+    def test_async_waits_concurrently(self):
+        """Test dat veel operaties tegelijk afgewacht worden in plaats van na elkaar"""
+        server, client = self.start_server(processing_seconds=0.3)
+        policy = PollingPolicy(first_delay=0.02)
+
+        async def read_many():
+            return await asyncio.gather(*[
+                read_pages_async(client, f"https://example/{number}.pdf", [number], policy)
+                for number in range(1, 11)
+            ])
+
+        start = time.monotonic()
+        results = asyncio.run(read_many())
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(results[4], {5: "Fake OCR page 5"})
+        self.assertEqual(len(server.operations), 10)
+        self.assertLess(elapsed, 10 * 0.3)
+
+    def test_parse_pages_query(self):
+        self.assertEqual(parse_pages("1,3-5"), [1, 3, 4, 5])
+        self.assertIsNone(parse_pages(None))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+"""
+Unit tests voor de routering van PDF pagina's
+Tests voor tekstlaag scoring en OCR fallback per pagina
+"""
+
+import unittest
+import sys
+import os
+
+# Add backend directory to path voor imports
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+from pdf_routing import (
+    NO_TEXT, OCR, TEXT_LAYER, join_pages, missing_ocr_pages, route_pages, score_text_layer, summarize_routes
+)
+
+GOOD_PAGE = "Order Number: APO-00199\nDate: 2024-01-15\nSupplier: JASA Packaging Solutions B.V."
+
+
+class FakeOcr:
+    """Registreert welke pagina's naar OCR gestuurd worden"""
+
+    def __init__(self, texts):
+        self.texts = texts
+        self.calls = []
+
+    def __call__(self, pages):
+        self.calls.append(pages)
+        if pages is None:
+            return dict(self.texts)
+        return {number: self.texts[number] for number in pages if number in self.texts}
+
+
+class TestScoreTextLayer(unittest.TestCase):
+    """Test cases voor score_text_layer"""
+
+    def test_born_digital_page_scores_high(self):
+        """Test dat een normale tekstpagina de maximale score krijgt"""
+        self.assertEqual(score_text_layer(GOOD_PAGE), 1.0)
+
+    def test_empty_page_scores_zero(self):
+        """Test dat gescande pagina's zonder tekstlaag 0 scoren"""
+        self.assertEqual(score_text_layer(""), 0.0)
+        self.assertEqual(score_text_layer(" \n\t "), 0.0)
+
+    def test_short_page_scores_low(self):
+        """Test dat een pagina met alleen een paginanummer laag scoort"""
+        self.assertLess(score_text_layer("3"), 0.1)
+
+    def test_broken_font_mapping_scores_low(self):
+        """Test dat tekst uit kapotte font-mappings als onbruikbaar geldt"""
+        self.assertLess(score_text_layer("(cid:12)(cid:34)(cid:56)(cid:78)" * 5), 0.6)
+        self.assertLess(score_text_layer("��� Order �����" * 5), 0.6)
+
+
+class TestRoutePages(unittest.TestCase):
+    """Test cases voor route_pages"""
+
+    def test_all_text_layer_skips_ocr(self):
+        """Test dat een born-digital PDF geen OCR aanroept"""
+        ocr = FakeOcr({})
+        pages = route_pages([GOOD_PAGE, GOOD_PAGE], ocr, 0.6)
+
+        self.assertEqual([page["route"] for page in pages], [TEXT_LAYER, TEXT_LAYER])
+        self.assertEqual(ocr.calls, [])
+
+    def test_only_weak_pages_go_to_ocr(self):
+        """Test dat alleen pagina's zonder bruikbare tekst naar OCR gaan"""
+        ocr = FakeOcr({2: "Gescande pagina tekst", 3: "Nog een scan"})
+        pages = route_pages([GOOD_PAGE, "", "(cid:1)", GOOD_PAGE], ocr, 0.6)
+
+        self.assertEqual(ocr.calls, [[2, 3]])
+        self.assertEqual([page["route"] for page in pages], [TEXT_LAYER, OCR, OCR, TEXT_LAYER])
+        self.assertEqual(pages[1]["text"], "Gescande pagina tekst")
+        self.assertEqual(missing_ocr_pages(pages), [])
+
+    def test_failed_ocr_keeps_weak_text_layer(self):
+        """Test dat een zwakke tekstlaag gebruikt wordt als OCR niets oplevert"""
+        pages = route_pages(["kort", ""], FakeOcr({}), 0.6)
+
+        self.assertEqual(pages[0]["route"], TEXT_LAYER)
+        self.assertEqual(pages[0]["text"], "kort")
+        self.assertEqual(pages[1]["route"], NO_TEXT)
+        self.assertEqual(missing_ocr_pages(pages), [1, 2])
+
+    def test_unreadable_pdf_uses_full_ocr(self):
+        """Test dat een PDF zonder leesbare tekstlaag volledig via OCR gaat"""
+        ocr = FakeOcr({1: "Pagina een", 2: "Pagina twee"})
+        pages = route_pages([], ocr, 0.6)
+
+        self.assertEqual(ocr.calls, [None])
+        self.assertEqual([page["route"] for page in pages], [OCR, OCR])
+        self.assertEqual(join_pages(pages), "Pagina een\nPagina twee\n")
+
+    def test_summarize_routes(self):
+        """Test dat de samenvatting geen tekst bevat en routes telt"""
+        pages = route_pages([GOOD_PAGE, ""], FakeOcr({2: "scan"}), 0.6)
+        summary = summarize_routes(pages)
+
+        self.assertEqual(summary["counts"], {TEXT_LAYER: 1, OCR: 1, NO_TEXT: 0})
+        self.assertEqual(summary["pages"][1], {
+            "page": 2, "route": OCR, "score": 0.0, "offset": len(GOOD_PAGE) + 1, "characters": 4
+        })
+        self.assertEqual(join_pages(pages)[summary["pages"][1]["offset"]:].rstrip(), "scan")
+        self.assertNotIn("text", summary["pages"][0])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
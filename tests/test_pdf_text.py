@@ -0,0 +1,79 @@
+"""
+Unit tests voor pagina-parallelle PyPDF2 extractie
+"""
+
+import unittest
+import sys
+import os
+
+# Add parent and backend directory to path voor imports
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "backend"))
+
+from benchmarks.pdf_builder import build_pdf
+import pdf_text
+from pdf_text import extract_pages, join_with_offsets, page_ranges, shutdown_pool
+
+
+def numbered_pages(count):
+    return [[f"Pagina {number}", f"Order Number: APO-{number:05d}"] for number in range(1, count + 1)]
+
+
+class TestPageRanges(unittest.TestCase):
+    """Test cases voor page_ranges"""
+
+    def test_ranges_cover_all_pages(self):
+        """Test dat de bereiken aaneengesloten zijn en alle pagina's dekken"""
+        for page_count, parts in [(10, 3), (7, 7), (3, 8), (500, 4)]:
+            ranges = page_ranges(page_count, parts)
+            self.assertEqual(ranges[0][0], 0)
+            self.assertEqual(ranges[-1][1], page_count)
+            for (_, stop), (start, _) in zip(ranges, ranges[1:]):
+                self.assertEqual(stop, start)
+            sizes = [stop - start for start, stop in ranges]
+            self.assertLessEqual(max(sizes) - min(sizes), 1)
+
+
+class TestExtractPages(unittest.TestCase):
+    """Test cases voor extract_pages"""
+
+    def tearDown(self):
+        shutdown_pool()
+
+    def test_serial_extraction(self):
+        """Test extractie zonder pool voor kleine documenten"""
+        pages = extract_pages(build_pdf(numbered_pages(3)), workers=4, min_pages=16)
+
+        self.assertEqual(len(pages), 3)
+        self.assertIn("APO-00002", pages[1])
+
+    def test_parallel_matches_serial(self):
+        """Test dat parallelle extractie dezelfde pagina's in dezelfde volgorde geeft"""
+        pdf = build_pdf(numbered_pages(9) + [[]])
+
+        serial = extract_pages(pdf, workers=1)
+        parallel = extract_pages(pdf, workers=3, min_pages=1)
+
+        self.assertEqual(parallel, serial)
+        self.assertEqual(parallel[-1], "")
+
+    def test_pool_uses_spawn(self):
+        """Test dat de pool niet forkt vanuit het multi-threaded host proces"""
+        pool = pdf_text._get_pool(2)
+
+        self.assertEqual(pool._mp_context.get_start_method(), "spawn")
+
+    def test_join_with_offsets(self):
+        """Test dat de offsets naar het begin van elke pagina wijzen"""
+        pages = ["eerste", "", "derde pagina"]
+        text, offsets = join_with_offsets(pages)
+
+        self.assertEqual(text, "eerste\n\nderde pagina\n")
+        self.assertEqual(offsets, [0, 7, 8])
+        for page, offset in zip(pages, offsets):
+            self.assertEqual(text[offset:offset + len(page)], page)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
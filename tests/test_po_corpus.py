@@ -0,0 +1,81 @@
+"""
+Unit tests voor de synthetische inkooporder generator
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from decimal import Decimal
+
+# Add parent and backend directory to path voor imports
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "backend"))
+
+import azure_functions
+from benchmarks.po_corpus import (Options, evaluate_corpus, format_amount, format_money,
+                                  generate_document, iter_corpus, write_corpus)
+
+
+class TestPurchaseOrderCorpus(unittest.TestCase):
+    """Test cases voor generate_document, write_corpus en evaluate_corpus"""
+
+    def test_documents_are_reproducible_per_index(self):
+        first = [document.text for document in iter_corpus(5, seed=7)]
+        again = [document.text for document in iter_corpus(2, seed=7, start=3)]
+
+        self.assertEqual(first[3:], again)
+        self.assertNotEqual(first[0], generate_document(8, 0).text)
+
+    def test_ground_truth_is_consistent(self):
+        for document in iter_corpus(30, seed=1, options=Options(max_items=300)):
+            truth = document.truth
+            self.assertAlmostEqual(sum(item["total"] for item in truth["items"]), truth["subtotal"], places=2)
+            self.assertAlmostEqual(truth["subtotal"] + truth["vat_amount"], truth["total"], places=2)
+            self.assertEqual(truth["document"]["page_count"], len(document.pages))
+            self.assertIn(truth["order_number"], document.text)
+
+    def test_variety_across_corpus(self):
+        documents = list(iter_corpus(60, seed=2, options=Options(max_items=5000)))
+
+        for key in ("language", "currency", "number_format", "layout"):
+            self.assertGreater(len({document.truth["document"][key] for document in documents}), 1)
+        item_counts = [document.truth["document"]["item_count"] for document in documents]
+        self.assertLess(min(item_counts), 20)
+        self.assertGreater(max(item_counts), 500)
+
+    def test_number_formats(self):
+        value = Decimal("1234567.5")
+        self.assertEqual(format_amount(value, "en"), "1,234,567.50")
+        self.assertEqual(format_amount(value, "eu"), "1.234.567,50")
+        self.assertEqual(format_amount(value, "plain"), "1234567.50")
+        self.assertEqual(format_money(Decimal("12"), "CHF", "eu"), "12,00 CHF")
+
+    def test_pdf_has_text_layer(self):
+        document = generate_document(3, 1, Options(min_items=100, max_items=100))
+
+        text = azure_functions.extract_text_with_pypdf2(document.pdf())
+
+        self.assertGreater(document.truth["document"]["page_count"], 1)
+        self.assertIn(document.truth["order_number"], text)
+
+    def test_write_and_evaluate_corpus(self):
+        directory = tempfile.mkdtemp()
+        options = Options(max_items=10, languages=("en",), currencies=("EUR",),
+                          number_formats=("plain",), date_formats=("iso",))
+
+        manifest = write_corpus(directory, 4, seed=5, options=options, formats=("txt",))
+        report = evaluate_corpus(directory)
+
+        self.assertEqual(len(manifest["documents"]), 4)
+        with open(os.path.join(directory, manifest["documents"][0]["id"] + ".json")) as handle:
+            self.assertIn("delivery_address", json.load(handle))
+        self.assertEqual(report["all"]["documents"], 4)
+        for field in ("order_number", "date", "supplier", "subtotal"):
+            self.assertEqual(report["en"][field], 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""
+Unit tests voor profiling op aanvraag van de Function routes
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+# Add parent and backend directory to path voor imports
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "backend"))
+
+import azure.functions as func
+
+import azure_functions
+from benchmarks.pdf_builder import SAMPLE_ORDER_PAGES, build_pdf
+from benchmarks.profile_report import find_profiles, format_report, summarize_profiles
+from conversion_cache import ConversionCache, MemoryCacheStore
+from request_profiling import profile_request, profiling_requested, write_profile
+
+
+def profiled_request(filename, content, key):
+    """Multipart convert request met de profiling headers"""
+    boundary = "test-boundary"
+    body = (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"{filename}\"\r\n"
+        f"Content-Type: application/pdf\r\n\r\n".encode()
+        + content + f"\r\n--{boundary}--\r\n".encode()
+    )
+    return func.HttpRequest(
+        "POST", "/api/convert_pdf_to_text", body=body,
+        headers={"Content-Type": f"multipart/form-data; boundary={boundary}",
+                 "X-Profile-Request": "true", "X-Profile-Key": key}
+    )
+
+
+class TestRequestProfiling(unittest.TestCase):
+    """Test cases voor de profiling vlag, de profielen en de samenvatting"""
+
+    def test_profiling_requires_admin_key(self):
+        headers = {"X-Profile-Request": "true", "X-Profile-Key": "secret"}
+
+        self.assertTrue(profiling_requested(headers, "secret"))
+        self.assertFalse(profiling_requested(headers, "other"))
+        self.assertFalse(profiling_requested(headers, None))
+        self.assertFalse(profiling_requested({}, "secret"))
+        self.assertTrue(profiling_requested({}, None, always=True))
+
+    def test_profile_uploaded_next_to_result_blob(self):
+        with profile_request("extract_purchase_order_data") as profile:
+            data = [str(index) * 100 for index in range(2000)]
+        uploads = {}
+
+        summary = write_profile(profile, "extracted_data/order_1.json.ab12", upload=uploads.__setitem__, top=5)
+
+        self.assertEqual(sorted(uploads), ["extracted_data/order_1.json.ab12.prof",
+                                           "extracted_data/order_1.json.ab12.profile.json"])
+        self.assertGreater(summary["peak_bytes"], 100 * 1000)
+        self.assertLessEqual(len(summary["allocations"]), 5)
+        self.assertTrue(any(site["file"] == __file__ for site in summary["allocations"]))
+        self.assertEqual(len(data), 2000)
+
+    def test_convert_route_writes_profile_and_report(self):
+        directory = tempfile.mkdtemp()
+        services = {"blob_storage": Mock(), "conversion_cache": ConversionCache(MemoryCacheStore())}
+        with patch.dict(azure_functions._services, services, clear=True), \
+                patch.multiple(azure_functions, PROFILE_DIR=directory, PROFILE_ADMIN_KEY="secret"):
+            response = azure_functions.convert_pdf_to_text(
+                profiled_request("order.pdf", build_pdf(SAMPLE_ORDER_PAGES), "secret")
+            )
+            unprofiled = azure_functions.convert_pdf_to_text(
+                profiled_request("order.pdf", build_pdf(SAMPLE_ORDER_PAGES), "wrong")
+            )
+            azure_functions.flush_uploads(5)
+        result = json.loads(response.get_body())
+
+        self.assertTrue(os.path.exists(result["profile"]["location"]["stats"]))
+        self.assertNotIn("profile", json.loads(unprofiled.get_body()))
+        report = summarize_profiles(find_profiles([directory]), top=50)
+        self.assertEqual(report["routes"]["convert_pdf_to_text"]["count"], 1)
+        self.assertTrue(any("extract_pages_with_pypdf2" in function["function"]
+                            for function in report["functions"]))
+        self.assertIn("convert_pdf_to_text: 1 requests", format_report(report))
+
+
+if __name__ == '__main__':
+    unittest.main()
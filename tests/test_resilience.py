@@ -0,0 +1,283 @@
+"""
+Unit tests voor retries, circuit breakers en hedged requests tegen een fault-injecting server
+"""
+
+import json
+import random
+import socket
+import threading
+import time
+import unittest
+import sys
+import os
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+# Add parent directory to path voor imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from devserver.faults import Fault, FaultInjector
+from services.azure_client import AzureFunctionsClient
+from services.http_transport import FunctionHttpTransport
+from services.resilience import (
+    CLOSED, HALF_OPEN, OPEN, CircuitBreaker, LatencyTracker, ResilientCaller, RetryPolicy, connect_failed
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FaultServer:
+    """JSON server die per request een fault uit de FaultInjector toepast"""
+
+    def __init__(self, faults):
+        self.faults = faults
+        self.paths = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _handle(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                server.paths.append((self.command, self.path))
+                fault = server.faults.next_fault()
+                time.sleep(fault.delay)
+                if fault.drop:
+                    self.close_connection = True
+                    return
+                status = fault.status or 200
+                body = json.dumps({
+                    "success": status == 200, "text": "Order Number: APO-1", "request": len(server.paths),
+                    "job_id": "job-1", "status": "queued"
+                }).encode()
+                self.send_response(status)
+                if fault.retry_after is not None:
+                    self.send_header("Retry-After", str(fault.retry_after))
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_POST = _handle
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        threading.Thread(target=self.httpd.serve_forever, args=(0.05,), daemon=True).start()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class TestPolicies(unittest.TestCase):
+    """Test cases voor RetryPolicy, CircuitBreaker en LatencyTracker"""
+
+    def test_backoff_is_jittered_and_capped(self):
+        policy = RetryPolicy(base_delay=0.1, multiplier=2, max_delay=0.5)
+        rng = random.Random(1)
+
+        delays = [policy.delay(retry, rng) for retry in range(6) for _ in range(50)]
+
+        self.assertTrue(all(0 <= delay <= 0.5 for delay in delays))
+        self.assertGreater(len(set(delays)), 100)
+        self.assertTrue(all(policy.delay(0, rng) <= 0.1 for _ in range(50)))
+        self.assertEqual(policy.delay(0, rng, retry_after=0.3), 0.3)
+        self.assertEqual(policy.delay(0, rng, retry_after=60), 0.5)
+
+    def test_circuit_breaker_states(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10, clock=clock)
+
+        for _ in range(3):
+            self.assertTrue(breaker.allow())
+            breaker.record_failure()
+        self.assertEqual(breaker.state, OPEN)
+        self.assertFalse(breaker.allow())
+
+        clock.now = 10
+        self.assertTrue(breaker.allow())
+        self.assertEqual(breaker.state, HALF_OPEN)
+        # Maar één proefrequest tegelijk
+        self.assertFalse(breaker.allow())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, OPEN)
+
+        clock.now = 20
+        self.assertTrue(breaker.allow())
+        breaker.record_success()
+        self.assertEqual(breaker.state, CLOSED)
+        self.assertTrue(breaker.allow())
+
+    def test_every_outcome_reaches_the_breaker(self):
+        """Test dat een 5xx buiten RETRY_STATUSES en een onverwachte exceptie het proefrequest niet vasthouden"""
+        clock = FakeClock()
+        caller = ResilientCaller(RetryPolicy(max_attempts=1), failure_threshold=1, reset_timeout=10,
+                                 clock=clock)
+        breaker = caller.breaker("POST x")
+
+        def respond(status):
+            response = requests.Response()
+            response.status_code = status
+            return lambda: response
+
+        self.assertEqual(caller.call("POST x", respond(501), idempotent=False).status_code, 501)
+        self.assertEqual(breaker.state, OPEN)
+
+        clock.now = 10
+
+        def broken_send():
+            raise ValueError("body kon niet gebouwd worden")
+
+        with self.assertRaises(ValueError):
+            caller.call("POST x", broken_send, idempotent=False)
+        self.assertEqual(breaker.state, HALF_OPEN)
+        # Het proefrequest is vrijgegeven: de volgende call mag proberen en sluit het circuit
+        self.assertEqual(caller.call("POST x", respond(200), idempotent=False).status_code, 200)
+        self.assertEqual(breaker.state, CLOSED)
+        self.assertEqual(caller.stats()["failures"], 2)
+
+    def test_refused_connection_is_retried_for_non_idempotent_calls(self):
+        """Test dat een geweigerde verbinding (niets verstuurd) ook zonder idempotentie opnieuw geprobeerd wordt"""
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            port = probe.getsockname()[1]
+        sleeps = []
+        caller = ResilientCaller(RetryPolicy(max_attempts=3), sleep=sleeps.append)
+
+        with self.assertRaises(requests.ConnectionError) as raised:
+            caller.call("POST x", lambda: requests.post(f"http://127.0.0.1:{port}/", timeout=1), idempotent=False)
+
+        self.assertTrue(connect_failed(raised.exception))
+        self.assertEqual(caller.stats()["attempts"], 3)
+        self.assertFalse(connect_failed(requests.ConnectionError("verbinding verbroken na verzenden")))
+
+    def test_latency_percentile(self):
+        tracker = LatencyTracker(window=100)
+        for value in range(1, 101):
+            tracker.record(value / 100)
+        self.assertEqual(tracker.percentile(0.95), 0.96)
+        self.assertIsNone(LatencyTracker().percentile(0.95))
+
+
+class TestResilientTransport(unittest.TestCase):
+    """Test cases voor AzureFunctionsClient met de resilience laag tegen de fault server"""
+
+    def make_client(self, script=None, **kwargs):
+        self.faults = FaultInjector(script=script)
+        self.server = FaultServer(self.faults)
+        self.addCleanup(self.server.stop)
+        self.sleeps = []
+        kwargs.setdefault("policy", RetryPolicy(max_attempts=3, base_delay=0.01))
+        resilience = ResilientCaller(sleep=self.sleeps.append, seed=1, **kwargs)
+        transport = FunctionHttpTransport(self.server.url, resilience=resilience)
+        self.addCleanup(transport.close)
+        return AzureFunctionsClient(self.server.url, transport=transport)
+
+    def test_retries_transient_errors(self):
+        client = self.make_client(script=[Fault(status=503), Fault(drop=True)])
+
+        result = client.extract_purchase_order_data("Order Number: APO-1")
+
+        self.assertTrue(result["success"])
+        self.assertEqual(self.faults.requests, 3)
+        stats = client.resilience_stats()
+        self.assertEqual((stats["attempts"], stats["retries"], stats["successes"]), (3, 2, 1))
+        self.assertEqual(len(self.sleeps), 2)
+
+    def test_retry_after_is_respected(self):
+        client = self.make_client(script=[Fault(status=429, retry_after=0.2)])
+
+        self.assertTrue(client.extract_purchase_order_data("tekst")["success"])
+        self.assertGreaterEqual(self.sleeps[0], 0.2)
+
+    def test_gives_up_after_max_attempts(self):
+        client = self.make_client(script=[Fault(status=500)] * 5)
+
+        result = client.extract_purchase_order_data("tekst")
+
+        self.assertFalse(result["success"])
+        self.assertIn("500", result["error"])
+        self.assertEqual(self.faults.requests, 3)
+
+    def test_non_idempotent_call_not_retried_after_processing(self):
+        """Test dat een job submit na een 500 niet opnieuw verstuurd wordt (dubbele job)"""
+        client = self.make_client(script=[Fault(status=500)])
+
+        result = client.submit_document(b"%PDF", "order.pdf")
+
+        self.assertFalse(result["success"])
+        self.assertEqual(self.faults.requests, 1)
+
+    def test_non_idempotent_call_retried_when_not_processed(self):
+        client = self.make_client(script=[Fault(status=503)])
+
+        self.assertTrue(client.submit_document(b"%PDF", "order.pdf")["success"])
+        self.assertEqual(self.faults.requests, 2)
+
+    def test_client_errors_are_not_retried(self):
+        client = self.make_client(script=[Fault(status=400)])
+
+        self.assertFalse(client.extract_purchase_order_data("tekst")["success"])
+        self.assertEqual(self.faults.requests, 1)
+        self.assertEqual(client.resilience_stats()["endpoints"]["POST extract_purchase_order_data"]["circuit"], CLOSED)
+
+    def test_circuit_opens_per_endpoint(self):
+        client = self.make_client(script=[Fault(status=500)] * 4, failure_threshold=4,
+                                  policy=RetryPolicy(max_attempts=2, base_delay=0.01))
+
+        client.extract_purchase_order_data("tekst")
+        client.extract_purchase_order_data("tekst")
+        rejected = client.extract_purchase_order_data("tekst")
+
+        self.assertFalse(rejected["success"])
+        self.assertIn("Circuit", rejected["error"])
+        self.assertEqual(self.faults.requests, 4)
+        stats = client.resilience_stats()
+        self.assertEqual(stats["circuit_rejections"], 1)
+        self.assertEqual(stats["endpoints"]["POST extract_purchase_order_data"]["circuit"], OPEN)
+        # Een ander endpoint heeft zijn eigen circuit
+        self.assertTrue(client.submit_document(b"%PDF", "order.pdf")["success"])
+
+    def test_hedged_request_beats_slow_instance(self):
+        """Test dat een tweede request na de p95 latency de trage eerste inhaalt"""
+        client = self.make_client(hedging=True, hedge_min_samples=5, hedge_min_delay=0.02)
+        for _ in range(5):
+            client.extract_purchase_order_data("tekst")
+        self.faults.script = [Fault(delay=1.0)]
+
+        start = time.perf_counter()
+        result = client.extract_purchase_order_data("tekst")
+        elapsed = time.perf_counter() - start
+
+        self.assertTrue(result["success"])
+        self.assertLess(elapsed, 0.8)
+        stats = client.resilience_stats()
+        self.assertEqual((stats["hedges_sent"], stats["hedges_won"]), (1, 1))
+
+    def test_non_idempotent_call_not_hedged(self):
+        client = self.make_client(hedging=True, hedge_min_samples=1, hedge_min_delay=0.01)
+        client.submit_document(b"%PDF", "order.pdf")
+        self.faults.script = [Fault(delay=0.2)]
+
+        client.submit_document(b"%PDF", "order.pdf")
+
+        self.assertEqual(client.resilience_stats()["hedges_sent"], 0)
+        self.assertEqual(self.faults.requests, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
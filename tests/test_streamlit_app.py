@@ -7,10 +7,14 @@ import unittest
 from unittest.mock import Mock, patch, MagicMock
 import sys
 import os
+import tempfile
 from datetime import datetime, timedelta
+from types import SimpleNamespace
 
-# Add parent directory to path voor imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Add parent and backend directory to path voor imports
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "backend"))
 
 # Mock streamlit voor testing
 sys.modules['streamlit'] = MagicMock()
@@ -19,6 +23,26 @@ sys.modules['plotly.express'] = MagicMock()
 sys.modules['plotly.graph_objects'] = MagicMock()
 
 from app import DataExtractorApp
+import azure_functions
+from backend.tracing import Span, new_trace_id
+from benchmarks.pdf_builder import SAMPLE_ORDER_PAGES, build_pdf
+from conversion_cache import ConversionCache, MemoryCacheStore
+from devserver.function_app import FunctionAppServer
+from services.azure_client import AzureFunctionsClient
+from services.http_transport import FunctionHttpTransport
+
+
+class SessionState(dict):
+    """Session state met attribuut toegang, zoals st.session_state"""
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        self[name] = value
 
 class TestDataExtractorApp(unittest.TestCase):
     """Test cases voor DataExtractorApp"""
@@ -288,6 +312,47 @@ class TestErrorHandling(unittest.TestCase):
             doc_id = doc.get('id', 'NO_ID')
             self.assertIsInstance(doc_id, str)
 
+class TestDocumentTrace(unittest.TestCase):
+    """Test dat de stappen van de app via de client onder één trace tot in de Function App lopen"""
+
+    def setUp(self):
+        services = {"conversion_cache": ConversionCache(MemoryCacheStore())}
+        patcher = patch.dict(azure_functions._services, services, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.server = FunctionAppServer(storage_dir=tempfile.mkdtemp()).start()
+        self.addCleanup(self.server.stop)
+        transport = FunctionHttpTransport(self.server.url)
+        self.addCleanup(transport.close)
+        self.client = AzureFunctionsClient(self.server.url, transport=transport)
+
+    def test_backend_spans_share_the_upload_trace(self):
+        state = SessionState(current_page='process', documents=[])
+        with patch('app.st.session_state', state):
+            app = DataExtractorApp(client=self.client)
+            process = state.current_process
+            process['document'] = SimpleNamespace(name="order.pdf", getvalue=lambda: build_pdf(SAMPLE_ORDER_PAGES))
+            process['trace'] = trace = Span("document", new_trace_id(), service="streamlit")
+
+            app.render_converting_step()
+            self.assertEqual(process['step'], 3)
+            app.render_extracting_step()
+            self.assertEqual(process['step'], 4)
+            self.assertEqual(process['extracted_data']['order_number'], "APO-12345")
+            app.finish_document_trace("approved")
+        azure_functions.flush_uploads(5)
+
+        spans = self.client.export_trace(trace.trace_id)["spans"]
+        services = {(span["name"], span["service"]) for span in spans}
+        self.assertIn(("converting", "streamlit"), services)
+        self.assertIn(("convert_pdf_to_text", "function_app"), services)
+        self.assertIn(("extract_purchase_order_data", "function_app"), services)
+        self.assertTrue(all(span["trace_id"] == trace.trace_id for span in spans))
+        container = self.server.blob_service.get_container_client("documents")
+        blob_name = container.blob_names("extracted_text/")[0]
+        self.assertEqual(container.get_properties(blob_name).metadata["trace_id"], trace.trace_id)
+
+
 if __name__ == '__main__':
     # Setup test environment
     os.environ['STREAMLIT_SERVER_HEADLESS'] = 'true'
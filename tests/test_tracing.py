@@ -0,0 +1,109 @@
+"""
+Unit tests voor trace correlatie van client via Function App tot blob metadata
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+# Add parent and backend directory to path voor imports
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "backend"))
+
+import azure_functions
+import tracing
+from backend import tracing as client_tracing
+from benchmarks.pdf_builder import SAMPLE_ORDER_PAGES, build_pdf
+from blob_writer import WriteBehindUploader
+from conversion_cache import ConversionCache, MemoryCacheStore
+from devserver.function_app import FunctionAppServer
+from services.azure_client import AzureFunctionsClient
+from services.http_transport import FunctionHttpTransport
+
+
+class TestSpans(unittest.TestCase):
+    """Test cases voor spans, traceparent en export"""
+
+    def test_traceparent_roundtrip(self):
+        context = tracing.SpanContext("4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7")
+
+        self.assertEqual(tracing.parse_traceparent(context.traceparent), context)
+        self.assertIsNone(tracing.parse_traceparent("00-" + "0" * 32 + "-00f067aa0ba902b7-01"))
+        self.assertIsNone(tracing.parse_traceparent("garbage"))
+        self.assertIsNone(tracing.parse_traceparent(None))
+
+    def test_nested_spans_and_chrome_export(self):
+        store = tracing.TraceStore(max_traces=2)
+        with tracing.start_span("document", service="streamlit", store=store) as root:
+            with tracing.start_span("convert", store=store) as child:
+                pass
+        with self.assertRaises(ValueError):
+            with tracing.start_span("failing", parent=root.context, store=store):
+                raise ValueError("kapot")
+
+        trace = store.export(root.trace_id)
+        spans = {span["name"]: span for span in trace["spans"]}
+        self.assertEqual(spans["convert"]["parent_id"], root.span_id)
+        self.assertEqual(spans["convert"]["service"], "streamlit")
+        self.assertEqual(spans["failing"]["status"], "error")
+        self.assertIsNone(tracing.current_span())
+        chrome = tracing.to_chrome_trace(trace)
+        self.assertEqual(len([event for event in chrome["traceEvents"] if event["ph"] == "X"]), 3)
+        self.assertEqual(child.trace_id, root.trace_id)
+
+    def test_write_behind_upload_keeps_trace(self):
+        seen = []
+        uploader = WriteBehindUploader(lambda name, content: seen.append(
+            (threading.current_thread().name, tracing.current_span().trace_id)
+        ))
+        self.addCleanup(uploader.shutdown, 5)
+
+        with tracing.start_span("route") as span:
+            uploader.submit("extracted_text/a.txt", "tekst")
+        uploader.flush(5)
+
+        self.assertTrue(seen[0][0].startswith("blob-writer"))
+        self.assertEqual(seen[0][1], span.trace_id)
+
+
+class TestEndToEndTrace(unittest.TestCase):
+    """Test cases voor één trace van client span tot Function route en blob metadata"""
+
+    def setUp(self):
+        services = {"conversion_cache": ConversionCache(MemoryCacheStore())}
+        patcher = patch.dict(azure_functions._services, services, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.server = FunctionAppServer(storage_dir=tempfile.mkdtemp()).start()
+        self.addCleanup(self.server.stop)
+
+    def test_process_document_trace(self):
+        transport = FunctionHttpTransport(self.server.url)
+        self.addCleanup(transport.close)
+        client = AzureFunctionsClient(self.server.url, transport=transport)
+
+        with client_tracing.start_span("document", service="streamlit") as document:
+            result = client.process_document(build_pdf(SAMPLE_ORDER_PAGES), "order.pdf")
+        azure_functions.flush_uploads(5)
+
+        self.assertEqual(result["trace_id"], document.trace_id)
+        trace = client.export_trace(document.trace_id)
+        spans = {span["name"]: span for span in trace["spans"]}
+        self.assertEqual(spans["process_document"]["service"], "function_app")
+        self.assertEqual(spans["process_document"]["parent_id"], spans["POST process_document"]["span_id"])
+        self.assertEqual(spans["pypdf2"]["parent_id"], spans["process_document"]["span_id"])
+        self.assertIn("blob_write", spans)
+        container = self.server.blob_service.get_container_client("documents")
+        blob_name = container.blob_names("extracted_data/")[0]
+        self.assertEqual(container.get_properties(blob_name).metadata["trace_id"], document.trace_id)
+        chrome = client.export_trace(document.trace_id, chrome=True)
+        self.assertEqual(json.loads(json.dumps(chrome))["otherData"]["trace_id"], document.trace_id)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+"""
+Unit tests voor zero-copy upload buffers
+"""
+
+import hashlib
+import io
+import tempfile
+import unittest
+import sys
+import os
+
+# Add parent and backend directory to path voor imports
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "backend"))
+
+from benchmarks.pdf_builder import build_pdf
+from pdf_text import extract_pages
+from upload_buffer import UploadBuffer, open_view
+
+
+class NonFileStream(io.RawIOBase):
+    """Seekable stream zonder bestandsdescriptor (zoals een netwerk of in-memory wrapper)"""
+
+    def __init__(self, content):
+        self._inner = io.BytesIO(content)
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        return self._inner.readinto(buffer)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        return self._inner.seek(offset, whence)
+
+
+class TestOpenView(unittest.TestCase):
+    """Test cases voor open_view"""
+
+    def test_read_and_seek_over_memoryview(self):
+        content = bytes(range(256)) * 10
+        stream = open_view(memoryview(bytearray(content)))
+
+        self.assertEqual(stream.read(4), content[:4])
+        stream.seek(-3, io.SEEK_END)
+        self.assertEqual(stream.read(), content[-3:])
+        stream.seek(100)
+        self.assertEqual(stream.tell(), 100)
+        self.assertEqual(stream.read(10), content[100:110])
+
+    def test_bytes_use_bytesio(self):
+        self.assertIsInstance(open_view(b"abc"), io.BytesIO)
+
+
+class TestUploadBuffer(unittest.TestCase):
+    """Test cases voor UploadBuffer.from_stream"""
+
+    def setUp(self):
+        self.content = build_pdf([[f"Order Number: APO-{number}"] for number in range(1, 4)],
+                                 scan_bytes_per_page=300_000)
+
+    def assert_shared_buffer_works(self, upload):
+        self.assertEqual(upload.size, len(self.content))
+        self.assertEqual(hashlib.sha256(upload.view).hexdigest(), hashlib.sha256(self.content).hexdigest())
+        self.assertEqual(extract_pages(upload.view, workers=1), extract_pages(self.content, workers=1))
+        self.assertEqual(open_view(upload.view).read(), self.content)
+
+    def test_small_upload_in_memory(self):
+        """Test dat kleine uploads gewoon in het geheugen gelezen worden"""
+        with UploadBuffer.from_stream(io.BytesIO(self.content), memory_limit=len(self.content)) as upload:
+            self.assertFalse(upload.memory_mapped)
+            self.assert_shared_buffer_works(upload)
+
+    def test_large_file_upload_is_memory_mapped(self):
+        """Test dat een upload met bestand (zoals de gespoolde form parser output) gemapt wordt"""
+        with tempfile.TemporaryFile() as handle:
+            handle.write(self.content)
+            with UploadBuffer.from_stream(handle, memory_limit=1024) as upload:
+                self.assertTrue(upload.memory_mapped)
+                self.assert_shared_buffer_works(upload)
+
+    def test_large_stream_without_file_is_spooled(self):
+        """Test dat een stream zonder fileno eerst naar een temp bestand gaat en dan gemapt wordt"""
+        with UploadBuffer.from_stream(NonFileStream(self.content), memory_limit=1024) as upload:
+            self.assertTrue(upload.memory_mapped)
+            self.assert_shared_buffer_works(upload)
+
+    def test_close_releases_view(self):
+        with tempfile.TemporaryFile() as handle:
+            handle.write(self.content)
+            upload = UploadBuffer.from_stream(handle, memory_limit=1024)
+            upload.close()
+            with self.assertRaises(ValueError):
+                upload.view[0]
+
+
+if __name__ == '__main__':
+    unittest.main()